@@ -0,0 +1,174 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import heapq
+import itertools
+
+import async_channel.enums as channel_enums
+import octobot_commons.channels_name as channels_name
+import octobot_trading.exchange_channel as exchanges_channel
+
+
+class IndexedThreshold:
+    __slots__ = ("target_price", "callback", "is_active")
+
+    def __init__(self, target_price, callback):
+        self.target_price = target_price
+        self.callback = callback
+        self.is_active = True
+
+
+class PriceThresholdIndex:
+    """
+    Price thresholds of a symbol sorted around its last price: the upper heap contains thresholds above
+    the last price (lowest first) and the lower heap thresholds below it (highest first) so that a price
+    update only looks at the thresholds it crossed.
+    A threshold is crossed when the price goes from one side of the threshold to reaching or going
+    through it. Thresholds added before the first price or equal to the last price are only sorted
+    on the next price change.
+    """
+    def __init__(self):
+        self.last_price = None
+        self.size = 0
+        self._upper = []
+        self._lower = []
+        self._unsorted = []
+        self._removed_count = 0
+        self._counter = itertools.count()
+
+    def add(self, target_price, callback) -> IndexedThreshold:
+        threshold = IndexedThreshold(target_price, callback)
+        if self.last_price is None:
+            self._unsorted.append(threshold)
+        else:
+            self._sort(threshold, self.last_price)
+        self.size += 1
+        return threshold
+
+    def remove(self, threshold: IndexedThreshold):
+        if not threshold.is_active:
+            return
+        # lazy removal: dropped from heaps when crossed or when too many thresholds are removed
+        threshold.is_active = False
+        self.size -= 1
+        self._removed_count += 1
+        if self._removed_count > self.size:
+            self._compact()
+
+    def update_price(self, price) -> list:
+        """
+        :return: the thresholds crossed by this price update
+        """
+        crossed = []
+        if self.last_price is not None:
+            if price > self.last_price:
+                while self._upper and self._upper[0][0] <= price:
+                    self._pop_active(heapq.heappop(self._upper)[2], crossed)
+            elif price < self.last_price:
+                while self._lower and -self._lower[0][0] >= price:
+                    self._pop_active(heapq.heappop(self._lower)[2], crossed)
+        if price != self.last_price and self._unsorted:
+            unsorted = self._unsorted
+            self._unsorted = []
+            for threshold in unsorted:
+                if threshold.is_active:
+                    self._sort(threshold, price)
+                else:
+                    self._removed_count -= 1
+        self.last_price = price
+        for threshold in crossed:
+            self._sort(threshold, price)
+        return crossed
+
+    def _pop_active(self, threshold, crossed):
+        if threshold.is_active:
+            crossed.append(threshold)
+        else:
+            self._removed_count -= 1
+
+    def _sort(self, threshold, price):
+        if threshold.target_price > price:
+            heapq.heappush(self._upper, (threshold.target_price, next(self._counter), threshold))
+        elif threshold.target_price < price:
+            heapq.heappush(self._lower, (-threshold.target_price, next(self._counter), threshold))
+        else:
+            self._unsorted.append(threshold)
+
+    def _compact(self):
+        self._upper = [element for element in self._upper if element[2].is_active]
+        self._lower = [element for element in self._lower if element[2].is_active]
+        heapq.heapify(self._upper)
+        heapq.heapify(self._lower)
+        self._unsorted = [threshold for threshold in self._unsorted if threshold.is_active]
+        self._removed_count = 0
+
+
+class _SymbolThresholds:
+    def __init__(self):
+        self.index = PriceThresholdIndex()
+        self.consumer = None
+
+
+# (exchange_id, symbol) => _SymbolThresholds
+_THRESHOLDS = {}
+
+
+async def add_threshold(exchange_id, symbol, target_price, callback) -> IndexedThreshold:
+    """
+    Register a price threshold: callback() is called when the mark price of symbol on the given exchange crosses
+    target_price. Thresholds of the same exchange and symbol share the same mark price consumer.
+    """
+    key = (exchange_id, symbol)
+    try:
+        return _THRESHOLDS[key].index.add(target_price, callback)
+    except KeyError:
+        symbol_thresholds = _THRESHOLDS[key] = _SymbolThresholds()
+    threshold = symbol_thresholds.index.add(target_price, callback)
+    consumer = await exchanges_channel.get_chan(
+        channels_name.OctoBotTradingChannelsName.MARK_PRICE_CHANNEL.value,
+        exchange_id
+    ).new_consumer(
+        _mark_price_callback,
+        priority_level=channel_enums.ChannelConsumerPriorityLevels.MEDIUM.value,
+        symbol=symbol
+    )
+    if _THRESHOLDS.get(key) is symbol_thresholds:
+        symbol_thresholds.consumer = consumer
+    else:
+        # every threshold has been removed in the meantime
+        await consumer.stop()
+    return threshold
+
+
+async def remove_threshold(exchange_id, symbol, threshold: IndexedThreshold):
+    key = (exchange_id, symbol)
+    try:
+        symbol_thresholds = _THRESHOLDS[key]
+    except KeyError:
+        return
+    symbol_thresholds.index.remove(threshold)
+    if symbol_thresholds.index.size == 0:
+        _THRESHOLDS.pop(key)
+        if symbol_thresholds.consumer is not None:
+            await symbol_thresholds.consumer.stop()
+
+
+async def _mark_price_callback(exchange: str, exchange_id: str, cryptocurrency: str, symbol: str, mark_price):
+    try:
+        index = _THRESHOLDS[(exchange_id, symbol)].index
+    except KeyError:
+        return
+    for threshold in index.update_price(mark_price):
+        threshold.callback()
@@ -0,0 +1,47 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import random
+
+
+class LegacyPriceThreshold:
+    """
+    Per trigger mark price check, as done by each PriceThreshold consumer before thresholds were indexed
+    """
+    def __init__(self, target_price):
+        self.target_price = target_price
+        self.last_price = None
+
+    def update_price(self, mark_price) -> bool:
+        crossed = self.last_price is not None and (
+            mark_price >= self.target_price > self.last_price or mark_price <= self.target_price < self.last_price
+        )
+        self.last_price = mark_price
+        return crossed
+
+
+def get_random_walk_prices(count, start=1000, step=5, seed=42):
+    rnd = random.Random(seed)
+    prices = []
+    price = start
+    for _ in range(count):
+        price = max(1, price + rnd.randint(-step, step))
+        prices.append(price)
+    return prices
+
+
+def get_thresholds_prices(count, min_price=900, max_price=1100, seed=42):
+    rnd = random.Random(seed)
+    return [rnd.randint(min_price, max_price) for _ in range(count)]
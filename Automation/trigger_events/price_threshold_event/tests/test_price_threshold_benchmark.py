@@ -0,0 +1,70 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import decimal
+import os
+import time
+import pytest
+
+import tentacles.Automation.trigger_events.price_threshold_event.price_threshold_index as price_threshold_index
+import tentacles.Automation.trigger_events.price_threshold_event.tests as price_threshold_tests
+
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it"),
+]
+
+THRESHOLDS_COUNT = 10000
+TICKS_COUNT = 100000
+# per trigger checks are too slow to run on every tick
+LEGACY_TICKS_COUNT = 200
+
+
+async def test_10k_thresholds_100k_ticks():
+    prices = [decimal.Decimal(price) for price in price_threshold_tests.get_random_walk_prices(TICKS_COUNT)]
+    targets = [decimal.Decimal(price) for price in price_threshold_tests.get_thresholds_prices(THRESHOLDS_COUNT)]
+
+    # previous behavior: each trigger consumer checks every tick
+    legacy_thresholds = [price_threshold_tests.LegacyPriceThreshold(target) for target in targets]
+    legacy_crossings = 0
+    t0 = time.perf_counter()
+    for price in prices[:LEGACY_TICKS_COUNT]:
+        for legacy_threshold in legacy_thresholds:
+            if legacy_threshold.update_price(price):
+                legacy_crossings += 1
+    legacy_tick_cost = (time.perf_counter() - t0) / LEGACY_TICKS_COUNT
+
+    crossings = 0
+
+    def on_crossed():
+        nonlocal crossings
+        crossings += 1
+
+    index = price_threshold_index.PriceThresholdIndex()
+    for target in targets:
+        index.add(target, on_crossed)
+    t0 = time.perf_counter()
+    for price in prices:
+        for threshold in index.update_price(price):
+            threshold.callback()
+    indexed_tick_cost = (time.perf_counter() - t0) / TICKS_COUNT
+    print(
+        f"\n{THRESHOLDS_COUNT} thresholds: per tick cost: per trigger checks: {legacy_tick_cost * 1e6:.1f}us, "
+        f"indexed: {indexed_tick_cost * 1e6:.2f}us ({crossings} crossings in {TICKS_COUNT} ticks, "
+        f"{crossings / TICKS_COUNT:.1f} per tick)"
+    )
+    assert crossings > 0
+    assert indexed_tick_cost * 10 < legacy_tick_cost
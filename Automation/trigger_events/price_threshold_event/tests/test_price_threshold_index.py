@@ -0,0 +1,172 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import decimal
+import mock
+import pytest
+
+import octobot_trading.api as trading_api
+import octobot_trading.exchange_channel as exchanges_channel
+
+import tentacles.Automation.trigger_events.price_threshold_event as price_threshold_event
+import tentacles.Automation.trigger_events.price_threshold_event.price_threshold_index as price_threshold_index
+import tentacles.Automation.trigger_events.price_threshold_event.tests as price_threshold_tests
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def mark_price_channel():
+    consumers = []
+
+    async def new_consumer(callback, **kwargs):
+        consumer = mock.Mock(callback=callback, kwargs=kwargs, stop=mock.AsyncMock())
+        consumers.append(consumer)
+        return consumer
+
+    channel = mock.Mock(new_consumer=mock.AsyncMock(side_effect=new_consumer), consumers=consumers)
+    with mock.patch.object(exchanges_channel, "get_chan", mock.Mock(return_value=channel)):
+        yield channel
+    price_threshold_index._THRESHOLDS.clear()
+
+
+async def test_crossed_thresholds():
+    index = price_threshold_index.PriceThresholdIndex()
+    thresholds = {
+        price: index.add(decimal.Decimal(price), None)
+        for price in (90, 100, 110)
+    }
+    # first price: nothing can be crossed
+    assert index.update_price(decimal.Decimal(100)) == []
+    # 100 was equal to the last price: it can't be crossed by moving away from it
+    assert index.update_price(decimal.Decimal(105)) == []
+    assert index.update_price(decimal.Decimal(110)) == [thresholds[110]]
+    assert index.update_price(decimal.Decimal(111)) == []
+    assert index.update_price(decimal.Decimal(80)) == [thresholds[110], thresholds[100], thresholds[90]]
+    assert index.update_price(decimal.Decimal(90)) == [thresholds[90]]
+    index.remove(thresholds[100])
+    assert index.size == 2
+    assert index.update_price(decimal.Decimal(200)) == [thresholds[110]]
+    assert index.update_price(decimal.Decimal(200)) == []
+
+
+async def test_same_crossings_as_per_trigger_checks():
+    prices = [decimal.Decimal(price) for price in price_threshold_tests.get_random_walk_prices(5000)]
+    targets = [decimal.Decimal(price) for price in price_threshold_tests.get_thresholds_prices(500)]
+    index = price_threshold_index.PriceThresholdIndex()
+    legacy_thresholds = [price_threshold_tests.LegacyPriceThreshold(target) for target in targets]
+    indexed_thresholds = [index.add(target, None) for target in targets]
+    ids_by_threshold = {threshold: threshold_id for threshold_id, threshold in enumerate(indexed_thresholds)}
+    removed_ids = set()
+    total_crossings = 0
+    for tick, price in enumerate(prices):
+        if tick == 2500:
+            # remove half of the thresholds
+            for threshold_id in range(0, len(targets), 2):
+                index.remove(indexed_thresholds[threshold_id])
+                removed_ids.add(threshold_id)
+        expected = {
+            threshold_id
+            for threshold_id, legacy_threshold in enumerate(legacy_thresholds)
+            if legacy_threshold.update_price(price) and threshold_id not in removed_ids
+        }
+        crossed = [ids_by_threshold[threshold] for threshold in index.update_price(price)]
+        assert len(crossed) == len(set(crossed))
+        assert set(crossed) == expected
+        total_crossings += len(expected)
+    assert total_crossings > 1000
+
+
+async def test_removed_thresholds_are_compacted():
+    index = price_threshold_index.PriceThresholdIndex()
+    index.update_price(500)
+    thresholds = [index.add(price, None) for price in range(1000)]
+    for threshold in thresholds[:900]:
+        index.remove(threshold)
+    assert index.size == 100
+    assert len(index._upper) + len(index._lower) + len(index._unsorted) <= 2 * index.size
+    # removing twice is ignored
+    index.remove(thresholds[0])
+    assert index.size == 100
+
+
+async def test_shared_mark_price_consumer(mark_price_channel):
+    with mock.patch.object(trading_api, "get_exchange_ids", mock.Mock(return_value=["exchange_id"])):
+        triggers = []
+        for target_price in (100, 110, 120):
+            trigger = price_threshold_event.PriceThreshold()
+            trigger.apply_config({
+                trigger.SYMBOL: "BTC/USDT",
+                trigger.TARGET_PRICE: target_price,
+                trigger.TRIGGER_ONLY_ONCE: False,
+                trigger.MAX_TRIGGER_FREQUENCY: 0,
+            })
+            await trigger._register_consumer()
+            triggers.append(trigger)
+        other_symbol_trigger = price_threshold_event.PriceThreshold()
+        other_symbol_trigger.apply_config({
+            other_symbol_trigger.SYMBOL: "ETH/USDT",
+            other_symbol_trigger.TARGET_PRICE: 10,
+            other_symbol_trigger.TRIGGER_ONLY_ONCE: False,
+            other_symbol_trigger.MAX_TRIGGER_FREQUENCY: 0,
+        })
+        await other_symbol_trigger._register_consumer()
+
+    # 1 consumer per exchange and symbol
+    assert [consumer.kwargs["symbol"] for consumer in mark_price_channel.consumers] == ["BTC/USDT", "ETH/USDT"]
+    callback = mark_price_channel.consumers[0].callback
+    await callback("exchange", "exchange_id", "BTC", "BTC/USDT", decimal.Decimal(105))
+    await callback("exchange", "exchange_id", "BTC", "BTC/USDT", decimal.Decimal(115))
+    assert [trigger.trigger_event.is_set() for trigger in triggers] == [False, True, False]
+    await callback("exchange", "exchange_id", "BTC", "BTC/USDT", decimal.Decimal(99))
+    assert [trigger.trigger_event.is_set() for trigger in triggers] == [True, True, False]
+    assert not other_symbol_trigger.trigger_event.is_set()
+
+    # consumer is stopped when its last trigger stops
+    for trigger in triggers[:2]:
+        await trigger.stop()
+    mark_price_channel.consumers[0].stop.assert_not_called()
+    triggers[2].trigger_event.clear()
+    await triggers[2].stop()
+    mark_price_channel.consumers[0].stop.assert_awaited_once()
+    await callback("exchange", "exchange_id", "BTC", "BTC/USDT", decimal.Decimal(130))
+    assert not triggers[2].trigger_event.is_set()
+    await other_symbol_trigger.stop()
+    mark_price_channel.consumers[1].stop.assert_awaited_once()
+    assert price_threshold_index._THRESHOLDS == {}
+
+
+async def test_triggered_event(mark_price_channel):
+    trigger = price_threshold_event.PriceThreshold()
+    trigger.apply_config({
+        trigger.SYMBOL: "BTC/USDT",
+        trigger.TARGET_PRICE: 100,
+        trigger.TRIGGER_ONLY_ONCE: True,
+        trigger.MAX_TRIGGER_FREQUENCY: 0,
+    })
+    with mock.patch.object(trading_api, "get_exchange_ids", mock.Mock(return_value=["exchange_id"])):
+        events = trigger.next_event()
+        next_event_task = asyncio.create_task(events.__anext__())
+        await asyncio.sleep(0)
+    callback = mark_price_channel.consumers[0].callback
+    await callback("exchange", "exchange_id", "BTC", "BTC/USDT", decimal.Decimal(90))
+    await asyncio.sleep(0)
+    assert not next_event_task.done()
+    await callback("exchange", "exchange_id", "BTC", "BTC/USDT", decimal.Decimal(100))
+    await asyncio.wait_for(next_event_task, 1)
+    await trigger.stop()
+    assert price_threshold_index._THRESHOLDS == {}
@@ -20,3 +20,10 @@ from octobot_backtesting.collectors.exchanges.exchange_collector cimport Abstrac
 cdef class ExchangeHistoryDataCollector(AbstractExchangeHistoryCollector):
     cdef public object exchange
     cdef public object exchange_manager
+    cdef public int max_concurrent_requests
+    cdef public object resumed_file_path
+
+    cdef dict _checkpoints
+    cdef dict _histories_progress
+    cdef object _requests_rate_limiter
+    cdef object _database_lock
@@ -13,17 +13,21 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
+import enum
 import logging
 import os
 import time
 
 import octobot_backtesting.collectors as collector
+import octobot_backtesting.constants as backtesting_constants
 import octobot_backtesting.enums as backtesting_enums
 import octobot_backtesting.errors as errors
 import octobot_commons.constants as commons_constants
 import octobot_commons.enums as commons_enums
 import octobot_commons.time_frame_manager as time_frame_manager
 import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+import tentacles.Trading.Exchange.exchange_requests_limiter as exchange_requests_limiter
 
 try:
     import octobot_trading.api as trading_api
@@ -33,19 +37,52 @@ except ImportError:
     logging.error("ExchangeHistoryDataCollector requires OctoBot-Trading package installed")
 
 
+class HistoryCollectorTables(enum.Enum):
+    CHECKPOINTS = "history_collector_checkpoints"
+
+
 class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
     IMPORTER = generic_exchange_importer.GenericExchangeDataImporter
+    # max number of (symbol, time frame) histories fetched at the same time
+    DEFAULT_MAX_CONCURRENT_REQUESTS = 5
+    # fetched candles are saved in a single transaction when reaching this count
+    SAVED_CANDLES_BATCH_SIZE = 10000
 
     def __init__(self, config, exchange_name, exchange_type, tentacles_setup_config, symbols, time_frames,
                  use_all_available_timeframes=False,
                  data_format=backtesting_enums.DataFormats.REGULAR_COLLECTOR_DATA,
                  start_timestamp=None,
-                 end_timestamp=None):
+                 end_timestamp=None,
+                 max_concurrent_requests=DEFAULT_MAX_CONCURRENT_REQUESTS):
         super().__init__(config, exchange_name, exchange_type, tentacles_setup_config, symbols, time_frames,
                          use_all_available_timeframes, data_format=data_format,
                          start_timestamp=start_timestamp, end_timestamp=end_timestamp)
         self.exchange = None
         self.exchange_manager = None
+        self.max_concurrent_requests = max_concurrent_requests
+        self.resumed_file_path = None
+        # (symbol, time frame value) => (last saved candle time, is complete)
+        self._checkpoints = {}
+        # (symbol, time frame value) => collection progress percent of the histories being collected
+        self._histories_progress = {}
+        self._requests_rate_limiter = None
+        self._database_lock = asyncio.Lock()
+
+    def resume(self, resumed_file_name):
+        """
+        Continue an interrupted collection from its temporary data file instead of creating a new data file.
+        Should be called before initialize()
+        :param resumed_file_name: name of the temporary data file of the interrupted collection
+        """
+        resumed_file_path = os.path.join(self.path, os.path.basename(resumed_file_name)) \
+            if self.path else resumed_file_name
+        if not resumed_file_path.endswith(backtesting_constants.BACKTESTING_DATA_FILE_TEMP_EXT) \
+                or not os.path.isfile(resumed_file_path):
+            raise errors.DataCollectorError(f"{resumed_file_name} is not an interrupted collection data file")
+        self.resumed_file_path = resumed_file_path
+        self.temp_file_path = resumed_file_path
+        self.file_path = resumed_file_path[:-len(backtesting_constants.BACKTESTING_DATA_FILE_TEMP_EXT)]
+        self.file_name = os.path.basename(self.file_path)
 
     async def start(self):
         self.should_stop = False
@@ -62,34 +99,41 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
                 .build()
 
             self.exchange = self.exchange_manager.exchange
+            if max_requests_per_second := exchange_requests_limiter.get_max_requests_per_second(
+                self.exchange_manager
+            ):
+                self._requests_rate_limiter = exchange_requests_limiter.RequestsRateLimiter(max_requests_per_second)
             self._load_timeframes_if_necessary()
 
             await self.check_timestamps()
 
-            # create description
-            await self._create_description()
+            await self._load_checkpoints()
+            if not await self.database.check_table_exists(backtesting_enums.DataTables.DESCRIPTION):
+                # create description
+                await self._create_description()
 
             self.total_steps = len(self.time_frames) * len(self.symbols)
+            self.current_step_index = 0
             self.in_progress = True
 
             self.logger.info(f"Start collecting history on {self.exchange_name}")
-            for symbol_index, symbol in enumerate(self.symbols):
-                self.logger.info(f"Collecting history for {symbol}...")
+            for symbol in self.symbols:
                 await self.get_ticker_history(self.exchange_name, symbol)
                 await self.get_order_book_history(self.exchange_name, symbol)
                 await self.get_recent_trades_history(self.exchange_name, symbol)
-
-                for time_frame_index, time_frame in enumerate(self.time_frames):
-                    self.current_step_index = (symbol_index * len(self.time_frames)) + time_frame_index + 1
-                    self.logger.info(
-                        f"[{time_frame_index}/{len(self.time_frames)}] Collecting {symbol} history on {time_frame}...")
-                    await self.get_ohlcv_history(self.exchange_name, symbol, time_frame)
-                    await self.get_kline_history(self.exchange_name, symbol, time_frame)
+            await self._collect_candles_histories()
+        except asyncio.CancelledError:
+            await self.database.stop()
+            should_stop_database = False
+            self._log_resumable_file()
+            raise
         except Exception as err:
             await self.database.stop()
             should_stop_database = False
+            if self._checkpoints or self.resumed_file_path is not None:
+                self._log_resumable_file()
             # Do not keep errored data file
-            if os.path.isfile(self.temp_file_path):
+            elif os.path.isfile(self.temp_file_path):
                 os.remove(self.temp_file_path)
             if not self.should_stop:
                 self.logger.exception(err, True, f"Error when collecting {self.exchange_name} history for "
@@ -98,6 +142,55 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
         finally:
             await self.stop(should_stop_database=should_stop_database)
 
+    async def _collect_candles_histories(self):
+        semaphore = asyncio.Semaphore(self._get_max_concurrent_requests())
+        tasks = [
+            asyncio.create_task(self._collect_candles_history(semaphore, symbol, time_frame))
+            for symbol in self.symbols
+            for time_frame in self.time_frames
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # on error or cancel, stop every other collection
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _collect_candles_history(self, semaphore, symbol, time_frame):
+        async with semaphore:
+            if self._is_complete(symbol, time_frame):
+                self.logger.info(f"Skipping already collected {symbol} history on {time_frame}")
+            else:
+                self.logger.info(f"Collecting {symbol} history on {time_frame}...")
+                await self.get_ohlcv_history(self.exchange_name, symbol, time_frame)
+                await self.get_kline_history(self.exchange_name, symbol, time_frame)
+                await self._save_checkpoint(symbol, time_frame, None, True)
+                self._histories_progress.pop((symbol.symbol_str, time_frame.value), None)
+            self.current_step_index += 1
+            self.logger.info(f"[{self.current_step_index}/{self.total_steps}] Collected {symbol} history on "
+                             f"{time_frame}")
+
+    def get_current_step_percent(self):
+        # concurrent collections: average progress of the histories being collected
+        if not self._histories_progress:
+            return 0
+        return sum(self._histories_progress.values()) / len(self._histories_progress)
+
+    async def _wait_for_request_slot(self):
+        if self._requests_rate_limiter is not None:
+            await self._requests_rate_limiter.wait()
+
+    def _get_max_concurrent_requests(self) -> int:
+        return exchange_requests_limiter.get_max_concurrent_requests(
+            self.exchange_manager, self.max_concurrent_requests
+        )
+
+    def _log_resumable_file(self):
+        if os.path.isfile(self.temp_file_path):
+            self.logger.info(f"Interrupted {self.exchange_name} history collection can be resumed "
+                             f"from {self.temp_file_path}")
+
     def _load_all_available_timeframes(self):
         allowed_timeframes = set(tf.value for tf in commons_enums.TimeFrames)
         self.time_frames = [commons_enums.TimeFrames(time_frame)
@@ -126,9 +219,7 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
         pass
 
     async def get_ohlcv_history(self, exchange, symbol, time_frame):
-        self.current_step_percent = 0
-        # use time_frame_sec to add time to save the candle closing time
-        time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+        self._histories_progress[(symbol.symbol_str, time_frame.value)] = 0
         symbol_id = str(symbol)
         cryptocurrency = self.exchange_manager.exchange.get_pair_cryptocurrency(symbol_id)
         if self.start_timestamp is not None:
@@ -139,34 +230,102 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
             ) * 1000
             if self.start_timestamp < first_candle_timestamp:
                 start_time = first_candle_timestamp
+            fetch_start_time = start_time
+            if last_saved_candle_time := self._get_last_saved_candle_time(symbol, time_frame):
+                # resume collection after the last saved candle
+                fetch_start_time = last_saved_candle_time * 1000 + 1
+            pending_candles = []
+            await self._wait_for_request_slot()
             async for hist_candles in trading_api.get_historical_ohlcv(self.exchange_manager, symbol_id, time_frame,
-                                                                       start_time, end_time):
+                                                                       fetch_start_time, end_time):
                 if hist_candles:
-                    self.current_step_percent = \
+                    progress = \
                         (hist_candles[-1][commons_enums.PriceIndexes.IND_PRICE_TIME.value] - start_time / 1000) / \
                         ((end_time - start_time) / 1000) * 100
-                    self.logger.info(f"[{self.current_step_percent}%] historical data fetched for {symbol} {time_frame}")
-                    await self.save_ohlcv(
-                        exchange=exchange,
-                        cryptocurrency=cryptocurrency,
-                        symbol=symbol.symbol_str, time_frame=time_frame, candle=hist_candles,
-                        timestamp=[candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] + time_frame_sec
-                                   for candle in hist_candles],
-                        multiple=True)
+                    self._histories_progress[(symbol.symbol_str, time_frame.value)] = progress
+                    self.logger.info(f"[{progress}%] historical data fetched for {symbol} {time_frame}")
+                    pending_candles += hist_candles
+                    if len(pending_candles) >= self.SAVED_CANDLES_BATCH_SIZE:
+                        await self._save_ohlcv_batch(exchange, cryptocurrency, symbol, time_frame, pending_candles)
+                        pending_candles = []
+                # the next candles are fetched when iterating again
+                await self._wait_for_request_slot()
+            if pending_candles:
+                await self._save_ohlcv_batch(exchange, cryptocurrency, symbol, time_frame, pending_candles)
         else:
             try:
+                await self._wait_for_request_slot()
                 candles = await self.exchange.get_symbol_prices(symbol_id, time_frame)
                 if candles:
-                    await self.save_ohlcv(exchange=exchange,
-                                          cryptocurrency=cryptocurrency,
-                                          symbol=symbol.symbol_str, time_frame=time_frame, candle=candles,
-                                          timestamp=[candle[0] + time_frame_sec for candle in candles], multiple=True)
+                    await self._save_ohlcv_batch(exchange, cryptocurrency, symbol, time_frame, candles)
                 else:
                     self.logger.error(f"No candles for {symbol} on {time_frame} ({exchange})")
             except trading_errors.FailedRequest as err:
                 self.logger.exception(err, False)
                 self.logger.warning(f"Ignored {symbol} {time_frame} candles on {exchange} ({err})")
 
+    async def _save_ohlcv_batch(self, exchange, cryptocurrency, symbol, time_frame, candles):
+        # use time_frame_sec to add time to save the candle closing time
+        time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+        async with self._database_lock:
+            await self.save_ohlcv(
+                exchange=exchange,
+                cryptocurrency=cryptocurrency,
+                symbol=symbol.symbol_str, time_frame=time_frame, candle=candles,
+                timestamp=[candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] + time_frame_sec
+                           for candle in candles],
+                multiple=True)
+            await self._save_checkpoint(
+                symbol, time_frame, candles[-1][commons_enums.PriceIndexes.IND_PRICE_TIME.value], False
+            )
+
+    async def _load_checkpoints(self):
+        self._checkpoints = {}
+        if not await self.database.check_table_exists(HistoryCollectorTables.CHECKPOINTS):
+            return
+        for _, symbol, time_frame, last_candle_time, complete in \
+                await self.database.select(HistoryCollectorTables.CHECKPOINTS):
+            last_candle_time = float(last_candle_time)
+            if complete != str(True):
+                # candles might have been saved without their checkpoint: resume from the last saved one
+                last_saved_candles_close_time = (await self.database.select_max(
+                    backtesting_enums.ExchangeDataTables.OHLCV, [self.database.TIMESTAMP_COLUMN],
+                    symbol=symbol, time_frame=time_frame
+                ))[0][0]
+                if last_saved_candles_close_time is not None:
+                    last_candle_time = max(
+                        last_candle_time,
+                        float(last_saved_candles_close_time)
+                        - commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(time_frame)]
+                        * commons_constants.MINUTE_TO_SECONDS
+                    )
+            self._checkpoints[(symbol, time_frame)] = (last_candle_time, complete == str(True))
+        self.logger.info(f"Resuming {self.exchange_name} history collection from {len(self._checkpoints)} "
+                         f"checkpoints")
+
+    async def _save_checkpoint(self, symbol, time_frame, last_candle_time, complete):
+        key = (symbol.symbol_str, time_frame.value)
+        if last_candle_time is None:
+            last_candle_time = self._checkpoints[key][0] if key in self._checkpoints else 0
+        if key in self._checkpoints:
+            await self.database.update(
+                HistoryCollectorTables.CHECKPOINTS,
+                {"last_candle_time": last_candle_time, "complete": complete},
+                symbol=key[0], time_frame=key[1]
+            )
+        else:
+            await self.database.insert(
+                HistoryCollectorTables.CHECKPOINTS, time.time(),
+                symbol=key[0], time_frame=key[1], last_candle_time=last_candle_time, complete=complete
+            )
+        self._checkpoints[key] = (last_candle_time, complete)
+
+    def _get_last_saved_candle_time(self, symbol, time_frame):
+        return self._checkpoints.get((symbol.symbol_str, time_frame.value), (0, False))[0]
+
+    def _is_complete(self, symbol, time_frame):
+        return self._checkpoints.get((symbol.symbol_str, time_frame.value), (0, False))[1]
+
     async def get_kline_history(self, exchange, symbol, time_frame):
         pass
 
@@ -185,6 +344,7 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
 
     async def get_first_candle_timestamp(self, ideal_start_timestamp, symbol, time_frame):
         try:
+            await self._wait_for_request_slot()
             return (
                 await self.exchange.get_symbol_prices(str(symbol), time_frame, limit=1, since=ideal_start_timestamp)
             )[0][commons_enums.PriceIndexes.IND_PRICE_TIME.value]
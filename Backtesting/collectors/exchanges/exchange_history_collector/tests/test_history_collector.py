@@ -18,6 +18,7 @@ import os
 import contextlib
 import json
 import asyncio
+import mock
 
 import octobot_commons.databases as databases
 import octobot_commons.symbols as commons_symbols
@@ -28,6 +29,7 @@ import octobot_backtesting.errors as errors
 import octobot_trading.enums as trading_enums
 import tests.test_utils.config as test_utils_config
 import tentacles.Backtesting.collectors.exchanges as collector_exchanges
+import tentacles.Backtesting.collectors.exchanges.exchange_history_collector.history_collector as history_collector
 import tentacles.Trading.Exchange as tentacles_exchanges
 
 # All test coroutines will be treated as marked.
@@ -39,14 +41,17 @@ BINANCEUS_MAX_CANDLES_COUNT = 500
 
 @contextlib.asynccontextmanager
 async def data_collector(exchange_name, tentacles_setup_config, symbols, time_frames, use_all_available_timeframes,
-                         start_timestamp=None, end_timestamp=None):
+                         start_timestamp=None, end_timestamp=None, resumed_file_name=None, **kwargs):
     collector_instance = collector_exchanges.ExchangeHistoryDataCollector(
         {}, exchange_name, trading_enums.ExchangeTypes.SPOT, tentacles_setup_config,
         [commons_symbols.parse_symbol(symbol) for symbol in symbols], time_frames,
         use_all_available_timeframes=use_all_available_timeframes,
         start_timestamp=start_timestamp,
-        end_timestamp=end_timestamp
+        end_timestamp=end_timestamp,
+        **kwargs
     )
+    if resumed_file_name is not None:
+        collector_instance.resume(resumed_file_name)
     try:
         await collector_instance.initialize()
         yield collector_instance
@@ -239,3 +244,200 @@ async def test_stop_collect():
         assert collector.exchange_manager is None
         assert not os.path.isfile(collector.temp_file_path)
         assert not os.path.isfile(collector.file_path)
+
+
+class FakeExchange:
+    """
+    Offline exchange returning deterministic candles after a fixed latency
+    """
+    MAX_FETCHED_OHLCV_COUNT = 500
+
+    def __init__(self, current_time, latency, rate_limit):
+        self.current_time = current_time
+        self.latency = latency
+        self.connector = mock.Mock(client=mock.Mock(rateLimit=rate_limit))
+        self.fetched_candles_requests = []
+        self.running_requests = 0
+        self.max_running_requests = 0
+        self.on_request = None
+
+    @staticmethod
+    def get_candle(symbol, time_frame, candle_time):
+        price = (candle_time // 60) % 1000 + len(symbol)
+        return [candle_time, price, price + 2, price - 2, price + 1, time_frame.value]
+
+    async def get_symbol_prices(self, symbol, time_frame, limit=None, since=None):
+        self.running_requests += 1
+        self.max_running_requests = max(self.max_running_requests, self.running_requests)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.running_requests -= 1
+        self.fetched_candles_requests.append((symbol, time_frame, limit))
+        if self.on_request is not None:
+            self.on_request()
+        time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+        first_candle_time = -(-since // (time_frame_sec * 1000)) * time_frame_sec
+        return [
+            self.get_candle(symbol, time_frame, candle_time)
+            for candle_time in range(
+                first_candle_time,
+                min(self.current_time, first_candle_time + (limit or self.MAX_FETCHED_OHLCV_COUNT) * time_frame_sec),
+                time_frame_sec
+            )
+        ]
+
+    async def retry_till_success(self, timeout, method, *args, **kwargs):
+        return await method(*args, **kwargs)
+
+    def get_exchange_current_time(self):
+        return self.current_time
+
+    def get_pair_cryptocurrency(self, pair):
+        return commons_symbols.parse_symbol(pair).base
+
+
+@contextlib.contextmanager
+def fake_exchange(current_time, latency, rate_limit=50):
+    exchange = FakeExchange(current_time, latency, rate_limit)
+    exchange_builder = mock.Mock()
+    for method in ("is_simulated", "is_rest_only", "is_exchange_only", "is_future", "disable_trading_mode",
+                   "use_tentacles_setup_config"):
+        getattr(exchange_builder, method).return_value = exchange_builder
+    exchange_builder.build = mock.AsyncMock(return_value=mock.Mock(exchange=exchange, stop=mock.AsyncMock()))
+    with mock.patch.object(history_collector.trading_api, "create_exchange_builder",
+                           mock.Mock(return_value=exchange_builder)):
+        yield exchange
+
+
+async def _get_collected_candles(collector):
+    async with collector_database(collector) as database:
+        return sorted(
+            (candle[3], candle[4], json.loads(candle[-1])[commons_enums.PriceIndexes.IND_PRICE_TIME.value])
+            for candle in await database.select(enums.ExchangeDataTables.OHLCV)
+        )
+
+
+def _get_expected_candles(symbols, time_frames, start_time, end_time):
+    expected_candles = []
+    for symbol in symbols:
+        for time_frame in time_frames:
+            time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+            first_candle_time = -(-start_time // (time_frame_sec * 1000)) * time_frame_sec
+            expected_candles += [
+                (symbol, time_frame.value, candle_time)
+                for candle_time in range(first_candle_time, int(end_time / 1000) + 1, time_frame_sec)
+            ]
+    return sorted(expected_candles)
+
+
+OFFLINE_SYMBOLS = ["BTC/USDT", "ETH/USDT", "ETH/BTC"]
+OFFLINE_TIME_FRAMES = [commons_enums.TimeFrames.ONE_HOUR, commons_enums.TimeFrames.FOUR_HOURS]
+OFFLINE_START_TIME = 1600000000000
+# 2000 1h candles
+OFFLINE_END_TIME = OFFLINE_START_TIME + 2000 * 60 * 60 * 1000
+OFFLINE_EXCHANGE_TIME = int(OFFLINE_END_TIME / 1000) + 24 * 60 * 60
+
+
+@pytest.mark.parametrize("max_concurrent_requests, rate_limit, expected_concurrent_requests", [
+    (4, 50, 4),
+    (1, 50, 1),
+    # 500ms between requests: at most 2 requests per second
+    (4, 500, 2),
+])
+async def test_collect_concurrently_offline(max_concurrent_requests, rate_limit, expected_concurrent_requests):
+    tentacles_setup_config = test_utils_config.load_test_tentacles_config()
+    # requests are not spaced: only the concurrency limit applies
+    with fake_exchange(OFFLINE_EXCHANGE_TIME, 0.01, rate_limit=rate_limit) as exchange, \
+            mock.patch.object(history_collector.exchange_requests_limiter.RequestsRateLimiter, "wait",
+                              mock.AsyncMock()):
+        async with data_collector(exchange.__class__.__name__, tentacles_setup_config, OFFLINE_SYMBOLS,
+                                  OFFLINE_TIME_FRAMES, False, OFFLINE_START_TIME, OFFLINE_END_TIME,
+                                  max_concurrent_requests=max_concurrent_requests) as collector:
+            await collector.start()
+            assert os.path.isfile(collector.file_path)
+            assert not os.path.isfile(collector.temp_file_path)
+            assert collector.get_current_step_index() == collector.get_total_steps() == 6
+            # collections start together: every allowed request is running at the same time, never more
+            assert exchange.max_running_requests == expected_concurrent_requests
+            assert exchange.running_requests == 0
+            assert await _get_collected_candles(collector) == _get_expected_candles(
+                OFFLINE_SYMBOLS, OFFLINE_TIME_FRAMES, OFFLINE_START_TIME, OFFLINE_END_TIME
+            )
+
+
+async def test_resume_interrupted_collection_offline():
+    tentacles_setup_config = test_utils_config.load_test_tentacles_config()
+    with fake_exchange(OFFLINE_EXCHANGE_TIME, 0.01) as exchange, \
+            mock.patch.object(collector_exchanges.ExchangeHistoryDataCollector, "SAVED_CANDLES_BATCH_SIZE", 500):
+        async with data_collector(exchange.__class__.__name__, tentacles_setup_config, OFFLINE_SYMBOLS,
+                                  OFFLINE_TIME_FRAMES, False, OFFLINE_START_TIME, OFFLINE_END_TIME,
+                                  max_concurrent_requests=2) as collector:
+            interrupted = asyncio.Event()
+
+            def _interrupt_on_request():
+                if len(exchange.fetched_candles_requests) == 15:
+                    interrupted.set()
+
+            exchange.on_request = _interrupt_on_request
+            collect_task = asyncio.create_task(collector.start())
+            await interrupted.wait()
+            collect_task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await collect_task
+            # interrupted collection is kept to be resumed
+            assert os.path.isfile(collector.temp_file_path)
+            assert not os.path.isfile(collector.file_path)
+            exchange.on_request = None
+            exchange.fetched_candles_requests.clear()
+
+            async with data_collector(exchange.__class__.__name__, tentacles_setup_config, OFFLINE_SYMBOLS,
+                                      OFFLINE_TIME_FRAMES, False, OFFLINE_START_TIME, OFFLINE_END_TIME,
+                                      resumed_file_name=os.path.basename(collector.temp_file_path)) \
+                    as resumed_collector:
+                assert resumed_collector.file_path == collector.file_path
+                await resumed_collector.start()
+                assert os.path.isfile(resumed_collector.file_path)
+                assert not os.path.isfile(resumed_collector.temp_file_path)
+                # already collected candles are not fetched again
+                assert 0 < len([
+                    request for request in exchange.fetched_candles_requests if request[2] is None
+                # 5 requests per 1h history, 2 per 4h history
+                ]) < 3 * 5 + 3 * 2
+                # no missing or duplicate candle
+                assert await _get_collected_candles(resumed_collector) == _get_expected_candles(
+                    OFFLINE_SYMBOLS, OFFLINE_TIME_FRAMES, OFFLINE_START_TIME, OFFLINE_END_TIME
+                )
+                async with collector_database(resumed_collector) as database:
+                    assert len(await database.select(enums.DataTables.DESCRIPTION)) == 1
+
+
+async def test_collect_rate_limited_offline():
+    tentacles_setup_config = test_utils_config.load_test_tentacles_config()
+    # 20ms between requests: at most 50 requests per second
+    with fake_exchange(OFFLINE_EXCHANGE_TIME, 0, rate_limit=20) as exchange:
+        async with data_collector(exchange.__class__.__name__, tentacles_setup_config, OFFLINE_SYMBOLS,
+                                  OFFLINE_TIME_FRAMES, False, OFFLINE_START_TIME, OFFLINE_END_TIME,
+                                  max_concurrent_requests=4) as collector:
+            requests_times = []
+            steps_percents = []
+
+            def _on_request():
+                requests_times.append(asyncio.get_event_loop().time())
+                steps_percents.append(collector.get_current_step_percent())
+
+            exchange.on_request = _on_request
+            await collector.start()
+            # concurrent collections still respect the exchange requests rate
+            assert len(requests_times) > 20
+            assert requests_times[-1] - requests_times[0] >= (len(requests_times) - 1) * 0.02 * 0.9
+            assert all(0 <= step_percent <= 100 for step_percent in steps_percents)
+            assert collector.get_current_step_percent() == 0
+
+
+async def test_resume_invalid_file():
+    tentacles_setup_config = test_utils_config.load_test_tentacles_config()
+    with pytest.raises(errors.DataCollectorError):
+        async with data_collector("binance", tentacles_setup_config, OFFLINE_SYMBOLS, OFFLINE_TIME_FRAMES, False,
+                                  resumed_file_name="missing_file.data.part"):
+            pass
@@ -18,4 +18,8 @@
 from octobot_backtesting.collectors.exchanges.exchange_collector cimport ExchangeDataCollector
 
 cdef class ExchangeLiveDataCollector(ExchangeDataCollector):
-    pass
+    cdef dict _buffered_events
+    cdef int _buffered_events_count
+    cdef object _flush_lock
+    cdef object _flush_task
+    cdef object _periodic_flush_task
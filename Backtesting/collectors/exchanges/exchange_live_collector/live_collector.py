@@ -18,6 +18,7 @@ import logging
 import time
 
 import octobot_backtesting.collectors.exchanges as exchanges
+import octobot_backtesting.enums as backtesting_enums
 import octobot_commons.channels_name as channels_name
 import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
 
@@ -30,6 +31,27 @@ except ImportError:
 
 class ExchangeLiveDataCollector(exchanges.AbstractExchangeLiveCollector):
     IMPORTER = generic_exchange_importer.GenericExchangeDataImporter
+    # buffered events are saved when reaching this count
+    FLUSH_EVENTS_COUNT = 1000
+    # max delay in seconds before saving buffered events
+    FLUSH_INTERVAL = 1
+    # callbacks wait for buffered events to be saved when their count is above this value
+    MAX_BUFFERED_EVENTS = 20 * FLUSH_EVENTS_COUNT
+
+    def __init__(self, config, exchange_name, exchange_type, tentacles_setup_config, symbols, time_frames,
+                 use_all_available_timeframes=False,
+                 data_format=backtesting_enums.DataFormats.REGULAR_COLLECTOR_DATA,
+                 start_timestamp=None,
+                 end_timestamp=None):
+        super().__init__(config, exchange_name, exchange_type, tentacles_setup_config, symbols, time_frames,
+                         use_all_available_timeframes, data_format=data_format,
+                         start_timestamp=start_timestamp, end_timestamp=end_timestamp)
+        # (table, shared save_* arguments) => (timestamps, values of each event argument)
+        self._buffered_events = {}
+        self._buffered_events_count = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+        self._periodic_flush_task = None
 
     async def start(self):
         exchange_manager = await trading_api.create_exchange_builder(self.config, self.exchange_name) \
@@ -45,6 +67,7 @@ class ExchangeLiveDataCollector(exchanges.AbstractExchangeLiveCollector):
 
         # create description
         await self._create_description()
+        self.start_periodic_flush()
 
         exchange_id = exchange_manager.id
         await exchange_channel.get_chan(channels_name.OctoBotTradingChannelsName.TICKER_CHANNEL.value,
@@ -60,36 +83,116 @@ class ExchangeLiveDataCollector(exchanges.AbstractExchangeLiveCollector):
 
         await asyncio.gather(*asyncio.all_tasks(asyncio.get_event_loop()))
 
+    async def stop(self, **kwargs):
+        await super().stop(**kwargs)
+        if self._periodic_flush_task is not None:
+            self._periodic_flush_task.cancel()
+            self._periodic_flush_task = None
+        # save every remaining event
+        await self.flush()
+
+    def start_periodic_flush(self):
+        self._periodic_flush_task = asyncio.create_task(self._periodic_flush())
+
+    async def _periodic_flush(self):
+        while not self.should_stop:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception as err:
+                self.logger.exception(err, True, f"Error when saving {self.exchange_name} live data: {err}")
+
+    async def flush(self):
+        """
+        Saves buffered events, one insert per table and symbol. Events that failed to be saved stay buffered
+        """
+        async with self._flush_lock:
+            save_method_by_table = {
+                backtesting_enums.ExchangeDataTables.TICKER: self.save_ticker,
+                backtesting_enums.ExchangeDataTables.ORDER_BOOK: self.save_order_book,
+                backtesting_enums.ExchangeDataTables.RECENT_TRADES: self.save_recent_trades,
+                backtesting_enums.ExchangeDataTables.OHLCV: self.save_ohlcv,
+                backtesting_enums.ExchangeDataTables.KLINE: self.save_kline,
+            }
+            for key in list(self._buffered_events):
+                # events buffered while saving are kept in a new buffer
+                timestamps, values_by_argument = self._buffered_events.pop(key)
+                table, shared_arguments = key
+                try:
+                    await save_method_by_table[table](
+                        timestamps, *shared_arguments, *values_by_argument, multiple=True
+                    )
+                except Exception:
+                    self._restore_buffered_events(key, timestamps, values_by_argument)
+                    raise
+                self._buffered_events_count -= len(timestamps)
+
+    def _restore_buffered_events(self, key, timestamps, values_by_argument):
+        if key in self._buffered_events:
+            # keep events order: restored events are older than the ones buffered while saving
+            new_timestamps, new_values_by_argument = self._buffered_events[key]
+            timestamps += new_timestamps
+            for values, new_values in zip(values_by_argument, new_values_by_argument):
+                values += new_values
+        self._buffered_events[key] = (timestamps, values_by_argument)
+
+    async def _buffer_event(self, table, shared_arguments: tuple, *values):
+        """
+        :param shared_arguments: save_* arguments shared by events of the same table and symbol
+        :param values: this event values, in the same order as the table save_* method arguments
+        """
+        try:
+            timestamps, values_by_argument = self._buffered_events[(table, shared_arguments)]
+        except KeyError:
+            timestamps, values_by_argument = self._buffered_events[(table, shared_arguments)] = \
+                [], tuple([] for _ in values)
+        timestamps.append(time.time())
+        for argument_values, value in zip(values_by_argument, values):
+            argument_values.append(value)
+        self._buffered_events_count += 1
+        if self._buffered_events_count >= self.MAX_BUFFERED_EVENTS:
+            # back-pressure: wait for buffered events to be saved
+            await self.flush()
+        elif self._buffered_events_count >= self.FLUSH_EVENTS_COUNT and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            self._flush_task = asyncio.create_task(self.flush())
+
     async def ticker_callback(self, exchange: str, exchange_id: str,
                               cryptocurrency: str, symbol: str, ticker):
-        self.logger.info(f"TICKER : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} || TICKER = {ticker}")
-        await self.save_ticker(timestamp=time.time(), exchange=exchange,
-                               cryptocurrency=cryptocurrency, symbol=symbol, ticker=ticker)
+        self.logger.debug(f"TICKER : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} || TICKER = {ticker}")
+        await self._buffer_event(
+            backtesting_enums.ExchangeDataTables.TICKER, (exchange, cryptocurrency, symbol), ticker
+        )
 
     async def order_book_callback(self, exchange: str, exchange_id: str,
                                   cryptocurrency: str, symbol: str, asks, bids):
-        self.logger.info(f"ORDERBOOK : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
-                         f"|| ASKS = {asks} || BIDS = {bids}")
-        await self.save_order_book(timestamp=time.time(), exchange=exchange,
-                                   cryptocurrency=cryptocurrency, symbol=symbol, asks=asks, bids=bids)
+        self.logger.debug(f"ORDERBOOK : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
+                          f"|| ASKS = {asks} || BIDS = {bids}")
+        await self._buffer_event(
+            backtesting_enums.ExchangeDataTables.ORDER_BOOK, (exchange, cryptocurrency, symbol), asks, bids
+        )
 
     async def recent_trades_callback(self, exchange: str, exchange_id: str,
                                      cryptocurrency: str, symbol: str, recent_trades):
-        self.logger.info(f"RECENT TRADE : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
-                         f"|| RECENT TRADE = {recent_trades}")
-        await self.save_recent_trades(timestamp=time.time(), exchange=exchange,
-                                      cryptocurrency=cryptocurrency, symbol=symbol, recent_trades=recent_trades)
+        self.logger.debug(f"RECENT TRADE : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
+                          f"|| RECENT TRADE = {recent_trades}")
+        await self._buffer_event(
+            backtesting_enums.ExchangeDataTables.RECENT_TRADES, (exchange, cryptocurrency, symbol), recent_trades
+        )
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle):
-        self.logger.info(f"OHLCV : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
-                         f"|| TIME FRAME = {time_frame} || CANDLE = {candle}")
-        await self.save_ohlcv(timestamp=time.time(), exchange=exchange,
-                              cryptocurrency=cryptocurrency, symbol=symbol, time_frame=time_frame, candle=candle)
+        self.logger.debug(f"OHLCV : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
+                          f"|| TIME FRAME = {time_frame} || CANDLE = {candle}")
+        await self._buffer_event(
+            backtesting_enums.ExchangeDataTables.OHLCV, (exchange, cryptocurrency, symbol, time_frame), candle
+        )
 
     async def kline_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, kline):
-        self.logger.info(f"KLINE : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
-                         f"|| TIME FRAME = {time_frame} || KLINE = {kline}")
-        await self.save_kline(timestamp=time.time(), exchange=exchange,
-                              cryptocurrency=cryptocurrency, symbol=symbol, time_frame=time_frame, kline=kline)
+        self.logger.debug(f"KLINE : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
+                          f"|| TIME FRAME = {time_frame} || KLINE = {kline}")
+        await self._buffer_event(
+            backtesting_enums.ExchangeDataTables.KLINE, (exchange, cryptocurrency, symbol, time_frame), kline
+        )
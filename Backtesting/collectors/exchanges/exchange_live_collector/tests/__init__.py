@@ -0,0 +1,89 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import contextlib
+import os
+
+import octobot_commons.enums as commons_enums
+import octobot_commons.symbols as commons_symbols
+import octobot_trading.enums as trading_enums
+import tentacles.Backtesting.collectors.exchanges.exchange_live_collector.live_collector as live_collector
+
+EXCHANGE = "binance"
+SYMBOL = "BTC/USDT"
+
+
+@contextlib.asynccontextmanager
+async def data_collector(symbols=(SYMBOL, ), time_frames=None):
+    collector_instance = live_collector.ExchangeLiveDataCollector(
+        {}, EXCHANGE, trading_enums.ExchangeTypes.SPOT, None,
+        [commons_symbols.parse_symbol(symbol) for symbol in symbols], time_frames
+    )
+    try:
+        await collector_instance.initialize()
+        yield collector_instance
+    finally:
+        await collector_instance.stop()
+        await collector_instance.database.stop()
+        for path in (collector_instance.file_path, collector_instance.temp_file_path):
+            if path and os.path.isfile(path):
+                os.remove(path)
+
+
+@contextlib.contextmanager
+def commits_counter(collector):
+    counter = {"commits": 0}
+    origin_commit = collector.database.connection.commit
+
+    async def _counted_commit():
+        counter["commits"] += 1
+        return await origin_commit()
+
+    collector.database.connection.commit = _counted_commit
+    try:
+        yield counter
+    finally:
+        collector.database.connection.commit = origin_commit
+
+
+def generate_events(count, symbols=(SYMBOL, ), time_frame=commons_enums.TimeFrames.ONE_MINUTE):
+    """
+    :return: (callback name, callback args) tuples alternating tickers, order books, recent trades, ohlcv and klines
+    """
+    events = []
+    for index in range(count):
+        symbol = symbols[index % len(symbols)]
+        price = 20000 + index % 100
+        kind = index % 5
+        if kind == 0:
+            events.append(("ticker_callback", (symbol, {"symbol": symbol, "close": price, "timestamp": index})))
+        elif kind == 1:
+            events.append(("order_book_callback", (symbol, [[price + 1, 1.5], [price + 2, 3]],
+                                                   [[price - 1, 2.1], [price - 2, 0.4]])))
+        elif kind == 2:
+            events.append(("recent_trades_callback", (symbol, [{"price": price, "amount": 0.1, "id": index}])))
+        elif kind == 3:
+            events.append(("ohlcv_callback", (symbol, time_frame, [index, price, price + 5, price - 5, price, 12])))
+        else:
+            events.append(("kline_callback", (symbol, time_frame, [index, price, price + 5, price - 5, price, 3])))
+    return events
+
+
+async def replay_events(collector, events):
+    for callback_name, args in events:
+        symbol = args[0]
+        await getattr(collector, callback_name)(
+            collector.exchange_name, "exchange_id", symbol.split("/")[0], symbol, *args[1:]
+        )
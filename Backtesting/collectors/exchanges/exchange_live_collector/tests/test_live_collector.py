@@ -0,0 +1,122 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import json
+import pytest
+import mock
+
+import octobot_commons.enums as commons_enums
+import octobot_backtesting.enums as enums
+from tentacles.Backtesting.collectors.exchanges.exchange_live_collector.tests import data_collector, \
+    commits_counter, generate_events, replay_events, SYMBOL
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+
+async def test_flush_saves_every_table():
+    time_frame = commons_enums.TimeFrames.ONE_MINUTE
+    async with data_collector(time_frames=[time_frame]) as collector:
+        events = generate_events(10, time_frame=time_frame)
+        with mock.patch.object(collector, "FLUSH_EVENTS_COUNT", 100), commits_counter(collector) as counter:
+            await replay_events(collector, events)
+            # nothing saved yet
+            assert counter["commits"] == 0
+            await collector.flush()
+            # one commit by table
+            assert counter["commits"] == 5
+        tickers = await collector.database.select(enums.ExchangeDataTables.TICKER, sort="ASC")
+        assert [json.loads(ticker[-1]) for ticker in tickers] == [events[0][1][1], events[5][1][1]]
+        assert [ticker[1:4] for ticker in tickers] == [(collector.exchange_name, "BTC", SYMBOL)] * 2
+        order_books = await collector.database.select(enums.ExchangeDataTables.ORDER_BOOK, sort="ASC")
+        assert [(json.loads(order_book[-2]), json.loads(order_book[-1])) for order_book in order_books] == \
+            [events[1][1][1:], events[6][1][1:]]
+        candles = await collector.database.select(enums.ExchangeDataTables.OHLCV, sort="ASC")
+        assert [candle[4] for candle in candles] == [time_frame.value] * 2
+        assert [json.loads(candle[-1]) for candle in candles] == [events[3][1][2], events[8][1][2]]
+        assert len(await collector.database.select(enums.ExchangeDataTables.KLINE)) == 2
+        assert len(await collector.database.select(enums.ExchangeDataTables.RECENT_TRADES)) == 2
+
+
+async def test_flush_when_reaching_events_count():
+    async with data_collector() as collector:
+        with mock.patch.object(collector, "FLUSH_EVENTS_COUNT", 3), commits_counter(collector) as counter:
+            await replay_events(collector, [event for event in generate_events(15) if event[0] == "ticker_callback"])
+            # flush is scheduled
+            assert counter["commits"] == 0
+            await asyncio.sleep(0.1)
+            assert counter["commits"] == 1
+        assert len(await collector.database.select(enums.ExchangeDataTables.TICKER)) == 3
+
+
+async def test_flush_when_exceeding_buffered_events_cap():
+    async with data_collector() as collector:
+        with mock.patch.object(collector, "MAX_BUFFERED_EVENTS", 2), commits_counter(collector) as counter:
+            await replay_events(collector, generate_events(1))
+            assert counter["commits"] == 0
+            # waits for buffered events to be saved before returning
+            await replay_events(collector, generate_events(1))
+            assert counter["commits"] == 1
+            assert collector._buffered_events_count == 0
+        assert len(await collector.database.select(enums.ExchangeDataTables.TICKER)) == 2
+
+
+async def test_periodic_flush():
+    async with data_collector() as collector:
+        with mock.patch.object(collector, "FLUSH_INTERVAL", 0.05), commits_counter(collector) as counter:
+            collector.start_periodic_flush()
+            await replay_events(collector, generate_events(1))
+            await asyncio.sleep(0.2)
+            assert counter["commits"] == 1
+        assert len(await collector.database.select(enums.ExchangeDataTables.TICKER)) == 1
+
+
+async def test_stop_saves_buffered_events():
+    async with data_collector() as collector:
+        collector.start_periodic_flush()
+        await replay_events(collector, generate_events(4))
+        await collector.stop()
+        assert collector.should_stop
+        assert collector._periodic_flush_task is None
+        for table in (enums.ExchangeDataTables.TICKER, enums.ExchangeDataTables.ORDER_BOOK,
+                      enums.ExchangeDataTables.RECENT_TRADES, enums.ExchangeDataTables.OHLCV):
+            assert len(await collector.database.select(table)) == 1
+
+
+async def test_failed_flush_keeps_buffered_events():
+    async with data_collector() as collector:
+        await replay_events(collector, generate_events(10))
+        origin_save_ohlcv = collector.save_ohlcv
+
+        async def _failing_save_ohlcv(*args, **kwargs):
+            # events received while saving
+            await replay_events(collector, [event for event in generate_events(5) if event[0] == "ohlcv_callback"])
+            raise OSError("disk full")
+
+        with mock.patch.object(collector, "save_ohlcv", mock.AsyncMock(side_effect=_failing_save_ohlcv)):
+            with pytest.raises(OSError):
+                await collector.flush()
+        # tables saved before the failure are not buffered anymore
+        assert len(await collector.database.select(enums.ExchangeDataTables.TICKER)) == 2
+        assert not await collector.database.check_table_exists(enums.ExchangeDataTables.OHLCV)
+        assert collector._buffered_events_count == 10 + 1 - 3 * 2
+        with mock.patch.object(collector, "save_ohlcv", mock.AsyncMock(side_effect=origin_save_ohlcv)):
+            await collector.flush()
+        assert collector._buffered_events_count == 0
+        candles = await collector.database.select(enums.ExchangeDataTables.OHLCV, sort="ASC")
+        # failed events are saved first
+        assert [json.loads(candle[-1])[0] for candle in candles] == [3, 8, 3]
+        assert len(await collector.database.select(enums.ExchangeDataTables.KLINE)) == 2
@@ -0,0 +1,78 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import os
+import time
+import pytest
+
+import octobot_backtesting.enums as enums
+from tentacles.Backtesting.collectors.exchanges.exchange_live_collector.tests import data_collector, \
+    commits_counter, generate_events, replay_events
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EVENTS_COUNT = 100000
+SYMBOLS = ("BTC/USDT", "ETH/USDT", "ETH/BTC")
+TABLES = (enums.ExchangeDataTables.TICKER, enums.ExchangeDataTables.ORDER_BOOK,
+          enums.ExchangeDataTables.RECENT_TRADES, enums.ExchangeDataTables.OHLCV, enums.ExchangeDataTables.KLINE)
+
+
+async def _replay_unbuffered_events(collector, events):
+    # previous behavior: one insert and commit per event
+    save_method_by_callback = {
+        "ticker_callback": collector.save_ticker,
+        "order_book_callback": collector.save_order_book,
+        "recent_trades_callback": collector.save_recent_trades,
+        "ohlcv_callback": collector.save_ohlcv,
+        "kline_callback": collector.save_kline,
+    }
+    for callback_name, args in events:
+        symbol = args[0]
+        await save_method_by_callback[callback_name](
+            time.time(), collector.exchange_name, symbol.split("/")[0], symbol, *args[1:]
+        )
+
+
+async def _replay(events, replay):
+    async with data_collector(symbols=SYMBOLS) as collector:
+        with commits_counter(collector) as counter:
+            t0 = time.perf_counter()
+            await replay(collector, events)
+            await collector.stop()
+            duration = time.perf_counter() - t0
+        saved_rows = {
+            table: [row[1:] for row in await collector.database.select(table, order_by="rowid", sort="ASC")]
+            for table in TABLES
+        }
+        return duration, counter["commits"], saved_rows
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+async def test_replay_live_events_benchmark():
+    events = generate_events(EVENTS_COUNT, symbols=SYMBOLS)
+    unbuffered_duration, unbuffered_commits, unbuffered_rows = await _replay(events, _replay_unbuffered_events)
+    buffered_duration, buffered_commits, buffered_rows = await _replay(events, replay_events)
+    print(f"\nReplaying {EVENTS_COUNT} live events: "
+          f"unbuffered: {EVENTS_COUNT / unbuffered_duration:.0f} events/s, {unbuffered_commits} commits, "
+          f"buffered: {EVENTS_COUNT / buffered_duration:.0f} events/s, {buffered_commits} commits "
+          f"(x{unbuffered_duration / buffered_duration:.1f} faster)")
+    # same saved data, rows are saved by table and symbol
+    for table in TABLES:
+        assert sorted(buffered_rows[table]) == sorted(unbuffered_rows[table])
+        assert len(buffered_rows[table]) == EVENTS_COUNT // len(TABLES)
+    assert unbuffered_commits == EVENTS_COUNT
+    assert buffered_commits < unbuffered_commits / 100
+    assert buffered_duration < unbuffered_duration
@@ -0,0 +1,99 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import os
+import os.path as path
+import shutil
+
+import octobot_backtesting.constants as backtesting_constants
+import octobot_backtesting.converters as converters
+import octobot_backtesting.data as backtesting_data
+import octobot_backtesting.enums as backtesting_enums
+import octobot_backtesting.importers as importers
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer.ohlcv_columns as ohlcv_columns
+
+
+class ColumnarDataConverter(converters.DataConverter):
+    """
+    ColumnarDataConverter adds binary OHLCV columns to OctoBot data files. Converted files candles are loaded
+    without parsing each candle's json.
+    Json candles are kept as the ohlcv table is still required: ExchangeDataImporter reads available data types
+    and timestamp intervals from it and OctoBot versions without GenericExchangeDataImporter columns support
+    only read candles from it.
+    """
+    CONVERTED_FILE_SUFFIX = "columnar"
+
+    def __init__(self, backtesting_file_to_convert):
+        super().__init__(backtesting_file_to_convert)
+        file_name, file_ext = path.splitext(path.basename(backtesting_file_to_convert))
+        # keep collector name prefix to use the same importer
+        self.converted_file = \
+            f"{file_name}{backtesting_constants.BACKTESTING_DATA_FILE_SEPARATOR}{self.CONVERTED_FILE_SUFFIX}{file_ext}"
+
+    async def can_convert(self) -> bool:
+        if not (path.isfile(self.file_to_convert)
+                and self.file_to_convert.endswith(backtesting_constants.BACKTESTING_DATA_FILE_EXT)):
+            return False
+        if await backtesting_data.get_file_description(self.file_to_convert) is None:
+            return False
+        async with databases.new_sqlite_database(self.file_to_convert) as database:
+            return await database.check_table_exists(backtesting_enums.ExchangeDataTables.OHLCV) \
+                and not await database.check_table_exists(ohlcv_columns.OHLCVColumnsTables.OHLCV_COLUMNS)
+
+    async def convert(self) -> bool:
+        converted_file_path = path.join(backtesting_constants.BACKTESTING_FILE_PATH, self.converted_file)
+        try:
+            os.makedirs(backtesting_constants.BACKTESTING_FILE_PATH, exist_ok=True)
+            shutil.copyfile(self.file_to_convert, converted_file_path)
+            async with databases.new_sqlite_database(converted_file_path) as database:
+                await ohlcv_columns.create_ohlcv_columns_table(database)
+                for exchange_name, cryptocurrency, symbol, time_frame in await self._get_candles_series(database):
+                    await self._convert_ohlcv(database, exchange_name, cryptocurrency, symbol, time_frame)
+                await database.connection.commit()
+            return True
+        except Exception as e:
+            self.logger.exception(e, True, f"Error while converting data file: {e}")
+            if path.isfile(converted_file_path):
+                os.remove(converted_file_path)
+            return False
+
+    async def _get_candles_series(self, database) -> list:
+        table = backtesting_enums.ExchangeDataTables.OHLCV.value
+        async with database.aio_cursor() as cursor:
+            await cursor.execute(f"PRAGMA table_info({table})")
+            # legacy files don't have a cryptocurrency column
+            cryptocurrency_column = "cryptocurrency" \
+                if "cryptocurrency" in (column[1] for column in await cursor.fetchall()) \
+                else "NULL"
+            await cursor.execute(
+                f"SELECT DISTINCT exchange_name, {cryptocurrency_column}, symbol, time_frame FROM {table}"
+            )
+            return await cursor.fetchall()
+
+    async def _convert_ohlcv(self, database, exchange_name, cryptocurrency, symbol, time_frame):
+        time_frame = commons_enums.TimeFrames(time_frame)
+        ohlcvs = importers.import_ohlcvs(
+            await database.select(backtesting_enums.ExchangeDataTables.OHLCV,
+                                  exchange_name=exchange_name, cryptocurrency=cryptocurrency,
+                                  symbol=symbol, time_frame=time_frame.value)
+        )
+        ohlcvs.sort(key=lambda ohlcv: ohlcv[-1][commons_enums.PriceIndexes.IND_PRICE_TIME.value])
+        await ohlcv_columns.insert_ohlcv_columns(
+            database, exchange_name, cryptocurrency, symbol, time_frame,
+            [ohlcv[0] for ohlcv in ohlcvs], [ohlcv[-1] for ohlcv in ohlcvs]
+        )
+        self.logger.info(f"Converted {len(ohlcvs)} {exchange_name} {symbol} {time_frame.value} candles")
@@ -0,0 +1,71 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import contextlib
+import json
+import os
+
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.constants as commons_constants
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+
+EXCHANGE_NAME = "binance"
+SYMBOL = "BTC/USDT"
+# insert_all builds a single query: insert large files by chunks
+INSERTED_CANDLES_CHUNK_SIZE = 50000
+
+
+def generate_candles(time_frame, start_time, count):
+    time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+    return [
+        [
+            start_time + i * time_frame_sec,
+            10000 + (i % 1000) * 0.5, 10000 + (i % 1000) * 0.5 + 12.25, 10000 + (i % 1000) * 0.5 - 7.5,
+            10000 + (i % 1000) * 0.5 + 3.125, 1.5 + i % 7
+        ]
+        for i in range(count)
+    ]
+
+
+@contextlib.asynccontextmanager
+async def data_file(file_path, candles_by_time_frame):
+    """
+    Creates a data file with the same format as ExchangeHistoryDataCollector ones
+    """
+    try:
+        async with databases.new_sqlite_database(file_path) as database:
+            all_candles = [candle for candles in candles_by_time_frame.values() for candle in candles]
+            await database.insert(backtesting_enums.DataTables.DESCRIPTION,
+                                  timestamp=1,
+                                  version="1.1",
+                                  exchange=EXCHANGE_NAME,
+                                  symbols=json.dumps([SYMBOL]),
+                                  time_frames=json.dumps([tf.value for tf in candles_by_time_frame]),
+                                  start_timestamp=min(candle[0] for candle in all_candles),
+                                  end_timestamp=max(candle[0] for candle in all_candles))
+            for time_frame, candles in candles_by_time_frame.items():
+                time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+                for index in range(0, len(candles), INSERTED_CANDLES_CHUNK_SIZE):
+                    chunk = candles[index:index + INSERTED_CANDLES_CHUNK_SIZE]
+                    await database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV,
+                                              timestamp=[candle[0] + time_frame_sec for candle in chunk],
+                                              exchange_name=EXCHANGE_NAME, cryptocurrency="Bitcoin",
+                                              symbol=SYMBOL, time_frame=time_frame.value,
+                                              candle=[json.dumps(candle) for candle in chunk])
+        yield file_path
+    finally:
+        if os.path.isfile(file_path):
+            os.remove(file_path)
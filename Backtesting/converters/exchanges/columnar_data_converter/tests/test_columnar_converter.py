@@ -0,0 +1,124 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import contextlib
+import os
+import pytest
+
+import octobot_backtesting.constants as backtesting_constants
+import octobot_backtesting.importers as importers
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.converters.exchanges.columnar_data_converter as columnar_data_converter
+import tentacles.Backtesting.converters.exchanges.columnar_data_converter.tests as columnar_data_converter_tests
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+DATA_FILE = "ExchangeHistoryDataCollector_1700000000.0.data"
+START_TIME = 1700000000
+
+
+@contextlib.asynccontextmanager
+async def importer(file_path):
+    importer_instance = generic_exchange_importer.GenericExchangeDataImporter({}, file_path)
+    try:
+        await importer_instance.initialize()
+        yield importer_instance
+    finally:
+        await importer_instance.stop()
+
+
+@contextlib.asynccontextmanager
+async def converted_data_file():
+    candles_by_time_frame = {
+        commons_enums.TimeFrames.ONE_HOUR: columnar_data_converter_tests.generate_candles(
+            commons_enums.TimeFrames.ONE_HOUR, START_TIME, 500
+        ),
+        commons_enums.TimeFrames.FOUR_HOURS: columnar_data_converter_tests.generate_candles(
+            commons_enums.TimeFrames.FOUR_HOURS, START_TIME, 125
+        ),
+    }
+    async with columnar_data_converter_tests.data_file(DATA_FILE, candles_by_time_frame) as file_path:
+        converter = columnar_data_converter.ColumnarDataConverter(file_path)
+        converted_file_path = os.path.join(backtesting_constants.BACKTESTING_FILE_PATH, converter.converted_file)
+        try:
+            assert await converter.can_convert() is True
+            assert await converter.convert() is True
+            yield file_path, converted_file_path
+        finally:
+            if os.path.isfile(converted_file_path):
+                os.remove(converted_file_path)
+
+
+def _as_tuples(ohlcvs):
+    # columns OHLCVs and candles are tuples
+    return [(*ohlcv[:-1], tuple(ohlcv[-1])) for ohlcv in ohlcvs]
+
+
+async def test_can_convert():
+    async with converted_data_file() as (file_path, converted_file_path):
+        assert os.path.basename(converted_file_path) == "ExchangeHistoryDataCollector_1700000000.0_columnar.data"
+        # already converted
+        assert await columnar_data_converter.ColumnarDataConverter(converted_file_path).can_convert() is False
+    assert await columnar_data_converter.ColumnarDataConverter(DATA_FILE).can_convert() is False
+
+
+async def test_convert():
+    async with converted_data_file() as (file_path, converted_file_path):
+        async with importer(file_path) as json_importer, importer(converted_file_path) as columns_importer:
+            assert json_importer.has_ohlcv_columns is False
+            assert columns_importer.has_ohlcv_columns is True
+            assert columns_importer.time_frames == json_importer.time_frames
+            assert columns_importer.available_data_types == json_importer.available_data_types
+            for time_frame in (commons_enums.TimeFrames.ONE_HOUR, commons_enums.TimeFrames.FOUR_HOURS):
+                assert await columns_importer.get_data_timestamp_interval(time_frame.value) == \
+                    await json_importer.get_data_timestamp_interval(time_frame.value)
+                json_ohlcvs = _as_tuples(await json_importer.get_ohlcv(
+                    exchange_name=columnar_data_converter_tests.EXCHANGE_NAME,
+                    symbol=columnar_data_converter_tests.SYMBOL, time_frame=time_frame
+                ))
+                assert await columns_importer.get_ohlcv(
+                    exchange_name=columnar_data_converter_tests.EXCHANGE_NAME,
+                    symbol=columnar_data_converter_tests.SYMBOL, time_frame=time_frame
+                ) == json_ohlcvs
+                assert await columns_importer.get_ohlcv(
+                    exchange_name=columnar_data_converter_tests.EXCHANGE_NAME,
+                    symbol=columnar_data_converter_tests.SYMBOL, time_frame=time_frame, limit=10
+                ) == json_ohlcvs[:10]
+                timestamps, operations = importers.get_operations_from_timestamps(
+                    json_ohlcvs[20][0], json_ohlcvs[80][0]
+                )
+                selected_ohlcvs = await columns_importer.get_ohlcv(
+                    exchange_name=columnar_data_converter_tests.EXCHANGE_NAME,
+                    symbol=columnar_data_converter_tests.SYMBOL, time_frame=time_frame,
+                    timestamps=timestamps, operations=operations
+                )
+                assert selected_ohlcvs == json_ohlcvs[20:81]
+                assert selected_ohlcvs == _as_tuples(await json_importer.get_ohlcv(
+                    exchange_name=columnar_data_converter_tests.EXCHANGE_NAME,
+                    symbol=columnar_data_converter_tests.SYMBOL, time_frame=time_frame,
+                    timestamps=timestamps, operations=operations
+                ))
+                # chronological cache reads
+                assert await columns_importer.get_ohlcv_from_timestamps(
+                    exchange_name=columnar_data_converter_tests.EXCHANGE_NAME,
+                    symbol=columnar_data_converter_tests.SYMBOL, time_frame=time_frame,
+                    inferior_timestamp=json_ohlcvs[-5][0], superior_timestamp=json_ohlcvs[-10][0]
+                ) == _as_tuples(await json_importer.get_ohlcv_from_timestamps(
+                    exchange_name=columnar_data_converter_tests.EXCHANGE_NAME,
+                    symbol=columnar_data_converter_tests.SYMBOL, time_frame=time_frame,
+                    inferior_timestamp=json_ohlcvs[-5][0], superior_timestamp=json_ohlcvs[-10][0]
+                ))
@@ -0,0 +1,97 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+import octobot_backtesting.constants as backtesting_constants
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.converters.exchanges.columnar_data_converter as columnar_data_converter
+import tentacles.Backtesting.converters.exchanges.columnar_data_converter.tests as columnar_data_converter_tests
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+DATA_FILE = "ExchangeHistoryDataCollector_1600000000.0.data"
+# 1 year of 1m candles
+CANDLES_COUNT = 365 * 24 * 60
+# loads candles in a new process to measure its peak RSS (ru_maxrss is inherited from the parent process: use VmHWM)
+LOAD_SCRIPT = """
+import asyncio, json, sys, time
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+
+def get_peak_rss_kb():
+    with open("/proc/self/status") as status:
+        return int(next(line for line in status if line.startswith("VmHWM")).split()[1])
+
+async def load(file_path, exchange_name, symbol):
+    importer = generic_exchange_importer.GenericExchangeDataImporter({}, file_path)
+    await importer.initialize()
+    rss_before_load = get_peak_rss_kb()
+    t0 = time.perf_counter()
+    ohlcvs = await importer.get_ohlcv(exchange_name=exchange_name, symbol=symbol,
+                                      time_frame=commons_enums.TimeFrames.ONE_MINUTE)
+    duration = time.perf_counter() - t0
+    await importer.stop()
+    print(json.dumps({
+        "duration": duration,
+        "count": len(ohlcvs),
+        "last_candle": ohlcvs[0][-1],
+        "peak_rss_kb": get_peak_rss_kb() - rss_before_load,
+    }))
+
+asyncio.run(load(*sys.argv[1:]))
+"""
+
+
+def _load_in_process(file_path):
+    output = subprocess.run(
+        [sys.executable, "-c", LOAD_SCRIPT, file_path,
+         columnar_data_converter_tests.EXCHANGE_NAME, columnar_data_converter_tests.SYMBOL],
+        capture_output=True, check=True, text=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="peak RSS is read from /proc")
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+async def test_load_one_year_of_minute_candles_benchmark():
+    candles = columnar_data_converter_tests.generate_candles(
+        commons_enums.TimeFrames.ONE_MINUTE, 1600000000, CANDLES_COUNT
+    )
+    async with columnar_data_converter_tests.data_file(
+        DATA_FILE, {commons_enums.TimeFrames.ONE_MINUTE: candles}
+    ) as file_path:
+        converter = columnar_data_converter.ColumnarDataConverter(file_path)
+        converted_file_path = os.path.join(backtesting_constants.BACKTESTING_FILE_PATH, converter.converted_file)
+        try:
+            assert await converter.convert() is True
+            json_load = _load_in_process(file_path)
+            columns_load = _load_in_process(converted_file_path)
+        finally:
+            if os.path.isfile(converted_file_path):
+                os.remove(converted_file_path)
+    print(f"\nLoading {CANDLES_COUNT} 1m candles: "
+          f"json candles: {json_load['duration']:.2f}s, +{json_load['peak_rss_kb'] / 1024:.0f}MB peak RSS, "
+          f"binary columns: {columns_load['duration']:.2f}s, +{columns_load['peak_rss_kb'] / 1024:.0f}MB peak RSS "
+          f"(x{json_load['duration'] / columns_load['duration']:.1f} faster)")
+    assert json_load["count"] == columns_load["count"] == CANDLES_COUNT
+    assert json_load["last_candle"] == columns_load["last_candle"] == candles[-1]
+    assert columns_load["duration"] < json_load["duration"]
+    assert columns_load["peak_rss_kb"] < json_load["peak_rss_kb"]
@@ -22,9 +22,9 @@ cdef class LegacyDataConverter(DataConverter):
     cdef str symbol
     cdef str time_data
     cdef list time_frames
-    cdef dict file_content
     cdef DataBase database
+    cdef dict _columns_files_by_time_frame
 
-    cdef list _get_formatted_candles(self, object time_frame)
-    cdef dict _read_data_file(self)
-    cdef dict _read_data_file(self)
+    cdef list _read_valid_time_frames(self)
+    cdef int _save_column_values(self, object reader, object columns_file)
+    cdef void _close_columns_files(self)
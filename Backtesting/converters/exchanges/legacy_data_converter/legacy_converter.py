@@ -13,11 +13,14 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
-import gzip
 import json
 import enum
+import itertools
+import marshal
 import os.path as path
 import datetime
+import tempfile
+import time
 
 import octobot_backtesting.collectors.exchanges as exchanges
 import octobot_backtesting.constants as backtesting_constants
@@ -28,6 +31,7 @@ import octobot_commons.databases as databases
 import octobot_commons.constants as commons_constants
 import octobot_commons.enums as commons_enums
 import octobot_commons.symbols.symbol_util as symbol_util
+import tentacles.Backtesting.converters.exchanges.legacy_data_converter.legacy_file_reader as legacy_file_reader
 
 
 class LegacyDataConverter(converters.DataConverter):
@@ -37,6 +41,9 @@ class LegacyDataConverter(converters.DataConverter):
     DATA_FILE_EXT = ".data"
     VERSION = "1.0"
     DATA_FILE_TIME_DATE_FORMAT = '%Y%m%d%H%M%S'
+    # candles are saved by batches to keep memory usage independent of the file size. Each insert_all query
+    # stays in the sqlite statements cache: larger batches significantly increase memory usage
+    CANDLES_BATCH_SIZE = 1000
 
     class PriceIndexes(enum.Enum):
         IND_PRICE_TIME = 0
@@ -52,28 +59,21 @@ class LegacyDataConverter(converters.DataConverter):
         self.symbol = ""
         self.time_data = ""
         self.time_frames = []
-        self.file_content = {}
         self.database = None
-        self.converted_file = backtesting_data.get_backtesting_file_name(exchanges.AbstractExchangeHistoryCollector)
+        # time frame => temporary files of the parsed [times, opens, highs, lows, closes, volumes] columns
+        self._columns_files_by_time_frame = {}
+        self.converted_file = backtesting_data.get_backtesting_file_name(exchanges.AbstractExchangeHistoryCollector,
+                                                                         time.time)
 
     async def can_convert(self, ) -> bool:
         self.exchange_name, self.symbol, self.time_data = LegacyDataConverter._interpret_file_name(self.file_to_convert)
         if None in (self.exchange_name, self.symbol, self.time_data):
             return False
-        self.file_content = self._read_data_file()
-        if not self.file_content:
+        try:
+            self.time_frames = self._read_valid_time_frames()
+        except Exception:
+            self._close_columns_files()
             return False
-        for time_frame, candles_data in self.file_content.items():
-            try:
-                # check time frame validity
-                time_frame = commons_enums.TimeFrames(time_frame)
-                # check candle data validity
-                if isinstance(candles_data, list) and len(candles_data) == 6:
-                    # check candle data non-emptiness
-                    if all(data for data in candles_data):
-                        self.time_frames.append(time_frame)
-            except ValueError:
-                pass
         return bool(self.time_frames)
 
     async def convert(self) -> bool:
@@ -89,6 +89,7 @@ class LegacyDataConverter(converters.DataConverter):
             self.logger.exception(e, True, f"Error while converting data file: {e}")
             return False
         finally:
+            self._close_columns_files()
             if self.database is not None:
                 await self.database.stop()
 
@@ -104,43 +105,77 @@ class LegacyDataConverter(converters.DataConverter):
     async def _convert_ohlcv(self, time_frame):
         # use time_frame_sec to add time to save the candle closing time
         time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
-        candles = self._get_formatted_candles(time_frame)
-        await self.database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV,
-                                       timestamp=[candle[0] + time_frame_sec for candle in candles],
-                                       exchange_name=self.exchange_name, symbol=self.symbol,
-                                       time_frame=time_frame.value, candle=[json.dumps(c) for c in candles])
+        # legacy candles are stored by column: read each column at the same time to build candles in order
+        candles_iterator = zip(*(
+            self._iter_column_values(columns_file)
+            for columns_file in self._columns_files_by_time_frame[time_frame]
+        ))
+        while True:
+            candles = [list(candle) for candle in itertools.islice(candles_iterator, self.CANDLES_BATCH_SIZE)]
+            if not candles:
+                return
+            await self.database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV,
+                                           timestamp=[candle[0] + time_frame_sec for candle in candles],
+                                           exchange_name=self.exchange_name, symbol=self.symbol,
+                                           time_frame=time_frame.value, candle=[json.dumps(c) for c in candles])
 
-    def _get_formatted_candles(self, time_frame):
-        data = self.file_content[time_frame.value]
-        candles = []
-        for i in range(len(data[LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value])):
-            candles.insert(i, [None] * len(LegacyDataConverter.PriceIndexes))
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_CLOSE.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_CLOSE.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_OPEN.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_OPEN.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_HIGH.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_HIGH.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_LOW.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_LOW.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_VOL.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_VOL.value][i]
-        return candles
+    def _read_valid_time_frames(self):
+        """
+        Parses the file once: columns of valid time frames are kept in temporary files to be converted
+        """
+        time_frames = []
+        with legacy_file_reader.LegacyFileReader(self.file_to_convert) as reader:
+            for key in reader.iter_object_keys():
+                try:
+                    # check time frame validity
+                    time_frame = commons_enums.TimeFrames(key)
+                except ValueError:
+                    reader.skip_value()
+                    continue
+                if reader.peek() != "[":
+                    reader.skip_value()
+                    continue
+                columns_files = self._columns_files_by_time_frame[time_frame] = []
+                columns_sizes = []
+                for _ in reader.iter_array_items():
+                    if reader.peek() == "[":
+                        columns_files.append(tempfile.TemporaryFile())
+                        columns_sizes.append(self._save_column_values(reader, columns_files[-1]))
+                    else:
+                        reader.skip_value()
+                        columns_sizes.append(0)
+                # check candle data validity and non-emptiness
+                if len(columns_sizes) == len(LegacyDataConverter.PriceIndexes) \
+                        and all(columns_sizes) and len(set(columns_sizes)) == 1:
+                    time_frames.append(time_frame)
+                else:
+                    for columns_file in self._columns_files_by_time_frame.pop(time_frame):
+                        columns_file.close()
+        return time_frames
 
-    def _read_data_file(self):
-        try:
-            # try zipfile
-            with gzip.open(self.file_to_convert, 'r') as file_to_parse:
-                file_content = json.loads(file_to_parse.read())
-        except OSError:
-            # try without unzip
-            with open(self.file_to_convert) as file_to_parse:
-                file_content = json.loads(file_to_parse.read())
-        except Exception:
-            return {}
-        return file_content
+    def _save_column_values(self, reader, columns_file):
+        """
+        :return: the number of values of the column
+        """
+        values_count = 0
+        for values in reader.iter_numbers():
+            marshal.dump(values, columns_file)
+            values_count += len(values)
+        columns_file.seek(0)
+        return values_count
+
+    def _iter_column_values(self, columns_file):
+        while True:
+            try:
+                yield from marshal.load(columns_file)
+            except EOFError:
+                return
+
+    def _close_columns_files(self):
+        for columns_files in self._columns_files_by_time_frame.values():
+            for columns_file in columns_files:
+                columns_file.close()
+        self._columns_files_by_time_frame = {}
 
     @staticmethod
     def _interpret_file_name(file_name):
@@ -150,7 +185,7 @@ class LegacyDataConverter(converters.DataConverter):
             symbol = symbol_util.merge_currencies(data[1], data[2])
             file_ext = LegacyDataConverter.DATA_FILE_EXT
             timestamp = data[3] + data[4].replace(file_ext, "")
-        except KeyError:
+        except (KeyError, IndexError):
             exchange_name = None
             symbol = None
             timestamp = None
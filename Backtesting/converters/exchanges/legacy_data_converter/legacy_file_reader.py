@@ -0,0 +1,195 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import gzip
+import io
+import json
+
+WHITESPACES = " \t\n\r"
+VALUE_ENDS = ",]}"
+
+
+class LegacyFileReader:
+    """
+    Incremental reader of legacy data files: reads gzip (or plain) json content chunk by chunk instead of
+    loading the whole file.
+    Legacy files content is {time frame: [[times], [opens], [highs], [lows], [closes], [volumes]]}.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._file = None
+        self._buffer = ""
+        self._position = 0
+
+    def __enter__(self):
+        try:
+            # try zipfile
+            self._file = io.TextIOWrapper(gzip.open(self.file_path, 'r'))
+            self._fill()
+        except OSError:
+            # try without unzip
+            self.close()
+            self._file = open(self.file_path)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._buffer = ""
+        self._position = 0
+
+    def iter_object_keys(self):
+        """
+        Iterates over the keys of the object at the current position. The associated value has to be read or
+        skipped before reading the next key.
+        """
+        self._consume("{")
+        if self.peek() == "}":
+            self._consume("}")
+            return
+        while True:
+            key = self.read_string()
+            self._consume(":")
+            yield key
+            if self.peek() == "}":
+                self._consume("}")
+                return
+            self._consume(",")
+
+    def iter_array_items(self):
+        """
+        Iterates over the items of the array at the current position. Each item has to be read or skipped before
+        reading the next one.
+        """
+        self._consume("[")
+        if self.peek() == "]":
+            self._consume("]")
+            return
+        while True:
+            yield
+            if self.peek() == "]":
+                self._consume("]")
+                return
+            self._consume(",")
+
+    def iter_numbers(self):
+        """
+        Yields the values of the numbers array at the current position by lists of at most CHUNK_SIZE characters
+        """
+        self._consume("[")
+        while True:
+            end = self._buffer.find("]", self._position)
+            if end != -1:
+                values = self._parse_values(self._buffer[self._position:end])
+                self._position = end + 1
+                if values:
+                    yield values
+                return
+            # only parse complete numbers
+            end = self._buffer.rfind(",", self._position)
+            if end != -1:
+                values = self._parse_values(self._buffer[self._position:end])
+                self._position = end + 1
+                yield values
+            if not self._fill():
+                raise ValueError(f"Unexpected end of file in {self.file_path}")
+
+    def skip_numbers(self):
+        """
+        Skips the numbers array at the current position without parsing it
+        """
+        self._consume("[")
+        while True:
+            end = self._buffer.find("]", self._position)
+            if end != -1:
+                self._position = end + 1
+                return
+            self._position = len(self._buffer)
+            if not self._fill():
+                raise ValueError(f"Unexpected end of file in {self.file_path}")
+
+    def read_string(self):
+        self.peek()
+        start = self._position
+        self._consume('"')
+        while True:
+            end = self._buffer.find('"', self._position)
+            if end == -1:
+                self._position = len(self._buffer)
+                if not self._fill(keep_from=start):
+                    raise ValueError(f"Unexpected end of file in {self.file_path}")
+                start = 0
+                continue
+            self._position = end + 1
+            escapes_count = len(self._buffer[start + 1:end]) - len(self._buffer[start + 1:end].rstrip("\\"))
+            if escapes_count % 2 == 0:
+                return json.loads(self._buffer[start:self._position])
+
+    def skip_value(self):
+        char = self.peek()
+        if char == '"':
+            self.read_string()
+        elif char == "{":
+            for _ in self.iter_object_keys():
+                self.skip_value()
+        elif char == "[":
+            for _ in self.iter_array_items():
+                self.skip_value()
+        else:
+            # number, true, false or null
+            while True:
+                for index in range(self._position, len(self._buffer)):
+                    if self._buffer[index] in VALUE_ENDS or self._buffer[index] in WHITESPACES:
+                        self._position = index
+                        return
+                self._position = len(self._buffer)
+                if not self._fill():
+                    return
+
+    def _parse_values(self, values):
+        return json.loads(f"[{values}]")
+
+    def peek(self):
+        while True:
+            for index in range(self._position, len(self._buffer)):
+                if self._buffer[index] not in WHITESPACES:
+                    self._position = index
+                    return self._buffer[index]
+            self._position = len(self._buffer)
+            if not self._fill():
+                raise ValueError(f"Unexpected end of file in {self.file_path}")
+
+    def _consume(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at {self._position} in {self.file_path}")
+        self._position += 1
+
+    def _fill(self, keep_from=None):
+        """
+        Reads the next chunk, drops already read content
+        :return: False when the end of the file is reached
+        """
+        chunk = self._file.read(self.CHUNK_SIZE)
+        keep_from = self._position if keep_from is None else keep_from
+        self._buffer = self._buffer[keep_from:] + chunk
+        self._position -= keep_from
+        return bool(chunk)
+
@@ -0,0 +1,68 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import contextlib
+import gzip
+import json
+import os
+
+import octobot_commons.constants as commons_constants
+import octobot_commons.enums as commons_enums
+
+LEGACY_FILE_NAME = "binance_BTC_USDT_20180101_120000.data"
+# legacy file columns are written by chunks to keep memory usage low on large files
+WRITTEN_VALUES_CHUNK_SIZE = 100000
+
+
+def get_candle(time_frame, start_time, index):
+    time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+    return [
+        start_time + index * time_frame_sec,
+        10000 + (index % 1000) * 0.5, 10000 + (index % 1000) * 0.5 + 12.25, 10000 + (index % 1000) * 0.5 - 7.5,
+        10000 + (index % 1000) * 0.5 + 3.125, 1.5 + index % 7
+    ]
+
+
+def _write_column(file, time_frame, start_time, count, column_index):
+    file.write("[")
+    for chunk_start in range(0, count, WRITTEN_VALUES_CHUNK_SIZE):
+        values = [
+            get_candle(time_frame, start_time, index)[column_index]
+            for index in range(chunk_start, min(chunk_start + WRITTEN_VALUES_CHUNK_SIZE, count))
+        ]
+        file.write(("," if chunk_start else "") + json.dumps(values)[1:-1])
+    file.write("]")
+
+
+@contextlib.contextmanager
+def legacy_data_file(candles_count_by_time_frame, start_time=1514808000, compress=True, extra_content=""):
+    """
+    Creates an OctoBot v0.3 data file: {time frame: [[times], [opens], [highs], [lows], [closes], [volumes]]}
+    """
+    try:
+        with (gzip.open(LEGACY_FILE_NAME, "wt") if compress else open(LEGACY_FILE_NAME, "w")) as file:
+            file.write("{")
+            for index, (time_frame, count) in enumerate(candles_count_by_time_frame.items()):
+                file.write(f'{", " if index else ""}"{time_frame.value}": [')
+                for column_index in range(6):
+                    if column_index:
+                        file.write(", ")
+                    _write_column(file, time_frame, start_time, count, column_index)
+                file.write("]")
+            file.write(f"{extra_content}}}")
+        yield LEGACY_FILE_NAME
+    finally:
+        if os.path.isfile(LEGACY_FILE_NAME):
+            os.remove(LEGACY_FILE_NAME)
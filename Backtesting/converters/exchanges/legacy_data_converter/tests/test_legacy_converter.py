@@ -0,0 +1,100 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import contextlib
+import gzip
+import json
+import os
+import mock
+import pytest
+
+import octobot_backtesting.constants as backtesting_constants
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.constants as commons_constants
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.converters.exchanges.legacy_data_converter as legacy_data_converter
+import tentacles.Backtesting.converters.exchanges.legacy_data_converter.legacy_file_reader as legacy_file_reader
+from tentacles.Backtesting.converters.exchanges.legacy_data_converter.tests import legacy_data_file, get_candle, \
+    LEGACY_FILE_NAME
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+START_TIME = 1514808000
+
+
+@contextlib.asynccontextmanager
+async def converted_file(file_path):
+    converter = legacy_data_converter.LegacyDataConverter(file_path)
+    converted_file_path = os.path.join(backtesting_constants.BACKTESTING_FILE_PATH, converter.converted_file)
+    try:
+        assert await converter.can_convert() is True
+        assert await converter.convert() is True
+        async with databases.new_sqlite_database(converted_file_path) as database:
+            yield converter, database
+    finally:
+        if os.path.isfile(converted_file_path):
+            os.remove(converted_file_path)
+
+
+async def _assert_converted_candles(database, time_frame, count):
+    time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
+    rows = await database.select(backtesting_enums.ExchangeDataTables.OHLCV, sort="ASC", time_frame=time_frame.value)
+    expected_candles = [get_candle(time_frame, START_TIME, index) for index in range(count)]
+    assert [json.loads(row[-1]) for row in rows] == expected_candles
+    assert [row[0] for row in rows] == [candle[0] + time_frame_sec for candle in expected_candles]
+    assert all(row[1:4] == ("binance", "BTC/USDT", time_frame.value) for row in rows)
+
+
+@pytest.mark.parametrize("compress", [True, False])
+async def test_convert(compress):
+    candles_count_by_time_frame = {
+        commons_enums.TimeFrames.ONE_HOUR: 250,
+        commons_enums.TimeFrames.FOUR_HOURS: 60,
+    }
+    with legacy_data_file(candles_count_by_time_frame, compress=compress,
+                          extra_content=', "info": {"name": "a \\"quoted\\" \\\\", "values": [1, null, true]}'), \
+            mock.patch.object(legacy_data_converter.LegacyDataConverter, "CANDLES_BATCH_SIZE", 100), \
+            mock.patch.object(legacy_file_reader.LegacyFileReader, "CHUNK_SIZE", 7), \
+            mock.patch.object(legacy_file_reader, "LegacyFileReader",
+                              mock.Mock(wraps=legacy_file_reader.LegacyFileReader)) as legacy_file_reader_mock:
+        async with converted_file(LEGACY_FILE_NAME) as (converter, database):
+            # the legacy file is parsed only once
+            legacy_file_reader_mock.assert_called_once_with(LEGACY_FILE_NAME)
+            assert converter._columns_files_by_time_frame == {}
+            assert converter.time_frames == list(candles_count_by_time_frame)
+            description = await database.select(backtesting_enums.DataTables.DESCRIPTION)
+            assert description[0][1:] == ("1.0", "binance", json.dumps(["BTC/USDT"]), json.dumps(["1h", "4h"]))
+            for time_frame, count in candles_count_by_time_frame.items():
+                await _assert_converted_candles(database, time_frame, count)
+
+
+async def test_can_convert_invalid_files():
+    converter = legacy_data_converter.LegacyDataConverter("invalid.data")
+    assert await converter.can_convert() is False
+    with legacy_data_file({}, extra_content='"1h": [[1, 2], [3, 4], [], [5, 6], [7, 8], [9, 10]]'):
+        assert await legacy_data_converter.LegacyDataConverter(LEGACY_FILE_NAME).can_convert() is False
+    with legacy_data_file({}, extra_content='"1h": [[1, 2], [3, 4], [5], [5, 6], [7, 8], [9, 10]]'):
+        assert await legacy_data_converter.LegacyDataConverter(LEGACY_FILE_NAME).can_convert() is False
+    with legacy_data_file({}, extra_content='"abc": [[1], [3], [5], [5], [7], [9]], "1h": [[1, 2]]'):
+        assert await legacy_data_converter.LegacyDataConverter(LEGACY_FILE_NAME).can_convert() is False
+    with legacy_data_file({commons_enums.TimeFrames.ONE_HOUR: 10}):
+        # truncated file
+        with gzip.open(LEGACY_FILE_NAME, "rt") as file:
+            content = file.read()
+        with gzip.open(LEGACY_FILE_NAME, "wt") as file:
+            file.write(content[:-20])
+        assert await legacy_data_converter.LegacyDataConverter(LEGACY_FILE_NAME).can_convert() is False
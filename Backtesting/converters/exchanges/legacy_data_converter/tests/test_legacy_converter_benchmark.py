@@ -0,0 +1,84 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+import octobot_commons.enums as commons_enums
+from tentacles.Backtesting.converters.exchanges.legacy_data_converter.tests import legacy_data_file
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+CANDLES_COUNT = 2000000
+MAX_PEAK_RSS_INCREASE_MB = 100
+# converts in a new process to measure its peak RSS (ru_maxrss is inherited from the parent process: use VmHWM)
+CONVERT_SCRIPT = """
+import asyncio, json, os, sys, time
+import octobot_backtesting.constants as backtesting_constants
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.databases as databases
+import tentacles.Backtesting.converters.exchanges.legacy_data_converter as legacy_data_converter
+
+def get_peak_rss_kb():
+    with open("/proc/self/status") as status:
+        return int(next(line for line in status if line.startswith("VmHWM")).split()[1])
+
+async def convert(file_path):
+    converter = legacy_data_converter.LegacyDataConverter(file_path)
+    rss_before_convert = get_peak_rss_kb()
+    t0 = time.perf_counter()
+    converted = await converter.can_convert() and await converter.convert()
+    duration = time.perf_counter() - t0
+    peak_rss_kb = get_peak_rss_kb() - rss_before_convert
+    converted_file_path = os.path.join(backtesting_constants.BACKTESTING_FILE_PATH, converter.converted_file)
+    try:
+        async with databases.new_sqlite_database(converted_file_path) as database:
+            count = (await database.select_count(backtesting_enums.ExchangeDataTables.OHLCV))[0][0]
+            last_candle = json.loads((await database.select(backtesting_enums.ExchangeDataTables.OHLCV, size=1))[0][-1])
+    finally:
+        if os.path.isfile(converted_file_path):
+            os.remove(converted_file_path)
+    print(json.dumps({
+        "converted": converted,
+        "duration": duration,
+        "count": count,
+        "last_candle": last_candle,
+        "peak_rss_kb": peak_rss_kb,
+    }))
+
+asyncio.run(convert(sys.argv[1]))
+"""
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="peak RSS is read from /proc")
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+async def test_convert_large_legacy_file_benchmark():
+    with legacy_data_file({commons_enums.TimeFrames.ONE_MINUTE: CANDLES_COUNT}) as file_path:
+        file_size = os.path.getsize(file_path)
+        output = subprocess.run(
+            [sys.executable, "-c", CONVERT_SCRIPT, file_path],
+            capture_output=True, check=True, text=True, env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        ).stdout
+    result = json.loads(output.splitlines()[-1])
+    print(f"\nConverting {CANDLES_COUNT} legacy candles ({file_size / 1024 / 1024:.0f}MB gzip file): "
+          f"{result['duration']:.2f}s, +{result['peak_rss_kb'] / 1024:.0f}MB peak RSS")
+    assert result["converted"] is True
+    assert result["count"] == CANDLES_COUNT
+    assert result["last_candle"][0] == 1514808000 + (CANDLES_COUNT - 1) * 60
+    assert result["peak_rss_kb"] < MAX_PEAK_RSS_INCREASE_MB * 1024
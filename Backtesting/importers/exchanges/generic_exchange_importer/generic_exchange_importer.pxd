@@ -17,4 +17,4 @@
 from octobot_backtesting.importers.exchanges.exchange_importer cimport ExchangeDataImporter
 
 cdef class GenericExchangeDataImporter(ExchangeDataImporter):
-    pass
\ No newline at end of file
+    cdef public bint has_ohlcv_columns
\ No newline at end of file
@@ -13,8 +13,38 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import octobot_commons.enums as common_enums
+import octobot_commons.databases as databases
 import octobot_backtesting.importers as importers
 
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer.ohlcv_columns as ohlcv_columns
+
 
 class GenericExchangeDataImporter(importers.ExchangeDataImporter):
-    pass
+    def __init__(self, config, file_path):
+        super().__init__(config, file_path)
+        # when available, OHLCVs are read from binary columns instead of json candles
+        self.has_ohlcv_columns = False
+
+    async def initialize(self) -> None:
+        await super().initialize()
+        self.has_ohlcv_columns = await self.database.check_table_exists(ohlcv_columns.OHLCVColumnsTables.OHLCV_COLUMNS)
+
+    async def get_ohlcv(self, exchange_name=None, symbol=None,
+                        time_frame=common_enums.TimeFrames.ONE_HOUR,
+                        limit=databases.SQLiteDatabase.DEFAULT_SIZE,
+                        timestamps=None,
+                        operations=None):
+        if not self.has_ohlcv_columns:
+            return await super().get_ohlcv(exchange_name=exchange_name, symbol=symbol, time_frame=time_frame,
+                                           limit=limit, timestamps=timestamps, operations=operations)
+        ohlcvs = ohlcv_columns.get_ohlcvs(
+            await self.database.select(
+                ohlcv_columns.OHLCVColumnsTables.OHLCV_COLUMNS,
+                exchange_name=exchange_name, symbol=symbol,
+                time_frame=None if time_frame is None else time_frame.value
+            ),
+            timestamps=timestamps,
+            operations=operations
+        )
+        return ohlcvs if limit == databases.SQLiteDatabase.DEFAULT_SIZE else ohlcvs[:limit]
@@ -0,0 +1,136 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import contextlib
+import enum
+import gc
+import itertools
+import operator
+
+import numpy
+
+import octobot_commons.enums as commons_enums
+
+
+class OHLCVColumnsTables(enum.Enum):
+    OHLCV_COLUMNS = "ohlcv_columns"
+
+
+# candles are stored as contiguous binary columns, one row per exchange, symbol and time frame
+OHLCV_COLUMNS_TABLE_COLUMNS = (
+    "timestamp datetime", "exchange_name text", "cryptocurrency text", "symbol text", "time_frame text",
+    "timestamps blob", "times blob", "values_columns blob",
+)
+TIMESTAMPS_DTYPE = numpy.float64
+TIMES_DTYPE = numpy.int64
+VALUES_DTYPE = numpy.float64
+VALUES_INDEXES = (
+    commons_enums.PriceIndexes.IND_PRICE_OPEN.value,
+    commons_enums.PriceIndexes.IND_PRICE_HIGH.value,
+    commons_enums.PriceIndexes.IND_PRICE_LOW.value,
+    commons_enums.PriceIndexes.IND_PRICE_CLOSE.value,
+    commons_enums.PriceIndexes.IND_PRICE_VOL.value,
+)
+OPERATORS = {
+    commons_enums.DataBaseOperations.SUP.value: operator.gt,
+    commons_enums.DataBaseOperations.INF.value: operator.lt,
+    commons_enums.DataBaseOperations.EQUALS.value: operator.eq,
+    commons_enums.DataBaseOperations.INF_EQUALS.value: operator.le,
+    commons_enums.DataBaseOperations.SUP_EQUALS.value: operator.ge,
+}
+
+
+async def create_ohlcv_columns_table(database):
+    async with database.aio_cursor() as cursor:
+        await cursor.execute(
+            f"CREATE TABLE {OHLCVColumnsTables.OHLCV_COLUMNS.value} ({', '.join(OHLCV_COLUMNS_TABLE_COLUMNS)})"
+        )
+    database.tables.append(OHLCVColumnsTables.OHLCV_COLUMNS.value)
+
+
+async def insert_ohlcv_columns(database, exchange_name, cryptocurrency, symbol, time_frame, timestamps, candles):
+    """
+    Saves candles as binary columns, commit is left to the caller
+    :param timestamps: candles database timestamps
+    :param candles: candles sorted by time
+    """
+    timestamps = numpy.array(timestamps, dtype=TIMESTAMPS_DTYPE)
+    times = numpy.array(
+        [candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] for candle in candles], dtype=TIMES_DTYPE
+    )
+    # one contiguous column per candle value
+    values_columns = numpy.ascontiguousarray(
+        numpy.array(candles, dtype=VALUES_DTYPE)[:, VALUES_INDEXES].T
+    )
+    async with database.aio_cursor() as cursor:
+        await cursor.execute(
+            f"INSERT INTO {OHLCVColumnsTables.OHLCV_COLUMNS.value} VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                float(timestamps[0]) if len(timestamps) else 0, exchange_name, cryptocurrency, symbol,
+                time_frame.value, timestamps.tobytes(), times.tobytes(), values_columns.tobytes()
+            )
+        )
+
+
+def get_ohlcvs(ohlcv_columns_rows, timestamps=None, operations=None) -> list:
+    """
+    :return: the OHLCVs of the given ohlcv_columns rows, with the same format as the ohlcv table ones
+    and sorted from the most recent. OHLCVs and their candles are tuples to avoid creating lists for each candle
+    """
+    ohlcvs = []
+    for _, exchange_name, cryptocurrency, symbol, time_frame, timestamps_blob, times_blob, values_columns_blob \
+            in ohlcv_columns_rows:
+        candles_timestamps = numpy.frombuffer(timestamps_blob, dtype=TIMESTAMPS_DTYPE)
+        times = numpy.frombuffer(times_blob, dtype=TIMES_DTYPE)
+        values_columns = numpy.frombuffer(values_columns_blob, dtype=VALUES_DTYPE).reshape(
+            len(VALUES_INDEXES), len(times)
+        )
+        if timestamps:
+            selected = numpy.ones(len(times), dtype=bool)
+            for timestamp, operation in zip(timestamps, operations):
+                selected &= OPERATORS[operation](candles_timestamps, float(timestamp))
+            candles_timestamps = candles_timestamps[selected]
+            times = times[selected]
+            values_columns = values_columns[:, selected]
+        # most recent first
+        candles_timestamps = candles_timestamps[::-1]
+        times = times[::-1]
+        values_columns = values_columns[:, ::-1]
+        # use int timestamps when possible, as stored in the ohlcv table
+        candles_timestamps = candles_timestamps.astype(TIMES_DTYPE).tolist() \
+            if numpy.array_equal(candles_timestamps, numpy.floor(candles_timestamps)) \
+            else candles_timestamps.tolist()
+        with _disabled_garbage_collector():
+            # zip columns to create candles without going through python loops
+            ohlcvs += zip(
+                candles_timestamps, itertools.repeat(exchange_name), itertools.repeat(cryptocurrency),
+                itertools.repeat(symbol), itertools.repeat(time_frame), zip(times.tolist(), *values_columns.tolist())
+            )
+    if len(ohlcv_columns_rows) > 1:
+        # same order as database selects
+        ohlcvs.sort(key=lambda ohlcv: ohlcv[0], reverse=True)
+    return ohlcvs
+
+
+@contextlib.contextmanager
+def _disabled_garbage_collector():
+    # creating millions of tuples would otherwise trigger many useless garbage collections
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
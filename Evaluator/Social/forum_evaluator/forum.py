@@ -19,6 +19,7 @@ import octobot_commons.tentacles_management as tentacles_management
 import octobot_evaluators.evaluators as evaluators
 import octobot_services.constants as services_constants
 import tentacles.Services.Services_feeds as Services_feeds
+import tentacles.Services.Services_feeds.reddit_service_feed.reddit_feed as reddit_feed
 import tentacles.Evaluator.Util as EvaluatorUtil
 
 CONFIG_REDDIT = "reddit"
@@ -94,13 +95,19 @@ class RedditForumEvaluator(evaluators.SocialEvaluator):
 
     async def _feed_callback(self, data):
         if self._is_interested_by_this_notification(data[services_constants.FEED_METADATA]):
-            self.count += 1
-            entry_note = self._get_sentiment(data[CONFIG_REDDIT_ENTRY])
-            if entry_note != commons_constants.START_PENDING_EVAL_NOTE:
-                self.overall_state_analyser.add_evaluation(entry_note, data[CONFIG_REDDIT_ENTRY_WEIGHT], False)
-                if data[CONFIG_REDDIT_ENTRY_WEIGHT] > 3:
-                    link = f"https://www.reddit.com{data[CONFIG_REDDIT_ENTRY].permalink}"
-                    self._print_entry(link, entry_note, str(self.count))
+            # entries are received in batches: evaluate once per batch
+            entries = data[reddit_feed.CONFIG_REDDIT_ENTRIES] if reddit_feed.CONFIG_REDDIT_ENTRIES in data else [data]
+            updated_evaluation = False
+            for entry in entries:
+                self.count += 1
+                entry_note = self._get_sentiment(entry[CONFIG_REDDIT_ENTRY])
+                if entry_note != commons_constants.START_PENDING_EVAL_NOTE:
+                    self.overall_state_analyser.add_evaluation(entry_note, entry[CONFIG_REDDIT_ENTRY_WEIGHT], False)
+                    if entry[CONFIG_REDDIT_ENTRY_WEIGHT] > 3:
+                        link = f"https://www.reddit.com{entry[CONFIG_REDDIT_ENTRY].permalink}"
+                        self._print_entry(link, entry_note, str(self.count))
+                    updated_evaluation = True
+            if updated_evaluation:
                 self.eval_note = self.overall_state_analyser.get_overall_state_after_refresh()
                 await self.evaluation_completed(self.cryptocurrency, eval_time=self.get_current_exchange_time())
 
@@ -13,6 +13,7 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
 import typing
 
 import octobot_commons.constants as commons_constants
@@ -35,6 +36,9 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
     SOCIAL_EVALUATORS_NOTIFICATION_TIMEOUT_KEY = "social_evaluators_notification_timeout"
     RE_EVAL_TA_ON_RT_OR_SOCIAL = "re_evaluate_TA_when_social_or_realtime_notification"
     BACKGROUND_SOCIAL_EVALUATORS = "background_social_evaluators"
+    TA_EVALUATIONS_COALESCING_DEADLINE_KEY = "technical_evaluations_coalescing_deadline"
+    # seconds to wait for every technical evaluator to evaluate a candle before evaluating anyway
+    TA_EVALUATIONS_COALESCING_DEADLINE = 5
 
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
@@ -43,6 +47,16 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
         self.social_evaluators_default_timeout = None
         self.re_evaluate_TA_when_social_or_realtime_notification = True
         self.background_social_evaluators = []
+        # when True, technical evaluations of a candle are evaluated once every technical evaluator
+        # of the time frame evaluated this candle instead of once per technical evaluator.
+        # Disabled in backtesting as the coalescing deadline is a wall-clock timer
+        self.coalesce_TA_evaluations = True
+        self.TA_evaluations_coalescing_deadline = self.TA_EVALUATIONS_COALESCING_DEADLINE
+        self.evaluations_count = 0
+        self.collapsed_evaluations_count = 0
+        self.deadline_evaluations_count = 0
+        self._coalescing_deadlines = {}
+        self._deadline_evaluation_tasks = set()
 
     def init_user_inputs(self, inputs: dict) -> None:
         """
@@ -82,6 +96,21 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
                             title="Social evaluator to consider as background evaluators: they won't trigger technical "
                                   "evaluators re-evaluation when updated. Avoiding unnecessary updates increases "
                                   "performances.")
+        self.TA_evaluations_coalescing_deadline = \
+            self.UI.user_input(self.TA_EVALUATIONS_COALESCING_DEADLINE_KEY, commons_enums.UserInputTypes.FLOAT,
+                               default_config[self.TA_EVALUATIONS_COALESCING_DEADLINE_KEY],
+                               inputs, min_val=0,
+                               title="Number of seconds to wait for every technical evaluator to evaluate a candle "
+                                     "before computing the strategy evaluation anyway. Not used in backtesting.")
+
+    async def load_and_save_user_inputs(self, bot_id: str) -> dict:
+        """
+        instance method API for user inputs
+        Initialize and save the tentacle user inputs in run data
+        :return: the filled user input configuration
+        """
+        self.coalesce_TA_evaluations = not self._is_in_backtesting()
+        return await super().load_and_save_user_inputs(bot_id)
 
     @classmethod
     def get_default_config(cls, time_frames: typing.Optional[list[str]] = None) -> dict:
@@ -93,8 +122,19 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
             cls.SOCIAL_EVALUATORS_NOTIFICATION_TIMEOUT_KEY: 1 * commons_constants.HOURS_TO_SECONDS,
             cls.RE_EVAL_TA_ON_RT_OR_SOCIAL: True,
             cls.BACKGROUND_SOCIAL_EVALUATORS: [],
+            cls.TA_EVALUATIONS_COALESCING_DEADLINE_KEY: cls.TA_EVALUATIONS_COALESCING_DEADLINE,
         }
 
+    async def stop(self) -> None:
+        for deadline in self._coalescing_deadlines.values():
+            deadline.cancel()
+        self._coalescing_deadlines.clear()
+        for task in self._deadline_evaluation_tasks:
+            task.cancel()
+        if self._deadline_evaluation_tasks:
+            await asyncio.gather(*self._deadline_evaluation_tasks, return_exceptions=True)
+        await super().stop()
+
     async def matrix_callback(self,
                               matrix_id,
                               evaluator_name,
@@ -125,7 +165,50 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
                                            eval_note_type,
                                            exchange_name,
                                            cryptocurrency,
-                                           symbol)
+                                           symbol,
+                                           time_frame=time_frame)
+
+    def get_coalescing_metrics(self) -> dict:
+        return {
+            "evaluations": self.evaluations_count,
+            "collapsed_evaluations": self.collapsed_evaluations_count,
+            "deadline_evaluations": self.deadline_evaluations_count,
+        }
+
+    def _is_waiting_for_TA_evaluations(self, TA_by_timeframe, evaluator_name, time_frame) -> bool:
+        try:
+            evaluations = TA_by_timeframe[commons_enums.TimeFrames(time_frame)]
+            evaluation_time = evaluators_api.get_time(evaluations[evaluator_name])
+        except (KeyError, ValueError):
+            return False
+        if evaluation_time is None:
+            return False
+        for evaluation in evaluations.values():
+            other_evaluation_time = evaluators_api.get_time(evaluation)
+            if other_evaluation_time is None or other_evaluation_time < evaluation_time:
+                # this evaluator did not evaluate the current candle yet
+                return True
+        return False
+
+    def _schedule_coalescing_deadline(self, evaluation_args, exchange_name, symbol, time_frame):
+        key = (exchange_name, symbol, time_frame)
+        if key not in self._coalescing_deadlines:
+            self._coalescing_deadlines[key] = asyncio.get_event_loop().call_later(
+                self.TA_evaluations_coalescing_deadline, self._on_coalescing_deadline, key, evaluation_args
+            )
+
+    def _cancel_coalescing_deadline(self, exchange_name, symbol, time_frame):
+        deadline = self._coalescing_deadlines.pop((exchange_name, symbol, time_frame), None)
+        if deadline is not None:
+            deadline.cancel()
+
+    def _on_coalescing_deadline(self, key, evaluation_args):
+        self._coalescing_deadlines.pop(key, None)
+        self.deadline_evaluations_count += 1
+        self.logger.debug(f"Technical evaluators coalescing deadline reached for {key}, evaluating now")
+        task = asyncio.create_task(self._trigger_evaluation(*evaluation_args, time_frame=key[2], force=True))
+        self._deadline_evaluation_tasks.add(task)
+        task.add_done_callback(self._deadline_evaluation_tasks.discard)
 
     async def _trigger_evaluation(self,
                                   matrix_id,
@@ -135,7 +218,9 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
                                   eval_note_type,
                                   exchange_name,
                                   cryptocurrency,
-                                  symbol):
+                                  symbol,
+                                  time_frame=None,
+                                  force=False):
         # ensure only start evaluations when technical evaluators have been initialized
         try:
             TA_by_timeframe = {
@@ -150,6 +235,18 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
                     allowed_values=[commons_constants.START_PENDING_EVAL_NOTE])
                 for available_time_frame in self.strategy_time_frames
             }
+            if evaluator_type == evaluators_enums.EvaluatorMatrixTypes.TA.value and time_frame is not None:
+                if not force and self.coalesce_TA_evaluations and \
+                        self._is_waiting_for_TA_evaluations(TA_by_timeframe, evaluator_name, time_frame):
+                    # evaluate once every technical evaluator evaluated this candle
+                    self.collapsed_evaluations_count += 1
+                    self._schedule_coalescing_deadline(
+                        (matrix_id, evaluator_name, evaluator_type, eval_note, eval_note_type,
+                         exchange_name, cryptocurrency, symbol),
+                        exchange_name, symbol, time_frame
+                    )
+                    return
+                self._cancel_coalescing_deadline(exchange_name, symbol, time_frame)
             # social evaluators by symbol
             social_evaluations_by_evaluator = matrix.get_evaluations_by_evaluator(matrix_id,
                                                                                   exchange_name,
@@ -232,6 +329,7 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
 
             if counter > 0:
                 self.eval_note = total_evaluation / counter
+                self.evaluations_count += 1
                 await self.strategy_completed(cryptocurrency, symbol)
 
         except errors.UnsetTentacleEvaluation as e:
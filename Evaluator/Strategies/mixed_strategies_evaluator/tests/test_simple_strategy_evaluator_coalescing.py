@@ -0,0 +1,176 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import contextlib
+import mock
+import pytest
+
+import octobot_commons.enums as commons_enums
+import octobot_evaluators.constants as evaluators_constants
+import octobot_evaluators.enums as evaluators_enums
+import tentacles.Evaluator.Strategies.mixed_strategies_evaluator.mixed_strategies as mixed_strategies
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+TA = evaluators_enums.EvaluatorMatrixTypes.TA.value
+EXCHANGE = "binance"
+CRYPTOCURRENCY = "BTC"
+SYMBOL = "BTC/USDT"
+TIME_FRAME = commons_enums.TimeFrames.ONE_HOUR
+EVALUATORS = ["RSIMomentumEvaluator", "MACDMomentumEvaluator", "DoubleMovingAverageTrendEvaluator"]
+NOTES_BY_CANDLE = [
+    [0.1, -0.3, 0.8],
+    [0.5, 0.2, -1],
+    [-0.4, -0.6, 0.3],
+]
+
+
+class _Evaluation:
+    def __init__(self, value, time):
+        self.value = value
+        self.time = time
+
+
+class _Matrix:
+    def __init__(self):
+        self.TA_evaluations = {
+            evaluator: _Evaluation(0, 0)
+            for evaluator in EVALUATORS
+        }
+
+    def get_evaluations_by_evaluator(self, matrix_id, exchange_name=None, tentacle_type=None, cryptocurrency=None,
+                                     symbol=None, time_frame=None, allow_missing=True, allowed_values=None):
+        if tentacle_type == TA and time_frame == TIME_FRAME.value:
+            return dict(self.TA_evaluations)
+        return {}
+
+
+@contextlib.contextmanager
+def _strategy_and_matrix(coalesce_TA_evaluations):
+    strategy = mixed_strategies.SimpleStrategyEvaluator(
+        mock.Mock(is_tentacle_activated=mock.Mock(return_value=True))
+    )
+    strategy.strategy_time_frames = [TIME_FRAME]
+    strategy.coalesce_TA_evaluations = coalesce_TA_evaluations
+    strategy.get_available_time_frames = mock.Mock(return_value=[])
+    strategy.completed_eval_notes = []
+
+    async def _strategy_completed(cryptocurrency, symbol):
+        strategy.completed_eval_notes.append(strategy.eval_note)
+    strategy.strategy_completed = mock.AsyncMock(side_effect=_strategy_completed)
+    fake_matrix = _Matrix()
+    with mock.patch.object(mixed_strategies.matrix, "get_evaluations_by_evaluator",
+                           mock.Mock(side_effect=fake_matrix.get_evaluations_by_evaluator)), \
+            mock.patch.object(mixed_strategies.evaluators_api, "get_value",
+                              mock.Mock(side_effect=lambda evaluation: evaluation.value)), \
+            mock.patch.object(mixed_strategies.evaluators_api, "get_time",
+                              mock.Mock(side_effect=lambda evaluation: evaluation.time)), \
+            mock.patch.object(mixed_strategies.evaluators_api, "get_type",
+                              mock.Mock(return_value=evaluators_constants.EVALUATOR_EVAL_DEFAULT_TYPE)):
+        yield strategy, fake_matrix
+
+
+async def _evaluate(strategy, fake_matrix, evaluator, note, candle_time):
+    fake_matrix.TA_evaluations[evaluator] = _Evaluation(note, candle_time)
+    await strategy.matrix_callback(
+        "matrix_id", evaluator, TA, note, evaluators_constants.EVALUATOR_EVAL_DEFAULT_TYPE,
+        EXCHANGE, CRYPTOCURRENCY, SYMBOL, TIME_FRAME.value
+    )
+
+
+async def _run_candles(strategy, fake_matrix):
+    for candle_index, notes in enumerate(NOTES_BY_CANDLE):
+        for evaluator, note in zip(EVALUATORS, notes):
+            await _evaluate(strategy, fake_matrix, evaluator, note, candle_index + 1)
+
+
+async def test_coalesced_evaluations_are_identical():
+    with _strategy_and_matrix(False) as (strategy, fake_matrix):
+        await _run_candles(strategy, fake_matrix)
+        not_coalesced_eval_notes = strategy.completed_eval_notes
+        assert len(not_coalesced_eval_notes) == len(NOTES_BY_CANDLE) * len(EVALUATORS)
+        assert strategy.get_coalescing_metrics() == {
+            "evaluations": len(NOTES_BY_CANDLE) * len(EVALUATORS),
+            "collapsed_evaluations": 0,
+            "deadline_evaluations": 0,
+        }
+
+    with _strategy_and_matrix(True) as (strategy, fake_matrix):
+        await _run_candles(strategy, fake_matrix)
+        # one evaluation per candle: the final evaluation of each candle is identical
+        assert strategy.completed_eval_notes == not_coalesced_eval_notes[len(EVALUATORS) - 1::len(EVALUATORS)]
+        assert strategy.completed_eval_notes == [sum(notes) / len(notes) for notes in NOTES_BY_CANDLE]
+        assert strategy.get_coalescing_metrics() == {
+            "evaluations": len(NOTES_BY_CANDLE),
+            "collapsed_evaluations": len(NOTES_BY_CANDLE) * (len(EVALUATORS) - 1),
+            "deadline_evaluations": 0,
+        }
+        assert strategy._coalescing_deadlines == {}
+
+
+async def test_coalescing_deadline():
+    with _strategy_and_matrix(True) as (strategy, fake_matrix):
+        strategy.TA_evaluations_coalescing_deadline = 0.01
+        await _run_candles(strategy, fake_matrix)
+        assert len(strategy.completed_eval_notes) == len(NOTES_BY_CANDLE)
+
+        # last evaluator does not evaluate the next candle
+        await _evaluate(strategy, fake_matrix, EVALUATORS[0], 1, len(NOTES_BY_CANDLE) + 1)
+        await _evaluate(strategy, fake_matrix, EVALUATORS[1], 1, len(NOTES_BY_CANDLE) + 1)
+        assert len(strategy.completed_eval_notes) == len(NOTES_BY_CANDLE)
+        await asyncio.sleep(0.1)
+        # evaluated anyway after deadline
+        assert strategy.completed_eval_notes[-1] == (1 + 1 + NOTES_BY_CANDLE[-1][-1]) / 3
+        assert strategy.get_coalescing_metrics() == {
+            "evaluations": len(NOTES_BY_CANDLE) + 1,
+            "collapsed_evaluations": len(NOTES_BY_CANDLE) * (len(EVALUATORS) - 1) + 2,
+            "deadline_evaluations": 1,
+        }
+
+
+async def test_no_coalescing_in_backtesting():
+    strategy = mixed_strategies.SimpleStrategyEvaluator(
+        mock.Mock(is_tentacle_activated=mock.Mock(return_value=True))
+    )
+    with mock.patch.object(mixed_strategies.evaluators.StrategyEvaluator, "load_and_save_user_inputs",
+                           mock.AsyncMock(return_value={})) as load_and_save_user_inputs_mock:
+        with mock.patch.object(strategy, "_is_in_backtesting", mock.Mock(return_value=False)):
+            await strategy.load_and_save_user_inputs("bot_id")
+            assert strategy.coalesce_TA_evaluations is True
+        with mock.patch.object(strategy, "_is_in_backtesting", mock.Mock(return_value=True)):
+            await strategy.load_and_save_user_inputs("bot_id")
+            assert strategy.coalesce_TA_evaluations is False
+        assert load_and_save_user_inputs_mock.await_count == 2
+
+
+async def test_stop_cancels_coalescing_deadlines():
+    with _strategy_and_matrix(True) as (strategy, fake_matrix):
+        await _evaluate(strategy, fake_matrix, EVALUATORS[0], 1, 1)
+        assert len(strategy._coalescing_deadlines) == 1
+        deadline = next(iter(strategy._coalescing_deadlines.values()))
+        deadline_evaluation_task = asyncio.create_task(asyncio.sleep(10))
+        strategy._deadline_evaluation_tasks.add(deadline_evaluation_task)
+        deadline_evaluation_task.add_done_callback(strategy._deadline_evaluation_tasks.discard)
+        with mock.patch.object(mixed_strategies.evaluators.StrategyEvaluator, "stop",
+                               mock.AsyncMock()) as stop_mock:
+            await strategy.stop()
+            stop_mock.assert_awaited_once()
+        assert strategy._coalescing_deadlines == {}
+        assert deadline.cancelled()
+        assert deadline_evaluation_task.cancelled()
+        assert strategy._deadline_evaluation_tasks == set()
+        assert strategy.completed_eval_notes == []
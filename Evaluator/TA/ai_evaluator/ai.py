@@ -28,6 +28,7 @@ import octobot_trading.api as trading_api
 import octobot_services.api as services_api
 import octobot_services.errors as services_errors
 import tentacles.Services.Services_bases.gpt_service as gpt_service
+import tentacles.Evaluator.Util as EvaluatorUtil
 
 
 class GPTEvaluator(evaluators.TAEvaluator):
@@ -38,8 +39,9 @@ class GPTEvaluator(evaluators.TAEvaluator):
     HIGH_CONFIDENCE_PERCENT = 80
     MEDIUM_CONFIDENCE_PERCENT = 50
     LOW_CONFIDENCE_PERCENT = 30
+    NO_INDICATOR = "No indicator: raw candles price data"
     INDICATORS = {
-        "No indicator: raw candles price data": lambda data, period: data,
+        NO_INDICATOR: lambda data, period: data,
         "EMA: Exponential Moving Average": tulipy.ema,
         "SMA: Simple Moving Average": tulipy.sma,
         "Kaufman Adaptive Moving Average": tulipy.kama,
@@ -47,6 +49,8 @@ class GPTEvaluator(evaluators.TAEvaluator):
         "RSI: Relative Strength Index": tulipy.rsi,
         "Detrended Price Oscillator": tulipy.dpo,
     }
+    # indicators which values are shared with other evaluators through the indicators cache
+    CACHED_INDICATORS = set(INDICATORS) - {NO_INDICATOR}
     SOURCES = ["Open", "High", "Low", "Close", "Volume", "Full candle (For no indicator only)"]
     ALLOW_GPT_REEVALUATION_ENV = "ALLOW_GPT_REEVALUATIONS"
     GPT_MODELS = []
@@ -178,7 +182,8 @@ class GPTEvaluator(evaluators.TAEvaluator):
             if self._check_timeframe(time_frame):
                 try:
                     candle_time = candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
-                    computed_data = self.call_indicator(candle_data)
+                    computed_data = self.call_indicator(candle_data, symbol=symbol, time_frame=time_frame,
+                                                        candle_time=candle_time)
                     formatted_data = self.get_formatted_data(computed_data)
                     prediction = await self.ask_gpt(self.PREPROMPT, formatted_data, symbol, time_frame, candle_time) \
                         or ""
@@ -243,7 +248,9 @@ class GPTEvaluator(evaluators.TAEvaluator):
                 time_frame=time_frame,
                 version=self.get_version(),
                 candle_open_time=candle_time,
-                use_stored_signals=self.is_backtesting
+                use_stored_signals=self.is_backtesting,
+                # symbols evaluated on the same candle are sent together
+                allow_batching=True,
             )
             self.logger.info(
                 f"GPT's answer is '{resp}' for {symbol} on {time_frame} with input: {inputs} "
@@ -258,10 +265,18 @@ class GPTEvaluator(evaluators.TAEvaluator):
         # return f"{self.gpt_model}-{self.source}-{self.indicator}-{self.period}-{self.GLOBAL_VERSION}"
         return "0.0.0"
 
-    def call_indicator(self, candle_data):
+    def call_indicator(self, candle_data, symbol=None, time_frame=None, candle_time=None):
         if self.source in self.get_unformated_sources():
             return candle_data
-        return data_util.drop_nan(self.INDICATORS[self.indicator](candle_data, self.period))
+        indicator_function = self.INDICATORS[self.indicator]
+        if candle_time is None or self.indicator not in self.CACHED_INDICATORS:
+            return data_util.drop_nan(indicator_function(candle_data, self.period))
+        # share indicators values with other evaluators using the same tulipy indicator
+        return data_util.drop_nan(EvaluatorUtil.IndicatorsCache.instance().get_or_compute(
+            self.exchange_name, symbol, time_frame, candle_time,
+            getattr(indicator_function, "__name__", self.indicator), (self.source.lower(), self.period), candle_data,
+            lambda: indicator_function(candle_data, self.period)
+        ))
 
     def get_candles_data(self, exchange, exchange_id, symbol, time_frame, inc_in_construction_data):
         if self.source in self.get_unformated_sources():
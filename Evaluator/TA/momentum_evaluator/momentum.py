@@ -95,15 +95,24 @@ class RSIMomentumEvaluator(evaluators.TAEvaluator):
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
-        candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
+        symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
+        candle_data = trading_api.get_symbol_close_candles(symbol_candles,
                                                            time_frame,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
-
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+        rsi_values = None
+        if candle_data is not None and len(candle_data) > self.period_length:
+            # share rsi values with other evaluators using tulipy.rsi
+            rsi_values = EvaluatorUtil.IndicatorsCache.instance().get_or_compute(
+                exchange, symbol, time_frame, candle[enums.PriceIndexes.IND_PRICE_TIME.value],
+                "rsi", ("close", self.period_length), candle_data,
+                lambda: tulipy.rsi(candle_data, period=self.period_length)
+            )
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle, rsi_values=rsi_values)
+
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, rsi_values=None):
         updated_value = False
         if candle_data is not None and len(candle_data) > self.period_length:
-            rsi_v = tulipy.rsi(candle_data, period=self.period_length)
+            rsi_v = tulipy.rsi(candle_data, period=self.period_length) if rsi_values is None else rsi_values
             if len(rsi_v) and not math.isnan(rsi_v[-1]):
                 if self.is_trend_change_identifier:
                     long_trend = EvaluatorUtil.TrendAnalysis.get_trend(rsi_v, self.long_term_averages)
@@ -246,12 +255,20 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
             fast_threshold[self.FAST_THRESHOLDS] = sorted(fast_threshold[self.FAST_THRESHOLDS],
                                                           key=lambda a: a[self.FAST_THRESHOLD])
 
-    def _get_rsi_averages(self, symbol_candles, time_frame, include_in_construction):
+    def _get_rsi_averages(self, symbol_candles, time_frame, include_in_construction,
+                          exchange=None, symbol=None, candle=None):
         # compute the slow and fast RSI average
         candle_data = trading_api.get_symbol_close_candles(symbol_candles, time_frame,
                                                            include_in_construction=include_in_construction)
         if len(candle_data) > self.period_length:
-            rsi_v = tulipy.rsi(candle_data, period=self.period_length)
+            if candle is None:
+                rsi_v = tulipy.rsi(candle_data, period=self.period_length)
+            else:
+                rsi_v = EvaluatorUtil.IndicatorsCache.instance().get_or_compute(
+                    exchange, symbol, time_frame, candle[enums.PriceIndexes.IND_PRICE_TIME.value],
+                    "rsi", ("close", self.period_length), candle_data,
+                    lambda: tulipy.rsi(candle_data, period=self.period_length)
+                )
             rsi_v = data_util.drop_nan(rsi_v)
             if len(rsi_v):
                 slow_average = numpy.mean(rsi_v[-self.slow_eval_count:])
@@ -284,7 +301,8 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
             symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
             # compute the slow and fast RSI average
             slow_rsi, fast_rsi, rsi_v = self._get_rsi_averages(symbol_candles, time_frame,
-                                                               include_in_construction=inc_in_construction_data)
+                                                               include_in_construction=inc_in_construction_data,
+                                                               exchange=exchange, symbol=symbol, candle=candle)
             current_candle_time = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
                                                                       include_in_construction=inc_in_construction_data)[
                 -1]
@@ -320,6 +338,9 @@ class BBMomentumEvaluator(evaluators.TAEvaluator):
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
         self.period_length = 20
+        self.bbands_indicators = EvaluatorUtil.IncrementalIndicatorsManager(
+            lambda: EvaluatorUtil.IncrementalBBands(self.period_length, 2)
+        )
 
     def init_user_inputs(self, inputs: dict) -> None:
         self.period_length = self.UI.user_input("period_length", enums.UserInputTypes.INT, self.period_length,
@@ -328,17 +349,26 @@ class BBMomentumEvaluator(evaluators.TAEvaluator):
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
-        candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
+        symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
+        candle_data = trading_api.get_symbol_close_candles(symbol_candles,
                                                            time_frame,
                                                            self.period_length,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
-
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+        bands = None
+        if len(candle_data) >= self.period_length:
+            time_data = trading_api.get_symbol_time_candles(symbol_candles, time_frame, self.period_length,
+                                                            include_in_construction=inc_in_construction_data)
+            bands = self.bbands_indicators.get_values((exchange, symbol, time_frame), time_frame,
+                                                      time_data, candle_data,
+                                                      include_in_construction=inc_in_construction_data)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle, bands=bands)
+
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, bands=None):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(candle_data) >= self.period_length:
             # compute bollinger bands
-            lower_band, middle_band, upper_band = tulipy.bbands(candle_data, self.period_length, 2)
+            lower_band, middle_band, upper_band = tulipy.bbands(candle_data, self.period_length, 2) \
+                if bands is None else bands
 
             # if close to lower band => low value => bad,
             # therefore if close to middle, value is keeping up => good
@@ -461,6 +491,15 @@ class ADXMomentumEvaluator(evaluators.TAEvaluator):
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
         self.period_length = 14
+        self.adx_indicators = EvaluatorUtil.IncrementalIndicatorsManager(
+            lambda: EvaluatorUtil.IncrementalADX(self.period_length)
+        )
+        self.instant_ema_indicators = EvaluatorUtil.IncrementalIndicatorsManager(
+            lambda: EvaluatorUtil.IncrementalEMA(2)
+        )
+        self.slow_ema_indicators = EvaluatorUtil.IncrementalIndicatorsManager(
+            lambda: EvaluatorUtil.IncrementalEMA(20)
+        )
 
     def init_user_inputs(self, inputs: dict) -> None:
         self.period_length = self.UI.user_input("period_length", enums.UserInputTypes.INT, self.period_length,
@@ -484,22 +523,39 @@ class ADXMomentumEvaluator(evaluators.TAEvaluator):
                                                                include_in_construction=inc_in_construction_data)
             low_candles = trading_api.get_symbol_low_candles(symbol_candles, time_frame,
                                                              include_in_construction=inc_in_construction_data)
-            await self.evaluate(cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle)
+            time_candles = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                               include_in_construction=inc_in_construction_data)
+            key = (exchange, symbol, time_frame)
+            adx, = self.adx_indicators.get_values(key, time_frame, time_candles,
+                                                  high_candles, low_candles, close_candles,
+                                                  include_in_construction=inc_in_construction_data)
+            instant_ema, = self.instant_ema_indicators.get_values(key, time_frame, time_candles, close_candles,
+                                                                  include_in_construction=inc_in_construction_data)
+            slow_ema, = self.slow_ema_indicators.get_values(key, time_frame, time_candles, close_candles,
+                                                            include_in_construction=inc_in_construction_data)
+            await self.evaluate(cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle,
+                                adx_values=adx, instant_ema_values=instant_ema, slow_ema_values=slow_ema)
         else:
             self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
             await self.evaluation_completed(cryptocurrency, symbol, time_frame,
                                             eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                     time_frame=time_frame))
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle,
+                       adx_values=None, instant_ema_values=None, slow_ema_values=None):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(close_candles) >= self._get_minimal_data():
             min_adx = 7.5
             max_adx = 45
             neutral_adx = 25
-            adx = tulipy.adx(high_candles, low_candles, close_candles, self.period_length)
-            instant_ema = data_util.drop_nan(tulipy.ema(close_candles, 2))
-            slow_ema = data_util.drop_nan(tulipy.ema(close_candles, 20))
+            adx = tulipy.adx(high_candles, low_candles, close_candles, self.period_length) \
+                if adx_values is None else adx_values
+            instant_ema = data_util.drop_nan(
+                tulipy.ema(close_candles, 2) if instant_ema_values is None else instant_ema_values
+            )
+            slow_ema = data_util.drop_nan(
+                tulipy.ema(close_candles, 20) if slow_ema_values is None else slow_ema_values
+            )
             adx = data_util.drop_nan(adx)
 
             if len(adx):
@@ -546,6 +602,10 @@ class MACDMomentumEvaluator(evaluators.TAEvaluator):
         self.long_period_length = 26
         self.short_period_length = 12
         self.signal_period_length = 9
+        self.macd_indicators = EvaluatorUtil.IncrementalIndicatorsManager(
+            lambda: EvaluatorUtil.IncrementalMACD(self.short_period_length, self.long_period_length,
+                                                  self.signal_period_length)
+        )
 
     def init_user_inputs(self, inputs: dict) -> None:
         self.short_period_length = self.UI.user_input(
@@ -598,16 +658,27 @@ class MACDMomentumEvaluator(evaluators.TAEvaluator):
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
-        candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
+        symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
+        candle_data = trading_api.get_symbol_close_candles(symbol_candles,
                                                            time_frame,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
-
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+        macd_hist = None
+        if len(candle_data) > self.long_period_length:
+            time_data = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                            include_in_construction=inc_in_construction_data)
+            _, _, macd_hist = self.macd_indicators.get_values((exchange, symbol, time_frame), time_frame,
+                                                              time_data, candle_data,
+                                                              include_in_construction=inc_in_construction_data)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle, macd_hist_values=macd_hist)
+
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, macd_hist_values=None):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(candle_data) > self.long_period_length:
-            macd, macd_signal, macd_hist = tulipy.macd(candle_data, self.short_period_length,
-                                                       self.long_period_length, self.signal_period_length)
+            if macd_hist_values is None:
+                macd, macd_signal, macd_hist = tulipy.macd(candle_data, self.short_period_length,
+                                                           self.long_period_length, self.signal_period_length)
+            else:
+                macd_hist = macd_hist_values
 
             # on macd hist => M pattern: bearish movement, W pattern: bullish movement
             #                 max on hist: optimal sell or buy
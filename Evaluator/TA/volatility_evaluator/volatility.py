@@ -21,6 +21,7 @@ import octobot_commons.data_util as data_util
 import octobot_evaluators.evaluators as evaluators
 import octobot_evaluators.util as evaluators_util
 import octobot_trading.api as trading_api
+import tentacles.Evaluator.Util as EvaluatorUtil
 
 
 class StochasticRSIVolatilityEvaluator(evaluators.TAEvaluator):
@@ -58,7 +59,7 @@ class StochasticRSIVolatilityEvaluator(evaluators.TAEvaluator):
     async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
         try:
             if len(candle_data) >= self.period * 2:
-                stochrsi_value = tulipy.stochrsi(data_util.drop_nan(candle_data), self.period)[-1]
+                stochrsi_value = self._get_stochrsi(symbol, time_frame, candle_data, candle)[-1]
 
                 if stochrsi_value * self.TULIPY_INDICATOR_MULTIPLICATOR >= self.high_level:
                     self.eval_note = 1
@@ -76,3 +77,12 @@ class StochasticRSIVolatilityEvaluator(evaluators.TAEvaluator):
         await self.evaluation_completed(cryptocurrency, symbol, time_frame,
                                         eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                 time_frame=time_frame))
+
+    def _get_stochrsi(self, symbol, time_frame, candle_data, candle):
+        if candle is None:
+            return tulipy.stochrsi(data_util.drop_nan(candle_data), self.period)
+        return EvaluatorUtil.IndicatorsCache.instance().get_or_compute(
+            self.exchange_name, symbol, time_frame, candle[enums.PriceIndexes.IND_PRICE_TIME.value],
+            "stochrsi", ("close", self.period), candle_data,
+            lambda: tulipy.stochrsi(data_util.drop_nan(candle_data), self.period)
+        )
@@ -1 +1 @@
-from .candles_util import CandlesUtil
\ No newline at end of file
+from .candles_util import CandlesUtil, HeikinAshi
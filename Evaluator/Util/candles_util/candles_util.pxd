@@ -16,9 +16,10 @@
 #  License along with this library.
 
 cimport numpy as np
-from math cimport mean
 
 cpdef object HL2(object high, object low)
 cpdef object HLC3(object high, object low, object close)
 cpdef object OHLC4(object open, object high, object low, object close)
-cpdef tuple HeikinAshi(object open, object high, object low, object close)
\ No newline at end of file
+cpdef tuple HeikinAshi(object open, object high, object low, object close)
+cpdef tuple HeikinAshiUpdate(double previous_open, double previous_close,
+                             double open, double high, double low, double close)
\ No newline at end of file
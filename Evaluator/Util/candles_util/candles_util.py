@@ -15,7 +15,9 @@
 #  License along with this library.
 
 import numpy as np
-from octobot_commons.data_util import mean
+
+import octobot_commons.enums as commons_enums
+
 
 class CandlesUtil:
 
@@ -27,8 +29,7 @@ class CandlesUtil:
         :param low: list of low
         :return: list of HL2
         """
-        return np.array(list(map((lambda candles_high, candles_low: mean([candles_high, candles_low])),
-                                                                candles_high, candles_low)))
+        return (np.asarray(candles_high, dtype=np.float64) + candles_low) / 2
 
     @staticmethod
     def HLC3(candles_high, candles_low, candles_close):
@@ -39,9 +40,7 @@ class CandlesUtil:
         :param close: list of close
         :return: list of HLC3
         """
-        return np.array(list(map((lambda candles_high, candles_low, candles_close:
-                            mean([candles_high, candles_low, candles_close])),
-                            candles_high, candles_low, candles_close)))
+        return (np.asarray(candles_high, dtype=np.float64) + candles_low + candles_close) / 3
 
     @staticmethod
     def OHLC4(candles_open, candles_high, candles_low, candles_close):
@@ -53,9 +52,7 @@ class CandlesUtil:
         :param close: list of close
         :return: list of OHLC4
         """
-        return np.array(list(map((lambda candles_open, candles_high, candles_low, candles_close:
-                            mean([candles_open, candles_high, candles_low, candles_close])),
-                            candles_open, candles_high, candles_low, candles_close)))
+        return (np.asarray(candles_open, dtype=np.float64) + candles_high + candles_low + candles_close) / 4
 
     @staticmethod
     def HeikinAshi(candles_open, candles_high, candles_low, candles_close):
@@ -67,17 +64,53 @@ class CandlesUtil:
         :param close: list of close
         :return: HAopen, HAhigh, HAlow, HAclose
         """
-        haOpen, haHigh, haLow, haClose = [np.array([]) for i in range(4)]
-        for i, (open_value, high_value, low_value, close_value) \
-                            in enumerate(zip(candles_open, candles_high, candles_low, candles_close)):
-            if i == 0:
-                haOpen = np.append(haOpen, open_value)
-                haHigh = np.append(haHigh, high_value)
-                haLow = np.append(haLow, low_value)
-                haClose = np.append(haClose, close_value)
-                continue
-            haOpen = np.append(haOpen, mean([candles_open[i-1], candles_close[i-1]]))
-            haHigh = np.append(haHigh, high_value)
-            haLow = np.append(haLow, low_value)
-            haClose = np.append(haClose, mean([open_value, high_value, low_value, close_value]))
-        return haOpen, haHigh, haLow, haClose
\ No newline at end of file
+        candles_open = np.asarray(candles_open, dtype=np.float64)
+        candles_close = np.asarray(candles_close, dtype=np.float64)
+        haOpen = np.empty(len(candles_open), dtype=np.float64)
+        if len(candles_open):
+            haOpen[0] = candles_open[0]
+            np.add(candles_open[:-1], candles_close[:-1], out=haOpen[1:])
+            haOpen[1:] /= 2
+        haHigh = np.array(candles_high, dtype=np.float64)
+        haLow = np.array(candles_low, dtype=np.float64)
+        haClose = CandlesUtil.OHLC4(candles_open, haHigh, haLow, candles_close)
+        if len(haClose):
+            # first candle is not averaged
+            haClose[0] = candles_close[0]
+        return haOpen, haHigh, haLow, haClose
+
+
+class HeikinAshi:
+    """
+    HeikinAshi values of live candles, each new candle is computed in O(1) and gives the same values
+    as CandlesUtil.HeikinAshi on the whole candles history.
+    """
+
+    def __init__(self):
+        # time, open and close of the last updated candle
+        self.last_candle_time = None
+        self._last_open = self._last_close = None
+        # open and close of the candle before the last updated one
+        self._previous_open = self._previous_close = None
+
+    def update(self, last_candle):
+        """
+        Return HeikinAshi values of the given candle, a candle can be updated again while it is in construction
+        :param last_candle: a candle (list of values ordered according to PriceIndexes)
+        :return: HAopen, HAhigh, HAlow, HAclose of the candle
+        """
+        candle_time = last_candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+        candle_open = last_candle[commons_enums.PriceIndexes.IND_PRICE_OPEN.value]
+        candle_high = last_candle[commons_enums.PriceIndexes.IND_PRICE_HIGH.value]
+        candle_low = last_candle[commons_enums.PriceIndexes.IND_PRICE_LOW.value]
+        candle_close = last_candle[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value]
+        if candle_time != self.last_candle_time:
+            # new candle
+            self._previous_open, self._previous_close = self._last_open, self._last_close
+        self.last_candle_time = candle_time
+        self._last_open, self._last_close = candle_open, candle_close
+        if self._previous_open is None:
+            # first candle is not averaged
+            return candle_open, candle_high, candle_low, candle_close
+        return (self._previous_open + self._previous_close) / 2, candle_high, candle_low, \
+            (candle_open + candle_high + candle_low + candle_close) / 4
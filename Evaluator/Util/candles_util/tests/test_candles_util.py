@@ -16,7 +16,8 @@
 
 import numpy as np
 
-from tentacles.Evaluator.Util import CandlesUtil
+from octobot_commons.enums import PriceIndexes
+from tentacles.Evaluator.Util import CandlesUtil, HeikinAshi
 
 
 def test_HL2():
@@ -31,6 +32,7 @@ def test_HL2():
                                     np.array([503.796, 509.7595, 75.708, 139.49349999999998, 528.6645, 629.6320000000001,
                                     919.0925, 211.06400000000002, 469.99800000000005], dtype=np.float64))
 
+
 def test_HLC3():
     candles_high = np.array([9, 13, np.nan, 45, 5.67, 6.54, 75, 8.01, 9])
     candles_low = np.array([19, 25, 17, 36, 45, 84, 31, 21, 10])
@@ -46,6 +48,7 @@ def test_HLC3():
                                   np.array([563.6436666666667, 398.25399999999996, 580.185, 608.526, 464.367,
                                   566.217, 744.2736666666666, 700.0123333333332, 451.62000000000006], dtype=np.float64))
 
+
 def test_OHLC4():
     candles_open = np.array([251.613, 259.098, 247.819, 140.73, 237.547, 830.611, 433.168, 404.026, 403.538])
     candles_high = np.array([980.99, 403.92, 698.072, 658.647, 245.151, 480.9, 621.35, 429.109, 637.439])
@@ -63,6 +66,7 @@ def test_OHLC4():
                                         np.array([531.74525, 579.37475, 228.04225, 475.553, 535.82725,
                                         321.56125, 741.777, 462.884, 580.32425], dtype=np.float64))
 
+
 def test_HeikinAshi():
     candles_open = np.array([977.88, 573.634, 816.233, 846.748, 184.114, 35.742, 598.653, 745.916, 854.334])
     candles_high = np.array([4.757, 499.759, 602.794, 179.313, 802.019, 384.307, 637.378, 161.048, 366.51])
@@ -92,4 +96,28 @@ def test_HeikinAshi():
     np.testing.assert_array_equal(haLow, np.array([652.361, 293.607, 295.191, 893.255, 819.447, 647.016,
                                                 330.303, 472.415, 617.705], dtype=np.float64))
     np.testing.assert_array_equal(haClose, np.array([968.007, 396.6965, 410.34975, 504.77475, 712.11825,
-                                                593.9905, 382.4445, 352.09725000000003, 532.744], dtype=np.float64))
\ No newline at end of file
+                                                593.9905, 382.4445, 352.09725000000003, 532.744], dtype=np.float64))
+
+
+def test_HeikinAshi_empty():
+    for values in CandlesUtil.HeikinAshi(np.array([]), np.array([]), np.array([]), np.array([])):
+        assert len(values) == 0
+
+
+def test_HeikinAshi_update():
+    candles_time = np.arange(9) * 3600
+    candles_open = np.array([977.88, 573.634, 816.233, 846.748, 184.114, 35.742, 598.653, 745.916, 854.334])
+    candles_high = np.array([4.757, 499.759, 602.794, 179.313, 802.019, 384.307, 637.378, 161.048, 366.51])
+    candles_low = np.array([903.152, 877.832, 966.154, 104.582, 837.638, 568.788, 788.584, 510.926, 608.184])
+    candles_close = np.array([405.527, 685.962, 495.698, 271.687, 573.667, 891.018, 445.342, 344.928, 894.279])
+    candles = np.column_stack((candles_time, candles_open, candles_high, candles_low, candles_close))
+
+    haOpen, haHigh, haLow, haClose = CandlesUtil.HeikinAshi(candles_open, candles_high, candles_low, candles_close)
+    heikin_ashi = HeikinAshi()
+    for i, candle in enumerate(candles):
+        if i == 4:
+            # in construction candle: updated again with the same time
+            in_construction_candle = candle.copy()
+            in_construction_candle[PriceIndexes.IND_PRICE_CLOSE.value] = 100
+            heikin_ashi.update(in_construction_candle)
+        assert heikin_ashi.update(candle) == (haOpen[i], haHigh[i], haLow[i], haClose[i])
@@ -0,0 +1,103 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import os
+import time
+import numpy as np
+import pytest
+
+from octobot_commons.data_util import mean
+from tentacles.Evaluator.Util import CandlesUtil
+
+pytestmark = pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+
+CANDLES_COUNT = 500000
+# previous HeikinAshi implementation is quadratic: benchmark it on a smaller sample
+LEGACY_HEIKIN_ASHI_CANDLES_COUNT = 20000
+
+
+def _legacy_HL2(candles_high, candles_low):
+    return np.array(list(map((lambda high, low: mean([high, low])), candles_high, candles_low)))
+
+
+def _legacy_HLC3(candles_high, candles_low, candles_close):
+    return np.array(list(map((lambda high, low, close: mean([high, low, close])),
+                             candles_high, candles_low, candles_close)))
+
+
+def _legacy_OHLC4(candles_open, candles_high, candles_low, candles_close):
+    return np.array(list(map((lambda open_value, high, low, close: mean([open_value, high, low, close])),
+                             candles_open, candles_high, candles_low, candles_close)))
+
+
+def _legacy_HeikinAshi(candles_open, candles_high, candles_low, candles_close):
+    haOpen, haHigh, haLow, haClose = [np.array([]) for _ in range(4)]
+    for i, (open_value, high_value, low_value, close_value) \
+            in enumerate(zip(candles_open, candles_high, candles_low, candles_close)):
+        if i == 0:
+            haOpen = np.append(haOpen, open_value)
+            haHigh = np.append(haHigh, high_value)
+            haLow = np.append(haLow, low_value)
+            haClose = np.append(haClose, close_value)
+            continue
+        haOpen = np.append(haOpen, mean([candles_open[i - 1], candles_close[i - 1]]))
+        haHigh = np.append(haHigh, high_value)
+        haLow = np.append(haLow, low_value)
+        haClose = np.append(haClose, mean([open_value, high_value, low_value, close_value]))
+    return haOpen, haHigh, haLow, haClose
+
+
+def _get_candles(count):
+    random = np.random.default_rng(42)
+    candles_close = 100 + np.cumsum(random.normal(0, 1, count))
+    candles_open = np.roll(candles_close, 1)
+    candles_open[0] = candles_close[0]
+    candles_high = np.maximum(candles_open, candles_close) + random.random(count)
+    candles_low = np.minimum(candles_open, candles_close) - random.random(count)
+    return candles_open, candles_high, candles_low, candles_close
+
+
+def _timed(function, *args):
+    t0 = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - t0
+
+
+def _compare(name, legacy_function, function, candles, legacy_candles=None):
+    legacy_candles = candles if legacy_candles is None else legacy_candles
+    legacy_result, legacy_duration = _timed(legacy_function, *legacy_candles)
+    result, duration = _timed(function, *candles)
+    for legacy_values, values in zip(legacy_result if isinstance(legacy_result, tuple) else (legacy_result, ),
+                                     result if isinstance(result, tuple) else (result, )):
+        np.testing.assert_array_equal(values[:len(legacy_values)], legacy_values)
+    legacy_candles_count = len(legacy_candles[0])
+    candles_count = len(candles[0])
+    speedup = (legacy_duration / legacy_candles_count) / (duration / candles_count)
+    print(f"{name}: legacy: {legacy_duration:.3f}s for {legacy_candles_count} candles, "
+          f"vectorized: {duration:.3f}s for {candles_count} candles, per candle speedup: x{speedup:.0f}")
+    assert speedup > 1
+
+
+def test_price_transforms_benchmark():
+    candles_open, candles_high, candles_low, candles_close = _get_candles(CANDLES_COUNT)
+    _compare("HL2", _legacy_HL2, CandlesUtil.HL2, (candles_high, candles_low))
+    _compare("HLC3", _legacy_HLC3, CandlesUtil.HLC3, (candles_high, candles_low, candles_close))
+    _compare("OHLC4", _legacy_OHLC4, CandlesUtil.OHLC4, (candles_open, candles_high, candles_low, candles_close))
+
+
+def test_heikin_ashi_benchmark():
+    candles = _get_candles(CANDLES_COUNT)
+    _compare("HeikinAshi", _legacy_HeikinAshi, CandlesUtil.HeikinAshi, candles,
+             legacy_candles=tuple(values[:LEGACY_HEIKIN_ASHI_CANDLES_COUNT] for values in candles))
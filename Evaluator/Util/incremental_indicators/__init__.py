@@ -0,0 +1,2 @@
+from .incremental_indicators import IndicatorSeries, IncrementalIndicator, IncrementalRSI, IncrementalEMA, \
+    IncrementalMACD, IncrementalADX, IncrementalBBands, IncrementalIndicatorsManager
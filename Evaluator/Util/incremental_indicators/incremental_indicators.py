@@ -0,0 +1,414 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import math
+import numpy
+
+import octobot_commons.constants as commons_constants
+import octobot_commons.enums as commons_enums
+
+
+def _safe_div(numerator, denominator):
+    # tulipy (C) returns nan on 0/0
+    return numerator / denominator if denominator else math.nan
+
+
+class IndicatorSeries:
+    """
+    Append-only indicator values buffer: each column is a contiguous numpy array that can be
+    read as a view, appending is amortized O(1) and only the last max_size rows are kept
+    """
+
+    def __init__(self, width=1, max_size=None, initial_capacity=256):
+        self.width = width
+        self.max_size = max_size
+        self._buffer = numpy.empty((initial_capacity, width), dtype=numpy.float64, order="F")
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def clear(self):
+        self._start = self._end = 0
+
+    def append(self, values):
+        self._ensure_space()
+        self._buffer[self._end] = values
+        self._end += 1
+        if self.max_size is not None and self._end - self._start > self.max_size:
+            self._start = self._end - self.max_size
+
+    def get(self, size=None, pending_values=None) -> tuple:
+        """
+        :param size: maximum number of values to return (the most recent ones)
+        :param pending_values: uncommitted values to add at the end of the returned series
+        :return: a tuple of numpy arrays (one per indicator output)
+        """
+        end = self._end
+        if pending_values is not None:
+            self._ensure_space()
+            self._buffer[end] = pending_values
+            end += 1
+        start = self._start if size is None else max(self._start, end - size)
+        return tuple(self._buffer[start:end, column] for column in range(self.width))
+
+    def _ensure_space(self):
+        # always keep one spare row for pending values
+        capacity = len(self._buffer)
+        if self._end + 1 < capacity:
+            return
+        size = len(self)
+        if self._start > capacity // 2:
+            # enough trimmed rows: move values back to the beginning of the buffer
+            self._buffer[:size] = self._buffer[self._start:self._end]
+        else:
+            buffer = numpy.empty((capacity * 2, self.width), dtype=numpy.float64, order="F")
+            buffer[:size] = self._buffer[self._start:self._end]
+            self._buffer = buffer
+        self._start = 0
+        self._end = size
+
+
+class IncrementalIndicator:
+    """
+    Streaming version of a tulipy indicator: each update(*candle_values) call processes one candle
+    in O(1) and appends the indicator values to self.series when enough candles have been processed.
+    Once fed with the same candles, self.series equals the tulipy output.
+    """
+    WIDTH = 1
+
+    def __init__(self, max_size=None):
+        self.series = IndicatorSeries(self.WIDTH, max_size=max_size)
+        self.state = self._get_initial_state()
+
+    def get_lookback(self) -> int:
+        """
+        :return: the number of input candles that are not associated to an output value
+        (tulipy output size is input size - lookback)
+        """
+        raise NotImplementedError("get_lookback is not implemented")
+
+    def reset(self):
+        self.series.clear()
+        self.state = self._get_initial_state()
+
+    def update(self, *candle_values):
+        self.state, values = self._next(self.state, *candle_values)
+        self._on_update(*candle_values)
+        if values is not None:
+            self.series.append(values)
+        return values
+
+    def peek(self, *candle_values):
+        """
+        :return: the values the indicator would have with the given candle without updating it
+        (used for in construction candles)
+        """
+        return self._next(self.state, *candle_values)[1]
+
+    def _get_initial_state(self) -> tuple:
+        raise NotImplementedError("_get_initial_state is not implemented")
+
+    def _next(self, state, *candle_values) -> (tuple, tuple):
+        """
+        :return: the new state and the new indicator values (None when more candles are required)
+        """
+        raise NotImplementedError("_next is not implemented")
+
+    def _on_update(self, *candle_values):
+        pass
+
+
+class IncrementalRSI(IncrementalIndicator):
+    # Wilder's smoothing, same as tulipy.rsi
+    def __init__(self, period, max_size=None):
+        self.period = period
+        self.smoothing = 1 / period
+        super().__init__(max_size=max_size)
+
+    def get_lookback(self) -> int:
+        return self.period
+
+    def _get_initial_state(self) -> tuple:
+        # processed candles count, previous close, average gain, average loss
+        return 0, 0, 0, 0
+
+    def _next(self, state, close):
+        count, previous_close, smooth_up, smooth_down = state
+        if count == 0:
+            return (1, close, 0, 0), None
+        upward = close - previous_close if close > previous_close else 0
+        downward = previous_close - close if close < previous_close else 0
+        if count < self.period:
+            return (count + 1, close, smooth_up + upward, smooth_down + downward), None
+        if count == self.period:
+            smooth_up = (smooth_up + upward) / self.period
+            smooth_down = (smooth_down + downward) / self.period
+        else:
+            smooth_up = (upward - smooth_up) * self.smoothing + smooth_up
+            smooth_down = (downward - smooth_down) * self.smoothing + smooth_down
+        return (count + 1, close, smooth_up, smooth_down), \
+            (100 * _safe_div(smooth_up, smooth_up + smooth_down), )
+
+
+class IncrementalEMA(IncrementalIndicator):
+    # seeded with the first value, same as tulipy.ema
+    def __init__(self, period, max_size=None):
+        self.period = period
+        self.smoothing = 2 / (period + 1)
+        super().__init__(max_size=max_size)
+
+    def get_lookback(self) -> int:
+        return 0
+
+    def _get_initial_state(self) -> tuple:
+        # processed candles count, current average
+        return 0, 0
+
+    def _next(self, state, value):
+        count, average = state
+        average = value if count == 0 else (value - average) * self.smoothing + average
+        return (count + 1, average), (average, )
+
+
+class IncrementalMACD(IncrementalIndicator):
+    # outputs macd, signal and histogram, same as tulipy.macd
+    WIDTH = 3
+
+    def __init__(self, short_period, long_period, signal_period, max_size=None):
+        self.short_period = short_period
+        self.long_period = long_period
+        self.signal_period = signal_period
+        self.short_smoothing = 2 / (short_period + 1)
+        self.long_smoothing = 2 / (long_period + 1)
+        self.signal_smoothing = 2 / (signal_period + 1)
+        if short_period == 12 and long_period == 26:
+            # tulipy uses fixed smoothing values for the standard MACD periods
+            self.short_smoothing = 0.15
+            self.long_smoothing = 0.075
+        super().__init__(max_size=max_size)
+
+    def get_lookback(self) -> int:
+        return self.long_period - 1
+
+    def _get_initial_state(self) -> tuple:
+        # processed candles count, short ema, long ema, signal
+        return 0, 0, 0, 0
+
+    def _next(self, state, close):
+        count, short_ema, long_ema, signal = state
+        if count == 0:
+            short_ema = long_ema = close
+        else:
+            long_ema = (close - long_ema) * self.long_smoothing + long_ema
+            short_ema = (close - short_ema) * self.short_smoothing + short_ema
+        macd = short_ema - long_ema
+        if count < self.long_period - 1:
+            return (count + 1, short_ema, long_ema, signal), None
+        if count == self.long_period - 1:
+            signal = macd
+        signal = (macd - signal) * self.signal_smoothing + signal
+        return (count + 1, short_ema, long_ema, signal), (macd, signal, macd - signal)
+
+
+class IncrementalADX(IncrementalIndicator):
+    # same as tulipy.adx
+    def __init__(self, period, max_size=None):
+        self.period = period
+        self.smoothing = (period - 1) / period
+        super().__init__(max_size=max_size)
+
+    def get_lookback(self) -> int:
+        return (self.period - 1) * 2
+
+    def _get_initial_state(self) -> tuple:
+        # processed candles count, previous high, low and close, smoothed true range, smoothed +DM and -DM, adx sum
+        return 0, 0, 0, 0, 0, 0, 0, 0
+
+    def _next(self, state, high, low, close):
+        count, previous_high, previous_low, previous_close, atr, dm_up, dm_down, adx = state
+        if count == 0:
+            return (1, high, low, close, 0, 0, 0, 0), None
+        true_range = max(high - low, abs(high - previous_close), abs(low - previous_close))
+        direction_up = high - previous_high
+        direction_down = previous_low - low
+        if direction_up < 0:
+            direction_up = 0
+        elif direction_up > direction_down:
+            direction_down = 0
+        if direction_down < 0:
+            direction_down = 0
+        elif direction_down > direction_up:
+            direction_up = 0
+        if count < self.period:
+            atr += true_range
+            dm_up += direction_up
+            dm_down += direction_down
+            if count == self.period - 1:
+                # tulipy seeds adx with the dx of the initial sums
+                adx = self._get_dx(atr, dm_up, dm_down)
+            return (count + 1, high, low, close, atr, dm_up, dm_down, adx), None
+        atr = atr * self.smoothing + true_range
+        dm_up = dm_up * self.smoothing + direction_up
+        dm_down = dm_down * self.smoothing + direction_down
+        dx = self._get_dx(atr, dm_up, dm_down)
+        values = None
+        if count - self.period < self.period - 2:
+            adx += dx
+        else:
+            if count - self.period == self.period - 2:
+                adx += dx
+            else:
+                adx = adx * self.smoothing + dx
+            values = (adx / self.period, )
+        return (count + 1, high, low, close, atr, dm_up, dm_down, adx), values
+
+    @staticmethod
+    def _get_dx(atr, dm_up, dm_down):
+        di_up = _safe_div(dm_up, atr)
+        di_down = _safe_div(dm_down, atr)
+        return _safe_div(abs(di_up - di_down), di_up + di_down) * 100
+
+
+class IncrementalBBands(IncrementalIndicator):
+    # outputs lower, middle and upper bands, same as tulipy.bbands
+    WIDTH = 3
+    # running sums are recomputed from the window every RESYNC_INTERVAL candles to avoid floating point drift
+    RESYNC_INTERVAL = 1000
+
+    def __init__(self, period, stddev, max_size=None):
+        self.period = period
+        self.stddev = stddev
+        self._window = numpy.zeros(period, dtype=numpy.float64)
+        super().__init__(max_size=max_size)
+
+    def get_lookback(self) -> int:
+        return self.period - 1
+
+    def reset(self):
+        super().reset()
+        self._window[:] = 0
+
+    def _get_initial_state(self) -> tuple:
+        # processed candles count, window sum, window sum of squares
+        return 0, 0, 0
+
+    def _next(self, state, close):
+        count, total, squares_total = state
+        total += close
+        squares_total += close * close
+        if count >= self.period:
+            # value leaving the window
+            removed = self._window[count % self.period]
+            total -= removed
+            squares_total -= removed * removed
+        if count < self.period - 1:
+            return (count + 1, total, squares_total), None
+        middle = total / self.period
+        deviation = math.sqrt(max(squares_total / self.period - middle * middle, 0)) * self.stddev
+        return (count + 1, total, squares_total), (middle - deviation, middle, middle + deviation)
+
+    def _on_update(self, close):
+        count = self.state[0]
+        self._window[(count - 1) % self.period] = close
+        if count >= self.period and count % self.RESYNC_INTERVAL == 0:
+            self.state = (count, float(self._window.sum()), float(numpy.dot(self._window, self._window)))
+
+
+class _IndicatorState:
+    def __init__(self, indicator):
+        self.indicator = indicator
+        self.last_time = None
+        self.last_candle_values = None
+
+
+class IncrementalIndicatorsManager:
+    """
+    Keeps one IncrementalIndicator per (exchange, symbol, time frame) key and synchronizes it with the
+    given candles: new closed candles are processed in O(1) each, the indicator is fully recomputed only
+    when candles are missing (gap) or when the candles history has been reloaded.
+    Returned values are the same as the tulipy indicator applied to the given candles, except right after
+    a candles history shift where values from the first candles can differ since the indicator is seeded
+    from older candles.
+    """
+
+    def __init__(self, indicator_factory):
+        self.indicator_factory = indicator_factory
+        self.incremental_updates = 0
+        self.full_recomputes = 0
+        self._states = {}
+
+    def get_values(self, key, time_frame, time_candles, *input_candles, include_in_construction=False) -> tuple:
+        """
+        :param key: the (exchange, symbol, time frame) identifier of the given candles
+        :param time_frame: time frame of the given candles
+        :param time_candles: candles times (seconds) array
+        :param input_candles: indicator inputs arrays (ex: close candles), aligned with time_candles
+        :param include_in_construction: True when the last candle is not closed yet
+        :return: a tuple of numpy arrays (one per indicator output)
+        """
+        candles_count = len(time_candles)
+        closed_count = candles_count - 1 if include_in_construction else candles_count
+        try:
+            state = self._states[key]
+        except KeyError:
+            state = self._states[key] = _IndicatorState(self.indicator_factory())
+        indicator = state.indicator
+        output_size = max(candles_count - indicator.get_lookback(), 0)
+        # keep enough values to answer with the full series, before processing new candles not to trim them
+        indicator.series.max_size = max(output_size, indicator.series.max_size or 0)
+        if not self._process_new_candles(state, time_frame, time_candles, input_candles, closed_count):
+            self.full_recomputes += 1
+            indicator.reset()
+            state.last_time = state.last_candle_values = None
+            for index in range(closed_count):
+                indicator.update(*(candles[index] for candles in input_candles))
+        if closed_count > 0:
+            state.last_time = time_candles[closed_count - 1]
+            state.last_candle_values = tuple(candles[closed_count - 1] for candles in input_candles)
+        pending_values = indicator.peek(*(candles[-1] for candles in input_candles)) \
+            if include_in_construction and candles_count else None
+        return indicator.series.get(output_size, pending_values)
+
+    def clear(self, key=None):
+        if key is None:
+            self._states.clear()
+        else:
+            self._states.pop(key, None)
+
+    def _process_new_candles(self, state, time_frame, time_candles, input_candles, closed_count) -> bool:
+        """
+        :return: False when the indicator state can't be updated from the given candles
+        """
+        if state.last_time is None or closed_count == 0:
+            return False
+        last_index = closed_count - 1
+        anchor_index = int(numpy.searchsorted(time_candles[:closed_count], state.last_time))
+        if anchor_index > last_index or time_candles[anchor_index] != state.last_time:
+            # last processed candle is not in history anymore
+            return False
+        if tuple(candles[anchor_index] for candles in input_candles) != state.last_candle_values:
+            # history has been reloaded with different values
+            return False
+        time_frame_seconds = commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(time_frame)] * \
+            commons_constants.MINUTE_TO_SECONDS
+        if time_candles[last_index] - state.last_time != (last_index - anchor_index) * time_frame_seconds:
+            # missing candles
+            return False
+        for index in range(anchor_index + 1, closed_count):
+            self.incremental_updates += 1
+            state.indicator.update(*(candles[index] for candles in input_candles))
+        return True
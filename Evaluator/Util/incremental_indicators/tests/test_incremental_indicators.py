@@ -0,0 +1,170 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import numpy as np
+import pytest
+import tulipy
+
+from tentacles.Evaluator.Util import IncrementalIndicatorsManager, IncrementalRSI, IncrementalEMA, \
+    IncrementalMACD, IncrementalADX, IncrementalBBands
+
+HOUR = 3600
+
+
+def _get_candles(count, seed=42):
+    random = np.random.default_rng(seed)
+    close = 100 + np.cumsum(random.normal(0, 1, count))
+    high = close + random.random(count)
+    low = close - random.random(count)
+    times = np.arange(count, dtype=np.float64) * HOUR
+    return times, high, low, close
+
+
+def _feed(indicator, *inputs):
+    for values in zip(*inputs):
+        indicator.update(*values)
+    return indicator.series.get()
+
+
+def test_rsi():
+    _, _, _, close = _get_candles(1000)
+    for period in (2, 14, 30):
+        rsi, = _feed(IncrementalRSI(period), close)
+        np.testing.assert_allclose(rsi, tulipy.rsi(close, period))
+
+
+def test_ema():
+    _, _, _, close = _get_candles(1000)
+    for period in (2, 20, 50):
+        ema, = _feed(IncrementalEMA(period), close)
+        np.testing.assert_allclose(ema, tulipy.ema(close, period))
+
+
+def test_macd():
+    _, _, _, close = _get_candles(1000)
+    for periods in ((12, 26, 9), (5, 10, 3)):
+        for values, expected_values in zip(_feed(IncrementalMACD(*periods), close), tulipy.macd(close, *periods)):
+            np.testing.assert_allclose(values, expected_values)
+
+
+def test_adx():
+    _, high, low, close = _get_candles(1000)
+    for period in (5, 14):
+        adx, = _feed(IncrementalADX(period), high, low, close)
+        np.testing.assert_allclose(adx, tulipy.adx(high, low, close, period))
+
+
+def test_bbands():
+    _, _, _, close = _get_candles(1000)
+    for values, expected_values in zip(_feed(IncrementalBBands(20, 2), close), tulipy.bbands(close, 20, 2)):
+        np.testing.assert_allclose(values, expected_values)
+
+
+def test_bbands_resync():
+    _, _, _, close = _get_candles(IncrementalBBands.RESYNC_INTERVAL * 5)
+    # large values to make running sums floating point errors significant
+    close = close + 1e6
+    indicator = IncrementalBBands(20, 2)
+    _feed(indicator, close)
+    # running sums have just been recomputed from the window
+    assert indicator.state[1] == pytest.approx(close[-20:].sum(), rel=1e-12)
+    assert indicator.state[2] == pytest.approx(np.dot(close[-20:], close[-20:]), rel=1e-12)
+    for values, expected_values in zip(indicator.series.get(), tulipy.bbands(close, 20, 2)):
+        np.testing.assert_allclose(values, expected_values)
+
+
+def test_peek():
+    _, _, _, close = _get_candles(100)
+    indicator = IncrementalRSI(14)
+    _feed(indicator, close[:-1])
+    pending_value = indicator.peek(close[-1])
+    assert len(indicator.series) == 100 - 1 - 14
+    assert pending_value[0] == pytest.approx(tulipy.rsi(close, 14)[-1])
+    assert indicator.update(close[-1]) == pending_value
+
+
+def test_manager_incremental_updates():
+    times, _, _, close = _get_candles(500)
+    manager = IncrementalIndicatorsManager(lambda: IncrementalRSI(14))
+    key = ("binance", "BTC/USDT", "1h")
+    for end in range(100, len(times) + 1):
+        rsi, = manager.get_values(key, "1h", times[:end], close[:end])
+        np.testing.assert_allclose(rsi, tulipy.rsi(close[:end], 14))
+    assert manager.full_recomputes == 1
+    assert manager.incremental_updates == 400
+
+    # same candles: nothing to update
+    rsi, = manager.get_values(key, "1h", times, close)
+    np.testing.assert_allclose(rsi, tulipy.rsi(close, 14))
+    assert manager.full_recomputes == 1
+    assert manager.incremental_updates == 400
+
+
+def test_manager_in_construction_candle():
+    times, _, _, close = _get_candles(200)
+    manager = IncrementalIndicatorsManager(lambda: IncrementalMACD(12, 26, 9))
+    key = ("binance", "BTC/USDT", "1h")
+    in_construction_close = close.copy()
+    for in_construction_value in (close[-1] * 0.9, close[-1] * 1.1, close[-1]):
+        in_construction_close[-1] = in_construction_value
+        for values, expected_values in zip(
+                manager.get_values(key, "1h", times, in_construction_close, include_in_construction=True),
+                tulipy.macd(in_construction_close, 12, 26, 9)):
+            np.testing.assert_allclose(values, expected_values)
+    assert manager.full_recomputes == 1
+    # in construction candle is not processed
+    assert manager.incremental_updates == 0
+    manager.get_values(key, "1h", times, close)
+    assert manager.full_recomputes == 1
+    assert manager.incremental_updates == 1
+
+
+def test_manager_gap_and_reload():
+    times, high, low, close = _get_candles(300)
+    manager = IncrementalIndicatorsManager(lambda: IncrementalADX(14))
+    key = ("binance", "BTC/USDT", "1h")
+    manager.get_values(key, "1h", times[:200], high[:200], low[:200], close[:200])
+    assert manager.full_recomputes == 1
+
+    # missing candle
+    gap_times = np.concatenate((times[:200], times[201:250]))
+    gap_high, gap_low, gap_close = (np.concatenate((values[:200], values[201:250])) for values in (high, low, close))
+    adx, = manager.get_values(key, "1h", gap_times, gap_high, gap_low, gap_close)
+    np.testing.assert_allclose(adx, tulipy.adx(gap_high, gap_low, gap_close, 14))
+    assert manager.full_recomputes == 2
+
+    # reloaded history
+    _, other_high, other_low, other_close = _get_candles(300, seed=1)
+    adx, = manager.get_values(key, "1h", times, other_high, other_low, other_close)
+    np.testing.assert_allclose(adx, tulipy.adx(other_high, other_low, other_close, 14))
+    assert manager.full_recomputes == 3
+    assert manager.incremental_updates == 0
+
+    # other key
+    manager.get_values(("binance", "ETH/USDT", "1h"), "1h", times, high, low, close)
+    assert manager.full_recomputes == 4
+
+
+def test_manager_sliding_history():
+    times, _, _, close = _get_candles(2000)
+    window = 500
+    manager = IncrementalIndicatorsManager(lambda: IncrementalEMA(20))
+    key = ("binance", "BTC/USDT", "1h")
+    for start in range(0, 1500):
+        ema, = manager.get_values(key, "1h", times[start:start + window], close[start:start + window])
+        assert len(ema) == window
+    # values are computed from the whole history, those converge with values computed on the window
+    np.testing.assert_allclose(ema[-100:], tulipy.ema(close[1499:1999], 20)[-100:])
+    assert manager.full_recomputes == 1
@@ -0,0 +1,68 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import os
+import time
+import numpy as np
+import pytest
+import tulipy
+
+from tentacles.Evaluator.Util import IncrementalIndicatorsManager, IncrementalRSI, IncrementalMACD
+
+pytestmark = pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+
+HOUR = 3600
+HISTORY_SIZE = 100000
+NEW_CANDLES = 1000
+
+
+def _get_candles(count):
+    random = np.random.default_rng(42)
+    return np.arange(count, dtype=np.float64) * HOUR, 100 + np.cumsum(random.normal(0, 1, count))
+
+
+def _benchmark(indicator_factory, full_recompute):
+    times, close = _get_candles(HISTORY_SIZE)
+    manager = IncrementalIndicatorsManager(indicator_factory)
+    key = ("binance", "BTC/USDT", "1h")
+    history_start = HISTORY_SIZE - NEW_CANDLES
+    manager.get_values(key, "1h", times[:history_start], close[:history_start])
+
+    t0 = time.perf_counter()
+    for end in range(history_start + 1, HISTORY_SIZE + 1):
+        full_recompute(close[:end])
+    full_recompute_duration = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for end in range(history_start + 1, HISTORY_SIZE + 1):
+        incremental_values = manager.get_values(key, "1h", times[:end], close[:end])
+    incremental_duration = time.perf_counter() - t0
+
+    assert manager.full_recomputes == 1
+    assert manager.incremental_updates == NEW_CANDLES
+    for values, expected_values in zip(incremental_values, full_recompute(close)):
+        np.testing.assert_allclose(values, expected_values)
+    print(f"{HISTORY_SIZE} candles history, {NEW_CANDLES} new candles: full recompute: "
+          f"{full_recompute_duration / NEW_CANDLES * 1000000:.1f}µs/candle, incremental: "
+          f"{incremental_duration / NEW_CANDLES * 1000000:.1f}µs/candle")
+    assert incremental_duration < full_recompute_duration
+
+
+def test_rsi_benchmark():
+    _benchmark(lambda: IncrementalRSI(14), lambda close: (tulipy.rsi(close, 14), ))
+
+
+def test_macd_benchmark():
+    _benchmark(lambda: IncrementalMACD(12, 26, 9), lambda close: tulipy.macd(close, 12, 26, 9))
@@ -0,0 +1 @@
+from .indicators_cache import IndicatorsCache
@@ -0,0 +1,114 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import collections
+import numpy
+
+import octobot_commons.singleton as singleton
+
+
+class IndicatorsCache(singleton.Singleton):
+    """
+    Process-wide cache of indicator values computed on candles: evaluators computing the same indicator
+    with the same parameters on the same candles share the result.
+    Entries are identified by (exchange, symbol, time frame, candle time, indicator, params, input size and
+    last input value) and dropped when a new candle is received for their exchange, symbol and time frame.
+    Memory is bounded by an LRU eviction.
+    Cached numpy arrays are read-only as they are shared between evaluators.
+    """
+    DEFAULT_MAX_SIZE = 2048
+    # keep previous candle values to handle evaluators working with in construction candles
+    KEPT_CANDLE_TIMES = 2
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._values = collections.OrderedDict()
+        # (exchange, symbol, time frame) => {candle time: set of keys}
+        self._keys_by_candle_time = {}
+
+    def get_or_compute(self, exchange, symbol, time_frame, candle_time, indicator, params, data, compute):
+        """
+        :param exchange: exchange of the candles
+        :param symbol: symbol of the candles
+        :param time_frame: time frame of the candles
+        :param candle_time: time of the last candle
+        :param indicator: indicator identifier
+        :param params: hashable indicator parameters including the candles source (ex: ("close", 14))
+        :param data: indicator input, its size and last value are part of the entry identifier
+        :param compute: callable returning the indicator value, only called on cache miss
+        :return: the cached or computed indicator value
+        """
+        candles_key = (exchange, symbol, time_frame)
+        key = (candles_key, candle_time, indicator, params, len(data), float(data[-1]) if len(data) else None)
+        try:
+            value = self._values[key]
+            self._values.move_to_end(key)
+            self.hits += 1
+            return value
+        except KeyError:
+            self.misses += 1
+        value = _as_read_only(compute())
+        self._invalidate_older_candles(candles_key, candle_time)
+        self._values[key] = value
+        self._keys_by_candle_time[candles_key].setdefault(candle_time, set()).add(key)
+        while len(self._values) > self.max_size:
+            self._remove(next(iter(self._values)))
+        return value
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0,
+            "size": len(self._values),
+        }
+
+    def reset_stats(self):
+        self.hits = self.misses = 0
+
+    def clear(self):
+        self._values.clear()
+        self._keys_by_candle_time.clear()
+        self.reset_stats()
+
+    def _invalidate_older_candles(self, candles_key, candle_time):
+        keys_by_candle_time = self._keys_by_candle_time.setdefault(candles_key, {})
+        if candle_time in keys_by_candle_time or not keys_by_candle_time or candle_time < max(keys_by_candle_time):
+            return
+        # new candle: only keep the most recent candles values
+        for outdated_time in sorted(keys_by_candle_time)[:-(self.KEPT_CANDLE_TIMES - 1) or None]:
+            for key in keys_by_candle_time.pop(outdated_time):
+                self._values.pop(key, None)
+
+    def _remove(self, key):
+        self._values.pop(key)
+        candles_key, candle_time = key[0], key[1]
+        keys_by_candle_time = self._keys_by_candle_time[candles_key]
+        keys = keys_by_candle_time[candle_time]
+        keys.discard(key)
+        if not keys:
+            keys_by_candle_time.pop(candle_time)
+
+
+def _as_read_only(value):
+    if isinstance(value, numpy.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for element in value:
+            _as_read_only(element)
+    return value
@@ -0,0 +1,109 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import numpy as np
+import pytest
+
+from tentacles.Evaluator.Util import IndicatorsCache
+
+HOUR = 3600
+
+
+@pytest.fixture
+def cache():
+    return IndicatorsCache(max_size=10)
+
+
+def _compute_counter(value):
+    calls = []
+
+    def _compute():
+        calls.append(1)
+        return value.copy()
+    return _compute, calls
+
+
+def test_get_or_compute(cache):
+    data = np.array([1, 2, 3], dtype=np.float64)
+    compute, calls = _compute_counter(data * 2)
+    for _ in range(3):
+        np.testing.assert_array_equal(
+            cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 14), data, compute),
+            data * 2
+        )
+    assert len(calls) == 1
+    assert cache.get_stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "size": 1}
+
+    # different indicator params, candles size or last candle value
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 7), data, compute)
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("open", 14), data, compute)
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 14), data[1:], compute)
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 14), np.array([1, 2, 4]), compute)
+    cache.get_or_compute("binance", "ETH/USDT", "1h", HOUR, "rsi", ("close", 14), data, compute)
+    assert len(calls) == 6
+    assert cache.get_stats()["size"] == 6
+
+    cache.reset_stats()
+    assert cache.get_stats() == {"hits": 0, "misses": 0, "hit_rate": 0, "size": 6}
+    cache.clear()
+    assert cache.get_stats()["size"] == 0
+
+
+def test_read_only_values(cache):
+    data = np.array([1, 2, 3], dtype=np.float64)
+    value = cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 14), data, lambda: data * 2)
+    with pytest.raises(ValueError):
+        value[0] = 1
+    lower, middle, upper = cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "bbands", ("close", 20, 2),
+                                                data, lambda: (data - 1, data, data + 1))
+    with pytest.raises(ValueError):
+        upper[0] = 1
+
+
+def test_invalidate_on_new_candle(cache):
+    data = np.array([1, 2, 3], dtype=np.float64)
+    compute, calls = _compute_counter(data)
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 14), data, compute)
+    cache.get_or_compute("binance", "ETH/USDT", "1h", HOUR, "rsi", ("close", 14), data, compute)
+    # previous candle values are kept for evaluators working with in construction candles
+    cache.get_or_compute("binance", "BTC/USDT", "1h", 2 * HOUR, "rsi", ("close", 14), data, compute)
+    assert cache.get_stats()["size"] == 3
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 14), data, compute)
+    assert len(calls) == 3
+
+    cache.get_or_compute("binance", "BTC/USDT", "1h", 3 * HOUR, "rsi", ("close", 14), data, compute)
+    # BTC/USDT 1h values at HOUR are removed, ETH/USDT values are kept
+    assert cache.get_stats()["size"] == 3
+    cache.get_or_compute("binance", "ETH/USDT", "1h", HOUR, "rsi", ("close", 14), data, compute)
+    cache.get_or_compute("binance", "BTC/USDT", "1h", 2 * HOUR, "rsi", ("close", 14), data, compute)
+    assert len(calls) == 4
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 14), data, compute)
+    assert len(calls) == 5
+
+
+def test_lru_eviction(cache):
+    data = np.array([1, 2, 3], dtype=np.float64)
+    compute, calls = _compute_counter(data)
+    for period in range(10):
+        cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", period), data, compute)
+    # use period 0 value: period 1 becomes the least recently used value
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 0), data, compute)
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 10), data, compute)
+    assert cache.get_stats()["size"] == 10
+    assert len(calls) == 11
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 0), data, compute)
+    assert len(calls) == 11
+    cache.get_or_compute("binance", "BTC/USDT", "1h", HOUR, "rsi", ("close", 1), data, compute)
+    assert len(calls) == 12
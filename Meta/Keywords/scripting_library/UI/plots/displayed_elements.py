@@ -13,6 +13,8 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import functools
+import math
 
 import octobot_trading.enums as trading_enums
 import octobot_trading.constants as trading_constants
@@ -37,9 +39,22 @@ class DisplayedElements(display.DisplayTranslator):
         commons_enums.PlotAttributes.VOLUME.value: "Volume",
         commons_enums.DBRows.SYMBOL.value: "Symbol",
     }
+    # tables describing displayed elements, always read entirely
+    DESCRIPTION_TABLES = {
+        commons_enums.DBTables.INPUTS.value,
+        commons_enums.DBTables.CANDLES_SOURCE.value,
+        commons_enums.DBTables.CACHE_SOURCE.value,
+    }
 
     async def fill_from_database(self, trading_mode, database_manager, exchange_name, symbol, time_frame, exchange_id,
-                                 with_inputs=True, symbols=None, time_frames=None):
+                                 with_inputs=True, symbols=None, time_frames=None,
+                                 start_time=None, end_time=None, series=None, max_points=None):
+        """
+        :param start_time: when set, only display elements from this time (in milliseconds)
+        :param end_time: when set, only display elements until this time (in milliseconds)
+        :param series: when set, only display these plotted series (candles are always displayed)
+        :param max_points: when set, downsample each chart dataset to about this number of points
+        """
         async with databases.MetaDatabase.database(database_manager) as meta_db:
             graphs_by_parts = {}
             inputs = []
@@ -69,7 +84,10 @@ class DisplayedElements(display.DisplayTranslator):
             ]
             for index, db in enumerate(dbs):
                 for table_name in await db.tables():
-                    display_data = await db.all(table_name)
+                    if series is not None and table_name not in series \
+                            and table_name not in self.DESCRIPTION_TABLES:
+                        continue
+                    display_data = await self._get_table_rows(db, table_name, start_time, end_time)
                     if table_name == commons_enums.DBTables.INPUTS.value:
                         inputs += display_data
                     if table_name == commons_enums.DBTables.CANDLES_SOURCE.value:
@@ -96,12 +114,20 @@ class DisplayedElements(display.DisplayTranslator):
                 run_start_time, run_end_time = await self._get_run_window(meta_db.get_run_db())
             except IndexError:
                 run_start_time = run_end_time = 0
+            run_start_time, run_end_time = self._restrict_run_window(run_start_time, run_end_time,
+                                                                     start_time, end_time)
             first_candle_time, last_candle_time = \
                 await self._add_candles(graphs_by_parts, candles, exchange_name, exchange_id, symbol, time_frame,
                                         run_start_time, run_end_time)
+            if series is not None:
+                cached_values = [
+                    cached_value
+                    for cached_value in cached_values
+                    if cached_value.get(commons_enums.PlotAttributes.TITLE.value) in series
+                ]
             await self._add_cached_values(graphs_by_parts, cached_values, time_frame,
                                           first_candle_time, last_candle_time)
-            self._plot_graphs(graphs_by_parts)
+            self._plot_graphs(graphs_by_parts, start_time, end_time, max_points)
             if with_inputs:
                 with self.part(commons_enums.DBTables.INPUTS.value,
                                element_type=commons_enums.DisplayedElementTypes.INPUT.value) as part:
@@ -135,10 +161,11 @@ class DisplayedElements(display.DisplayTranslator):
                 pass
         return exchange_name, symbol, time_frame
 
-    def _plot_graphs(self, graphs_by_parts):
+    def _plot_graphs(self, graphs_by_parts, start_time=None, end_time=None, max_points=None):
         for part, datasets in graphs_by_parts.items():
             with self.part(part, element_type=commons_enums.DisplayedElementTypes.CHART.value) as part:
                 for title, dataset in datasets.items():
+                    dataset = self._downsample(self._filter_window(dataset, start_time, end_time), max_points)
                     if not dataset:
                         continue
                     x = []
@@ -276,6 +303,63 @@ class DisplayedElements(display.DisplayTranslator):
         ]
         return self._adapt_for_display(table_name, filtered_elements)
 
+    async def _get_table_rows(self, database, table_name, start_time, end_time):
+        if (start_time is None and end_time is None) or table_name in self.DESCRIPTION_TABLES:
+            return await database.all(table_name)
+        # only read rows of the window, rows without x (ex: orders) are filtered once adapted for display.
+        # Use a plain function as query: much faster than a tinydb Query on large tables
+        return await database.select(table_name, functools.partial(
+            _is_row_in_window, commons_enums.PlotAttributes.X.value,
+            -math.inf if start_time is None else start_time, math.inf if end_time is None else end_time
+        ))
+
+    @staticmethod
+    def _filter_window(dataset, start_time, end_time):
+        if start_time is None and end_time is None:
+            return dataset
+        return [
+            element
+            for element in dataset
+            if _is_in_window(element.get(commons_enums.PlotAttributes.X.value), start_time, end_time)
+        ]
+
+    @staticmethod
+    def _downsample(dataset, max_points):
+        """
+        Min / max bucketing: keeps the lowest and highest y element of each bucket, candles of a bucket are merged
+        into one candle
+        """
+        if max_points is None or len(dataset) <= max_points:
+            return dataset
+        bucket_size = math.ceil(len(dataset) / max(1, max_points // 2))
+        downsampled = []
+        for bucket_start in range(0, len(dataset), bucket_size):
+            bucket = dataset[bucket_start:bucket_start + bucket_size]
+            first_element = bucket[0]
+            if first_element.get(commons_enums.PlotAttributes.CLOSE.value) is not None:
+                downsampled.append(_merge_candles(bucket))
+                continue
+            try:
+                y_key = commons_enums.PlotAttributes.Y.value
+                indexes = sorted({
+                    min(range(len(bucket)), key=lambda index: bucket[index][y_key]),
+                    max(range(len(bucket)), key=lambda index: bucket[index][y_key]),
+                })
+            except (KeyError, TypeError):
+                # no comparable y values
+                indexes = sorted({0, len(bucket) - 1})
+            downsampled.extend(bucket[index] for index in indexes)
+        return downsampled
+
+    @staticmethod
+    def _restrict_run_window(run_start_time, run_end_time, start_time, end_time):
+        # run window is in seconds, 0, 0 when not restricted
+        if start_time is not None:
+            run_start_time = max(run_start_time, start_time / 1000)
+        if end_time is not None:
+            run_end_time = end_time / 1000 if run_end_time == 0 else min(run_end_time, end_time / 1000)
+        return run_start_time, run_end_time
+
     async def _get_run_window(self, run_database):
         run_metadata = (await run_database.all(commons_enums.DBTables.METADATA.value))[0]
         end_time = run_metadata.get("end_time", 0)
@@ -527,3 +611,31 @@ class DisplayedElements(display.DisplayTranslator):
             type=commons_enums.DisplayedElementTypes.VALUE.value
         )
         self.elements.append(element)
+
+
+def _is_row_in_window(x_key, start_time, end_time, row):
+    try:
+        x = row[x_key]
+        return x is not None and start_time <= x <= end_time
+    except KeyError:
+        return True
+
+
+def _is_in_window(x, start_time, end_time):
+    return x is not None and (start_time is None or x >= start_time) and (end_time is None or x <= end_time)
+
+
+def _merge_candles(candles):
+    merged = dict(candles[0])
+    merged[commons_enums.PlotAttributes.HIGH.value] = max(
+        candle[commons_enums.PlotAttributes.HIGH.value] for candle in candles
+    )
+    merged[commons_enums.PlotAttributes.LOW.value] = min(
+        candle[commons_enums.PlotAttributes.LOW.value] for candle in candles
+    )
+    merged[commons_enums.PlotAttributes.CLOSE.value] = candles[-1][commons_enums.PlotAttributes.CLOSE.value]
+    if merged.get(commons_enums.PlotAttributes.VOLUME.value) is not None:
+        merged[commons_enums.PlotAttributes.VOLUME.value] = sum(
+            candle[commons_enums.PlotAttributes.VOLUME.value] for candle in candles
+        )
+    return merged
@@ -14,7 +14,7 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import json
-import sortedcontainers
+import numpy
 
 import octobot_trading.enums as trading_enums
 import octobot_trading.constants as trading_constants
@@ -241,12 +241,6 @@ async def plot_historical_portfolio_value(
 ):
     price_data, trades_data, moving_portfolio_data, trading_type, metadata, _ = \
         historical_values or await load_historical_values(meta_database, exchange)
-    price_data_by_time = {}
-    for symbol, candles in price_data.items():
-        price_data_by_time[symbol] = {
-            candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]: candle
-            for candle in candles
-        }
     if trading_type == "future":
         # TODO: historical unrealized pnl
         pass
@@ -254,106 +248,187 @@ async def plot_historical_portfolio_value(
         trades_data[pair] = sorted(trades_data[pair], key=lambda tr: tr[commons_enums.PlotAttributes.X.value])
     funding_fees_history_by_pair = await _get_grouped_funding_fees(meta_database,
                                                                    commons_enums.DBRows.SYMBOL.value)
-    value_data = sortedcontainers.SortedDict()
-    pairs = list(trades_data)
-    if pairs:
-        pair = pairs[0]
-        candles = price_data_by_time[pair]
-        value_data = sortedcontainers.SortedDict({
-            t: 0
-            for t in candles
-        })
-        trade_index_by_pair = {p: 0 for p in pairs}
-        funding_fees_index_by_pair = {p: 0 for p in pairs}
-        # TODO multi exchanges
-        exchange_name = metadata[commons_enums.DBRows.EXCHANGES.value][0]
-        # TODO hedge mode with multi position by pair
-        # if metadata[commons_enums.DBRows.FUTURE_CONTRACTS.value] and \
-        #         exchange_name in metadata[commons_enums.DBRows.FUTURE_CONTRACTS.value]:
-        #     positions_by_pair = {
-        #         pair: _position_factory(pair,
-        #                                 metadata[commons_enums.DBRows.FUTURE_CONTRACTS.value][exchange_name][pair])
-        #         for pair in pairs
-        #     }
-        # else:
-        #     positions_by_pair = {}
-        # TODO update position instead of portfolio when filled orders and apply position unrealized pnl to portfolio
-        for candle_time, ref_candle in candles.items():
-            current_candles = {}
-            for pair in pairs:
-                if candle_time not in price_data_by_time[pair]:
-                    # no price data for this time in this pair
-                    continue
-                other_candle = price_data_by_time[pair][candle_time]
-                current_candles[pair] = other_candle
-                symbol, ref_market = symbol_util.parse_symbol(pair).base_and_quote()
-                moving_portfolio_data[ref_market] = moving_portfolio_data.get(ref_market, 0)
-                moving_portfolio_data[symbol] = moving_portfolio_data.get(symbol, 0)
-                # part 1: compute portfolio total value after trade update when any
-                # 1.1: trades
-                # start iteration where it last stopped to reduce complexity
-                for trade_index, trade in enumerate(trades_data[pair][trade_index_by_pair[pair]:]):
-                    # handle trades that are both older and at the current candle starting from the last trade index
-                    # (older trades to handle the ones that might be from candles we dont have data on)
-                    if trade[commons_enums.PlotAttributes.X.value] <= candle_time:
-                        if trade[commons_enums.PlotAttributes.SIDE.value] == trading_enums.TradeOrderSide.SELL.value:
-                            moving_portfolio_data[symbol] -= trade[commons_enums.PlotAttributes.VOLUME.value]
-                            moving_portfolio_data[ref_market] += trade[commons_enums.PlotAttributes.VOLUME.value] * \
-                                                                 trade[commons_enums.PlotAttributes.Y.value]
-                        else:
-                            moving_portfolio_data[symbol] += trade[commons_enums.PlotAttributes.VOLUME.value]
-                            moving_portfolio_data[ref_market] -= trade[commons_enums.PlotAttributes.VOLUME.value] * \
-                                                                 trade[commons_enums.PlotAttributes.Y.value]
-                        moving_portfolio_data[trade[commons_enums.DBRows.FEES_CURRENCY.value]] -= \
-                            trade[commons_enums.DBRows.FEES_AMOUNT.value]
-
-                        # last trade case: as there is not trade afterwards, the next condition would never be filled,
-                        # force trade_index_by_pair[pair] increment
-                        if all(it_trade[commons_enums.PlotAttributes.X.value] ==
-                               trade[commons_enums.PlotAttributes.X.value]
-                               for it_trade in trades_data[pair][trade_index_by_pair[pair]:]):
-                            trade_index_by_pair[pair] += 1
-                            break
-
-                    if trade[commons_enums.PlotAttributes.X.value] > \
-                            ref_candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]:
-                        # no need to continue iterating, save current index for new candle
-                        trade_index_by_pair[pair] += trade_index
-                        break
-                # 1.2: funding fees
-                # start iteration where it last stopped to reduce complexity
-                for funding_fee_index, funding_fee \
-                        in enumerate(funding_fees_history_by_pair.get(pair, [])[funding_fees_index_by_pair[pair]:]):
-                    if funding_fee[commons_enums.PlotAttributes.X.value] == candle_time:
-                        moving_portfolio_data[funding_fee[trading_enums.FeePropertyColumns.CURRENCY.value]] -= \
-                            funding_fee["quantity"]
-                    if funding_fee[commons_enums.PlotAttributes.X.value] > candle_time:
-                        # no need to continue iterating, save current index for new candle
-                        funding_fees_index_by_pair[pair] = funding_fee_index  # TODO
-                        break
-            # part 2: now that portfolio is up-to-date, compute portfolio total value
-            handled_currencies = []
-            for pair, other_candle in current_candles.items():
-                symbol, ref_market = symbol_util.parse_symbol(pair).base_and_quote()
-                if symbol not in handled_currencies:
-                    value_data[candle_time] = \
-                        value_data[candle_time] + \
-                        moving_portfolio_data[symbol] * other_candle[
-                            commons_enums.PriceIndexes.IND_PRICE_OPEN.value
-                        ]
-                    handled_currencies.append(symbol)
-                if ref_market not in handled_currencies:
-                    value_data[candle_time] = value_data[candle_time] + moving_portfolio_data[ref_market]
-                    handled_currencies.append(ref_market)
+    # TODO multi exchanges
+    # TODO hedge mode with multi position by pair
+    # TODO update position instead of portfolio when filled orders and apply position unrealized pnl to portfolio
+    times, values = _get_historical_portfolio_values(
+        price_data, trades_data, moving_portfolio_data, funding_fees_history_by_pair
+    )
     plotted_element.plot(
         mode="scatter",
-        x=list(value_data.keys()),
-        y=list(value_data.values()),
+        x=times,
+        y=values,
         title="Portfolio value",
         own_yaxis=own_yaxis
     )
 
 
+def _get_historical_portfolio_values(price_data, trades_data, moving_portfolio_data, funding_fees_history_by_pair):
+    """
+    Replays trades and funding fees on the first traded pair candles: at each candle, the portfolio value is
+    computed using the open price of each pair having a candle at this time, after applying the trades that
+    happened until this candle and the funding fees of this candle.
+    Updates moving_portfolio_data to the final holdings.
+    :return: the candles times and the associated portfolio values
+    """
+    pairs = list(trades_data)
+    if not pairs:
+        return [], []
+    candles_by_pair = {
+        pair: numpy.array(price_data[pair], dtype=numpy.float64)
+        for pair in pairs
+        if price_data.get(pair)
+    }
+    if pairs[0] not in candles_by_pair:
+        return [], []
+    # candles are identified by their time: keep the last candle of each time
+    ref_times = _get_unique_candles(candles_by_pair[pairs[0]])[:, commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+    candles_count = len(ref_times)
+    base_and_quote_by_pair = {pair: symbol_util.parse_symbol(pair).base_and_quote() for pair in pairs}
+    currencies = list(moving_portfolio_data)
+    for pair in pairs:
+        currencies += base_and_quote_by_pair[pair]
+        currencies += [trade[commons_enums.DBRows.FEES_CURRENCY.value] for trade in trades_data[pair]]
+        currencies += [funding_fee[trading_enums.FeePropertyColumns.CURRENCY.value]
+                       for funding_fee in funding_fees_history_by_pair.get(pair, [])]
+    currency_indexes = {currency: index for index, currency in enumerate(dict.fromkeys(currencies))}
+
+    # each pair open price and presence at each reference candle time
+    open_prices_by_pair = {}
+    for pair, candles in candles_by_pair.items():
+        candles = _get_unique_candles(candles)
+        candle_indexes = numpy.minimum(
+            numpy.searchsorted(candles[:, commons_enums.PriceIndexes.IND_PRICE_TIME.value], ref_times),
+            len(candles) - 1
+        )
+        open_prices = candles[candle_indexes, commons_enums.PriceIndexes.IND_PRICE_OPEN.value]
+        open_prices[candles[candle_indexes, commons_enums.PriceIndexes.IND_PRICE_TIME.value] != ref_times] = numpy.nan
+        open_prices_by_pair[pair] = open_prices
+
+    # portfolio updates, identified by (candle index, pair index, update kind, update index, currency position) to
+    # apply them in the same order as a candle by candle replay
+    updates = []
+    for pair_index, pair in enumerate(pairs):
+        if pair not in open_prices_by_pair:
+            continue
+        present_candle_indexes = numpy.flatnonzero(~numpy.isnan(open_prices_by_pair[pair]))
+        updates += _get_trades_updates(
+            trades_data[pair], pair_index, base_and_quote_by_pair[pair], currency_indexes,
+            ref_times[present_candle_indexes], present_candle_indexes
+        )
+        updates += _get_funding_fees_updates(
+            funding_fees_history_by_pair.get(pair, []), pair_index, currency_indexes,
+            ref_times[present_candle_indexes], present_candle_indexes
+        )
+    updates = numpy.concatenate(updates, axis=1) if updates else numpy.empty((7, 0))
+    updates = updates[:, numpy.lexsort(updates[4::-1])]
+    update_candle_indexes, update_currency_indexes, update_values = updates[0], updates[5], updates[6]
+
+    # holdings of each currency at each candle: cumulated updates from the initial holdings
+    holdings = numpy.empty((candles_count, len(currency_indexes)), dtype=numpy.float64)
+    candle_positions = numpy.arange(candles_count)
+    for currency, currency_index in currency_indexes.items():
+        currency_updates = update_currency_indexes == currency_index
+        cumulated_holdings = numpy.cumsum(numpy.concatenate((
+            (moving_portfolio_data.get(currency, 0), ), update_values[currency_updates]
+        )))
+        holdings[:, currency_index] = cumulated_holdings[
+            numpy.searchsorted(update_candle_indexes[currency_updates], candle_positions, side="right")
+        ]
+        moving_portfolio_data[currency] = float(cumulated_holdings[-1])
+
+    # value each currency once, at the first pair having a candle at this time
+    values = numpy.zeros(candles_count, dtype=numpy.float64)
+    handled_currencies = numpy.zeros((candles_count, len(currency_indexes)), dtype=bool)
+    for pair in pairs:
+        if pair not in open_prices_by_pair:
+            continue
+        open_prices = open_prices_by_pair[pair]
+        present = ~numpy.isnan(open_prices)
+        base_index, quote_index = (currency_indexes[currency] for currency in base_and_quote_by_pair[pair])
+        valued = present & ~handled_currencies[:, base_index]
+        values[valued] += holdings[valued, base_index] * open_prices[valued]
+        handled_currencies[present, base_index] = True
+        valued = present & ~handled_currencies[:, quote_index]
+        values[valued] += holdings[valued, quote_index]
+        handled_currencies[present, quote_index] = True
+    return ref_times.tolist(), values.tolist()
+
+
+def _get_unique_candles(candles):
+    times = candles[:, commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+    if len(times) < 2 or numpy.all(times[1:] > times[:-1]):
+        return candles
+    _, reversed_indexes = numpy.unique(times[::-1], return_index=True)
+    return candles[len(times) - 1 - reversed_indexes]
+
+
+def _get_update_candle_indexes(update_times, present_times, present_candle_indexes, exact_time):
+    """
+    :return: the index of the candle each update is applied on (first candle at or after the update time), -1 when
+    there is no such candle
+    """
+    positions = numpy.searchsorted(present_times, update_times, side="left")
+    applied = positions < len(present_times)
+    candle_indexes = numpy.full(len(update_times), -1)
+    candle_indexes[applied] = present_candle_indexes[positions[applied]]
+    if exact_time:
+        applied[applied] = present_times[positions[applied]] == update_times[applied]
+        candle_indexes[~applied] = -1
+    return candle_indexes
+
+
+def _get_trades_updates(trades, pair_index, base_and_quote, currency_indexes, present_times, present_candle_indexes):
+    if not trades:
+        return []
+    base, quote = base_and_quote
+    times = numpy.array([trade[commons_enums.PlotAttributes.X.value] for trade in trades], dtype=numpy.float64)
+    volumes = numpy.array([trade[commons_enums.PlotAttributes.VOLUME.value] for trade in trades],
+                          dtype=numpy.float64)
+    costs = volumes * numpy.array([trade[commons_enums.PlotAttributes.Y.value] for trade in trades],
+                                  dtype=numpy.float64)
+    is_sell = numpy.array([trade[commons_enums.PlotAttributes.SIDE.value] == trading_enums.TradeOrderSide.SELL.value
+                           for trade in trades], dtype=bool)
+    fees = numpy.array([trade[commons_enums.DBRows.FEES_AMOUNT.value] for trade in trades], dtype=numpy.float64)
+    fees_currencies = numpy.array([currency_indexes[trade[commons_enums.DBRows.FEES_CURRENCY.value]]
+                                   for trade in trades])
+    candle_indexes = _get_update_candle_indexes(times, present_times, present_candle_indexes, False)
+    trade_indexes = numpy.arange(len(trades))
+    updates = [
+        # base, quote and fees currency updates of each trade
+        (0, numpy.full(len(trades), currency_indexes[base]), numpy.where(is_sell, -volumes, volumes)),
+        (1, numpy.full(len(trades), currency_indexes[quote]), numpy.where(is_sell, costs, -costs)),
+        (2, fees_currencies, -fees),
+    ]
+    return [
+        _filter_applied_updates(numpy.vstack((
+            candle_indexes, numpy.full(len(trades), pair_index), numpy.zeros(len(trades)), trade_indexes,
+            numpy.full(len(trades), currency_position), updated_currencies, values
+        )))
+        for currency_position, updated_currencies, values in updates
+    ]
+
+
+def _get_funding_fees_updates(funding_fees, pair_index, currency_indexes, present_times, present_candle_indexes):
+    if not funding_fees:
+        return []
+    times = numpy.array([funding_fee[commons_enums.PlotAttributes.X.value] for funding_fee in funding_fees],
+                        dtype=numpy.float64)
+    # funding fees are applied on the candle of their time only
+    candle_indexes = _get_update_candle_indexes(times, present_times, present_candle_indexes, True)
+    return [_filter_applied_updates(numpy.vstack((
+        candle_indexes, numpy.full(len(funding_fees), pair_index), numpy.ones(len(funding_fees)),
+        numpy.arange(len(funding_fees)), numpy.zeros(len(funding_fees)),
+        numpy.array([currency_indexes[funding_fee[trading_enums.FeePropertyColumns.CURRENCY.value]]
+                     for funding_fee in funding_fees]),
+        -numpy.array([funding_fee["quantity"] for funding_fee in funding_fees], dtype=numpy.float64)
+    )))]
+
+
+def _filter_applied_updates(updates):
+    return updates[:, updates[0] != -1]
+
+
 def _read_pnl_from_trades(x_data, pnl_data, cumulative_pnl_data, trades_history, x_as_trade_count):
     buy_order_volume_by_price_by_currency = {
         symbol_util.parse_symbol(symbol).base: {}
@@ -13,6 +13,7 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import weakref
 import numpy
 
 import tentacles.Meta.Keywords.scripting_library.data.reading.exchange_public_data as exchange_public_data
@@ -21,6 +22,11 @@ import octobot_commons.enums as commons_enums
 import octobot_commons.constants as commons_constants
 
 
+# plotted rows are written in bulk by the symbol writer every PLOTS_ROWS_BUFFER_SIZE rows of a table and
+# when the writer is flushed (at the end of the backtesting run)
+PLOTS_ROWS_BUFFER_SIZE = 50000
+
+
 async def disable_candles_plot(ctx, time_frame=None):
     time_frame = time_frame or ctx.time_frame
     if not ctx.symbol_writer.are_data_initialized_by_key.get(time_frame):
@@ -66,10 +72,15 @@ async def plot(ctx, title, x=None,
 
     x_shift = -commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(ctx.time_frame)] * \
         commons_constants.MINUTE_TO_SECONDS if shift_to_open_candle_time else 0
-    if not await ctx.symbol_writer.contains_row(
+    plotted_table = None if cache_value is not None else await _get_plotted_table(ctx, title)
+    if plotted_table is None:
+        is_initialized = await ctx.symbol_writer.contains_row(
             commons_enums.DBTables.CACHE_SOURCE.value if cache_value is not None else title,
             count_query
-    ):
+        )
+    else:
+        is_initialized = ctx.time_frame in plotted_table.time_frames
+    if not is_initialized:
         if cache_value is not None:
             table = commons_enums.DBTables.CACHE_SOURCE.value
             # save x_shift to be applied when displaying and not to change actual cached values
@@ -143,40 +154,39 @@ async def plot(ctx, title, x=None,
                 ],
                 cache=False
             )
+            if plotted_table is not None:
+                plotted_table.register_logged_rows(ctx.time_frame, adapted_x)
     elif cache_value is None and x is not None:
         if isinstance(y, list) and not isinstance(x, list):
             x = [x] * len(y)
         elif isinstance(z, list) and not isinstance(x, list):
             x = [x] * len(z)
-        if len(x) and \
-                not await ctx.symbol_writer.contains_row(title,
-                                                   {"x": _get_value_from_array(x, -1) * x_multiplier}):
+        if len(x) and not await _contains_x(ctx, title, plotted_table, _get_value_from_array(x, -1) * x_multiplier):
             x_value = (_get_value_from_array(x, -1) + x_shift) * x_multiplier
-            await ctx.symbol_writer.upsert(
-                title,
-                {
-                    "time_frame": ctx.time_frame,
-                    "x": x_value,
-                    "y": _get_value_from_array(y, -1),
-                    "z": _get_value_from_array(z, -1),
-                    "open": _get_value_from_array(open, -1),
-                    "high": _get_value_from_array(high, -1),
-                    "low": _get_value_from_array(low, -1),
-                    "close": _get_value_from_array(close, -1),
-                    "volume": _get_value_from_array(volume, -1),
-                    "kind": kind,
-                    "mode": mode,
-                    "line_shape": line_shape,
-                    "chart": chart,
-                    "own_yaxis": own_yaxis,
-                    "color": color,
-                    "text": text,
-                    "size": size,
-                    "shape": shape,
-                },
-                None,
-                cache_query={"x": x_value}
-            )
+            row = {
+                "time_frame": ctx.time_frame,
+                "x": x_value,
+                "y": _get_value_from_array(y, -1),
+                "z": _get_value_from_array(z, -1),
+                "open": _get_value_from_array(open, -1),
+                "high": _get_value_from_array(high, -1),
+                "low": _get_value_from_array(low, -1),
+                "close": _get_value_from_array(close, -1),
+                "volume": _get_value_from_array(volume, -1),
+                "kind": kind,
+                "mode": mode,
+                "line_shape": line_shape,
+                "chart": chart,
+                "own_yaxis": own_yaxis,
+                "color": color,
+                "text": text,
+                "size": size,
+                "shape": shape,
+            }
+            if plotted_table is None:
+                await ctx.symbol_writer.upsert(title, row, None, cache_query={"x": x_value})
+            else:
+                await plotted_table.upsert(ctx.symbol_writer, title, row)
 
 
 async def plot_shape(ctx, title, value, y_value,
@@ -201,6 +211,71 @@ async def plot_shape(ctx, title, value, y_value,
         )
 
 
+class _PlottedTable:
+    """
+    In memory index of the rows plotted in a table during a backtesting run, avoids looking into the
+    database (scanning the whole table) on each plot call
+    """
+    def __init__(self):
+        self.time_frames = set()
+        # x of rows logged at once on the first plot call
+        self.logged_x_values = set()
+        self.upserted_x_values = set()
+        self.last_upserted_row = None
+
+    def register_logged_rows(self, time_frame, x_values):
+        if len(x_values):
+            self.time_frames.add(time_frame)
+            self.logged_x_values.update(x_values)
+
+    async def upsert(self, writer, table, row):
+        x_value = row["x"]
+        if x_value not in self.upserted_x_values:
+            # new row: buffered by the writer, written in bulk later on
+            await writer.log(table, row, cache=False, rows_buffering=True)
+            self.time_frames.add(row["time_frame"])
+            self.upserted_x_values.add(x_value)
+            self.last_upserted_row = row
+        elif self.last_upserted_row["x"] == x_value and self._is_buffered(writer, table, self.last_upserted_row):
+            # update of the last row (plotted again on the same candle) before it's written
+            self.last_upserted_row.update(row)
+        else:
+            await writer.upsert(table, row, await writer.search({"x": x_value}))
+
+    @staticmethod
+    def _is_buffered(writer, table, row):
+        buffered_rows = writer.rows_buffer.get(table)
+        return bool(buffered_rows) and buffered_rows[-1][0] is row
+
+
+# symbol writer => {table: _PlottedTable or None when plotted rows are not indexed}
+_PLOTTED_TABLES_BY_WRITER = weakref.WeakKeyDictionary()
+
+
+async def _get_plotted_table(ctx, title):
+    if not ctx.exchange_manager.is_backtesting:
+        # live databases can be reset and already contain data from previous runs: always use the database
+        return None
+    try:
+        plotted_tables = _PLOTTED_TABLES_BY_WRITER[ctx.symbol_writer]
+    except KeyError:
+        plotted_tables = _PLOTTED_TABLES_BY_WRITER[ctx.symbol_writer] = {}
+        ctx.symbol_writer.rows_buffer_size = max(ctx.symbol_writer.rows_buffer_size, PLOTS_ROWS_BUFFER_SIZE)
+    try:
+        return plotted_tables[title]
+    except KeyError:
+        # rows that were not plotted from this index are unknown to it: use the database for this table
+        plotted_table = None if await ctx.symbol_writer.contains_row(title, {}) else _PlottedTable()
+        plotted_tables[title] = plotted_table
+        return plotted_table
+
+
+async def _contains_x(ctx, title, plotted_table, x_value):
+    if plotted_table is None:
+        return await ctx.symbol_writer.contains_row(title, {"x": x_value})
+    return x_value in plotted_table.logged_x_values
+
+
 def _get_value_from_array(array, index, multiplier=1):
     if array is None:
         return None
@@ -17,6 +17,8 @@ import asyncio
 import time
 
 import tentacles.Meta.Keywords.scripting_library.orders.open_orders as open_orders
+import octobot_trading.enums as trading_enums
+import octobot_trading.exchange_channel as exchanges_channel
 import octobot_trading.personal_data as personal_data
 import octobot_commons.logging as logging
 
@@ -24,40 +26,54 @@ import octobot_commons.logging as logging
 async def wait_for_orders_close(ctx, orders, timeout=None):
     if not isinstance(orders, list):
         orders = [orders]
-    t0 = time.time()
-    refresh_interval = 0.01
     # wait for orders to be filled or cancelled
     # also wait for associated chained orders to be opened
     try:  # order.is_closed() fails when order got filled meanwhile
-        while not all(order.is_closed() for order in orders) or \
-                not are_all_chained_orders_created(ctx, orders):
-            if timeout is None or time.time() - t0 < timeout:
-                if ctx.exchange_manager.is_backtesting:
-                    raise asyncio.TimeoutError("Can't wait for orders in backtesting")
-                await asyncio.sleep(refresh_interval)
-            else:
-                raise asyncio.TimeoutError("Order wasnt not filled in time")
+        if _are_orders_closed(ctx, orders):
+            return
+        if ctx.exchange_manager.is_backtesting:
+            raise asyncio.TimeoutError("Can't wait for orders in backtesting")
+        waited_order_ids = [order.order_id for order in orders] + \
+            [chained_order.order_id for order in orders for chained_order in order.chained_orders]
+        order_waiters = await _get_order_waiters(ctx.exchange_manager)
+        if not await order_waiters.wait_until(lambda: _are_orders_closed(ctx, orders), waited_order_ids, timeout):
+            raise asyncio.TimeoutError("Order wasnt not filled in time")
     except AttributeError as e:
         logging.get_logger("Waiting").exception(e, True, "AttributeError on checking orders (should not happen)")
         pass  # continue try to create take profit in case of connection issues
 
 
+def _are_orders_closed(ctx, orders):
+    return all(order.is_closed() for order in orders) and are_all_chained_orders_created(ctx, orders)
+
+
 def are_all_chained_orders_created(ctx, orders):
+    # chained orders that still have to be found in open orders, by parent order id
+    pending_chained_orders_by_parent_order_id = {}
     for order in orders:
         for chained_order in order.chained_orders:
             if not chained_order.is_created():
                 return False
             if chained_order.is_closed():
                 continue
-            found_order = False
-            # ensure that chained orders are open or got closed
-            for open_order in open_orders.get_open_orders(ctx):
-                if personal_data.is_associated_pending_order(open_order, chained_order):
-                    found_order = True
-                    break
-            if not found_order:
-                return False
-    return True
+            pending_chained_orders_by_parent_order_id.setdefault(order.order_id, []).append(chained_order)
+    if not pending_chained_orders_by_parent_order_id:
+        return True
+    # ensure that chained orders are open or got closed: scan open orders only once
+    for open_order in open_orders.get_open_orders(ctx):
+        for parent_order_id, chained_orders in list(pending_chained_orders_by_parent_order_id.items()):
+            remaining_chained_orders = [
+                chained_order
+                for chained_order in chained_orders
+                if not personal_data.is_associated_pending_order(open_order, chained_order)
+            ]
+            if remaining_chained_orders:
+                pending_chained_orders_by_parent_order_id[parent_order_id] = remaining_chained_orders
+            else:
+                pending_chained_orders_by_parent_order_id.pop(parent_order_id)
+        if not pending_chained_orders_by_parent_order_id:
+            return True
+    return False
 
 
 async def wait_for_stop_loss_open(ctx, order_tag=None, order_group=None, timeout=60):
@@ -69,20 +85,166 @@ async def wait_for_stop_loss_open(ctx, order_tag=None, order_group=None, timeout
     :param timeout: in seconds
     :return: the stop loss order
     """
-    t0 = time.time()
-    refresh_interval = 0.01
     orders = ctx.exchange_manager.exchange_personal_data.orders_manager.orders
+    stop_order = _find_order(orders, order_tag, order_group)
+    if stop_order is not None:
+        return stop_order
+    if ctx.exchange_manager.is_backtesting:
+        raise asyncio.TimeoutError("Can't wait for orders in backtesting")
+    order_waiters = await _get_order_waiters(ctx.exchange_manager)
+    if await order_waiters.wait_until(lambda: _find_order(orders, order_tag, order_group) is not None, None, timeout):
+        return _find_order(orders, order_tag, order_group)
+    ctx.logger.error("Stop Loss Order was not found: was not placed in time or got already triggered")
+    return None
+
+
+def _find_order(orders, order_tag, order_group):
+    for order in orders.values():
+        if order.tag == order_tag or order.order_group == order_group:
+            return order
+    return None
+
+
+class _OrderWaiters:
+    """
+    Futures of the coroutines waiting for orders updates, resolved by the exchange ORDERS and TRADES channels
+    """
+    # closed orders are not pushed on the ORDERS channel but their trade is pushed on the TRADES channel:
+    # only check waited orders from time to time in case an update is missed
+    CHECK_INTERVAL = 1
+    # used when the ORDERS or TRADES channels are not available
+    POLLING_INTERVAL = 0.01
+
+    def __init__(self):
+        self.waiters_by_order_id = {}
+        self.any_order_waiters = set()
+        self.consumers = []
+        self.is_stopped = False
+
+    async def start(self, exchange_id):
+        try:
+            callback_by_channel = {
+                exchanges_channel.get_chan(personal_data.OrdersChannel.get_name(), exchange_id): self.order_callback,
+                exchanges_channel.get_chan(personal_data.TradesChannel.get_name(), exchange_id): self.trade_callback,
+            }
+        except KeyError as e:
+            logging.get_logger("Waiting").warning(f"Orders channels unavailable, polling orders instead: {e}")
+            return
+        for channel, callback in callback_by_channel.items():
+            self.consumers.append(
+                await channel.new_consumer(consumer_instance=_OrderWaitersConsumer(self, callback, exchange_id))
+            )
+
+    @property
+    def is_consuming(self):
+        return bool(self.consumers)
+
+    def stop(self):
+        # wake every waiter for a last check
+        self.is_stopped = True
+        self.consumers = []
+        for futures in self.waiters_by_order_id.values():
+            _resolve(futures)
+        self.waiters_by_order_id.clear()
+        _resolve(self.any_order_waiters)
+        self.any_order_waiters.clear()
+
+    async def order_callback(self, exchange, exchange_id, cryptocurrency, symbol, order, update_type, is_from_bot):
+        self.notify(order[trading_enums.ExchangeConstantsOrderColumns.ID.value])
+
+    async def trade_callback(self, exchange, exchange_id, cryptocurrency, symbol, trade, old_trade):
+        if not old_trade:
+            self.notify(trade[trading_enums.ExchangeConstantsOrderColumns.ORDER_ID.value])
+
+    def notify(self, order_id):
+        _resolve(self.waiters_by_order_id.pop(order_id, ()))
+        _resolve(self.any_order_waiters)
+        self.any_order_waiters.clear()
+
+    async def wait_until(self, condition, order_ids, timeout) -> bool:
+        """
+        Checks condition after each update of the given orders (or of any order when order_ids is None)
+        :return: False if condition is still not met after timeout seconds
+        """
+        t0 = time.time()
+        while not condition():
+            interval = self.CHECK_INTERVAL if self.is_consuming else self.POLLING_INTERVAL
+            remaining_time = None if timeout is None else timeout - (time.time() - t0)
+            if remaining_time is not None and remaining_time <= 0:
+                return False
+            # condition has just been checked: register before yielding to avoid missing any update
+            future = asyncio.get_event_loop().create_future()
+            self._register(future, order_ids)
+            try:
+                await asyncio.wait((future, ),
+                                   timeout=interval if remaining_time is None else min(interval, remaining_time))
+            finally:
+                self._unregister(future, order_ids)
+            if self.is_stopped:
+                return condition()
+        return True
+
+    def _register(self, future, order_ids):
+        if order_ids is None:
+            self.any_order_waiters.add(future)
+            return
+        for order_id in order_ids:
+            self.waiters_by_order_id.setdefault(order_id, set()).add(future)
+
+    def _unregister(self, future, order_ids):
+        if order_ids is None:
+            self.any_order_waiters.discard(future)
+            return
+        for order_id in order_ids:
+            waiters = self.waiters_by_order_id.get(order_id)
+            if waiters is not None:
+                waiters.discard(future)
+                if not waiters:
+                    self.waiters_by_order_id.pop(order_id)
+
+
+class _OrderWaitersConsumer(exchanges_channel.ExchangeChannelConsumer):
+    """
+    ORDERS or TRADES channel consumer removing its order waiters when the exchange channels are stopped
+    """
+    def __init__(self, order_waiters, callback, exchange_id):
+        super().__init__(callback)
+        self.order_waiters = order_waiters
+        self.exchange_id = exchange_id
+
+    async def stop(self):
+        await super().stop()
+        if _ORDER_WAITERS_BY_EXCHANGE_ID.get(self.exchange_id) is self.order_waiters:
+            _ORDER_WAITERS_BY_EXCHANGE_ID.pop(self.exchange_id)
+        self.order_waiters.stop()
+
+
+def _resolve(futures):
+    for future in futures:
+        if not future.done():
+            future.set_result(None)
+
+
+_ORDER_WAITERS_BY_EXCHANGE_ID = {}
+# only exist while order waiters are being started
+_ORDER_WAITERS_LOCKS_BY_EXCHANGE_ID = {}
+
 
-    stop_found = False
-    while not stop_found:
-        for order in orders:
-            stop_found = orders[order].tag == order_tag or orders[order].order_group == order_group
-            if stop_found:
-                return orders[order]
-        if timeout is None or time.time() - t0 < timeout:
-            if ctx.exchange_manager.is_backtesting:
-                raise asyncio.TimeoutError("Can't wait for orders in backtesting")
-            await asyncio.sleep(refresh_interval)
-        else:
-            ctx.logger.error("Stop Loss Order was not found: was not placed in time or got already triggered")
-            return None
+async def _get_order_waiters(exchange_manager):
+    try:
+        return _ORDER_WAITERS_BY_EXCHANGE_ID[exchange_manager.id]
+    except KeyError:
+        lock = _ORDER_WAITERS_LOCKS_BY_EXCHANGE_ID.setdefault(exchange_manager.id, asyncio.Lock())
+        async with lock:
+            if exchange_manager.id in _ORDER_WAITERS_BY_EXCHANGE_ID:
+                # started by a concurrent call
+                return _ORDER_WAITERS_BY_EXCHANGE_ID[exchange_manager.id]
+            order_waiters = _OrderWaiters()
+            await order_waiters.start(exchange_manager.id)
+            if order_waiters.is_consuming:
+                # publish once the ORDERS and TRADES consumers are registered, polling order waiters are not shared as
+                # nothing would remove them when the exchange stops
+                _ORDER_WAITERS_BY_EXCHANGE_ID[exchange_manager.id] = order_waiters
+            if _ORDER_WAITERS_LOCKS_BY_EXCHANGE_ID.get(exchange_manager.id) is lock:
+                _ORDER_WAITERS_LOCKS_BY_EXCHANGE_ID.pop(exchange_manager.id)
+            return order_waiters
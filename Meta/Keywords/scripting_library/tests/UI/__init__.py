@@ -0,0 +1,92 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import contextlib
+import mock
+
+import tentacles.Meta.Keywords.scripting_library.UI.plots as plots
+import octobot_commons.enums as commons_enums
+import octobot_commons.databases as databases
+import octobot_trading.api as trading_api
+
+EXCHANGE = "binance"
+SYMBOL = "BTC/USDT"
+TIME_FRAME = "1h"
+HOUR_MS = 3600 * 1000
+
+
+async def symbol_database(file_path, rows_count_by_series):
+    """
+    :return: a symbol database containing rows_count_by_series plotted rows for each series, one per hour
+    """
+    database = databases.DBWriterReader(str(file_path))
+    for series_index, (series, rows_count) in enumerate(rows_count_by_series.items()):
+        await database.log_many(
+            series,
+            [
+                {
+                    commons_enums.PlotAttributes.X.value: index * HOUR_MS,
+                    commons_enums.PlotAttributes.Y.value: series_index + (index % 100) / 100,
+                    commons_enums.DBRows.TIME_FRAME.value: TIME_FRAME,
+                    commons_enums.PlotAttributes.KIND.value: "scattergl",
+                    commons_enums.PlotAttributes.MODE.value: "lines",
+                    commons_enums.DisplayedElementTypes.CHART.value: commons_enums.PlotCharts.SUB_CHART.value,
+                }
+                for index in range(rows_count)
+            ],
+            cache=False
+        )
+    return database
+
+
+@contextlib.contextmanager
+def run_databases(symbol_db):
+    empty_db = mock.Mock(tables=mock.AsyncMock(return_value=[]), all=mock.AsyncMock(return_value=[]))
+    meta_db = mock.Mock(
+        get_run_db=mock.Mock(return_value=empty_db),
+        get_transactions_db=mock.Mock(return_value=empty_db),
+        get_orders_db=mock.Mock(return_value=empty_db),
+        get_trades_db=mock.Mock(return_value=empty_db),
+        get_symbol_db=mock.Mock(return_value=symbol_db),
+    )
+
+    @contextlib.asynccontextmanager
+    async def _meta_database(*_, **__):
+        yield meta_db
+
+    with mock.patch.object(databases.MetaDatabase, "database", _meta_database), \
+            mock.patch.object(trading_api, "get_account_type_from_run_metadata", mock.Mock()):
+        yield meta_db
+
+
+async def fill_displayed_elements(symbol_db, **kwargs):
+    displayed_elements = plots.DisplayedElements()
+    with run_databases(symbol_db):
+        await displayed_elements.fill_from_database(
+            mock.Mock(is_backtestable=mock.Mock(return_value=False)), mock.Mock(), EXCHANGE, SYMBOL, TIME_FRAME,
+            "exchange_id", with_inputs=False, **kwargs
+        )
+    return displayed_elements
+
+
+def get_plotted_elements(displayed_elements):
+    """
+    :return: plotted elements by title
+    """
+    return {
+        element.title: element
+        for part in displayed_elements.nested_elements.values()
+        for element in part.elements
+    }
@@ -0,0 +1,92 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import pytest
+import pytest_asyncio
+
+import tentacles.Meta.Keywords.scripting_library.UI.plots as plots
+import tentacles.Meta.Keywords.scripting_library.tests.UI as ui_tests
+import octobot_commons.enums as commons_enums
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def symbol_db(tmp_path):
+    database = await ui_tests.symbol_database(tmp_path / "symbol.json", {"rsi": 1000, "ema": 500})
+    yield database
+    await database.close()
+
+
+async def test_fill_from_database_all_rows(symbol_db):
+    elements = ui_tests.get_plotted_elements(await ui_tests.fill_displayed_elements(symbol_db))
+    assert sorted(elements) == ["ema", "rsi"]
+    assert elements["rsi"].x == [index * ui_tests.HOUR_MS for index in range(1000)]
+    assert len(elements["ema"].y) == 500
+
+
+async def test_fill_from_database_window_and_series(symbol_db):
+    elements = ui_tests.get_plotted_elements(await ui_tests.fill_displayed_elements(
+        symbol_db, start_time=100 * ui_tests.HOUR_MS, end_time=199 * ui_tests.HOUR_MS, series=["rsi"]
+    ))
+    assert list(elements) == ["rsi"]
+    assert elements["rsi"].x == [index * ui_tests.HOUR_MS for index in range(100, 200)]
+    assert elements["rsi"].y == [(index % 100) / 100 for index in range(100, 200)]
+    # open ended window
+    elements = ui_tests.get_plotted_elements(await ui_tests.fill_displayed_elements(
+        symbol_db, start_time=450 * ui_tests.HOUR_MS
+    ))
+    assert len(elements["rsi"].x) == 550
+    assert len(elements["ema"].x) == 50
+
+
+async def test_fill_from_database_max_points(symbol_db):
+    elements = ui_tests.get_plotted_elements(await ui_tests.fill_displayed_elements(symbol_db, max_points=100))
+    assert len(elements["rsi"].x) == 100
+    assert elements["rsi"].x == sorted(elements["rsi"].x)
+    # extremes are kept
+    assert min(elements["rsi"].y) == 0
+    assert max(elements["rsi"].y) == 0.99
+    assert len(elements["ema"].x) == 100
+
+
+def test_downsample():
+    dataset = [{"x": index, "y": value} for index, value in enumerate([1, 5, 3, 2, 8, 0, 4, 4, 6])]
+    assert plots.DisplayedElements._downsample(dataset, None) is dataset
+    assert plots.DisplayedElements._downsample(dataset, 9) is dataset
+    # 3 buckets of 3 elements
+    assert [element["x"] for element in plots.DisplayedElements._downsample(dataset, 6)] == [0, 1, 4, 5, 6, 8]
+    candles = [
+        {
+            commons_enums.PlotAttributes.X.value: index,
+            commons_enums.PlotAttributes.OPEN.value: index,
+            commons_enums.PlotAttributes.HIGH.value: index + 10,
+            commons_enums.PlotAttributes.LOW.value: index - 10,
+            commons_enums.PlotAttributes.CLOSE.value: index + 1,
+            commons_enums.PlotAttributes.VOLUME.value: 1,
+        }
+        for index in range(4)
+    ]
+    assert plots.DisplayedElements._downsample(candles, 2) == [
+        {
+            commons_enums.PlotAttributes.X.value: 0,
+            commons_enums.PlotAttributes.OPEN.value: 0,
+            commons_enums.PlotAttributes.HIGH.value: 13,
+            commons_enums.PlotAttributes.LOW.value: -10,
+            commons_enums.PlotAttributes.CLOSE.value: 4,
+            commons_enums.PlotAttributes.VOLUME.value: 4,
+        }
+    ]
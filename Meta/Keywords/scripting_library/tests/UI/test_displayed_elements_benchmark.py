@@ -0,0 +1,73 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import os
+import time
+import tracemalloc
+import pytest
+
+import tentacles.Meta.Keywords.scripting_library.tests.UI as ui_tests
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+SERIES_COUNT = 5
+ROWS_COUNT_BY_SERIES = 200000
+WINDOW_START = 100000 * ui_tests.HOUR_MS
+WINDOW_END = WINDOW_START + 2000 * ui_tests.HOUR_MS
+MAX_POINTS = 500
+
+
+async def _measure_fill(symbol_db, **kwargs):
+    t0 = time.perf_counter()
+    displayed_elements = await ui_tests.fill_displayed_elements(symbol_db, **kwargs)
+    duration = time.perf_counter() - t0
+    tracemalloc.start()
+    try:
+        await ui_tests.fill_displayed_elements(symbol_db, **kwargs)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return ui_tests.get_plotted_elements(displayed_elements), duration, peak_memory
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+async def test_fill_from_database_zoomed_window_benchmark(tmp_path):
+    symbol_db = await ui_tests.symbol_database(
+        tmp_path / "symbol.json", {f"series {index}": ROWS_COUNT_BY_SERIES for index in range(SERIES_COUNT)}
+    )
+    try:
+        all_elements, all_duration, all_peak_memory = await _measure_fill(symbol_db)
+        window_elements, window_duration, window_peak_memory = await _measure_fill(
+            symbol_db, start_time=WINDOW_START, end_time=WINDOW_END, max_points=MAX_POINTS
+        )
+    finally:
+        await symbol_db.close()
+    for label, elements, duration, peak_memory in (
+        ("all rows", all_elements, all_duration, all_peak_memory),
+        ("zoomed window", window_elements, window_duration, window_peak_memory),
+    ):
+        print(f"{label}: {SERIES_COUNT * ROWS_COUNT_BY_SERIES} rows: {round(duration, 3)}s, "
+              f"peak memory: {round(peak_memory / 1024 / 1024, 1)}MB, "
+              f"displayed points: {sum(len(element.x) for element in elements.values())}")
+    assert all(len(element.x) == ROWS_COUNT_BY_SERIES for element in all_elements.values())
+    assert len(window_elements) == SERIES_COUNT
+    for element in window_elements.values():
+        assert len(element.x) <= MAX_POINTS
+        assert WINDOW_START <= min(element.x) and max(element.x) <= WINDOW_END
+    # only rows of the window are copied from the database
+    assert window_peak_memory < 50 * 1024 * 1024
+    assert window_peak_memory * 20 < all_peak_memory
+    assert window_duration * 5 < all_duration
@@ -0,0 +1,210 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import copy
+import os
+import random
+import time
+import pytest
+import sortedcontainers
+
+import tentacles.Meta.Keywords.scripting_library.backtesting.run_data_analysis as run_data_analysis
+import octobot_trading.enums as trading_enums
+import octobot_commons.enums as commons_enums
+import octobot_commons.symbols.symbol_util as symbol_util
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+START_TIME = 1606780800000
+HOUR_MS = 3600 * 1000
+
+
+def _generate_historical_values(candles_count, trades_count, seed=42):
+    """
+    :return: price_data, trades_data, portfolio and funding fees of pairs with missing candles
+    """
+    rng = random.Random(seed)
+    price_data = {}
+    for pair, base_price, missing_candles_ratio in (("BTC/USDT", 20000, 0), ("ETH/USDT", 1500, 0.02),
+                                                    ("ETH/BTC", 0.075, 0.05)):
+        price_data[pair] = [
+            [float(START_TIME + index * HOUR_MS), base_price * (1 + (index % 500) / 1000),
+             base_price * 1.01, base_price * 0.99, base_price * (1 + (index % 400) / 1000), 10 + index % 7]
+            for index in range(candles_count)
+            if rng.random() >= missing_candles_ratio
+        ]
+    trades_data = {}
+    for pair in price_data:
+        base, quote = symbol_util.parse_symbol(pair).base_and_quote()
+        candles = price_data[pair]
+        # trades until 90% of the candles, some trades share the same time
+        times = sorted(rng.randrange(START_TIME - HOUR_MS, START_TIME + int(candles_count * 0.9) * HOUR_MS)
+                       for _ in range(trades_count // len(price_data)))
+        times = [times[index - 1] if index and rng.random() < 0.1 else trade_time
+                 for index, trade_time in enumerate(times)]
+        # last trade alone on its candle
+        times.append(candles[-rng.randrange(2, max(3, len(candles) // 20))][0])
+        trades = []
+        for trade_time in times:
+            is_buy = rng.random() < 0.5
+            price = candles[0][1] * (0.9 + rng.random() / 5)
+            trades.append({
+                commons_enums.PlotAttributes.X.value: trade_time,
+                commons_enums.PlotAttributes.VOLUME.value: rng.random(),
+                commons_enums.DBRows.SYMBOL.value: pair,
+                commons_enums.PlotAttributes.Y.value: price,
+                commons_enums.PlotAttributes.SIDE.value: trading_enums.TradeOrderSide.BUY.value if is_buy
+                else trading_enums.TradeOrderSide.SELL.value,
+                commons_enums.DBRows.FEES_AMOUNT.value: rng.random() / 1000,
+                commons_enums.DBRows.FEES_CURRENCY.value: base if is_buy else quote,
+            })
+        trades_data[pair] = trades
+    funding_fees_by_pair = {
+        "BTC/USDT": [
+            {
+                commons_enums.PlotAttributes.X.value: START_TIME + index * 8 * HOUR_MS + (HOUR_MS // 2 if index % 9 == 0
+                                                                                       else 0),
+                trading_enums.FeePropertyColumns.CURRENCY.value: "USDT",
+                "quantity": rng.random(),
+            }
+            for index in range(candles_count // 8)
+        ]
+    }
+    portfolio = {"BTC": 1.0, "ETH": 10.0, "USDT": 100000.0}
+    return price_data, trades_data, portfolio, funding_fees_by_pair
+
+
+def _candle_by_candle_historical_portfolio_values(price_data, trades_data, moving_portfolio_data,
+                                                  funding_fees_history_by_pair):
+    # previous plot_historical_portfolio_value implementation
+    price_data_by_time = {}
+    for symbol, candles in price_data.items():
+        price_data_by_time[symbol] = {
+            candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]: candle
+            for candle in candles
+        }
+    for pair in trades_data:
+        trades_data[pair] = sorted(trades_data[pair], key=lambda tr: tr[commons_enums.PlotAttributes.X.value])
+    value_data = sortedcontainers.SortedDict()
+    pairs = list(trades_data)
+    if pairs:
+        pair = pairs[0]
+        candles = price_data_by_time[pair]
+        value_data = sortedcontainers.SortedDict({
+            t: 0
+            for t in candles
+        })
+        trade_index_by_pair = {p: 0 for p in pairs}
+        funding_fees_index_by_pair = {p: 0 for p in pairs}
+        for candle_time, ref_candle in candles.items():
+            current_candles = {}
+            for pair in pairs:
+                if candle_time not in price_data_by_time[pair]:
+                    continue
+                other_candle = price_data_by_time[pair][candle_time]
+                current_candles[pair] = other_candle
+                symbol, ref_market = symbol_util.parse_symbol(pair).base_and_quote()
+                moving_portfolio_data[ref_market] = moving_portfolio_data.get(ref_market, 0)
+                moving_portfolio_data[symbol] = moving_portfolio_data.get(symbol, 0)
+                for trade_index, trade in enumerate(trades_data[pair][trade_index_by_pair[pair]:]):
+                    if trade[commons_enums.PlotAttributes.X.value] <= candle_time:
+                        if trade[commons_enums.PlotAttributes.SIDE.value] == trading_enums.TradeOrderSide.SELL.value:
+                            moving_portfolio_data[symbol] -= trade[commons_enums.PlotAttributes.VOLUME.value]
+                            moving_portfolio_data[ref_market] += trade[commons_enums.PlotAttributes.VOLUME.value] * \
+                                trade[commons_enums.PlotAttributes.Y.value]
+                        else:
+                            moving_portfolio_data[symbol] += trade[commons_enums.PlotAttributes.VOLUME.value]
+                            moving_portfolio_data[ref_market] -= trade[commons_enums.PlotAttributes.VOLUME.value] * \
+                                trade[commons_enums.PlotAttributes.Y.value]
+                        moving_portfolio_data[trade[commons_enums.DBRows.FEES_CURRENCY.value]] -= \
+                            trade[commons_enums.DBRows.FEES_AMOUNT.value]
+                        if all(it_trade[commons_enums.PlotAttributes.X.value] ==
+                               trade[commons_enums.PlotAttributes.X.value]
+                               for it_trade in trades_data[pair][trade_index_by_pair[pair]:]):
+                            trade_index_by_pair[pair] += 1
+                            break
+                    if trade[commons_enums.PlotAttributes.X.value] > \
+                            ref_candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]:
+                        trade_index_by_pair[pair] += trade_index
+                        break
+                for funding_fee_index, funding_fee \
+                        in enumerate(funding_fees_history_by_pair.get(pair, [])[funding_fees_index_by_pair[pair]:]):
+                    if funding_fee[commons_enums.PlotAttributes.X.value] == candle_time:
+                        moving_portfolio_data[funding_fee[trading_enums.FeePropertyColumns.CURRENCY.value]] -= \
+                            funding_fee["quantity"]
+                    if funding_fee[commons_enums.PlotAttributes.X.value] > candle_time:
+                        funding_fees_index_by_pair[pair] = funding_fee_index
+                        break
+            handled_currencies = []
+            for pair, other_candle in current_candles.items():
+                symbol, ref_market = symbol_util.parse_symbol(pair).base_and_quote()
+                if symbol not in handled_currencies:
+                    value_data[candle_time] = \
+                        value_data[candle_time] + \
+                        moving_portfolio_data[symbol] * other_candle[
+                            commons_enums.PriceIndexes.IND_PRICE_OPEN.value
+                        ]
+                    handled_currencies.append(symbol)
+                if ref_market not in handled_currencies:
+                    value_data[candle_time] = value_data[candle_time] + moving_portfolio_data[ref_market]
+                    handled_currencies.append(ref_market)
+    return list(value_data.keys()), list(value_data.values())
+
+
+def _compare_implementations(candles_count, trades_count):
+    price_data, trades_data, portfolio, funding_fees_by_pair = _generate_historical_values(candles_count,
+                                                                                           trades_count)
+    candle_by_candle_portfolio = copy.deepcopy(portfolio)
+    t0 = time.perf_counter()
+    expected_times, expected_values = _candle_by_candle_historical_portfolio_values(
+        price_data, copy.deepcopy(trades_data), candle_by_candle_portfolio, funding_fees_by_pair
+    )
+    candle_by_candle_duration = time.perf_counter() - t0
+    vectorized_portfolio = copy.deepcopy(portfolio)
+    times, values = run_data_analysis._get_historical_portfolio_values(
+        price_data, copy.deepcopy(trades_data), vectorized_portfolio, funding_fees_by_pair
+    )
+    # updates are applied in the same order: same float values
+    assert times == expected_times
+    assert values == expected_values
+    assert vectorized_portfolio == candle_by_candle_portfolio
+    return candle_by_candle_duration
+
+
+async def test_historical_portfolio_values_match_candle_by_candle_replay():
+    _compare_implementations(2000, 300)
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+async def test_historical_portfolio_values_benchmark():
+    candles_count, trades_count = 500000, 50000
+    # the candle by candle replay is quadratic: measure it on a smaller history
+    candle_by_candle_candles_count, candle_by_candle_trades_count = candles_count // 20, trades_count // 20
+    candle_by_candle_duration = _compare_implementations(candle_by_candle_candles_count,
+                                                         candle_by_candle_trades_count)
+    price_data, trades_data, portfolio, funding_fees_by_pair = _generate_historical_values(candles_count,
+                                                                                           trades_count)
+    t0 = time.perf_counter()
+    times, values = run_data_analysis._get_historical_portfolio_values(
+        price_data, trades_data, portfolio, funding_fees_by_pair
+    )
+    vectorized_duration = time.perf_counter() - t0
+    print(f"\nPortfolio value of {trades_count} trades over {candles_count} candles: "
+          f"vectorized: {vectorized_duration:.2f}s, "
+          f"candle by candle on {candle_by_candle_trades_count} trades over {candle_by_candle_candles_count} "
+          f"candles: {candle_by_candle_duration:.2f}s")
+    assert len(times) == len(values) == len(price_data["BTC/USDT"])
+    assert vectorized_duration < candle_by_candle_duration
@@ -0,0 +1,61 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import json
+import mock
+import numpy
+
+import tentacles.Meta.Keywords.scripting_library.data.writing.plotting as plotting
+import octobot_commons.databases as databases
+
+HOUR = 3600
+PLOTTED_CANDLES = 100
+
+
+def symbol_writer(file_path):
+    writer = databases.DBWriter(str(file_path))
+    # only flush rows when the writer is flushed
+    writer.rows_buffer_size = 10 ** 9
+    return writer
+
+
+def plotting_context(writer, is_backtesting):
+    ctx = mock.Mock(symbol_writer=writer, time_frame="1h", symbol="BTC/USDT")
+    ctx.exchange_manager.is_backtesting = is_backtesting
+    return ctx
+
+
+async def plot_candles(ctx, candles_count, series_count, same_candle_calls=1, shift_to_open_candle_time=True):
+    """
+    Plots series_count series on each candle like a script would do, each candle is plotted same_candle_calls times
+    """
+    times = numpy.arange(candles_count + PLOTTED_CANDLES, dtype=float) * HOUR
+    values = numpy.random.default_rng(42).random(candles_count + PLOTTED_CANDLES)
+    for candle_index in range(candles_count):
+        for call_index in range(same_candle_calls):
+            plotted = slice(candle_index, candle_index + PLOTTED_CANDLES)
+            for series_index in range(series_count):
+                await plotting.plot(
+                    ctx, f"series {series_index}", x=times[plotted], y=values[plotted] + series_index + call_index,
+                    shift_to_open_candle_time=shift_to_open_candle_time
+                )
+
+
+def read_tables(file_path):
+    with open(file_path) as db_file:
+        return {
+            table: list(rows.values())
+            for table, rows in json.load(db_file).items()
+        }
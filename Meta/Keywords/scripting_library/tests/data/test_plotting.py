@@ -0,0 +1,87 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import mock
+import pytest
+
+import tentacles.Meta.Keywords.scripting_library.data.writing.plotting as plotting
+import tentacles.Meta.Keywords.scripting_library.tests.data as data_tests
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize("same_candle_calls, shift_to_open_candle_time", [(1, True), (3, True), (3, False)])
+async def test_plot_in_backtesting_writes_database_rows(tmp_path, same_candle_calls, shift_to_open_candle_time):
+    tables_by_path = {}
+    for is_backtesting in (False, True):
+        file_path = tmp_path / f"{is_backtesting}.json"
+        writer = data_tests.symbol_writer(file_path)
+        await data_tests.plot_candles(data_tests.plotting_context(writer, is_backtesting), 300, 3,
+                                      same_candle_calls=same_candle_calls,
+                                      shift_to_open_candle_time=shift_to_open_candle_time)
+        await writer.close()
+        tables_by_path[is_backtesting] = data_tests.read_tables(file_path)
+    assert tables_by_path[True] == tables_by_path[False]
+    assert len(tables_by_path[True]) == 3
+    assert all(len(rows) == data_tests.PLOTTED_CANDLES + 300 - 1 for rows in tables_by_path[True].values())
+
+
+async def test_plot_in_backtesting_does_not_look_into_database(tmp_path):
+    writer = data_tests.symbol_writer(tmp_path / "db.json")
+    with mock.patch.object(writer, "contains_row", mock.AsyncMock(wraps=writer.contains_row)) as contains_row_mock, \
+            mock.patch.object(writer, "upsert", mock.AsyncMock(wraps=writer.upsert)) as upsert_mock:
+        await data_tests.plot_candles(data_tests.plotting_context(writer, True), 100, 2, same_candle_calls=2)
+        # only checked once per table when plotting it for the first time
+        assert contains_row_mock.await_count == 2
+        upsert_mock.assert_not_awaited()
+    assert all(len(rows) == 100 - 1 for rows in writer.rows_buffer.values())
+    await writer.close()
+
+
+async def test_plot_in_backtesting_updates_written_row(tmp_path):
+    file_path = tmp_path / "db.json"
+    writer = data_tests.symbol_writer(file_path)
+    ctx = data_tests.plotting_context(writer, True)
+    await data_tests.plot_candles(ctx, 3, 1)
+    await writer.flush()
+    # plot again the last candle after it has been written
+    with mock.patch.object(writer, "upsert", mock.AsyncMock(wraps=writer.upsert)) as upsert_mock:
+        await plotting.plot(ctx, "series 0", x=[(2 + data_tests.PLOTTED_CANDLES - 1) * data_tests.HOUR], y=[-1])
+        upsert_mock.assert_awaited_once()
+    await writer.close()
+    rows = data_tests.read_tables(file_path)["series 0"]
+    assert len(rows) == data_tests.PLOTTED_CANDLES + 2
+    assert rows[-1]["y"] == -1
+
+
+async def test_plot_in_backtesting_with_existing_table(tmp_path):
+    writer = data_tests.symbol_writer(tmp_path / "db.json")
+    await writer.log_many("series 0", [{"x": 1, "time_frame": "1h"}], cache=False)
+    ctx = data_tests.plotting_context(writer, True)
+    with mock.patch.object(writer, "contains_row", mock.AsyncMock(wraps=writer.contains_row)) as contains_row_mock:
+        await data_tests.plot_candles(ctx, 3, 1)
+        # rows are not indexed: use the database
+        assert contains_row_mock.await_count == 1 + 3 * 2
+    await writer.close()
+
+
+async def test_plot_in_live_uses_database(tmp_path):
+    writer = data_tests.symbol_writer(tmp_path / "db.json")
+    with mock.patch.object(writer, "contains_row", mock.AsyncMock(wraps=writer.contains_row)) as contains_row_mock:
+        await data_tests.plot_candles(data_tests.plotting_context(writer, False), 3, 1)
+        assert contains_row_mock.await_count == 3 + 2
+    assert writer.rows_buffer_size == 10 ** 9
+    await writer.close()
@@ -0,0 +1,60 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import os
+import time
+import pytest
+
+import tentacles.Meta.Keywords.scripting_library.tests.data as data_tests
+import octobot_commons.databases as databases
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+SERIES_COUNT = 5
+CANDLES_COUNT = 200000
+# plotting was looking into the database at each call: only run a small backtesting using the database
+DATABASE_PLOT_CANDLES_COUNT = 2000
+
+
+async def _plot_backtesting(file_path, candles_count, is_backtesting):
+    writer = databases.DBWriter(str(file_path))
+    t0 = time.perf_counter()
+    await data_tests.plot_candles(data_tests.plotting_context(writer, is_backtesting), candles_count, SERIES_COUNT)
+    plot_duration = time.perf_counter() - t0
+    await writer.close()
+    return plot_duration, time.perf_counter() - t0, os.path.getsize(file_path)
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+async def test_plot_backtesting_benchmark(tmp_path):
+    database_plot_duration, database_total_duration, database_size = await _plot_backtesting(
+        tmp_path / "database.json", DATABASE_PLOT_CANDLES_COUNT, False
+    )
+    plot_duration, total_duration, size = await _plot_backtesting(
+        tmp_path / "backtesting.json", CANDLES_COUNT, True
+    )
+    for label, candles_count, duration, total, db_size in (
+        ("database lookups", DATABASE_PLOT_CANDLES_COUNT, database_plot_duration, database_total_duration,
+         database_size),
+        ("in memory index", CANDLES_COUNT, plot_duration, total_duration, size),
+    ):
+        print(f"{label}: {candles_count} candles x {SERIES_COUNT} series: plot calls: {round(duration, 2)}s, "
+              f"with final write: {round(total, 2)}s ({round(candles_count / total)} candles/s), "
+              f"database size: {round(db_size / 1024 / 1024, 1)}MB")
+    # same rows are written
+    assert size / CANDLES_COUNT < database_size / DATABASE_PLOT_CANDLES_COUNT * 1.1
+    # even with 100 times more candles, each one being slower to plot on database lookups as the tables grow
+    assert CANDLES_COUNT / total_duration > 10 * DATABASE_PLOT_CANDLES_COUNT / database_total_duration
@@ -0,0 +1,291 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import contextlib
+import time
+import pytest
+import mock
+
+import tentacles.Meta.Keywords.scripting_library.orders.waiting as waiting
+import octobot_trading.enums as trading_enums
+import octobot_trading.personal_data as personal_data
+
+from tentacles.Meta.Keywords.scripting_library.tests import event_loop
+
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+
+class _Order:
+    def __init__(self, order_id, chained_orders=None, tag=None):
+        self.order_id = order_id
+        self.exchange_order_id = f"exchange_{order_id}"
+        self.chained_orders = chained_orders or []
+        self.tag = tag
+        self.order_group = None
+        self.closed = False
+        self.created = True
+        self.symbol = "BTC/USDT"
+        self.origin_quantity = 1
+        self.origin_price = 100
+        self.trader = None
+
+    def is_closed(self):
+        return self.closed
+
+    def is_created(self):
+        return self.created
+
+
+async def _get_consumer_instance(consumer_instance):
+    return consumer_instance
+
+
+@contextlib.contextmanager
+def waiting_context(open_orders=None, orders=None, is_backtesting=False):
+    orders_channel = mock.Mock(new_consumer=mock.AsyncMock(side_effect=_get_consumer_instance))
+    trades_channel = mock.Mock(new_consumer=mock.AsyncMock(side_effect=_get_consumer_instance))
+    channels = {
+        personal_data.OrdersChannel.get_name(): orders_channel,
+        personal_data.TradesChannel.get_name(): trades_channel,
+    }
+    ctx = mock.Mock(
+        exchange_manager=mock.Mock(
+            id="exchange_id",
+            is_backtesting=is_backtesting,
+            exchange_personal_data=mock.Mock(orders_manager=mock.Mock(
+                orders=orders if orders is not None else {},
+                get_open_orders=mock.Mock(return_value=open_orders or [])
+            ))
+        )
+    )
+    with mock.patch.object(waiting, "_ORDER_WAITERS_BY_EXCHANGE_ID", {}), \
+            mock.patch.object(waiting, "_ORDER_WAITERS_LOCKS_BY_EXCHANGE_ID", {}), \
+            mock.patch.object(waiting.exchanges_channel, "get_chan",
+                              mock.Mock(side_effect=lambda name, _: channels[name])):
+        yield ctx, orders_channel, trades_channel
+
+
+def _get_consumer(orders_channel):
+    return orders_channel.new_consumer.mock_calls[-1].kwargs["consumer_instance"]
+
+
+async def _push_order_update(orders_channel, order):
+    await _get_consumer(orders_channel).callback("exchange", "exchange_id", "Bitcoin", order.symbol,
+                         {trading_enums.ExchangeConstantsOrderColumns.ID.value: order.order_id},
+                         trading_enums.OrderUpdateType.STATE_CHANGE.value, True)
+
+
+async def _push_trade_update(trades_channel, order, old_trade=False):
+    await _get_consumer(trades_channel).callback("exchange", "exchange_id", "Bitcoin", order.symbol,
+                         {trading_enums.ExchangeConstantsOrderColumns.ORDER_ID.value: order.order_id},
+                         old_trade)
+
+
+async def test_wait_for_orders_close():
+    order = _Order("1")
+    with waiting_context() as (ctx, orders_channel, _):
+        waiting_task = asyncio.create_task(waiting.wait_for_orders_close(ctx, order))
+        await asyncio.sleep(0.01)
+        orders_channel.new_consumer.assert_called_once()
+        assert not waiting_task.done()
+        order.closed = True
+        await _push_order_update(orders_channel, order)
+        await asyncio.wait_for(waiting_task, 0.1)
+        # no remaining waiter
+        assert waiting._ORDER_WAITERS_BY_EXCHANGE_ID["exchange_id"].waiters_by_order_id == {}
+
+        # already closed
+        await asyncio.wait_for(waiting.wait_for_orders_close(ctx, [order]), 0.1)
+
+
+async def test_wait_for_orders_close_waits_for_chained_orders():
+    chained_order = _Order("2")
+    chained_order.created = False
+    order = _Order("1", chained_orders=[chained_order])
+    order.closed = True
+    with waiting_context() as (ctx, orders_channel, _):
+        waiting_task = asyncio.create_task(waiting.wait_for_orders_close(ctx, order))
+        await asyncio.sleep(0.01)
+        chained_order.created = True
+        await _push_order_update(orders_channel, chained_order)
+        await asyncio.sleep(0.01)
+        # chained order is not open yet
+        assert not waiting_task.done()
+        ctx.exchange_manager.exchange_personal_data.orders_manager.get_open_orders.return_value = [chained_order]
+        await _push_order_update(orders_channel, chained_order)
+        await asyncio.wait_for(waiting_task, 0.1)
+
+
+async def test_wait_for_orders_close_on_trade_update():
+    order = _Order("1")
+    with waiting_context() as (ctx, orders_channel, trades_channel):
+        waiting_task = asyncio.create_task(waiting.wait_for_orders_close(ctx, order))
+        await asyncio.sleep(0.01)
+        trades_channel.new_consumer.assert_called_once()
+        # closed orders are not pushed on the orders channel: filled and cancelled orders are woken up by their trade
+        order.closed = True
+        await _push_trade_update(trades_channel, order, old_trade=True)
+        await asyncio.sleep(0.01)
+        assert not waiting_task.done()
+        await _push_trade_update(trades_channel, order)
+        await asyncio.wait_for(waiting_task, 0.1)
+
+
+async def test_wait_for_orders_close_without_update():
+    order = _Order("1")
+    with waiting_context() as (ctx, orders_channel, _), mock.patch.object(waiting._OrderWaiters, "CHECK_INTERVAL", 0.02):
+        waiting_task = asyncio.create_task(waiting.wait_for_orders_close(ctx, order))
+        await asyncio.sleep(0.01)
+        # missed update
+        order.closed = True
+        await asyncio.wait_for(waiting_task, 0.1)
+
+
+async def test_wait_for_orders_close_timeout():
+    order = _Order("1")
+    with waiting_context() as (ctx, orders_channel, _):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(waiting.wait_for_orders_close(ctx, order, timeout=0.05), 0.5)
+        assert waiting._ORDER_WAITERS_BY_EXCHANGE_ID["exchange_id"].waiters_by_order_id == {}
+    with waiting_context(is_backtesting=True) as (ctx, orders_channel, _):
+        with pytest.raises(asyncio.TimeoutError):
+            await waiting.wait_for_orders_close(ctx, order)
+        orders_channel.new_consumer.assert_not_called()
+
+
+async def test_wait_for_orders_close_without_orders_channel():
+    order = _Order("1")
+    with waiting_context() as (ctx, orders_channel, _):
+        waiting.exchanges_channel.get_chan.side_effect = KeyError
+        waiting_task = asyncio.create_task(waiting.wait_for_orders_close(ctx, order))
+        await asyncio.sleep(0.01)
+        order.closed = True
+        # polling
+        await asyncio.wait_for(waiting_task, 0.1)
+        # nothing to remove on exchange stop
+        assert waiting._ORDER_WAITERS_BY_EXCHANGE_ID == {}
+
+
+async def test_concurrent_first_waiters_share_started_order_waiters():
+    with waiting_context() as (ctx, orders_channel, trades_channel):
+        async def _slow_new_consumer(consumer_instance):
+            await asyncio.sleep(0.01)
+            return consumer_instance
+
+        orders_channel.new_consumer.side_effect = _slow_new_consumer
+        order_waiters = await asyncio.gather(*(waiting._get_order_waiters(ctx.exchange_manager) for _ in range(3)))
+        orders_channel.new_consumer.assert_called_once()
+        trades_channel.new_consumer.assert_called_once()
+        # no caller got order waiters without orders consumer
+        assert all(order_waiter is order_waiters[0] for order_waiter in order_waiters)
+        assert order_waiters[0].consumers == [_get_consumer(orders_channel), _get_consumer(trades_channel)]
+        assert waiting._ORDER_WAITERS_BY_EXCHANGE_ID == {"exchange_id": order_waiters[0]}
+        assert waiting._ORDER_WAITERS_LOCKS_BY_EXCHANGE_ID == {}
+
+
+async def test_order_waiters_removed_on_exchange_stop():
+    order = _Order("1")
+    with waiting_context() as (ctx, orders_channel, _):
+        waiting_task = asyncio.create_task(waiting.wait_for_orders_close(ctx, order))
+        await asyncio.sleep(0.01)
+        order_waiters = waiting._ORDER_WAITERS_BY_EXCHANGE_ID["exchange_id"]
+        # stopping exchange channels stops their consumers
+        await _get_consumer(orders_channel).stop()
+        assert waiting._ORDER_WAITERS_BY_EXCHANGE_ID == {}
+        # waiters are not left waiting on a stopped exchange
+        await asyncio.sleep(0.01)
+        assert waiting_task.done()
+        with pytest.raises(asyncio.TimeoutError):
+            await waiting_task
+        assert order_waiters.waiters_by_order_id == {}
+
+        # restarted exchange
+        waiting_task = asyncio.create_task(waiting.wait_for_orders_close(ctx, order))
+        await asyncio.sleep(0.01)
+        assert orders_channel.new_consumer.call_count == 2
+        assert waiting._ORDER_WAITERS_BY_EXCHANGE_ID["exchange_id"] is not order_waiters
+        order.closed = True
+        await _push_order_update(orders_channel, order)
+        await asyncio.wait_for(waiting_task, 0.1)
+
+
+async def test_wait_for_stop_loss_open():
+    stop_order = _Order("2", tag="stop")
+    orders = {"1": _Order("1", tag="entry")}
+    orders["1"].order_group = stop_order.order_group = mock.Mock()
+    with waiting_context(orders=orders) as (ctx, orders_channel, _):
+        waiting_task = asyncio.create_task(waiting.wait_for_stop_loss_open(ctx, order_tag="stop"))
+        await asyncio.sleep(0.01)
+        await _push_order_update(orders_channel, orders["1"])
+        await asyncio.sleep(0.01)
+        assert not waiting_task.done()
+        orders["2"] = stop_order
+        await _push_order_update(orders_channel, stop_order)
+        assert await asyncio.wait_for(waiting_task, 0.1) is stop_order
+        assert waiting._ORDER_WAITERS_BY_EXCHANGE_ID["exchange_id"].any_order_waiters == set()
+
+        assert await waiting.wait_for_stop_loss_open(ctx, order_tag="stop") is stop_order
+        assert await waiting.wait_for_stop_loss_open(ctx, order_tag="other", timeout=0.05) is None
+        ctx.logger.error.assert_called_once()
+
+
+async def test_are_all_chained_orders_created():
+    open_orders = [_Order(str(index)) for index in range(1000)]
+    chained_orders = [_Order(str(index)) for index in range(500)]
+    with waiting_context(open_orders=open_orders) as (ctx, _, __):
+        assert waiting.are_all_chained_orders_created(ctx, [_Order("parent", chained_orders=chained_orders)])
+        ctx.exchange_manager.exchange_personal_data.orders_manager.get_open_orders.assert_called_once()
+        # associated by attributes
+        other_chained_order = _Order("other")
+        assert waiting.are_all_chained_orders_created(ctx, [_Order("parent", chained_orders=[other_chained_order])])
+        other_chained_order.origin_price = 101
+        assert not waiting.are_all_chained_orders_created(ctx,
+                                                          [_Order("parent", chained_orders=[other_chained_order])])
+        other_chained_order.closed = True
+        assert waiting.are_all_chained_orders_created(ctx, [_Order("parent", chained_orders=[other_chained_order])])
+        other_chained_order.created = False
+        assert not waiting.are_all_chained_orders_created(ctx,
+                                                          [_Order("parent", chained_orders=[other_chained_order])])
+
+
+async def test_concurrent_waiters_idle_cpu_time_and_wake_ups():
+    waiters_count = 1000
+    orders = [_Order(str(index)) for index in range(waiters_count)]
+    with waiting_context() as (ctx, orders_channel, _):
+        waiting_tasks = [asyncio.create_task(waiting.wait_for_orders_close(ctx, order)) for order in orders]
+        await asyncio.sleep(0.1)
+        idle_duration = 1
+        cpu_t0 = time.process_time()
+        await asyncio.sleep(idle_duration)
+        idle_cpu_time = time.process_time() - cpu_t0
+        assert not any(task.done() for task in waiting_tasks)
+
+        t0 = time.perf_counter()
+        for index, order in enumerate(orders):
+            order.closed = True
+            await _push_order_update(orders_channel, order)
+            if index % 100 == 0:
+                # let waiters run between updates
+                await asyncio.sleep(0)
+        await asyncio.wait_for(asyncio.gather(*waiting_tasks), waiting._OrderWaiters.CHECK_INTERVAL / 2)
+        wake_up_duration = time.perf_counter() - t0
+        print(f"\n{waiters_count} waiters: {idle_cpu_time * 1000:.1f}ms CPU time over {idle_duration}s idle, "
+              f"all woken up in {wake_up_duration * 1000:.1f}ms")
+        # 10ms polling would check orders 100 times per second and per waiter
+        assert idle_cpu_time < 0.1
+        assert waiting._ORDER_WAITERS_BY_EXCHANGE_ID["exchange_id"].waiters_by_order_id == {}
@@ -126,7 +126,8 @@ def register(blueprint):
             elif action_type == "start_collector":
                 details = flask.request.get_json()
                 success, reply = models.collect_data_file(details["exchange"], details["symbols"], details["time_frames"],
-                                                          details["startTimestamp"], details["endTimestamp"])
+                                                          details["startTimestamp"], details["endTimestamp"],
+                                                          details.get("resumedFile"))
                 if success:
                     web_interface.send_data_collector_status()
             elif action_type == "stop_collector":
@@ -26,11 +26,13 @@ def register(blueprint):
     def currency_price_graph_update(exchange_id, symbol, time_frame, mode="live"):
         in_backtesting = mode != "live"
         display_orders = flask.request.args.get("display_orders", "true") == "true"
+        since = flask.request.args.get("since", None, type=float)
         return flask.jsonify(models.get_currency_price_graph_update(exchange_id,
                                                                     models.get_value_from_dict_or_string(symbol),
                                                                     time_frame,
                                                                     backtesting=in_backtesting,
-                                                                    ignore_orders=not display_orders))
+                                                                    ignore_orders=not display_orders,
+                                                                    since=since))
 
 
     @blueprint.route('/dashboard/first_symbol')
@@ -269,6 +269,8 @@ from tentacles.Services.Interfaces.web_interface.models.trading import (
     get_portfolio_historical_values,
     get_pnl_history_symbols,
     get_pnl_history,
+    register_pnl_history_trade,
+    reset_pnl_histories,
     get_all_orders_data,
     get_all_trades_data,
     get_all_positions_data,
@@ -477,6 +479,8 @@ __all__ = [
     "get_portfolio_historical_values",
     "get_pnl_history_symbols",
     "get_pnl_history",
+    "register_pnl_history_trade",
+    "reset_pnl_histories",
     "get_all_orders_data",
     "get_all_trades_data",
     "get_all_positions_data",
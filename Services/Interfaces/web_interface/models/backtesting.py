@@ -33,6 +33,7 @@ import octobot_backtesting.api as backtesting_api
 import octobot_tentacles_manager.api as tentacles_manager_api
 import octobot_backtesting.constants as backtesting_constants
 import octobot_backtesting.enums as backtesting_enums
+import octobot_backtesting.errors as backtesting_errors
 import octobot_backtesting.collectors as collectors
 import octobot_services.interfaces.util as interfaces_util
 import octobot_services.enums as services_enums
@@ -434,7 +435,8 @@ def get_data_files_from_current_bot(exchange_id, start_timestamp, end_timestamp,
         web_interface_root.WebInterface.tools[constants.BOT_TOOLS_DATA_COLLECTOR] = None
 
 
-def collect_data_file(exchange, symbols, time_frames=None, start_timestamp=None, end_timestamp=None):
+def collect_data_file(exchange, symbols, time_frames=None, start_timestamp=None, end_timestamp=None,
+                      resumed_file=None):
     if not is_backtesting_enabled():
         return False, "Backtesting is disabled."
     if not exchange:
@@ -456,8 +458,11 @@ def collect_data_file(exchange, symbols, time_frames=None, start_timestamp=None,
         exchange_type = trading_enums.ExchangeTypes.SPOT if first_symbol.is_spot() \
             else trading_enums.ExchangeTypes.FUTURE if first_symbol.is_future() \
             else trading_enums.ExchangeTypes.UNKNOWN
-        _background_collect_exchange_historical_data(exchange, exchange_type, symbols, time_frames,
-                                                     start_timestamp, end_timestamp)
+        try:
+            _background_collect_exchange_historical_data(exchange, exchange_type, symbols, time_frames,
+                                                         start_timestamp, end_timestamp, resumed_file)
+        except backtesting_errors.DataCollectorError as err:
+            return False, f"Can't resume data collection: {err}"
         return True, f"Historical data collection started."
     else:
         return False, f"Can't collect data for {symbols} on {exchange} (Historical data collector is already running)"
@@ -476,7 +481,7 @@ async def _start_collect_and_notify(data_collector_instance):
 
 
 def _background_collect_exchange_historical_data(exchange, exchange_type, symbols, time_frames,
-                                                 start_timestamp, end_timestamp):
+                                                 start_timestamp, end_timestamp, resumed_file=None):
     data_collector_instance = backtesting_api.exchange_historical_data_collector_factory(
         exchange,
         exchange_type,
@@ -487,6 +492,9 @@ def _background_collect_exchange_historical_data(exchange, exchange_type, symbol
         end_timestamp=end_timestamp,
         config=interfaces_util.get_bot_api().get_edited_config(dict_only=True),
     )
+    if resumed_file:
+        # continue an interrupted collection instead of collecting the whole history again
+        data_collector_instance.resume(resumed_file)
     web_interface_root.WebInterface.tools[constants.BOT_TOOLS_DATA_COLLECTOR] = data_collector_instance
     coro = _start_collect_and_notify(data_collector_instance)
     threading.Thread(target=asyncio.run, args=(coro,), name=f"DataCollector{symbols}").start()
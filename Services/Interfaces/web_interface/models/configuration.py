@@ -58,6 +58,7 @@ import octobot.constants as octobot_constants
 import octobot.enums as octobot_enums
 import octobot.configuration_manager as configuration_manager
 import octobot.databases_util as octobot_databases_util
+import tentacles.Trading.Exchange.markets_cache as markets_cache
 import tentacles.Services.Interfaces.web_interface.constants as constants
 import tentacles.Services.Interfaces.web_interface.models as models
 import tentacles.Services.Interfaces.web_interface.plugins as web_plugins
@@ -895,24 +896,44 @@ def _get_filtered_exchange_symbols(symbols):
     return [res for res in symbols if octobot_commons.MARKET_SEPARATOR in res]
 
 
+async def _fetch_exchange_symbols(exchange):
+    if exchange in auto_filled_exchanges():
+        async with trading_api.get_new_ccxt_client(
+            exchange, {}, interfaces_util.get_edited_tentacles_config(), False
+        ) as client:
+            await client.load_markets()
+            symbols = client.symbols
+    else:
+        async with getattr(ccxt.async_support, exchange)({'verbose': False}) as client:
+            client.logger.setLevel(logging.INFO)    # prevent log of each request (huge on market statuses)
+            await client.load_markets()
+            symbols = client.symbols
+    # filter symbols with a "." or no "/" because bot can't handle them for now
+    markets_by_exchanges[exchange] = _get_filtered_exchange_symbols(symbols)
+    return markets_by_exchanges[exchange]
+
+
 async def _load_market(exchange, results):
+    cache = markets_cache.MarketsCache.instance()
+    if (symbols := cache.get(exchange, markets_cache.SYMBOLS_CONTENT)) is not None:
+        # up-to-date symbols from a previous run
+        markets_by_exchanges[exchange] = symbols
+        results.append(symbols)
+        return
+    # missing or expired symbols: fetch them now as this coroutine's event loop is closed once markets are loaded,
+    # which would cancel any background refresh
     try:
-        if exchange in auto_filled_exchanges():
-            async with trading_api.get_new_ccxt_client(
-                exchange, {}, interfaces_util.get_edited_tentacles_config(), False
-            ) as client:
-                await client.load_markets()
-                symbols = client.symbols
-        else:
-            async with getattr(ccxt.async_support, exchange)({'verbose': False}) as client:
-                client.logger.setLevel(logging.INFO)    # prevent log of each request (huge on market statuses)
-                await client.load_markets()
-                symbols = client.symbols
-        # filter symbols with a "." or no "/" because bot can't handle them for now
-        markets_by_exchanges[exchange] = _get_filtered_exchange_symbols(symbols)
-        results.append(markets_by_exchanges[exchange])
+        symbols = await _fetch_exchange_symbols(exchange)
+        if symbols:
+            cache.set(exchange, markets_cache.SYMBOLS_CONTENT, symbols)
+        results.append(symbols)
     except Exception as e:
-        _get_logger().exception(e, True, f"error when loading symbol list for {exchange}: {e}")
+        if (symbols := cache.get(exchange, markets_cache.SYMBOLS_CONTENT, allow_expired=True)) is None:
+            _get_logger().exception(e, True, f"error when loading symbol list for {exchange}: {e}")
+        else:
+            _get_logger().warning(f"Using expired {exchange} symbol list: error when refreshing it: {e}")
+            markets_by_exchanges[exchange] = symbols
+            results.append(symbols)
 
 
 def _add_merged_exchanges(exchanges):
@@ -15,6 +15,9 @@
 #  License along with this library.
 import numpy as np
 import math
+import bisect
+import collections
+import threading
 
 import octobot_backtesting.api as backtesting_api
 import octobot_services.interfaces.util as interfaces_util
@@ -88,11 +91,13 @@ def format_orders(order, min_order_time):
     price_key = "price"
     description_key = "description"
     order_side_key = "order_side"
+    id_key = "id"
     formatted_orders = {
         time_key: [],
         price_key: [],
         description_key: [],
-        order_side_key: []
+        order_side_key: [],
+        id_key: [],
     }
     for order in order:
         if order.creation_time > trading_constants.MINIMUM_VAL_TRADE_TIME:
@@ -108,6 +113,7 @@ def format_orders(order, min_order_time):
                 f"at {order.origin_price}"
             )
             formatted_orders[order_side_key].append(order.side.value)
+            formatted_orders[id_key].append(order.order_id)
     return formatted_orders
 
 
@@ -188,8 +194,135 @@ def get_first_symbol_data():
         return {}
 
 
+# historical candles payloads are kept to only convert new candles on each request
+# (exchange_id, symbol, time_frame) => _CandlesPayload, least recently displayed payloads are dropped first
+_CANDLES_PAYLOADS = collections.OrderedDict()
+_CANDLES_PAYLOADS_LOCK = threading.Lock()
+MAX_CACHED_CANDLES_PAYLOADS = 32
+CANDLES_TIME_FORMAT = "%y-%m-%d %H:%M:%S"
+_CANDLES_PAYLOAD_KEYS = {
+    commons_enums.PriceIndexes.IND_PRICE_CLOSE.value: enums.PriceStrings.STR_PRICE_CLOSE.value,
+    commons_enums.PriceIndexes.IND_PRICE_LOW.value: enums.PriceStrings.STR_PRICE_LOW.value,
+    commons_enums.PriceIndexes.IND_PRICE_OPEN.value: enums.PriceStrings.STR_PRICE_OPEN.value,
+    commons_enums.PriceIndexes.IND_PRICE_HIGH.value: enums.PriceStrings.STR_PRICE_HIGH.value,
+    commons_enums.PriceIndexes.IND_PRICE_VOL.value: enums.PriceStrings.STR_PRICE_VOL.value,
+}
+
+
+class _CandlesPayload:
+    """
+    JSON ready historical candles of a symbol and time frame: extended with new candles (and updated for
+    candles dropped from history) instead of being created from the whole history on each request
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.times = []
+        self.candles = _get_empty_candles_payload()
+
+    def update(self, historical_candles):
+        times = historical_candles[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+        new_candles_index = self._get_new_candles_index(times)
+        if new_candles_index is None:
+            self.times = []
+            self.candles = _get_empty_candles_payload()
+            new_candles_index = 0
+        new_times = times[new_candles_index:]
+        self.times.extend(new_times.tolist())
+        self.candles[enums.PriceStrings.STR_PRICE_TIME.value].extend(_convert_candles_times(new_times))
+        for index, key in _CANDLES_PAYLOAD_KEYS.items():
+            self.candles[key].extend(historical_candles[index][new_candles_index:].tolist())
+
+    def get_candles(self, kline, since):
+        """
+        :return: a copy of the candles (from since when provided) with kline as last candle when
+        it is not yet in history
+        """
+        first_index = bisect.bisect_left(self.times, since) if since else 0
+        candles = {
+            key: values[first_index:]
+            for key, values in self.candles.items()
+        }
+        if _should_add_kline(self.times[-1], kline) and (
+            not since or kline[commons_enums.PriceIndexes.IND_PRICE_TIME.value] >= since
+        ):
+            candles[enums.PriceStrings.STR_PRICE_TIME.value].extend(
+                _convert_candles_times(np.array([kline[commons_enums.PriceIndexes.IND_PRICE_TIME.value]]))
+            )
+            for index, key in _CANDLES_PAYLOAD_KEYS.items():
+                candles[key].append(kline[index])
+        return candles
+
+    def _get_new_candles_index(self, times):
+        """
+        Drops cached candles that are not in times anymore
+        :return: the index of the first candle of times to add, None when cached candles are not
+        consistent with times
+        """
+        if not self.times or not len(times):
+            return None
+        first_kept_index = bisect.bisect_left(self.times, times[0])
+        # the last cached candle is always refreshed as it could have been updated
+        last_cached_index = int(np.searchsorted(times, self.times[-1]))
+        if (
+            first_kept_index == len(self.times)
+            or self.times[first_kept_index] != times[0]
+            or last_cached_index == len(times)
+            or times[last_cached_index] != self.times[-1]
+            or len(self.times) - first_kept_index != last_cached_index + 1
+        ):
+            return None
+        del self.times[:first_kept_index]
+        self.times.pop()
+        for values in self.candles.values():
+            del values[:first_kept_index]
+            values.pop()
+        return last_cached_index
+
+
+def _get_empty_candles_payload():
+    return {
+        enums.PriceStrings.STR_PRICE_TIME.value: [],
+        **{key: [] for key in _CANDLES_PAYLOAD_KEYS.values()}
+    }
+
+
+def _convert_candles_times(times):
+    # equivalent to timestamp_util.convert_timestamps_to_datetime with CANDLES_TIME_FORMAT and local timezone
+    # using numpy instead of creating a datetime for each candle
+    local_offset = timestamp_util.LOCAL_TIMEZONE.utcoffset(None).total_seconds()
+    return [
+        # from "2023-11-14T22:13:20" to "23-11-14 22:13:20"
+        f"{datetime_str[2:10]} {datetime_str[11:]}"
+        for datetime_str in np.datetime_as_string(
+            (np.asarray(times, dtype=np.float64) + local_offset).astype("datetime64[s]")
+        ).tolist()
+    ]
+
+
+def _should_add_kline(last_candle_time, kline):
+    # add kline as the last (current) candle when it is not yet in history
+    return math.nan not in kline and last_candle_time != kline[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+
+
+def _get_cached_candles(exchange_id, symbol, time_frame, historical_candles, kline, since):
+    key = (exchange_id, symbol, time_frame)
+    with _CANDLES_PAYLOADS_LOCK:
+        try:
+            candles_payload = _CANDLES_PAYLOADS[key]
+            _CANDLES_PAYLOADS.move_to_end(key)
+        except KeyError:
+            candles_payload = _CANDLES_PAYLOADS[key] = _CandlesPayload()
+            while len(_CANDLES_PAYLOADS) > MAX_CACHED_CANDLES_PAYLOADS:
+                _CANDLES_PAYLOADS.popitem(last=False)
+    with candles_payload.lock:
+        candles_payload.update(historical_candles)
+        return candles_payload.get_candles(kline, since)
+
+
 def _create_candles_data(exchange_manager, symbol, time_frame, historical_candles, kline,
-                         bot_api, list_arrays, in_backtesting, ignore_trades, ignore_orders):
+                         bot_api, list_arrays, in_backtesting, ignore_trades, ignore_orders,
+                         use_candles_cache=False, since=None):
     candles_key = "candles"
     trades_key = "trades"
     orders_key = "orders"
@@ -206,34 +339,32 @@ def _create_candles_data(exchange_manager, symbol, time_frame, historical_candle
     }
     try:
         data = historical_candles
-
-        # add kline as the last (current) candle that is not yet in history
-        if math.nan not in kline and data[commons_enums.PriceIndexes.IND_PRICE_TIME.value][-1] != kline[
-            commons_enums.PriceIndexes.IND_PRICE_TIME.value]:
-            data[commons_enums.PriceIndexes.IND_PRICE_TIME.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_TIME.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_TIME.value])
-            data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value])
-            data[commons_enums.PriceIndexes.IND_PRICE_LOW.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_LOW.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_LOW.value])
-            data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_OPEN.value])
-            data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_HIGH.value])
-            data[commons_enums.PriceIndexes.IND_PRICE_VOL.value] = np.append(
-                data[commons_enums.PriceIndexes.IND_PRICE_VOL.value],
-                kline[commons_enums.PriceIndexes.IND_PRICE_VOL.value])
-        data_x = timestamp_util.convert_timestamps_to_datetime(data[commons_enums.PriceIndexes.IND_PRICE_TIME.value],
-                                                               time_format="%y-%m-%d %H:%M:%S",
-                                                               local_timezone=True)
+        first_candle_time = data[commons_enums.PriceIndexes.IND_PRICE_TIME.value][0]
+        candles_count = len(data[commons_enums.PriceIndexes.IND_PRICE_TIME.value])
+        if _should_add_kline(data[commons_enums.PriceIndexes.IND_PRICE_TIME.value][-1], kline):
+            candles_count += 1
+            if not use_candles_cache:
+                data[commons_enums.PriceIndexes.IND_PRICE_TIME.value] = np.append(
+                    data[commons_enums.PriceIndexes.IND_PRICE_TIME.value],
+                    kline[commons_enums.PriceIndexes.IND_PRICE_TIME.value])
+                data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value] = np.append(
+                    data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value],
+                    kline[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value])
+                data[commons_enums.PriceIndexes.IND_PRICE_LOW.value] = np.append(
+                    data[commons_enums.PriceIndexes.IND_PRICE_LOW.value],
+                    kline[commons_enums.PriceIndexes.IND_PRICE_LOW.value])
+                data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value] = np.append(
+                    data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value],
+                    kline[commons_enums.PriceIndexes.IND_PRICE_OPEN.value])
+                data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value] = np.append(
+                    data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value],
+                    kline[commons_enums.PriceIndexes.IND_PRICE_HIGH.value])
+                data[commons_enums.PriceIndexes.IND_PRICE_VOL.value] = np.append(
+                    data[commons_enums.PriceIndexes.IND_PRICE_VOL.value],
+                    kline[commons_enums.PriceIndexes.IND_PRICE_VOL.value])
         if not ignore_trades:
             # handle trades after the 1st displayed candle start time for dashboard
-            first_time_to_handle_in_board = data[commons_enums.PriceIndexes.IND_PRICE_TIME.value][0]
+            first_time_to_handle_in_board = max(first_candle_time, since or 0)
             trades_history = []
             if trading_api.is_trader_existing_and_enabled(exchange_manager):
                 trades_history += trading_api.get_trade_history(exchange_manager, None, symbol,
@@ -246,28 +377,41 @@ def _create_candles_data(exchange_manager, symbol, time_frame, historical_candle
                 result_dict[orders_key] = format_orders(
                     trading_api.get_open_orders(exchange_manager, symbol=symbol),
                     # align time for historical candles only
-                    data[commons_enums.PriceIndexes.IND_PRICE_TIME.value][0]
-                    if len(data[commons_enums.PriceIndexes.IND_PRICE_TIME.value]) > 2 else 0
+                    first_candle_time if candles_count > 2 else 0
                 )
 
-        if list_arrays:
-            result_dict[candles_key] = {
-                enums.PriceStrings.STR_PRICE_TIME.value: data_x,
-                enums.PriceStrings.STR_PRICE_CLOSE.value: data[
-                    commons_enums.PriceIndexes.IND_PRICE_CLOSE.value].tolist(),
-                enums.PriceStrings.STR_PRICE_LOW.value: data[commons_enums.PriceIndexes.IND_PRICE_LOW.value].tolist(),
-                enums.PriceStrings.STR_PRICE_OPEN.value: data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value].tolist(),
-                enums.PriceStrings.STR_PRICE_HIGH.value: data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value].tolist(),
-                enums.PriceStrings.STR_PRICE_VOL.value: data[commons_enums.PriceIndexes.IND_PRICE_VOL.value].tolist()
-            }
+        if use_candles_cache:
+            result_dict[candles_key] = _get_cached_candles(
+                result_dict[exchange_id_key], symbol, time_frame, data, kline, since
+            )
         else:
-            result_dict[candles_key] = {
-                enums.PriceStrings.STR_PRICE_TIME.value: data_x,
-                enums.PriceStrings.STR_PRICE_CLOSE.value: data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value],
-                enums.PriceStrings.STR_PRICE_LOW.value: data[commons_enums.PriceIndexes.IND_PRICE_LOW.value],
-                enums.PriceStrings.STR_PRICE_OPEN.value: data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value],
-                enums.PriceStrings.STR_PRICE_HIGH.value: data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value]
-            }
+            data_x = timestamp_util.convert_timestamps_to_datetime(
+                data[commons_enums.PriceIndexes.IND_PRICE_TIME.value],
+                time_format=CANDLES_TIME_FORMAT,
+                local_timezone=True
+            )
+            if list_arrays:
+                result_dict[candles_key] = {
+                    enums.PriceStrings.STR_PRICE_TIME.value: data_x,
+                    enums.PriceStrings.STR_PRICE_CLOSE.value: data[
+                        commons_enums.PriceIndexes.IND_PRICE_CLOSE.value].tolist(),
+                    enums.PriceStrings.STR_PRICE_LOW.value: data[
+                        commons_enums.PriceIndexes.IND_PRICE_LOW.value].tolist(),
+                    enums.PriceStrings.STR_PRICE_OPEN.value: data[
+                        commons_enums.PriceIndexes.IND_PRICE_OPEN.value].tolist(),
+                    enums.PriceStrings.STR_PRICE_HIGH.value: data[
+                        commons_enums.PriceIndexes.IND_PRICE_HIGH.value].tolist(),
+                    enums.PriceStrings.STR_PRICE_VOL.value: data[
+                        commons_enums.PriceIndexes.IND_PRICE_VOL.value].tolist()
+                }
+            else:
+                result_dict[candles_key] = {
+                    enums.PriceStrings.STR_PRICE_TIME.value: data_x,
+                    enums.PriceStrings.STR_PRICE_CLOSE.value: data[commons_enums.PriceIndexes.IND_PRICE_CLOSE.value],
+                    enums.PriceStrings.STR_PRICE_LOW.value: data[commons_enums.PriceIndexes.IND_PRICE_LOW.value],
+                    enums.PriceStrings.STR_PRICE_OPEN.value: data[commons_enums.PriceIndexes.IND_PRICE_OPEN.value],
+                    enums.PriceStrings.STR_PRICE_HIGH.value: data[commons_enums.PriceIndexes.IND_PRICE_HIGH.value]
+                }
     except IndexError:
         pass
     return result_dict
@@ -283,7 +427,10 @@ def _ensure_time_frame(time_frame: str):
 
 
 def get_currency_price_graph_update(exchange_id, symbol, time_frame, list_arrays=True, backtesting=False,
-                                    minimal_candles=False, ignore_trades=False, ignore_orders=False):
+                                    minimal_candles=False, ignore_trades=False, ignore_orders=False, since=None):
+    """
+    :param since: when provided, only candles (and trades) from this timestamp are returned for full history requests
+    """
     bot_api = interfaces_util.get_bot_api()
     parsed_symbol = commons_symbols.parse_symbol(parse_get_symbol(symbol))
     in_backtesting = backtesting_api.is_backtesting_enabled(interfaces_util.get_global_config()) or backtesting
@@ -300,7 +447,10 @@ def get_currency_price_graph_update(exchange_id, symbol, time_frame, list_arrays
                 kline = trading_api.get_symbol_klines(symbol_data, time_frame)
             if historical_candles is not None:
                 return _create_candles_data(exchange_manager, symbol_id, time_frame, historical_candles,
-                                            kline, bot_api, list_arrays, in_backtesting, ignore_trades, ignore_orders)
+                                            kline, bot_api, list_arrays, in_backtesting, ignore_trades, ignore_orders,
+                                            # backtesting candles are displayed once
+                                            use_candles_cache=list_arrays and not minimal_candles
+                                            and not in_backtesting, since=since)
         except KeyError:
             traded_pairs = trading_api.get_trading_pairs(exchange_manager)
             if not traded_pairs or symbol_id in traded_pairs:
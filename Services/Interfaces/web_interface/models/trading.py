@@ -13,14 +13,19 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import collections
+import contextlib
 import decimal
 import time
+import threading
 import sortedcontainers
 
 import octobot_services.interfaces.util as interfaces_util
 import octobot_trading.api as trading_api
 import octobot_trading.enums as trading_enums
 import octobot_trading.errors as trading_errors
+import octobot_trading.constants as trading_constants
+import octobot_trading.personal_data as trading_personal_data
 import octobot_commons.enums as commons_enums
 import octobot_commons.constants as commons_constants
 import octobot_commons.logging as logging
@@ -233,32 +238,483 @@ def _convert_timestamp(timestamp):
     return timestamp_util.convert_timestamp_to_datetime(timestamp, time_format='%Y-%m-%d %H:%M:%S', local_timezone=True)
 
 
+_ENTRY_PRICE = "en_p"
+_EXIT_PRICE = "ex_p"
+_ENTRY_TIME = "en_t"
+_ENTRY_DATE = "en_d"
+_EXIT_TIME = "ex_t"
+_EXIT_DATE = "ex_d"
+_ENTRY_SIDE = "en_s"
+_EXIT_SIDE = "ex_s"
+_ENTRY_AMOUNT = "en_a"
+_EXIT_AMOUNT = "ex_a"
+_DETAILS = "d"
+_PNL = "pnl"
+_PNL_AMOUNT = "pnl_a"
+_EXCHANGE = "ex"
+_FEES = "f"
+_SPECIAL_FEES = "s_f"
+_BASE = "b"
+_QUOTE = "q"
+_CURRENCY = "c"
+_SYMBOL = "s"
+_TRADES_COUNT = "tc"
+
+
+class _PnlBucket:
+    """
+    Sum of the pnl of the trades closed in a time bucket
+    """
+    def __init__(self):
+        self.pnl = trading_constants.ZERO
+        self.pnl_a = trading_constants.ZERO
+        self.trades_count = 0
+        # entry id => (pnl position in trades history, TradePnl)
+        self.historical_pnls = {}
+
+    def add(self, entry_id, position, historical_pnl, pnl, pnl_a, trades_count):
+        self.pnl += pnl
+        self.pnl_a += pnl_a
+        self.trades_count += trades_count
+        self.historical_pnls[entry_id] = (position, historical_pnl)
+
+    def remove(self, entry_id, pnl, pnl_a, trades_count):
+        self.pnl -= pnl
+        self.pnl_a -= pnl_a
+        self.trades_count -= trades_count
+        self.historical_pnls.pop(entry_id)
+
+    def get_first_pnl(self):
+        return min(self.historical_pnls.values(), key=_get_position)
+
+    def get_last_pnl(self):
+        return max(self.historical_pnls.values(), key=_get_position)
+
+
+class _ExchangePnlHistory:
+    """
+    Completed trades pnl of an exchange, aggregated by symbol and time bucket.
+    Initialized from the exchange trades history and updated with each new trade instead of
+    being computed from every trade on each request.
+    Outdated when the trades manager history has been reset or its oldest trades removed: it should then
+    be created again.
+    New trades are registered from the bot loop without locking and added on the next request.
+    """
+    MAX_KEPT_CHANGES = 10000
+    MAX_PENDING_TRADES = 10000
+
+    def __init__(self, exchange_manager):
+        self.exchange_manager = exchange_manager
+        self.exchange_name = trading_api.get_exchange_name(exchange_manager)
+        self.lock = threading.Lock()
+        # incremented on each pnl change
+        self.version = 0
+        # entry ids of pnls that can't be computed
+        self.invalid_pnl_entry_ids = set()
+        self._trade_ids = set()
+        # same pairing as trading_api.get_completed_pnl_history: exits are associated to the last trade
+        # of their entry order
+        self._trades_by_order_id = {}
+        self._exits_by_entry_id = {}
+        # entry id => position of its pnl in trades history (order of the first exit trades)
+        self._positions_by_entry_id = {}
+        # entry id => (symbol, close time, pnl, pnl amount, trades count) of valid pnls
+        self._pnl_values_by_entry_id = {}
+        # entry id => TradePnl
+        self._historical_pnls = {}
+        # scale seconds => {symbol: {scaled time: _PnlBucket}}
+        self._buckets_by_scale = {}
+        # (symbol, close time) of the pnls updated by each version since _changes_offset
+        self._changes = []
+        self._changes_offset = 0
+        # trades manager trades and first trade id to identify history reset and oldest trades removals
+        self._trades = exchange_manager.exchange_personal_data.trades_manager.trades
+        self._first_trade_id = next(iter(self._trades), None)
+        # trades registered and not added yet
+        self._pending_trades = collections.deque()
+        # set when pending trades are not requested anymore: trades have to be loaded again
+        self._has_missed_trades = False
+
+    def load_trades_history(self):
+        for trade in trading_api.get_trade_history(self.exchange_manager, as_dict=False):
+            self.add_trade(trade)
+
+    def is_outdated(self) -> bool:
+        trades = self.exchange_manager.exchange_personal_data.trades_manager.trades
+        return self._has_missed_trades or trades is not self._trades or \
+            (self._first_trade_id is not None and self._first_trade_id not in trades)
+
+    def register_trade(self, trade):
+        """
+        Called from the bot loop: never waits for lock
+        """
+        if len(self._pending_trades) >= self.MAX_PENDING_TRADES:
+            self._has_missed_trades = True
+            return
+        self._pending_trades.append(trade)
+
+    def add_pending_trades(self):
+        while self._pending_trades:
+            self.add_trade(self._pending_trades.popleft())
+
+    def add_trade(self, trade):
+        if self._first_trade_id is None:
+            self._first_trade_id = next(iter(self._trades), None)
+        if trade.status is trading_enums.OrderStatus.CANCELED or trade.trade_id in self._trade_ids:
+            return
+        self._trade_ids.add(trade.trade_id)
+        updated_entry_ids = set(trade.associated_entry_ids or ())
+        self._trades_by_order_id[trade.origin_order_id] = trade
+        if trade.origin_order_id in self._exits_by_entry_id:
+            # updated entry trade
+            updated_entry_ids.add(trade.origin_order_id)
+        for entry_id in trade.associated_entry_ids or ():
+            try:
+                self._exits_by_entry_id[entry_id].append(trade)
+            except KeyError:
+                self._exits_by_entry_id[entry_id] = [trade]
+                self._positions_by_entry_id[entry_id] = len(self._positions_by_entry_id)
+        for entry_id in updated_entry_ids:
+            if entry_id in self._trades_by_order_id:
+                self._update_pnl(
+                    entry_id,
+                    trading_personal_data.TradePnl(
+                        [self._trades_by_order_id[entry_id]], self._exits_by_entry_id[entry_id]
+                    )
+                )
+
+    def get_buckets(self, scale_seconds):
+        try:
+            return self._buckets_by_scale[scale_seconds]
+        except KeyError:
+            # first request of this scale: aggregate known pnls
+            buckets = self._buckets_by_scale[scale_seconds] = {}
+            for entry_id, pnl_values in self._pnl_values_by_entry_id.items():
+                self._add_to_buckets(buckets, scale_seconds, entry_id, pnl_values)
+            return buckets
+
+    def get_changes(self, since_version):
+        """
+        :return: the (symbol, close time) of the pnls updated after since_version, None when unknown
+        """
+        if since_version < self._changes_offset:
+            return None
+        return [
+            change
+            for changes in self._changes[since_version - self._changes_offset:]
+            for change in changes
+        ]
+
+    def _update_pnl(self, entry_id, historical_pnl):
+        changes = []
+        if entry_id in self._pnl_values_by_entry_id:
+            symbol, close_time, pnl, pnl_a, trades_count = self._pnl_values_by_entry_id.pop(entry_id)
+            changes.append((symbol, close_time))
+            for scale_seconds, buckets in self._buckets_by_scale.items():
+                symbol_buckets = buckets[symbol]
+                scaled_time = close_time - (close_time % scale_seconds)
+                symbol_buckets[scaled_time].remove(entry_id, pnl, pnl_a, trades_count)
+                if not symbol_buckets[scaled_time].historical_pnls:
+                    symbol_buckets.pop(scaled_time)
+        self.invalid_pnl_entry_ids.discard(entry_id)
+        self._historical_pnls[entry_id] = historical_pnl
+        self._add_changes(changes)
+        if not _is_valid_pnl(historical_pnl):
+            return
+        try:
+            close_time = historical_pnl.get_close_time()
+            pnl_values = (
+                historical_pnl.entries[0].symbol,
+                close_time,
+                historical_pnl.get_profits()[0],
+                historical_pnl.get_closed_close_value(),
+                len(historical_pnl.entries) + len(historical_pnl.closes),
+            )
+        except trading_errors.IncompletePNLError:
+            self.invalid_pnl_entry_ids.add(entry_id)
+            return
+        self._pnl_values_by_entry_id[entry_id] = pnl_values
+        changes.append((pnl_values[0], close_time))
+        for scale_seconds, buckets in self._buckets_by_scale.items():
+            self._add_to_buckets(buckets, scale_seconds, entry_id, pnl_values)
+
+    def _add_changes(self, changes):
+        self.version += 1
+        self._changes.append(changes)
+        if len(self._changes) > self.MAX_KEPT_CHANGES:
+            removed_changes = len(self._changes) // 2
+            del self._changes[:removed_changes]
+            self._changes_offset += removed_changes
+
+    def _add_to_buckets(self, buckets, scale_seconds, entry_id, pnl_values):
+        symbol, close_time, pnl, pnl_a, trades_count = pnl_values
+        scaled_time = close_time - (close_time % scale_seconds)
+        try:
+            bucket = buckets[symbol][scaled_time]
+        except KeyError:
+            bucket = buckets.setdefault(symbol, {})[scaled_time] = _PnlBucket()
+        bucket.add(
+            entry_id, self._positions_by_entry_id[entry_id], self._historical_pnls[entry_id], pnl, pnl_a, trades_count
+        )
+
+
+def _get_position(positioned_element):
+    return positioned_element[0]
+
+
+class _PnlHistoryView:
+    """
+    Formatted pnl history of a request, only the rows of the time buckets with updated pnls are
+    formatted again when exchanges pnl histories change
+    """
+    def __init__(self, scale_seconds, symbol, quote, use_detailed_history):
+        self.scale_seconds = scale_seconds
+        self.symbol = symbol
+        self.quote = quote
+        self.use_detailed_history = use_detailed_history
+        self.pnl_histories = []
+        self.versions = []
+        # scaled time => formatted row
+        self.rows = {}
+        self.pnl_history = []
+        self.lock = threading.Lock()
+
+    def get_pnl_history(self, pnl_histories):
+        with self.lock:
+            return self._get_pnl_history(pnl_histories)
+
+    def _get_pnl_history(self, pnl_histories):
+        versions = [pnl_history.version for pnl_history in pnl_histories]
+        if pnl_histories == self.pnl_histories and versions == self.versions:
+            return self.pnl_history
+        with contextlib.ExitStack() as stack:
+            for pnl_history in pnl_histories:
+                stack.enter_context(pnl_history.lock)
+            versions = [pnl_history.version for pnl_history in pnl_histories]
+            updated_scaled_times = self._get_updated_scaled_times(pnl_histories) \
+                if pnl_histories == self.pnl_histories else None
+            if updated_scaled_times is None:
+                self.rows = {}
+                updated_scaled_times = set(
+                    scaled_time
+                    for pnl_history in pnl_histories
+                    for symbol, buckets in pnl_history.get_buckets(self.scale_seconds).items()
+                    if self._is_selected_symbol(symbol)
+                    for scaled_time in buckets
+                )
+            for scaled_time in updated_scaled_times:
+                row = self._get_row(pnl_histories, scaled_time)
+                if row is None:
+                    self.rows.pop(scaled_time, None)
+                else:
+                    self.rows[scaled_time] = row
+            invalid_pnls = sum(len(pnl_history.invalid_pnl_entry_ids) for pnl_history in pnl_histories)
+        if invalid_pnls:
+            logging.get_logger("TradingModel").warning(f"{invalid_pnls} invalid TradePNLs in history")
+        self.pnl_histories = pnl_histories
+        self.versions = versions
+        self.pnl_history = [self.rows[scaled_time] for scaled_time in sorted(self.rows)]
+        return self.pnl_history
+
+    def _get_updated_scaled_times(self, pnl_histories):
+        updated_scaled_times = set()
+        for pnl_history, version in zip(pnl_histories, self.versions):
+            changes = pnl_history.get_changes(version)
+            if changes is None:
+                return None
+            updated_scaled_times.update(
+                close_time - (close_time % self.scale_seconds)
+                for symbol, close_time in changes
+                if self._is_selected_symbol(symbol)
+            )
+        return updated_scaled_times
+
+    def _is_selected_symbol(self, symbol):
+        return (self.symbol is None or symbol == self.symbol) and \
+            (self.quote is None or commons_symbols.parse_symbol(symbol).quote == self.quote)
+
+    def _get_row(self, pnl_histories, scaled_time):
+        pnl_val = None
+        # quote and details are from the first and last pnl of the time bucket in trades history
+        first_pnl = last_pnl = None
+        for exchange_index, pnl_history in enumerate(pnl_histories):
+            for symbol, buckets in pnl_history.get_buckets(self.scale_seconds).items():
+                if scaled_time not in buckets or not self._is_selected_symbol(symbol):
+                    continue
+                bucket = buckets[scaled_time]
+                if pnl_val is None:
+                    pnl_val = {
+                        _PNL: bucket.pnl,
+                        _PNL_AMOUNT: bucket.pnl_a,
+                        _QUOTE: None,
+                        _TRADES_COUNT: bucket.trades_count,
+                        _DETAILS: None
+                    }
+                else:
+                    pnl_val[_PNL] += bucket.pnl
+                    pnl_val[_PNL_AMOUNT] += bucket.pnl_a
+                    pnl_val[_TRADES_COUNT] += bucket.trades_count
+                position, historical_pnl = bucket.get_first_pnl()
+                if first_pnl is None or (exchange_index, position) < first_pnl[0]:
+                    first_pnl = ((exchange_index, position), historical_pnl)
+                position, historical_pnl = bucket.get_last_pnl()
+                if last_pnl is None or (exchange_index, position) > last_pnl[0]:
+                    last_pnl = ((exchange_index, position), pnl_history.exchange_name, historical_pnl)
+        if pnl_val is None:
+            return None
+        pnl_val[_QUOTE] = first_pnl[1].entries[0].market
+        if self.use_detailed_history:
+            pnl_val[_DETAILS] = _get_pnl_details(last_pnl[1], last_pnl[2])
+        return _format_pnl_row(scaled_time, pnl_val, self.use_detailed_history)
+
+
+# exchange id => _ExchangePnlHistory
+_PNL_HISTORIES = {}
+_PNL_HISTORIES_LOCK = threading.Lock()
+# (exchange, quote, symbol, scale) => _PnlHistoryView, least recently used first
+_PNL_HISTORY_VIEWS = collections.OrderedDict()
+_PNL_HISTORY_VIEWS_LOCK = threading.Lock()
+MAX_PNL_HISTORY_VIEWS = 32
+
+
+def _get_exchange_pnl_history(exchange_manager):
+    exchange_id = trading_api.get_exchange_manager_id(exchange_manager)
+    with _PNL_HISTORIES_LOCK:
+        pnl_history = _PNL_HISTORIES.get(exchange_id)
+        is_up_to_date = pnl_history is not None and pnl_history.exchange_manager is exchange_manager \
+            and not pnl_history.is_outdated()
+        if not is_up_to_date:
+            pnl_history = _PNL_HISTORIES[exchange_id] = _ExchangePnlHistory(exchange_manager)
+            # registered before loading trades history: trades registered meanwhile are added once it is loaded
+            pnl_history.lock.acquire()
+    if is_up_to_date:
+        pnl_history.lock.acquire()
+    try:
+        if not is_up_to_date:
+            pnl_history.load_trades_history()
+        pnl_history.add_pending_trades()
+    finally:
+        pnl_history.lock.release()
+    return pnl_history
+
+
+def register_pnl_history_trade(exchange_id, trade_id):
+    """
+    Updates the pnl history of exchange_id on next request when it has already been computed.
+    Called from the bot loop: never waits for the web interface requests.
+    """
+    try:
+        pnl_history = _PNL_HISTORIES[exchange_id]
+    except KeyError:
+        return
+    if pnl_history.is_outdated():
+        # trades history has been reset or its oldest trades removed: created again on next request
+        return
+    try:
+        trade = pnl_history.exchange_manager.exchange_personal_data.trades_manager.get_trade(trade_id)
+    except KeyError:
+        return
+    pnl_history.register_trade(trade)
+
+
+def reset_pnl_histories():
+    with _PNL_HISTORIES_LOCK:
+        _PNL_HISTORIES.clear()
+    with _PNL_HISTORY_VIEWS_LOCK:
+        _PNL_HISTORY_VIEWS.clear()
+
+
+def _get_pnl_histories(exchange):
+    if exchange:
+        return [_get_exchange_pnl_history(dashboard.get_first_exchange_data(exchange, trading_exchange_only=True)[0])]
+    return [
+        _get_exchange_pnl_history(exchange_manager)
+        for exchange_manager in configuration.get_live_trading_enabled_exchange_managers()
+    ]
+
+
+def _get_pnl_details(exchange_name, historical_pnl):
+    return {
+        _ENTRY_TIME: historical_pnl.get_entry_time(),
+        _ENTRY_DATE: _convert_timestamp(historical_pnl.get_entry_time()),
+        _ENTRY_PRICE: float(historical_pnl.get_entry_price()),
+        _EXIT_PRICE: float(historical_pnl.get_close_price()),
+        _ENTRY_SIDE: historical_pnl.entries[0].side.value,
+        _EXIT_SIDE: historical_pnl.closes[0].side.value,
+        _ENTRY_AMOUNT: historical_pnl.get_total_entry_quantity(),
+        _EXIT_AMOUNT: historical_pnl.get_total_close_quantity(),
+        _SYMBOL: historical_pnl.entries[0].symbol,
+        _FEES: float(historical_pnl.get_paid_regular_fees_in_quote()),
+        _SPECIAL_FEES: [
+            {
+                _CURRENCY: currency,
+                _FEES: float(value),
+            }
+            for currency, value in historical_pnl.get_paid_special_fees_by_currency().items()
+        ],
+        _BASE: historical_pnl.entries[0].currency,
+        _EXCHANGE: exchange_name,
+    }
+
+
+def _format_pnl_row(t, pnl, use_detailed_history):
+    # skip 0 value pnl in detailed history
+    if use_detailed_history and not (pnl[_PNL] or pnl.get(_DETAILS, {}).get(_SPECIAL_FEES, 0)):
+        return None
+    return {
+        _EXIT_TIME: t,
+        _EXIT_DATE: _convert_timestamp(t),
+        _PNL: float(pnl[_PNL]),
+        _PNL_AMOUNT: float(pnl[_PNL_AMOUNT]),
+        _QUOTE: pnl[_QUOTE],
+        _TRADES_COUNT: pnl[_TRADES_COUNT],
+        _DETAILS: pnl[_DETAILS],
+    }
+
+
+def _format_pnl_history(pnl_history, use_detailed_history):
+    return sorted(
+        [
+            row
+            for row in (
+                _format_pnl_row(t, pnl, use_detailed_history)
+                for t, pnl in pnl_history.items()
+            )
+            if row is not None
+        ],
+        key=lambda x: x[_EXIT_TIME]
+    )
+
+
+def _get_scale_seconds(scale):
+    return commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(scale)] * \
+        commons_constants.MINUTE_TO_SECONDS if scale else 1
+
+
 def get_pnl_history(exchange=None, quote=None, symbol=None, since=None, scale=None):
-    ENTRY_PRICE = "en_p"
-    EXIT_PRICE = "ex_p"
-    ENTRY_TIME = "en_t"
-    ENTRY_DATE = "en_d"
-    EXIT_TIME = "ex_t"
-    EXIT_DATE = "ex_d"
-    ENTRY_SIDE = "en_s"
-    EXIT_SIDE = "ex_s"
-    ENTRY_AMOUNT = "en_a"
-    EXIT_AMOUNT = "ex_a"
-    DETAILS = "d"
-    PNL = "pnl"
-    PNL_AMOUNT = "pnl_a"
-    EXCHANGE = "ex"
-    FEES = "f"
-    SPECIAL_FEES = "s_f"
-    BASE = "b"
-    QUOTE = "q"
-    CURRENCY = "c"
-    SYMBOL = "s"
-    TRADES_COUNT = "tc"
+    if since:
+        return _compute_pnl_history(exchange=exchange, quote=quote, symbol=symbol, since=since, scale=scale)
+    symbol = symbol or None
+    # set quote filter to None when symbol is not provided
+    quote = None if symbol else quote
+    key = (exchange, quote, symbol, scale)
+    with _PNL_HISTORY_VIEWS_LOCK:
+        try:
+            pnl_history_view = _PNL_HISTORY_VIEWS[key]
+            _PNL_HISTORY_VIEWS.move_to_end(key)
+        except KeyError:
+            pnl_history_view = _PNL_HISTORY_VIEWS[key] = _PnlHistoryView(
+                _get_scale_seconds(scale), symbol, quote, not scale
+            )
+            while len(_PNL_HISTORY_VIEWS) > MAX_PNL_HISTORY_VIEWS:
+                _PNL_HISTORY_VIEWS.popitem(last=False)
+    return pnl_history_view.get_pnl_history(_get_pnl_histories(exchange))
+
+
+def _compute_pnl_history(exchange=None, quote=None, symbol=None, since=None, scale=None):
     pnl_history = {}
     use_detailed_history = not(scale)
-    scale_seconds = commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(scale)] * \
-        commons_constants.MINUTE_TO_SECONDS if scale else 1
+    scale_seconds = _get_scale_seconds(scale)
     symbol = symbol or None
     # set quote filter to None when symbol is not provided
     quote = None if symbol else quote
@@ -273,60 +729,24 @@ def get_pnl_history(exchange=None, quote=None, symbol=None, since=None, scale=No
                 pnl_a = historical_pnl.get_closed_close_value()
                 if scaled_time not in pnl_history:
                     pnl_history[scaled_time] = {
-                        PNL: pnl,
-                        PNL_AMOUNT: pnl_a,
-                        QUOTE: historical_pnl.entries[0].market,
-                        TRADES_COUNT: len(historical_pnl.entries) + len(historical_pnl.closes),
-                        DETAILS: None
+                        _PNL: pnl,
+                        _PNL_AMOUNT: pnl_a,
+                        _QUOTE: historical_pnl.entries[0].market,
+                        _TRADES_COUNT: len(historical_pnl.entries) + len(historical_pnl.closes),
+                        _DETAILS: None
                     }
                 else:
                     pnl_val = pnl_history[scaled_time]
-                    pnl_val[PNL] += pnl
-                    pnl_val[PNL_AMOUNT] += pnl_a
-                    pnl_val[TRADES_COUNT] += len(historical_pnl.entries) + len(historical_pnl.closes)
+                    pnl_val[_PNL] += pnl
+                    pnl_val[_PNL_AMOUNT] += pnl_a
+                    pnl_val[_TRADES_COUNT] += len(historical_pnl.entries) + len(historical_pnl.closes)
                 if use_detailed_history:
-                    pnl_history[scaled_time][DETAILS] = {
-                        ENTRY_TIME: historical_pnl.get_entry_time(),
-                        ENTRY_DATE: _convert_timestamp(historical_pnl.get_entry_time()),
-                        ENTRY_PRICE: float(historical_pnl.get_entry_price()),
-                        EXIT_PRICE: float(historical_pnl.get_close_price()),
-                        ENTRY_SIDE: historical_pnl.entries[0].side.value,
-                        EXIT_SIDE: historical_pnl.closes[0].side.value,
-                        ENTRY_AMOUNT: historical_pnl.get_total_entry_quantity(),
-                        EXIT_AMOUNT: historical_pnl.get_total_close_quantity(),
-                        SYMBOL: historical_pnl.entries[0].symbol,
-                        FEES: float(historical_pnl.get_paid_regular_fees_in_quote()),
-                        SPECIAL_FEES: [
-                            {
-                                CURRENCY: currency,
-                                FEES: float(value),
-                            }
-                            for currency, value in historical_pnl.get_paid_special_fees_by_currency().items()
-                        ],
-                        BASE: historical_pnl.entries[0].currency,
-                        EXCHANGE: exchange_name,
-                    }
+                    pnl_history[scaled_time][_DETAILS] = _get_pnl_details(exchange_name, historical_pnl)
             except trading_errors.IncompletePNLError:
                 invalid_pnls += 1
     if invalid_pnls:
         logging.get_logger("TradingModel").warning(f"{invalid_pnls} invalid TradePNLs in history")
-    return sorted(
-        [
-            {
-                EXIT_TIME: t,
-                EXIT_DATE: _convert_timestamp(t),
-                PNL: float(pnl[PNL]),
-                PNL_AMOUNT: float(pnl[PNL_AMOUNT]),
-                QUOTE: pnl[QUOTE],
-                TRADES_COUNT: pnl[TRADES_COUNT],
-                DETAILS: pnl[DETAILS],
-            }
-            for t, pnl in pnl_history.items()
-            # skip 0 value pnl in detailed history
-            if not use_detailed_history or (pnl[PNL] or pnl.get(DETAILS, {}).get(SPECIAL_FEES, 0))
-        ],
-        key=lambda x: x[EXIT_TIME]
-    )
+    return _format_pnl_history(pnl_history, use_detailed_history)
 
 
 def _get_dumped_data(real, simulated, dump_func):
@@ -473,6 +893,7 @@ def clear_exchanges_orders_history(simulated_only=False):
 
 def clear_exchanges_trades_history(simulated_only=False):
     _run_on_exchange_ids(trading_api.clear_trades_storage_history, simulated_only=simulated_only)
+    reset_pnl_histories()
     return {"title": "Cleared trades history"}
 
 
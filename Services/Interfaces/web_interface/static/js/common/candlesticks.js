@@ -340,11 +340,54 @@ function push_new_candle(price_trace, volume_trace, candles, candle_index, last_
     volume_trace.marker.color.push(vol_color);
 }
 
+// element_id => Map of order id => {time, price, description, order_side}
+const plotted_open_orders_by_element = {};
+
+function get_plotted_orders(element_id, symbol_price_data){
+    // full open orders snapshots reset the plotted orders, new_data updates only contain changed orders
+    if(isDefined(symbol_price_data["orders"]) || !isDefined(plotted_open_orders_by_element[element_id])){
+        plotted_open_orders_by_element[element_id] = new Map();
+        _update_plotted_orders(plotted_open_orders_by_element[element_id], symbol_price_data["orders"]);
+    }
+    const plotted_orders = plotted_open_orders_by_element[element_id];
+    const orders_update = symbol_price_data["orders_update"];
+    if(isDefined(orders_update)){
+        orders_update.removed.forEach((order_id) => plotted_orders.delete(order_id));
+        _update_plotted_orders(plotted_orders, orders_update.updated);
+    }
+    const orders = {
+        time: [],
+        price: [],
+        description: [],
+        order_side: [],
+    };
+    plotted_orders.forEach((order) => {
+        orders.time.push(order.time);
+        orders.price.push(order.price);
+        orders.description.push(order.description);
+        orders.order_side.push(order.order_side);
+    });
+    return orders;
+}
+
+function _update_plotted_orders(plotted_orders, orders){
+    if(isDefined(orders) && isDefined(orders.time)){
+        orders.time.forEach((time, index) => {
+            plotted_orders.set(isDefined(orders.id) ? orders.id[index] : index, {
+                time: time,
+                price: orders.price[index],
+                description: orders.description[index],
+                order_side: orders.order_side[index],
+            });
+        });
+    }
+}
+
 function create_or_update_candlestick_graph(element_id, symbol_price_data, symbol, exchange_name, time_frame, replace=false){
     if (symbol_price_data) {
         const candles = symbol_price_data["candles"];
         const trades = symbol_price_data["trades"];
-        const orders = symbol_price_data["orders"];
+        const orders = get_plotted_orders(element_id, symbol_price_data);
         const isSimulated = symbol_price_data["simulated"]
 
         let layout = undefined;
@@ -0,0 +1,61 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import collections
+import contextlib
+import mock
+import numpy as np
+
+import octobot_commons.enums as commons_enums
+import octobot_trading.api as trading_api
+import tentacles.Services.Interfaces.web_interface.models.dashboard as dashboard_model
+
+EXCHANGE_ID = "exchange_id"
+SYMBOL = "BTC/USDT"
+TIME_FRAME = commons_enums.TimeFrames.ONE_HOUR.value
+FIRST_CANDLE_TIME = 1700000000
+
+
+def historical_candles(first_index, last_index):
+    times = FIRST_CANDLE_TIME + np.arange(first_index, last_index, dtype=np.float64) * 3600
+    return {
+        commons_enums.PriceIndexes.IND_PRICE_TIME.value: times,
+        commons_enums.PriceIndexes.IND_PRICE_OPEN.value: times / 1e6,
+        commons_enums.PriceIndexes.IND_PRICE_HIGH.value: times / 1e6 + 2,
+        commons_enums.PriceIndexes.IND_PRICE_LOW.value: times / 1e6 - 2,
+        commons_enums.PriceIndexes.IND_PRICE_CLOSE.value: times / 1e6 + 1,
+        commons_enums.PriceIndexes.IND_PRICE_VOL.value: times / 1e5,
+    }
+
+
+def kline(index, close=None):
+    candle_time = FIRST_CANDLE_TIME + index * 3600
+    return [candle_time, candle_time / 1e6, candle_time / 1e6 + 2, candle_time / 1e6 - 2,
+            close or candle_time / 1e6 + 1, candle_time / 1e5]
+
+
+@contextlib.contextmanager
+def candles_payloads():
+    with mock.patch.object(trading_api, "is_trader_simulated", mock.Mock(return_value=True)), \
+         mock.patch.object(trading_api, "get_exchange_manager_id", mock.Mock(return_value=EXCHANGE_ID)), \
+         mock.patch.object(dashboard_model, "_CANDLES_PAYLOADS", collections.OrderedDict()):
+        yield
+
+
+def get_candles(candles, current_kline, use_candles_cache=True, since=None):
+    return dashboard_model._create_candles_data(
+        None, SYMBOL, TIME_FRAME, candles, current_kline, None, True, False, True, True,
+        use_candles_cache=use_candles_cache, since=since
+    )["candles"]
@@ -0,0 +1,67 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import mock
+import pytest
+
+import tentacles.Trading.Exchange.markets_cache as markets_cache
+import tentacles.Services.Interfaces.web_interface.models.configuration as configuration_model
+
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE = "binance"
+CACHED_SYMBOLS = ["BTC/USDT"]
+EXCHANGE_SYMBOLS = ["BTC/USDT", "ETH/USDT"]
+
+
+async def _load_market(cache, fetch_exchange_symbols):
+    results = []
+    with mock.patch.object(configuration_model, "markets_by_exchanges", {}), \
+         mock.patch.object(markets_cache.MarketsCache, "instance", mock.Mock(return_value=cache)), \
+         mock.patch.object(configuration_model, "_fetch_exchange_symbols", fetch_exchange_symbols):
+        await configuration_model._load_market(EXCHANGE, results)
+        return results, dict(configuration_model.markets_by_exchanges)
+
+
+async def test_load_market_from_up_to_date_cache(tmp_path):
+    cache = markets_cache.MarketsCache(cache_folder=str(tmp_path))
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, CACHED_SYMBOLS)
+    fetch_exchange_symbols = mock.AsyncMock(return_value=EXCHANGE_SYMBOLS)
+    assert await _load_market(cache, fetch_exchange_symbols) == ([CACHED_SYMBOLS], {EXCHANGE: CACHED_SYMBOLS})
+    fetch_exchange_symbols.assert_not_called()
+
+
+async def test_load_market_refreshes_expired_cache(tmp_path):
+    cache = markets_cache.MarketsCache(cache_folder=str(tmp_path), ttl=0)
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, CACHED_SYMBOLS)
+    fetch_exchange_symbols = mock.AsyncMock(return_value=EXCHANGE_SYMBOLS)
+    assert (await _load_market(cache, fetch_exchange_symbols))[0] == [EXCHANGE_SYMBOLS]
+    fetch_exchange_symbols.assert_awaited_once_with(EXCHANGE)
+    # refreshed symbols are cached
+    assert markets_cache.MarketsCache(cache_folder=str(tmp_path)).get(
+        EXCHANGE, markets_cache.SYMBOLS_CONTENT
+    ) == EXCHANGE_SYMBOLS
+
+
+async def test_load_market_with_expired_cache_and_exchange_error(tmp_path):
+    cache = markets_cache.MarketsCache(cache_folder=str(tmp_path), ttl=0)
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, CACHED_SYMBOLS)
+    fetch_exchange_symbols = mock.AsyncMock(side_effect=ConnectionError)
+    # expired symbols are better than no symbol
+    assert await _load_market(cache, fetch_exchange_symbols) == ([CACHED_SYMBOLS], {EXCHANGE: CACHED_SYMBOLS})
+    fetch_exchange_symbols.assert_awaited_once_with(EXCHANGE)
+    # without cache
+    assert await _load_market(markets_cache.MarketsCache(cache_folder=str(tmp_path / "empty")),
+                              fetch_exchange_symbols) == ([], {})
@@ -0,0 +1,142 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import contextlib
+import logging
+import os
+import time
+import aiohttp
+import aiohttp.web
+import ccxt.async_support
+import mock
+import pytest
+import pytest_asyncio
+
+import octobot_trading.api as trading_api
+import tentacles.Trading.Exchange.markets_cache as markets_cache
+import tentacles.Services.Interfaces.web_interface.models.configuration as configuration_model
+
+pytestmark = pytest.mark.asyncio
+
+EXCHANGES = ["binance", "kucoin", "okx", "bybit", "gateio"]
+SYMBOLS_COUNT = 2000
+MARKETS_LATENCY = 0.5
+
+
+class FakeMarketsServer:
+    def __init__(self):
+        self.requests_by_exchange = {}
+        self.runner = None
+        self.url = None
+
+    async def start(self):
+        app = aiohttp.web.Application()
+        app.router.add_get("/{exchange}/markets", self._markets)
+        self.runner = aiohttp.web.AppRunner(app)
+        await self.runner.setup()
+        site = aiohttp.web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def _markets(self, request):
+        exchange = request.match_info["exchange"]
+        self.requests_by_exchange[exchange] = self.requests_by_exchange.get(exchange, 0) + 1
+        # simulate remote exchange latency
+        await asyncio.sleep(MARKETS_LATENCY)
+        return aiohttp.web.json_response(
+            [f"{exchange.upper()}{i}/USDT" for i in range(SYMBOLS_COUNT)] + [f"{exchange}.pair"]
+        )
+
+
+def _fake_ccxt_exchange(exchange, server):
+    class FakeCCXTExchange:
+        def __init__(self, config):
+            self.logger = logging.getLogger(exchange)
+            self.symbols = None
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+        async def load_markets(self):
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{server.url}/{exchange}/markets") as response:
+                    self.symbols = await response.json()
+    return FakeCCXTExchange
+
+
+@pytest_asyncio.fixture
+async def markets_server():
+    server = FakeMarketsServer()
+    await server.start()
+    try:
+        yield server
+    finally:
+        await server.stop()
+
+
+@contextlib.contextmanager
+def _restarted_web_interface(server, cache):
+    # a new process: empty in-memory markets and a cache reading from disk
+    with mock.patch.object(configuration_model, "markets_by_exchanges", {}), \
+         mock.patch.object(configuration_model, "MERGED_CCXT_EXCHANGES", {}), \
+         mock.patch.object(configuration_model, "auto_filled_exchanges", mock.Mock(return_value=[])), \
+         mock.patch.object(trading_api, "get_exchange_ids", mock.Mock(return_value=[])), \
+         mock.patch.object(trading_api, "get_exchange_managers_from_exchange_ids", mock.Mock(return_value=[])), \
+         mock.patch.object(markets_cache.MarketsCache, "instance", mock.Mock(return_value=cache)), \
+         contextlib.ExitStack() as stack:
+        for exchange in EXCHANGES:
+            stack.enter_context(
+                mock.patch.object(ccxt.async_support, exchange, _fake_ccxt_exchange(exchange, server))
+            )
+        yield
+
+
+async def _start(server, cache_folder, ttl=markets_cache.DEFAULT_CACHE_TTL):
+    cache = markets_cache.MarketsCache(cache_folder=cache_folder, ttl=ttl)
+    with _restarted_web_interface(server, cache):
+        t0 = time.perf_counter()
+        symbols = await configuration_model._load_markets(EXCHANGES)
+        duration = time.perf_counter() - t0
+        await cache.wait_for_refreshes()
+    return duration, sorted(symbols)
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+async def test_load_markets_startup_benchmark(markets_server, tmp_path):
+    cold_duration, cold_symbols = await _start(markets_server, str(tmp_path))
+    assert markets_server.requests_by_exchange == {exchange: 1 for exchange in EXCHANGES}
+    assert len(cold_symbols) == len(EXCHANGES) * SYMBOLS_COUNT
+
+    warm_duration, warm_symbols = await _start(markets_server, str(tmp_path))
+    # up-to-date cache: no request
+    assert markets_server.requests_by_exchange == {exchange: 1 for exchange in EXCHANGES}
+    assert warm_symbols == cold_symbols
+
+    expired_duration, expired_symbols = await _start(markets_server, str(tmp_path), ttl=0)
+    # expired cache: markets are refreshed
+    assert markets_server.requests_by_exchange == {exchange: 2 for exchange in EXCHANGES}
+    assert expired_symbols == cold_symbols
+
+    print(f"\n{len(EXCHANGES)} exchanges markets loading at startup: cold: {cold_duration:.3f}s, "
+          f"warm: {warm_duration:.3f}s, warm with expired cache: {expired_duration:.3f}s")
+    assert cold_duration >= MARKETS_LATENCY
+    assert warm_duration * 10 < cold_duration
@@ -0,0 +1,102 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import mock
+import numpy as np
+
+import octobot_commons.timestamp_util as timestamp_util
+import tentacles.Services.Interfaces.web_interface.models.dashboard as dashboard_model
+import tentacles.Services.Interfaces.web_interface.tests.web_models as models_tests
+
+
+def test_convert_candles_times():
+    times = np.array([0, 1700000000, 1700000059.9, 4102444800], dtype=np.float64)
+    assert dashboard_model._convert_candles_times(times) == timestamp_util.convert_timestamps_to_datetime(
+        times, time_format=dashboard_model.CANDLES_TIME_FORMAT, local_timezone=True
+    )
+
+
+def test_cached_candles():
+    with models_tests.candles_payloads():
+        # first request
+        candles = models_tests.historical_candles(0, 100)
+        current_kline = models_tests.kline(100)
+        expected = models_tests.get_candles(models_tests.historical_candles(0, 100), current_kline, False)
+        assert len(expected["time"]) == 101
+        assert models_tests.get_candles(candles, current_kline) == expected
+        # same candles, updated kline
+        current_kline = models_tests.kline(100, close=1)
+        assert models_tests.get_candles(candles, current_kline) == \
+            models_tests.get_candles(models_tests.historical_candles(0, 100), current_kline, False)
+        # new candles and first candles out of history
+        candles = models_tests.historical_candles(3, 105)
+        current_kline = models_tests.kline(105)
+        assert models_tests.get_candles(candles, current_kline) == \
+            models_tests.get_candles(models_tests.historical_candles(3, 105), current_kline, False)
+        # kline already in history
+        current_kline = models_tests.kline(104)
+        assert models_tests.get_candles(candles, current_kline) == \
+            models_tests.get_candles(models_tests.historical_candles(3, 105), current_kline, False)
+        # updated last candle
+        candles = models_tests.historical_candles(3, 105)
+        candles[dashboard_model.commons_enums.PriceIndexes.IND_PRICE_CLOSE.value][-1] = 2
+        assert models_tests.get_candles(candles, current_kline)["close"][-1] == 2
+
+
+def test_cached_candles_inconsistent_history():
+    with models_tests.candles_payloads():
+        models_tests.get_candles(models_tests.historical_candles(0, 100), models_tests.kline(100))
+        # history restarted after a gap
+        current_kline = models_tests.kline(300)
+        assert models_tests.get_candles(models_tests.historical_candles(200, 300), current_kline) == \
+            models_tests.get_candles(models_tests.historical_candles(200, 300), current_kline, False)
+        # missing candle in history
+        candles = models_tests.historical_candles(200, 302)
+        for index, values in candles.items():
+            candles[index] = np.delete(values, 100)
+        current_kline = models_tests.kline(302)
+        assert models_tests.get_candles(candles, current_kline)["time"] == \
+            dashboard_model._convert_candles_times(
+                np.append(candles[dashboard_model.commons_enums.PriceIndexes.IND_PRICE_TIME.value], current_kline[0])
+            )
+
+
+def test_cached_candles_since():
+    with models_tests.candles_payloads():
+        current_kline = models_tests.kline(100)
+        since = models_tests.kline(97)[0]
+        candles = models_tests.get_candles(models_tests.historical_candles(0, 100), current_kline, since=since)
+        expected = models_tests.get_candles(models_tests.historical_candles(0, 100), current_kline, False)
+        assert candles == {key: values[-4:] for key, values in expected.items()}
+        # only the kline is returned
+        candles = models_tests.get_candles(models_tests.historical_candles(0, 100), current_kline,
+                                           since=current_kline[0])
+        assert candles == {key: values[-1:] for key, values in expected.items()}
+
+
+def test_cached_candles_payloads_count():
+    with models_tests.candles_payloads(), \
+         mock.patch.object(dashboard_model, "MAX_CACHED_CANDLES_PAYLOADS", 2):
+        current_kline = models_tests.kline(100)
+        for symbol in ("BTC/USDT", "ETH/USDT", "BTC/USDT", "SOL/USDT"):
+            dashboard_model._get_cached_candles(
+                models_tests.EXCHANGE_ID, symbol, models_tests.TIME_FRAME,
+                models_tests.historical_candles(0, 100), current_kline, None
+            )
+        # least recently displayed payload is dropped
+        assert list(dashboard_model._CANDLES_PAYLOADS) == [
+            (models_tests.EXCHANGE_ID, "BTC/USDT", models_tests.TIME_FRAME),
+            (models_tests.EXCHANGE_ID, "SOL/USDT", models_tests.TIME_FRAME),
+        ]
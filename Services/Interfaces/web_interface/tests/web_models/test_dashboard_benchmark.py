@@ -0,0 +1,53 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import os
+import time
+import pytest
+
+import tentacles.Services.Interfaces.web_interface.tests.web_models as models_tests
+
+HISTORY_SIZE = 10000
+POLLS_COUNT = 200
+
+
+def _poll(use_candles_cache, since=None):
+    with models_tests.candles_payloads():
+        payload_sizes = []
+        t0 = time.perf_counter()
+        for poll in range(POLLS_COUNT):
+            # a new candle every 10 polls, history is a sliding window
+            new_candles = poll // 10
+            candles = models_tests.get_candles(
+                models_tests.historical_candles(new_candles, HISTORY_SIZE + new_candles),
+                models_tests.kline(HISTORY_SIZE + new_candles, close=poll),
+                use_candles_cache=use_candles_cache,
+                since=None if since is None else models_tests.kline(HISTORY_SIZE + new_candles - since)[0]
+            )
+            payload_sizes.append(len(candles["time"]))
+        return time.perf_counter() - t0, payload_sizes
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+def test_dashboard_polling_benchmark():
+    previous_duration, previous_sizes = _poll(False)
+    cached_duration, cached_sizes = _poll(True)
+    tail_duration, tail_sizes = _poll(True, since=1)
+    print(f"\n{POLLS_COUNT} polls of {HISTORY_SIZE} candles: full history: {previous_duration:.3f}s, "
+          f"cached full history: {cached_duration:.3f}s, cached tail: {tail_duration:.3f}s")
+    assert previous_sizes == cached_sizes == [HISTORY_SIZE + 1] * POLLS_COUNT
+    assert tail_sizes == [2] * POLLS_COUNT
+    assert cached_duration * 3 < previous_duration
+    assert tail_duration * 10 < previous_duration
@@ -0,0 +1,265 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import decimal
+import os
+import threading
+import time
+import types
+import mock
+import pytest
+
+import octobot_trading.api as trading_api
+import octobot_trading.enums as trading_enums
+import octobot_trading.personal_data as trading_personal_data
+import tentacles.Services.Interfaces.web_interface.models.configuration as configuration
+import tentacles.Services.Interfaces.web_interface.models.trading as trading_model
+
+EXCHANGE_ID = "exchange_id"
+SYMBOLS = ["BTC/USDT", "ETH/USDT", "ETH/BTC"]
+FIRST_TRADE_TIME = 1700000000
+
+
+class FakeTradesManager:
+    def __init__(self):
+        self.trades = {}
+
+    def get_trade(self, trade_id):
+        return self.trades[trade_id]
+
+    def get_trades(self):
+        return list(self.trades.values())
+
+    def get_completed_trades_pnl(self, trades_history=None, selected_trades=None):
+        return trading_personal_data.TradesManager.get_completed_trades_pnl(self, trades_history, selected_trades)
+
+
+def _trade(trades_manager, order_id, symbol, side, price, executed_time, entry_ids=None, quantity="1",
+           status=trading_enums.OrderStatus.FILLED):
+    base, quote = symbol.split("/")
+    trade = types.SimpleNamespace(
+        trade_id=f"trade-{len(trades_manager.trades)}",
+        origin_order_id=order_id,
+        associated_entry_ids=entry_ids,
+        status=status,
+        executed_time=executed_time,
+        canceled_time=0,
+        executed_price=decimal.Decimal(str(price)),
+        executed_quantity=decimal.Decimal(quantity),
+        side=side,
+        fee=None,
+        symbol=symbol,
+        market=quote,
+        currency=base,
+    )
+    trades_manager.trades[trade.trade_id] = trade
+    return trade
+
+
+def _add_round_trips(trades_manager, count, start=0):
+    trades = []
+    for index in range(start, start + count):
+        symbol = SYMBOLS[index % len(SYMBOLS)]
+        entry_time = FIRST_TRADE_TIME + index * 600
+        trades.append(_trade(trades_manager, f"entry-{index}", symbol, trading_enums.TradeOrderSide.BUY,
+                             100 + index % 7, entry_time))
+        trades.append(_trade(trades_manager, f"exit-{index}", symbol, trading_enums.TradeOrderSide.SELL,
+                             105 + index % 11, entry_time + 300, entry_ids=[f"entry-{index}"]))
+    return trades
+
+
+@pytest.fixture
+def trades_manager():
+    trades_manager = FakeTradesManager()
+    exchange_manager = mock.Mock(exchange_personal_data=mock.Mock(trades_manager=trades_manager))
+    with mock.patch.object(configuration, "get_live_trading_enabled_exchange_managers",
+                           mock.Mock(return_value=[exchange_manager])), \
+         mock.patch.object(trading_api, "get_exchange_name", mock.Mock(return_value="binance")), \
+         mock.patch.object(trading_api, "get_exchange_manager_id", mock.Mock(return_value=EXCHANGE_ID)):
+        trading_model.reset_pnl_histories()
+        yield trades_manager
+        trading_model.reset_pnl_histories()
+
+
+def _register(trades):
+    for trade in trades:
+        trading_model.register_pnl_history_trade(EXCHANGE_ID, trade.trade_id)
+
+
+def _assert_equals_computed_pnl_history(**kwargs):
+    assert trading_model.get_pnl_history(**kwargs) == trading_model._compute_pnl_history(**kwargs)
+
+
+def _assert_all_equals_computed_pnl_history():
+    for scale in ("", "1h", "1d"):
+        _assert_equals_computed_pnl_history(scale=scale)
+        _assert_equals_computed_pnl_history(scale=scale, symbol="ETH/USDT")
+        _assert_equals_computed_pnl_history(scale=scale, quote="USDT")
+
+
+def test_get_pnl_history(trades_manager):
+    _add_round_trips(trades_manager, 30)
+    _assert_all_equals_computed_pnl_history()
+    assert trading_model.get_pnl_history_symbols() == set(SYMBOLS)
+
+    # new trades from trades channel
+    _register(_add_round_trips(trades_manager, 5, start=30))
+    # exit trade received before its entry trade
+    exit_trade = _trade(trades_manager, "exit-late", "BTC/USDT", trading_enums.TradeOrderSide.SELL, 120,
+                        FIRST_TRADE_TIME + 100000, entry_ids=["entry-late"])
+    _register([exit_trade])
+    _assert_all_equals_computed_pnl_history()
+    entry_trade = _trade(trades_manager, "entry-late", "BTC/USDT", trading_enums.TradeOrderSide.BUY, 100,
+                         FIRST_TRADE_TIME + 90000)
+    _register([entry_trade, entry_trade])
+    _assert_all_equals_computed_pnl_history()
+    # partial exit and new fill of an entry order
+    _register([
+        _trade(trades_manager, "exit-late-2", "BTC/USDT", trading_enums.TradeOrderSide.SELL, 150,
+               FIRST_TRADE_TIME + 200000, entry_ids=["entry-late"]),
+        _trade(trades_manager, "entry-late", "BTC/USDT", trading_enums.TradeOrderSide.BUY, 90,
+               FIRST_TRADE_TIME + 91000, quantity="2"),
+        _trade(trades_manager, "exit-cancelled", "BTC/USDT", trading_enums.TradeOrderSide.SELL, 150,
+               FIRST_TRADE_TIME + 300000, entry_ids=["entry-0"], status=trading_enums.OrderStatus.CANCELED),
+    ])
+    _assert_all_equals_computed_pnl_history()
+
+
+def test_get_pnl_history_after_many_changes(trades_manager):
+    _add_round_trips(trades_manager, 3, start=1)
+    _assert_all_equals_computed_pnl_history()
+    with mock.patch.object(trading_model._ExchangePnlHistory, "MAX_KEPT_CHANGES", 4):
+        # changes of previous requests are not kept anymore: views are computed again
+        _register(_add_round_trips(trades_manager, 10, start=4))
+        _assert_all_equals_computed_pnl_history()
+        _register(_add_round_trips(trades_manager, 2, start=14))
+        _assert_all_equals_computed_pnl_history()
+
+
+def test_reset_pnl_histories(trades_manager):
+    _add_round_trips(trades_manager, 3, start=1)
+    assert len(trading_model.get_pnl_history(scale="")) == 3
+    # not registered: history is not updated
+    _add_round_trips(trades_manager, 2, start=4)
+    assert len(trading_model.get_pnl_history(scale="")) == 3
+    trading_model.reset_pnl_histories()
+    assert len(trading_model.get_pnl_history(scale="")) == 5
+
+
+def test_get_pnl_history_after_oldest_trades_removal(trades_manager):
+    _add_round_trips(trades_manager, 10)
+    _assert_all_equals_computed_pnl_history()
+    # trades manager history size limit reached: oldest trades are removed
+    for trade_id in list(trades_manager.trades)[:6]:
+        trades_manager.trades.pop(trade_id)
+    _register(_add_round_trips(trades_manager, 2, start=10))
+    assert trading_model._PNL_HISTORIES[EXCHANGE_ID].is_outdated()
+    _assert_all_equals_computed_pnl_history()
+
+
+def test_get_pnl_history_after_trades_history_reset(trades_manager):
+    _add_round_trips(trades_manager, 10)
+    _assert_all_equals_computed_pnl_history()
+    # trades history reloaded
+    trades_manager.trades = {}
+    _add_round_trips(trades_manager, 3, start=20)
+    assert len(trading_model.get_pnl_history(scale="")) == 3
+    _assert_all_equals_computed_pnl_history()
+
+
+def test_register_trade_while_loading_history(trades_manager):
+    _add_round_trips(trades_manager, 10)
+    get_trade_history = trading_api.get_trade_history
+    registering_threads = []
+
+    def _get_trade_history(exchange_manager, as_dict):
+        history = get_trade_history(exchange_manager, as_dict=as_dict)
+        # trades received by the bot while the web interface loads trades history
+        new_trades = _add_round_trips(trades_manager, 1, start=10)
+        registering_threads.append(threading.Thread(target=_register, args=(new_trades, )))
+        registering_threads[0].start()
+        time.sleep(0.05)
+        return history
+
+    with mock.patch.object(trading_api, "get_trade_history", mock.Mock(side_effect=_get_trade_history)):
+        trading_model.get_pnl_history(scale="")
+    registering_threads[0].join()
+    assert len(trading_model.get_pnl_history(scale="")) == 11
+    _assert_all_equals_computed_pnl_history()
+
+
+def test_register_trade_while_computing_pnl_history(trades_manager):
+    _add_round_trips(trades_manager, 10)
+    assert len(trading_model.get_pnl_history(scale="")) == 10
+    pnl_history = trading_model._PNL_HISTORIES[EXCHANGE_ID]
+    with pnl_history.lock:
+        # registering trades does not wait for web interface requests
+        _register(_add_round_trips(trades_manager, 2, start=10))
+    assert len(trading_model.get_pnl_history(scale="")) == 12
+    _assert_all_equals_computed_pnl_history()
+
+
+def test_register_too_many_trades_without_request(trades_manager):
+    _add_round_trips(trades_manager, 10)
+    assert len(trading_model.get_pnl_history(scale="")) == 10
+    with mock.patch.object(trading_model._ExchangePnlHistory, "MAX_PENDING_TRADES", 3):
+        _register(_add_round_trips(trades_manager, 1, start=10))
+        assert not trading_model._PNL_HISTORIES[EXCHANGE_ID].is_outdated()
+        _register(_add_round_trips(trades_manager, 1, start=11))
+        # trades are missing: history is loaded again
+        assert trading_model._PNL_HISTORIES[EXCHANGE_ID].is_outdated()
+        assert len(trading_model.get_pnl_history(scale="")) == 12
+        _assert_all_equals_computed_pnl_history()
+
+
+def test_pnl_history_views_count(trades_manager):
+    _add_round_trips(trades_manager, 3)
+    with mock.patch.object(trading_model, "MAX_PNL_HISTORY_VIEWS", 2):
+        trading_model.get_pnl_history(scale="1h")
+        trading_model.get_pnl_history(scale="1d")
+        trading_model.get_pnl_history(scale="1h")
+        trading_model.get_pnl_history(scale="")
+        # least recently used view is removed
+        assert list(trading_model._PNL_HISTORY_VIEWS) == [(None, None, None, "1h"), (None, None, None, "")]
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it")
+def test_get_pnl_history_after_100k_trades(trades_manager):
+    _add_round_trips(trades_manager, 50000)
+    t0 = time.perf_counter()
+    trading_model._compute_pnl_history(scale="1h")
+    computed_duration = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pnl_history = trading_model.get_pnl_history(scale="1h")
+    first_request_duration = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(100):
+        assert trading_model.get_pnl_history(scale="1h") is pnl_history
+    repeated_requests_duration = (time.perf_counter() - t0) / 100
+
+    new_trades = _add_round_trips(trades_manager, 1, start=50000)
+    t0 = time.perf_counter()
+    _register(new_trades)
+    updated_pnl_history = trading_model.get_pnl_history(scale="1h")
+    updated_request_duration = time.perf_counter() - t0
+    print(f"\nPnl history of 100k trades: computed: {computed_duration:.3f}s, first request: "
+          f"{first_request_duration:.3f}s, repeated requests: {repeated_requests_duration * 1000:.3f}ms, "
+          f"request after a new trade: {updated_request_duration * 1000:.3f}ms")
+    assert updated_pnl_history == trading_model._compute_pnl_history(scale="1h")
+    assert sum(pnl["pnl"] for pnl in updated_pnl_history) == \
+        pytest.approx(sum(pnl["pnl"] for pnl in pnl_history) + float(new_trades[1].executed_price - new_trades[0].executed_price))
+    assert repeated_requests_duration * 1000 < computed_duration
+    assert updated_request_duration * 100 < computed_duration
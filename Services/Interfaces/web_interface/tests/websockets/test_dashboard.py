@@ -0,0 +1,214 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import json
+import decimal
+import mock
+import pytest
+
+import octobot_trading.enums as trading_enums
+import octobot_trading.api as octobot_trading_api
+import tentacles.Services.Interfaces.web_interface.models as models
+import tentacles.Services.Interfaces.web_interface.websockets as websockets
+import tentacles.Services.Interfaces.web_interface.websockets.dashboard as dashboard
+
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE_ID = "exchange_id"
+SYMBOL = "BTC/USDT"
+OPEN_ORDERS_COUNT = 50
+BURST_ORDERS_COUNT = 1000
+CLIENT_ID = "client_id"
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.messages = []
+        self.sent_bytes = 0
+
+    def emit(self, event, data, namespace=None, to=None):
+        self.messages.append((event, data))
+        self.sent_bytes += len(json.dumps(data, default=str))
+
+
+class FakeOrder:
+    def __init__(self, order_id, price):
+        self.order_id = order_id
+        self.origin_price = decimal.Decimal(str(price))
+        self.origin_quantity = decimal.Decimal("0.1")
+        self.quantity_currency = "BTC"
+        self.order_type = trading_enums.TraderOrderType.BUY_LIMIT
+        self.side = trading_enums.TradeOrderSide.BUY
+        self.creation_time = 1700000000 + order_id
+
+    def to_dict(self):
+        return {trading_enums.ExchangeConstantsOrderColumns.ID.value: self.order_id}
+
+
+@pytest.fixture
+def open_orders():
+    orders = {}
+    with mock.patch.object(octobot_trading_api, "get_exchange_manager_from_exchange_id", mock.Mock()), \
+         mock.patch.object(octobot_trading_api, "is_trader_simulated", mock.Mock(return_value=True)), \
+         mock.patch.object(octobot_trading_api, "get_open_orders",
+                           mock.Mock(side_effect=lambda *_, **__: list(orders.values()))):
+        yield orders
+
+
+@pytest.fixture
+def namespace():
+    namespace = dashboard.DashboardNamespace("/dashboard")
+    namespace.socketio = FakeSocketIO()
+    namespace.clients_count = 1
+    namespace.sent_open_orders_by_client[CLIENT_ID] = {}
+    # don't wait for the default window in tests
+    namespace.new_data_aggregator.window = 0.01
+    yield namespace
+    namespace.new_data_aggregator.clear()
+
+
+def _orders_burst(open_orders):
+    # grid like burst: each new order fills the oldest open one
+    for order_id in range(BURST_ORDERS_COUNT):
+        order = FakeOrder(order_id, 30000 + order_id % 100)
+        open_orders[order_id] = order
+        yield order
+        if len(open_orders) > OPEN_ORDERS_COUNT:
+            yield open_orders.pop(next(iter(open_orders)))
+
+
+def _apply_orders_update(client_orders, orders_update):
+    for order_id in orders_update["removed"]:
+        # orders opened and closed in between can be unknown to clients
+        client_orders.pop(order_id, None)
+    updated = orders_update["updated"]
+    for index, order_id in enumerate(updated["id"]):
+        client_orders[order_id] = updated["price"][index]
+
+
+async def test_events_aggregator():
+    sent = []
+    aggregator = websockets.EventsAggregator(lambda key, events: sent.append((key, events)), 0.01)
+    aggregator.add("a", 1)
+    aggregator.add("b", 2)
+    aggregator.add("a", 3)
+    assert sent == []
+    await asyncio.sleep(0.05)
+    assert sent == [("a", [1, 3]), ("b", [2])]
+    aggregator.add("a", 4)
+    aggregator.clear()
+    await asyncio.sleep(0.05)
+    assert sent == [("a", [1, 3]), ("b", [2])]
+
+
+async def test_events_aggregator_without_event_loop():
+    sent = []
+    aggregator = websockets.EventsAggregator(lambda key, events: sent.append((key, events)), 0.01)
+    await asyncio.get_event_loop().run_in_executor(None, aggregator.add, "a", 1)
+    assert sent == [("a", [1])]
+
+
+async def test_no_client(namespace, open_orders):
+    namespace.clients_count = 0
+    assert namespace.all_clients_send_notifications(exchange_id=EXCHANGE_ID, order={}, symbol=SYMBOL) is False
+    await asyncio.sleep(namespace.new_data_aggregator.window * 2)
+    assert namespace.socketio.messages == []
+
+
+async def test_orders_update(namespace, open_orders):
+    client_orders = {}
+    window = namespace.new_data_aggregator.window
+    for order_id in range(3):
+        open_orders[order_id] = FakeOrder(order_id, 100 + order_id)
+        namespace.all_clients_send_notifications(exchange_id=EXCHANGE_ID, order=open_orders[order_id].to_dict(),
+                                                 symbol=SYMBOL)
+    await asyncio.sleep(window * 2)
+    assert len(namespace.socketio.messages) == 1
+    event, data = namespace.socketio.messages[-1]
+    assert event == "new_data"
+    assert data["data"]["symbol"] == SYMBOL
+    assert data["data"]["exchange_id"] == EXCHANGE_ID
+    assert data["data"]["orders_update"]["updated"]["id"] == [0, 1, 2]
+    assert data["data"]["orders_update"]["removed"] == []
+    _apply_orders_update(client_orders, data["data"]["orders_update"])
+
+    # order 0 is filled, order 1 is edited, order 3 is created and filled before being sent
+    filled_order = open_orders.pop(0)
+    open_orders[1].origin_price = decimal.Decimal(110)
+    created_order = FakeOrder(3, 103)
+    for order in (filled_order, open_orders[1], created_order, created_order):
+        namespace.all_clients_send_notifications(exchange_id=EXCHANGE_ID, order=order.to_dict(), symbol=SYMBOL)
+    namespace.all_clients_send_notifications(exchange_id=EXCHANGE_ID, trades=[], symbol=SYMBOL)
+    await asyncio.sleep(window * 2)
+    assert len(namespace.socketio.messages) == 2
+    orders_update = namespace.socketio.messages[-1][1]["data"]["orders_update"]
+    assert orders_update["updated"]["id"] == [1]
+    assert sorted(orders_update["removed"]) == [0, 3]
+    _apply_orders_update(client_orders, orders_update)
+    assert client_orders == {1: 110, 2: 102}
+
+
+async def test_orders_update_by_client(namespace, open_orders):
+    window = namespace.new_data_aggregator.window
+    sent_clients = []
+    namespace.socketio.emit = lambda event, data, namespace=None, to=None: sent_clients.append((to, data))
+    open_orders[0] = FakeOrder(0, 100)
+    namespace.all_clients_send_notifications(exchange_id=EXCHANGE_ID, order=open_orders[0].to_dict(), symbol=SYMBOL)
+    await asyncio.sleep(window * 2)
+    assert [client_id for client_id, _ in sent_clients] == [CLIENT_ID]
+
+    # a new client connects: it did not receive the first open order
+    namespace.sent_open_orders_by_client["other_client_id"] = {}
+    sent_clients.clear()
+    open_orders[1] = FakeOrder(1, 101)
+    namespace.all_clients_send_notifications(exchange_id=EXCHANGE_ID, order=open_orders[1].to_dict(), symbol=SYMBOL)
+    await asyncio.sleep(window * 2)
+    updated_ids_by_client = {
+        client_id: data["data"]["orders_update"]["updated"]["id"]
+        for client_id, data in sent_clients
+    }
+    assert updated_ids_by_client == {CLIENT_ID: [1], "other_client_id": [0, 1]}
+
+
+async def test_orders_burst(namespace, open_orders):
+    # previous behavior: one message with every open order for each update
+    legacy_socketio = FakeSocketIO()
+    for order in _orders_burst(open_orders):
+        legacy_socketio.emit("new_data", {"data": {
+            "trades": models.format_trades(None),
+            "orders": models.format_orders(octobot_trading_api.get_open_orders(None, symbol=SYMBOL), 0),
+            "simulated": True,
+            "symbol": SYMBOL,
+            "exchange_id": EXCHANGE_ID,
+        }})
+    open_orders.clear()
+
+    client_orders = {}
+    for order in _orders_burst(open_orders):
+        namespace.all_clients_send_notifications(exchange_id=EXCHANGE_ID, order=order.to_dict(), symbol=SYMBOL)
+    await asyncio.sleep(namespace.new_data_aggregator.window * 2)
+    for _, data in namespace.socketio.messages:
+        _apply_orders_update(client_orders, data["data"]["orders_update"])
+    assert client_orders == {order_id: float(order.origin_price) for order_id, order in open_orders.items()}
+
+    print(f"{BURST_ORDERS_COUNT} orders burst: "
+          f"{len(legacy_socketio.messages)} messages, {legacy_socketio.sent_bytes} bytes before, "
+          f"{len(namespace.socketio.messages)} messages, {namespace.socketio.sent_bytes} bytes after")
+    assert len(legacy_socketio.messages) == 2 * BURST_ORDERS_COUNT - OPEN_ORDERS_COUNT
+    assert len(namespace.socketio.messages) == 1
+    assert namespace.socketio.sent_bytes * 100 < legacy_socketio.sent_bytes
@@ -27,6 +27,7 @@ import octobot_services.constants as services_constants
 import octobot_services.interfaces as services_interfaces
 import octobot_services.interfaces.util as interfaces_util
 import octobot_trading.api as trading_api
+import octobot_trading.enums as trading_enums
 import octobot.configuration_manager as configuration_manager
 import octobot.enums
 import tentacles.Services.Interfaces.web_interface.constants as constants
@@ -37,6 +38,7 @@ import tentacles.Services.Interfaces.web_interface.plugins as web_interface_plug
 import tentacles.Services.Interfaces.web_interface.flask_util as flask_util
 import tentacles.Services.Interfaces.web_interface.util as web_interface_util
 import tentacles.Services.Interfaces.web_interface as web_interface_root
+import tentacles.Services.Interfaces.web_interface.models as web_interface_models
 import tentacles.Services.Interfaces.web_interface.controllers
 import tentacles.Services.Interfaces.web_interface.advanced_controllers
 import tentacles.Services.Interfaces.web_interface.api
@@ -136,6 +138,9 @@ class WebInterface(services_interfaces.AbstractWebInterface):
             exchange_id,
             symbol
         )
+        web_interface_models.register_pnl_history_trade(
+            exchange_id, trade[trading_enums.ExchangeConstantsOrderColumns.ID.value]
+        )
 
     @staticmethod
     async def _web_orders_callback(exchange: str, exchange_id: str, cryptocurrency: str, symbol: str, order,
@@ -18,6 +18,11 @@
 namespaces = []
 
 
+from tentacles.Services.Interfaces.web_interface.websockets import events_aggregator
+from tentacles.Services.Interfaces.web_interface.websockets.events_aggregator import (
+    EventsAggregator,
+)
+
 from tentacles.Services.Interfaces.web_interface.websockets import abstract_websocket_namespace_notifier
 from tentacles.Services.Interfaces.web_interface.websockets.abstract_websocket_namespace_notifier import (
     AbstractWebSocketNamespaceNotifier,
@@ -49,6 +54,7 @@ from tentacles.Services.Interfaces.web_interface.websockets.strategy_optimizer i
 
 
 __all__ = [
+    "EventsAggregator",
     "AbstractWebSocketNamespaceNotifier",
     "websocket_with_login_required_when_activated",
     "BacktestingNamespace",
@@ -14,6 +14,7 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 
+import flask
 import flask_socketio
 
 import octobot_commons.pretty_printer as pretty_printer
@@ -26,6 +27,13 @@ import tentacles.Services.Interfaces.web_interface.websockets as websockets
 
 
 class DashboardNamespace(websockets.AbstractWebSocketNamespaceNotifier):
+    NEW_DATA_AGGREGATION_WINDOW = 0.25
+
+    def __init__(self, namespace=None):
+        super().__init__(namespace)
+        self.new_data_aggregator = websockets.EventsAggregator(self._send_new_data, self.NEW_DATA_AGGREGATION_WINDOW)
+        # client sid => {(exchange_id, symbol) => {order id: formatted order}} of the open orders sent to this client
+        self.sent_open_orders_by_client = {}
 
     @staticmethod
     def _get_profitability():
@@ -56,31 +64,88 @@ class DashboardNamespace(websockets.AbstractWebSocketNamespaceNotifier):
         return profitability_data
 
     @staticmethod
-    def _format_new_data(exchange_id=None, trades=None, order=None, symbol=None):
-        exchange_manager = octobot_trading_api.get_exchange_manager_from_exchange_id(exchange_id)
+    def _get_open_orders(exchange_manager, symbol):
+        """
+        :return: the formatted open orders by id
+        """
+        formatted_orders = models.format_orders(octobot_trading_api.get_open_orders(exchange_manager, symbol=symbol), 0)
         return {
-            "trades": models.format_trades(trades),
-            "orders": models.format_orders(octobot_trading_api.get_open_orders(exchange_manager, symbol=symbol), 0),
-            "simulated": octobot_trading_api.is_trader_simulated(exchange_manager),
-            "symbol": symbol,
-            "exchange_id": exchange_id
+            order_id: (time, price, description, order_side)
+            for time, price, description, order_side, order_id in zip(
+                formatted_orders["time"], formatted_orders["price"], formatted_orders["description"],
+                formatted_orders["order_side"], formatted_orders["id"]
+            )
+        }
+
+    def _get_orders_update(self, client_id, key, open_orders, updated_order_ids):
+        """
+        :return: the open orders added or updated since the last data sent to this client and the ids of the
+        removed ones
+        """
+        sent_open_orders_by_key = self.sent_open_orders_by_client.setdefault(client_id, {})
+        sent_open_orders = sent_open_orders_by_key.get(key, {})
+        sent_open_orders_by_key[key] = open_orders
+        updated_orders = {
+            "time": [],
+            "price": [],
+            "description": [],
+            "order_side": [],
+            "id": [],
         }
+        for order_id, order in open_orders.items():
+            if sent_open_orders.get(order_id) != order:
+                for key, value in zip(updated_orders, (*order, order_id)):
+                    updated_orders[key].append(value)
+        return {
+            "updated": updated_orders,
+            "removed": [
+                order_id
+                for order_id in (*sent_open_orders, *(updated_order_ids - sent_open_orders.keys()))
+                if order_id not in open_orders
+            ],
+        }
+
+    def _send_new_data(self, key, events):
+        exchange_id, symbol = key
+        try:
+            exchange_manager = octobot_trading_api.get_exchange_manager_from_exchange_id(exchange_id)
+            trades = models.format_trades([trade for event in events for trade in event["trades"] or ()])
+            simulated = octobot_trading_api.is_trader_simulated(exchange_manager)
+            open_orders = self._get_open_orders(exchange_manager, symbol)
+            # also remove orders that opened and closed since the last sent data: clients might have fetched them
+            updated_order_ids = {
+                event["order"][trading_enums.ExchangeConstantsOrderColumns.ID.value]
+                for event in events
+                if event["order"]
+            }
+            # clients connected at different times know different open orders: send each one its own update
+            for client_id in list(self.sent_open_orders_by_client):
+                self.socketio.emit("new_data",
+                                   {
+                                       "data": {
+                                           "trades": trades,
+                                           "orders_update": self._get_orders_update(
+                                               client_id, key, open_orders, updated_order_ids
+                                           ),
+                                           "simulated": simulated,
+                                           "symbol": symbol,
+                                           "exchange_id": exchange_id
+                                       }
+                                   },
+                                   namespace=self.namespace,
+                                   to=client_id)
+        except Exception as e:
+            self.logger.exception(e, True, f"Error when sending web notification: {e}")
 
     @websockets.websocket_with_login_required_when_activated
     def on_profitability(self):
         flask_socketio.emit("profitability", self._get_profitability())
 
-    def all_clients_send_notifications(self, **kwargs) -> bool:
+    def all_clients_send_notifications(self, exchange_id=None, trades=None, order=None, symbol=None) -> bool:
         if self._has_clients():
-            try:
-                self.socketio.emit("new_data",
-                                   {
-                                       "data": self._format_new_data(**kwargs)
-                                   },
-                                   namespace=self.namespace)
-                return True
-            except Exception as e:
-                self.logger.exception(e, True, f"Error when sending web notification: {e}")
+            # trades and orders updates can come in bursts: send them at once
+            self.new_data_aggregator.add((exchange_id, symbol), {"trades": trades, "order": order})
+            return True
         return False
 
     @websockets.websocket_with_login_required_when_activated
@@ -96,14 +161,23 @@ class DashboardNamespace(websockets.AbstractWebSocketNamespaceNotifier):
                                                                ignore_trades=True,
                                                                ignore_orders=not models.get_display_orders())
             })
+            # full snapshots reset the client open orders: send every open order in its next update
+            self.sent_open_orders_by_client.get(flask.request.sid, {}).pop(
+                (data["exchange_id"], models.get_value_from_dict_or_string(data["symbol"])), None
+            )
         except KeyError:
             flask_socketio.emit("error", "missing exchange manager")
 
     @websockets.websocket_with_login_required_when_activated
     def on_connect(self):
         super().on_connect()
+        self.sent_open_orders_by_client[flask.request.sid] = {}
         self.on_profitability()
 
+    def on_disconnect(self, reason):
+        super().on_disconnect(reason)
+        self.sent_open_orders_by_client.pop(flask.request.sid, None)
+
 
 notifier = DashboardNamespace('/dashboard')
 web_interface.register_notifier(web_interface.DASHBOARD_NOTIFICATION_KEY, notifier)
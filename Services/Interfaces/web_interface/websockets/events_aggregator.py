@@ -0,0 +1,52 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+
+
+class EventsAggregator:
+    """
+    Collects events by key during a short window and sends them at once through send_callback(key, events)
+    """
+
+    def __init__(self, send_callback, window):
+        self.send_callback = send_callback
+        self.window = window
+        self._events_by_key = {}
+        self._flush_handle = None
+
+    def add(self, key, event):
+        try:
+            self._events_by_key[key].append(event)
+        except KeyError:
+            self._events_by_key[key] = [event]
+        if self._flush_handle is None:
+            try:
+                self._flush_handle = asyncio.get_running_loop().call_later(self.window, self.flush)
+            except RuntimeError:
+                # not called from an event loop: nothing to wait for events with
+                self.flush()
+
+    def flush(self):
+        self._flush_handle = None
+        events_by_key, self._events_by_key = self._events_by_key, {}
+        for key, events in events_by_key.items():
+            self.send_callback(key, events)
+
+    def clear(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._events_by_key = {}
@@ -1 +1,2 @@
-from .gpt import GPTService
\ No newline at end of file
+from .gpt import GPTService, BATCHED_PROMPTS_INSTRUCTIONS
+from .requests_optimizer import TokenBucketLimiter, ResponsesCache, PromptsBatcher
@@ -15,6 +15,7 @@
 #  License along with this library.
 import asyncio
 import os
+import re
 import typing
 import uuid
 import openai
@@ -36,6 +37,8 @@ import octobot_commons.configuration.fields_utils as fields_utils
 import octobot.constants as constants
 import octobot.community as community
 
+import tentacles.Services.Services_bases.gpt_service.requests_optimizer as requests_optimizer
+
 
 NO_SYSTEM_PROMPT_MODELS = [
     "o1-mini",
@@ -48,12 +51,19 @@ MINIMAL_PARAMS_MODELS = [
 ]
 SYSTEM = "system"
 USER = "user"
+BATCHED_PROMPTS_INSTRUCTIONS = (
+    "Several inputs are given, one per line, formatted as 'ID: input'. "
+    "Answer each input on its own line, formatted as 'ID: answer'."
+)
+BATCHED_ANSWER_PATTERN = re.compile(r"^\W*(\d+)\s*[:.)\]-]\s*(.+)$")
 
 
 class GPTService(services.AbstractService):
     BACKTESTING_ENABLED = True
     DEFAULT_MODEL = "gpt-3.5-turbo"
     NO_TOKEN_LIMIT_VALUE = -1
+    MAX_REQUESTS_PER_MINUTE = 500
+    MAX_CONCURRENT_REQUESTS = 10
 
     def get_fields_description(self):
         if self._env_secret_key is None:
@@ -88,6 +98,13 @@ class GPTService(services.AbstractService):
         self._daily_tokens_limit: int = self._env_daily_token_limit
         self.consumed_daily_tokens: int = 1
         self.last_consumed_token_date: datetime.date = None
+        self.rate_limiter = requests_optimizer.TokenBucketLimiter(
+            self.MAX_REQUESTS_PER_MINUTE / commons_constants.MINUTE_TO_SECONDS,
+            self.MAX_CONCURRENT_REQUESTS,
+            self.MAX_CONCURRENT_REQUESTS
+        )
+        self.responses_cache = requests_optimizer.ResponsesCache()
+        self.prompts_batcher = requests_optimizer.PromptsBatcher(self._send_prompts_batch)
 
     @staticmethod
     def create_message(role, content, model: str = None):
@@ -112,7 +129,12 @@ class GPTService(services.AbstractService):
         version: str = None,
         candle_open_time: float = None,
         use_stored_signals: bool = False,
+        allow_batching: bool = False,
     ) -> str:
+        """
+        :param allow_batching: when True, [instructions, prompt] messages can be sent together with other prompts
+        using the same instructions, model and parameters for the same candle
+        """
         if use_stored_signals:
             return self._get_signal_from_stored_signals(exchange, symbol, time_frame, version, candle_open_time)
         if self.use_stored_signals_only():
@@ -124,7 +146,72 @@ class GPTService(services.AbstractService):
                     f"for timestamp: {candle_open_time} with version: {version}"
                 )
             return signal
-        return await self._get_signal_from_gpt(messages, model, max_tokens, n, stop, temperature)
+        model = model or self.model
+        cache_key = self.responses_cache.get_key(model, messages, max_tokens, n, stop, temperature)
+        signal = self.responses_cache.get(cache_key)
+        if signal is not None:
+            return signal
+        if allow_batching and len(messages) == 2 and n == 1 and stop is None:
+            instructions, prompt = messages
+            signal = await self.prompts_batcher.submit(
+                (
+                    model, instructions["role"], instructions["content"], prompt["role"],
+                    max_tokens, temperature, time_frame, candle_open_time
+                ),
+                prompt["content"]
+            )
+        else:
+            signal = await self._get_signal_from_gpt(messages, model, max_tokens, n, stop, temperature)
+        if signal:
+            self.responses_cache.set(cache_key, signal)
+        return signal
+
+    async def _send_prompts_batch(self, batch_key, prompts: list) -> dict:
+        model, instructions_role, instructions, prompts_role, max_tokens, temperature, _, _ = batch_key
+        if len(prompts) == 1:
+            return {prompts[0]: await self._get_batched_prompt_signal(batch_key, prompts[0])}
+        answer = await self._get_signal_from_gpt(
+            [
+                {"role": instructions_role, "content": f"{instructions}\n{BATCHED_PROMPTS_INSTRUCTIONS}"},
+                {
+                    "role": prompts_role,
+                    "content": "\n".join(
+                        f"{index}: {' '.join(prompt.splitlines())}" for index, prompt in enumerate(prompts, 1)
+                    )
+                },
+            ],
+            model, max_tokens, 1, None, temperature
+        )
+        answers = self._parse_batched_answer(answer, prompts)
+        if missing_prompts := [prompt for prompt in prompts if not answers.get(prompt)]:
+            # answers can't be identified: ask separately
+            self.logger.debug(f"Missing {len(missing_prompts)}/{len(prompts)} answers in batched request answer")
+            missing_answers = await asyncio.gather(*(
+                self._get_batched_prompt_signal(batch_key, prompt)
+                for prompt in missing_prompts
+            ))
+            answers.update(zip(missing_prompts, missing_answers))
+        return answers
+
+    async def _get_batched_prompt_signal(self, batch_key, prompt: str) -> str:
+        model, instructions_role, instructions, prompts_role, max_tokens, temperature, _, _ = batch_key
+        return await self._get_signal_from_gpt(
+            [
+                {"role": instructions_role, "content": instructions},
+                {"role": prompts_role, "content": prompt},
+            ],
+            model, max_tokens, 1, None, temperature
+        )
+
+    @staticmethod
+    def _parse_batched_answer(answer: typing.Optional[str], prompts: list) -> dict:
+        answers = {}
+        for line in (answer or "").splitlines():
+            if match := BATCHED_ANSWER_PATTERN.match(line.strip()):
+                index = int(match.group(1)) - 1
+                if 0 <= index < len(prompts):
+                    answers[prompts[index]] = match.group(2).strip()
+        return answers
 
     def _get_client(self) -> openai.AsyncOpenAI:
         return openai.AsyncOpenAI(
@@ -169,14 +256,15 @@ class GPTService(services.AbstractService):
                     f"The {model} model does not support every required parameter, results might not be as accurate "
                     f"as with other models."
                 )
-            completions = await self._get_client().chat.completions.create(
-                model=model,
-                max_completion_tokens=max_tokens,
-                n=n,
-                stop=stop,
-                temperature=temperature if supports_params else openai.NOT_GIVEN,
-                messages=messages
-            )
+            async with self.rate_limiter.acquire():
+                completions = await self._get_client().chat.completions.create(
+                    model=model,
+                    max_completion_tokens=max_tokens,
+                    n=n,
+                    stop=stop,
+                    temperature=temperature if supports_params else openai.NOT_GIVEN,
+                    messages=messages
+                )
             self._update_token_usage(completions.usage.total_tokens)
             return completions.choices[0].message.content
         except (
@@ -438,4 +526,4 @@ class GPTService(services.AbstractService):
         return not self.config
 
     async def stop(self):
-        pass
+        await self.prompts_batcher.stop()
@@ -0,0 +1,178 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import collections
+import contextlib
+import hashlib
+import json
+import time
+
+
+class TokenBucketLimiter:
+    """
+    Limits the rate of requests using a token bucket refilled at rate tokens per second up to capacity tokens
+    and the number of requests running at the same time
+    """
+    def __init__(self, rate: float, capacity: float, max_concurrent_requests: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_concurrent_requests = max_concurrent_requests
+        self._tokens = capacity
+        self._last_refill_time = time.monotonic()
+        self._semaphore = None
+        self._lock = None
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, cost: float = 1):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._lock = asyncio.Lock()
+        async with self._semaphore:
+            await self._consume(cost)
+            yield
+
+    async def _consume(self, cost):
+        # lock to serve waiting requests in order
+        async with self._lock:
+            self._refill()
+            if self._tokens < cost:
+                await asyncio.sleep((cost - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= cost
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill_time) * self.rate)
+        self._last_refill_time = now
+
+
+class ResponsesCache:
+    """
+    LRU cache of completions identified by the hash of their request content
+    """
+    DEFAULT_MAX_SIZE = 2048
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._values = collections.OrderedDict()
+
+    @staticmethod
+    def get_key(*request_elements) -> str:
+        return hashlib.sha256(
+            json.dumps(request_elements, sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def get(self, key):
+        try:
+            value = self._values[key]
+            self._values.move_to_end(key)
+            self.hits += 1
+            return value
+        except KeyError:
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        self._values[key] = value
+        self._values.move_to_end(key)
+        while len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0,
+            "size": len(self._values),
+        }
+
+    def clear(self):
+        self._values.clear()
+        self.hits = self.misses = 0
+
+
+class PromptsBatcher:
+    """
+    Groups prompts submitted with the same batch key during window seconds (or until max_batch_size prompts
+    are waiting) and sends them at once using send_batch(batch_key, prompts) which returns a
+    {prompt: answer} dict. Identical prompts of a batch are sent once.
+    """
+    DEFAULT_WINDOW = 0.5
+    DEFAULT_MAX_BATCH_SIZE = 25
+
+    def __init__(self, send_batch, window=DEFAULT_WINDOW, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        self.send_batch = send_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        # batch key => (future by prompt, flush timer handle)
+        self._pending = {}
+        self._sending_tasks = set()
+
+    async def submit(self, batch_key, prompt):
+        try:
+            futures_by_prompt, _ = self._pending[batch_key]
+        except KeyError:
+            futures_by_prompt = {}
+            self._pending[batch_key] = (
+                futures_by_prompt, asyncio.get_running_loop().call_later(self.window, self.flush, batch_key)
+            )
+        try:
+            future = futures_by_prompt[prompt]
+        except KeyError:
+            future = futures_by_prompt[prompt] = asyncio.get_running_loop().create_future()
+            if len(futures_by_prompt) >= self.max_batch_size:
+                self.flush(batch_key)
+        # shield: a cancelled caller should not cancel the answer of other callers of the same prompt
+        return await asyncio.shield(future)
+
+    def flush(self, batch_key):
+        try:
+            futures_by_prompt, handle = self._pending.pop(batch_key)
+        except KeyError:
+            return
+        handle.cancel()
+        task = asyncio.create_task(self._send(batch_key, futures_by_prompt))
+        self._sending_tasks.add(task)
+        task.add_done_callback(self._sending_tasks.discard)
+
+    async def _send(self, batch_key, futures_by_prompt):
+        try:
+            answers = await self.send_batch(batch_key, list(futures_by_prompt))
+            for prompt, future in futures_by_prompt.items():
+                if not future.done():
+                    future.set_result(answers.get(prompt))
+        except asyncio.CancelledError:
+            for future in futures_by_prompt.values():
+                future.cancel()
+            raise
+        except Exception as err:
+            for future in futures_by_prompt.values():
+                if not future.done():
+                    future.set_exception(err)
+
+    async def stop(self):
+        for futures_by_prompt, handle in self._pending.values():
+            handle.cancel()
+            for future in futures_by_prompt.values():
+                future.cancel()
+        self._pending.clear()
+        sending_tasks = list(self._sending_tasks)
+        for task in sending_tasks:
+            task.cancel()
+        await asyncio.gather(*sending_tasks, return_exceptions=True)
@@ -0,0 +1,107 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import contextlib
+import re
+import time
+
+import aiohttp.web
+
+import octobot_commons.logging as commons_logging
+import octobot_services.constants as services_constants
+
+import tentacles.Services.Services_bases.gpt_service as gpt_service
+
+
+class FakeCompletionServer:
+    """
+    Local openai-like chat completion server answering "ID: up 70%" for each "ID: input" line of batched prompts
+    and "up 70%" otherwise
+    """
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.received_requests = []
+        self.runner = None
+        self.url = None
+
+    async def start(self):
+        app = aiohttp.web.Application()
+        app.router.add_post("/v1/chat/completions", self._chat_completions)
+        self.runner = aiohttp.web.AppRunner(app)
+        await self.runner.setup()
+        site = aiohttp.web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/v1"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def _chat_completions(self, request):
+        body = await request.json()
+        self.received_requests.append(body)
+        await asyncio.sleep(self.latency)
+        prompt = body["messages"][-1]["content"]
+        if gpt_service.BATCHED_PROMPTS_INSTRUCTIONS in body["messages"][0]["content"]:
+            content = "\n".join(
+                f"{match.group(1)}: up 70%"
+                for match in re.finditer(r"^(\d+): ", prompt, re.MULTILINE)
+            )
+        else:
+            content = "up 70%"
+        return aiohttp.web.json_response({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+        })
+
+
+@contextlib.asynccontextmanager
+async def fake_completion_server(latency=0.05):
+    server = FakeCompletionServer(latency=latency)
+    await server.start()
+    try:
+        yield server
+    finally:
+        await server.stop()
+
+
+def create_gpt_service(base_url):
+    service = gpt_service.GPTService()
+    service.logger = commons_logging.get_logger(service.get_name())
+    service.config = {
+        services_constants.CONFIG_CATEGORY_SERVICES: {
+            services_constants.CONFIG_GPT: {
+                services_constants.CONIG_OPENAI_SECRET_KEY: "fake-key",
+                services_constants.CONIG_LLM_CUSTOM_BASE_URL: base_url,
+            }
+        }
+    }
+    return service
+
+
+def get_messages(service, inputs):
+    return [
+        service.create_message("system", "Predict: {up or down} {confidence%} (no other information)"),
+        service.create_message("user", inputs),
+    ]
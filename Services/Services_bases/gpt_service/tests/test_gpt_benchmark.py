@@ -0,0 +1,69 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import os
+import time
+import pytest
+
+import tentacles.Services.Services_bases.gpt_service.tests as gpt_service_tests
+
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it"),
+]
+
+SYMBOLS_COUNT = 50
+
+
+async def _evaluate_symbols(service, candle_open_time, allow_batching):
+    async def ask(index):
+        return await service.get_chat_completion(
+            gpt_service_tests.get_messages(service, f"{index + candle_open_time}, {index * 2}, {index * 3}"),
+            symbol=f"S{index}/USDT", time_frame="1h", candle_open_time=candle_open_time,
+            allow_batching=allow_batching
+        )
+
+    t0 = time.perf_counter()
+    answers = await asyncio.gather(*(ask(index) for index in range(SYMBOLS_COUNT)))
+    assert answers == ["up 70%"] * SYMBOLS_COUNT
+    return time.perf_counter() - t0
+
+
+async def test_50_symbols_requests_and_latency():
+    async with gpt_service_tests.fake_completion_server(latency=0.1) as server:
+        service = gpt_service_tests.create_gpt_service(server.url)
+        not_batched_duration = await _evaluate_symbols(service, 1, False)
+        not_batched_requests = len(server.received_requests)
+
+        server.received_requests.clear()
+        batched_duration = await _evaluate_symbols(service, 2, True)
+        batched_requests = len(server.received_requests)
+
+        server.received_requests.clear()
+        cached_duration = await _evaluate_symbols(service, 2, True)
+        cached_requests = len(server.received_requests)
+    print(
+        f"\n{SYMBOLS_COUNT} symbols on the same candle: "
+        f"one request per symbol: {not_batched_requests} requests in {not_batched_duration * 1000:.1f}ms, "
+        f"batched: {batched_requests} requests in {batched_duration * 1000:.1f}ms, "
+        f"cached: {cached_requests} requests in {cached_duration * 1000:.1f}ms"
+    )
+    assert not_batched_requests == SYMBOLS_COUNT
+    assert batched_requests == SYMBOLS_COUNT // service.prompts_batcher.max_batch_size
+    assert cached_requests == 0
+    assert batched_duration * 2 < not_batched_duration
+    assert cached_duration * 10 < batched_duration
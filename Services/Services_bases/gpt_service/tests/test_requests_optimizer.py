@@ -0,0 +1,192 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+import mock
+import pytest
+
+import octobot_services.errors as errors
+import tentacles.Services.Services_bases.gpt_service as gpt_service
+import tentacles.Services.Services_bases.gpt_service.tests as gpt_service_tests
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_token_bucket_limiter_rate():
+    limiter = gpt_service.TokenBucketLimiter(rate=100, capacity=5, max_concurrent_requests=10)
+
+    async def request():
+        async with limiter.acquire():
+            pass
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(15)))
+    # 5 requests from the bucket capacity, then 10 at 100 requests per second
+    assert 0.08 <= time.perf_counter() - t0 < 0.5
+
+
+async def test_token_bucket_limiter_concurrency():
+    limiter = gpt_service.TokenBucketLimiter(rate=1000, capacity=1000, max_concurrent_requests=3)
+    running = []
+    max_running = 0
+
+    async def request():
+        nonlocal max_running
+        async with limiter.acquire():
+            running.append(1)
+            max_running = max(max_running, len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+    await asyncio.gather(*(request() for _ in range(20)))
+    assert max_running == 3
+
+
+async def test_responses_cache():
+    cache = gpt_service.ResponsesCache(max_size=2)
+    key_1 = cache.get_key("model", [{"role": "user", "content": "1, 2, 3"}])
+    assert key_1 == cache.get_key("model", [{"role": "user", "content": "1, 2, 3"}])
+    key_2 = cache.get_key("model", [{"role": "user", "content": "1, 2, 4"}])
+    key_3 = cache.get_key("other_model", [{"role": "user", "content": "1, 2, 3"}])
+    assert len({key_1, key_2, key_3}) == 3
+    assert cache.get(key_1) is None
+    cache.set(key_1, "up 70%")
+    cache.set(key_2, "down 70%")
+    assert cache.get(key_1) == "up 70%"
+    # key_2 is the least recently used value
+    cache.set(key_3, "down 10%")
+    assert cache.get(key_2) is None
+    assert cache.get(key_1) == "up 70%"
+    assert cache.get(key_3) == "down 10%"
+    assert cache.get_stats() == {"hits": 3, "misses": 2, "hit_rate": 3 / 5, "size": 2}
+    cache.clear()
+    assert cache.get_stats()["size"] == 0
+
+
+async def test_prompts_batcher():
+    sent_batches = []
+
+    async def send_batch(batch_key, prompts):
+        sent_batches.append((batch_key, prompts))
+        return {prompt: f"{batch_key}-{prompt}" for prompt in prompts}
+
+    batcher = gpt_service.PromptsBatcher(send_batch, window=0.01, max_batch_size=3)
+    answers = await asyncio.gather(
+        batcher.submit("a", "1"), batcher.submit("a", "2"), batcher.submit("b", "1"), batcher.submit("a", "1"),
+    )
+    assert answers == ["a-1", "a-2", "b-1", "a-1"]
+    # identical prompts are sent once
+    assert sorted(sent_batches) == [("a", ["1", "2"]), ("b", ["1"])]
+
+    # full batches are sent without waiting for the window
+    sent_batches.clear()
+    batcher.window = 10
+    answers = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit("a", str(i)) for i in range(3))), 1
+    )
+    assert answers == ["a-0", "a-1", "a-2"]
+    assert sent_batches == [("a", ["0", "1", "2"])]
+
+
+async def test_prompts_batcher_error():
+    async def send_batch(batch_key, prompts):
+        raise errors.InvalidRequestError("error")
+
+    batcher = gpt_service.PromptsBatcher(send_batch, window=0.01)
+    results = await asyncio.gather(batcher.submit("a", "1"), batcher.submit("a", "2"), return_exceptions=True)
+    assert all(isinstance(result, errors.InvalidRequestError) for result in results)
+
+
+async def test_prompts_batcher_stop():
+    async def send_batch(batch_key, prompts):
+        await asyncio.sleep(10)
+
+    batcher = gpt_service.PromptsBatcher(send_batch, window=0.01)
+    sent_prompt = asyncio.create_task(batcher.submit("a", "1"))
+    await asyncio.sleep(0.05)
+    pending_prompt = asyncio.create_task(batcher.submit("b", "1"))
+    await asyncio.sleep(0)
+    assert len(batcher._sending_tasks) == 1
+    await asyncio.wait_for(batcher.stop(), 1)
+    assert batcher._sending_tasks == set()
+    for prompt in (sent_prompt, pending_prompt):
+        with pytest.raises(asyncio.CancelledError):
+            await prompt
+
+
+async def test_get_chat_completion_batching_and_cache():
+    async with gpt_service_tests.fake_completion_server() as server:
+        service = gpt_service_tests.create_gpt_service(server.url)
+        service.prompts_batcher.window = 0.05
+
+        async def ask(inputs, symbol):
+            return await service.get_chat_completion(
+                gpt_service_tests.get_messages(service, inputs),
+                symbol=symbol, time_frame="1h", candle_open_time=1000, allow_batching=True
+            )
+
+        answers = await asyncio.gather(*(ask(f"{i}, {i + 1}", f"BTC{i}/USDT") for i in range(10)))
+        assert answers == ["up 70%"] * 10
+        # 1 request for the 10 symbols
+        assert len(server.received_requests) == 1
+        batched_messages = server.received_requests[0]["messages"]
+        assert gpt_service.BATCHED_PROMPTS_INSTRUCTIONS in batched_messages[0]["content"]
+        assert batched_messages[1]["content"].splitlines()[2] == "3: 2, 3"
+        assert service.consumed_daily_tokens == 20
+
+        # same prompts: answered from cache
+        assert await ask("3, 4", "BTC3/USDT") == "up 70%"
+        assert len(server.received_requests) == 1
+
+        # not batched request
+        assert await service.get_chat_completion(gpt_service_tests.get_messages(service, "1, 1")) == "up 70%"
+        assert len(server.received_requests) == 2
+        assert gpt_service.BATCHED_PROMPTS_INSTRUCTIONS not in \
+            server.received_requests[1]["messages"][0]["content"]
+
+
+async def test_get_chat_completion_batching_with_unidentified_answers():
+    async with gpt_service_tests.fake_completion_server() as server:
+        service = gpt_service_tests.create_gpt_service(server.url)
+        service.prompts_batcher.window = 0.05
+        origin_parse_batched_answer = service._parse_batched_answer
+
+        def _parse_batched_answer(answer, prompts):
+            answers = origin_parse_batched_answer(answer, prompts)
+            # answer of the 1st prompt is missing
+            answers.pop(prompts[0])
+            return answers
+
+        with mock.patch.object(service, "_parse_batched_answer", mock.Mock(side_effect=_parse_batched_answer)):
+            answers = await asyncio.gather(*(
+                service.get_chat_completion(
+                    gpt_service_tests.get_messages(service, f"{i}"), candle_open_time=1000, allow_batching=True
+                )
+                for i in range(3)
+            ))
+        assert answers == ["up 70%"] * 3
+        # batched request + request for the missing answer
+        assert len(server.received_requests) == 2
+        assert server.received_requests[1]["messages"][1]["content"] == "0"
+
+
+def test_parse_batched_answer():
+    prompts = ["a", "b", "c"]
+    assert gpt_service.GPTService._parse_batched_answer(
+        "1: up 70%\n2) down 50%\n\n 3. up 10%\n4: up 30%\nplop", prompts
+    ) == {"a": "up 70%", "b": "down 50%", "c": "up 10%"}
+    assert gpt_service.GPTService._parse_batched_answer(None, prompts) == {}
@@ -0,0 +1,87 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import os
+import time
+import flask
+import numpy
+import pytest
+
+import tentacles.Services.Services_bases.webhook_service.webhook as webhook
+
+
+# All test coroutines will be treated as marked.
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it"),
+]
+
+WEBHOOKS_COUNT = 5000
+SOURCES = ["trading_view", "other_source"]
+# simulated signal parsing and order creation duration
+PROCESSING_DURATION = 0.0005
+
+
+def _post_webhooks(client):
+    latencies = []
+    status_codes = []
+    for index in range(WEBHOOKS_COUNT):
+        t0 = time.perf_counter()
+        response = client.post(f"/webhook/{SOURCES[index % len(SOURCES)]}", data=f"signal {index}")
+        latencies.append(time.perf_counter() - t0)
+        status_codes.append(response.status_code)
+    return latencies, status_codes
+
+
+async def test_webhook_load():
+    received = {source: [] for source in SOURCES}
+
+    def callback_factory(source):
+        async def callback(data):
+            await asyncio.sleep(PROCESSING_DURATION)
+            received[source].append(data)
+        return callback
+
+    service = webhook.WebHookService()
+    service.config = {"services": {}}
+    for source in SOURCES:
+        service.subscribe_feed(source, callback_factory(source), lambda data: True)
+    service.webhook_app = flask.Flask(__name__)
+    service._register_webhook_routes(service.webhook_app)
+    service._start_webhook_queue()
+    try:
+        t0 = time.perf_counter()
+        latencies, status_codes = await asyncio.get_event_loop().run_in_executor(
+            None, _post_webhooks, service.webhook_app.test_client()
+        )
+        acceptance_duration = time.perf_counter() - t0
+        await service.webhook_queue.join()
+        processing_duration = time.perf_counter() - t0
+    finally:
+        await service.webhook_queue.stop()
+    p50, p95, p99 = numpy.percentile(latencies, [50, 95, 99]) * 1000
+    print(f"\n{WEBHOOKS_COUNT} webhooks accepted in {acceptance_duration:.3f}s and processed in "
+          f"{processing_duration:.3f}s, acceptance latency: p50={p50:.3f}ms, p95={p95:.3f}ms, p99={p99:.3f}ms, "
+          f"max={max(latencies) * 1000:.3f}ms")
+    assert status_codes == [200] * WEBHOOKS_COUNT
+    # no signal lost, in reception order
+    for source_index, source in enumerate(SOURCES):
+        assert received[source] == [
+            f"signal {index}" for index in range(source_index, WEBHOOKS_COUNT, len(SOURCES))
+        ]
+    # accepted without waiting for signals to be processed
+    assert acceptance_duration < processing_duration
+    assert p50 < PROCESSING_DURATION * 1000 * 10
@@ -0,0 +1,110 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import pytest
+
+import tentacles.Services.Services_bases.webhook_service.webhook_queue as webhook_queue
+
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+
+class Processor:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.processed = []
+
+    async def process(self, source, data):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.processed.append((source, data))
+
+
+async def _put_from_thread(queue, *webhooks):
+    return await asyncio.get_event_loop().run_in_executor(
+        None, lambda: [queue.put(source, data) for source, data in webhooks]
+    )
+
+
+async def test_put_and_process_by_source():
+    processor = Processor(delay=0.001)
+    queue = webhook_queue.WebhookQueue(processor.process)
+    assert queue.put("a", 0) is False
+    queue.start(asyncio.get_event_loop())
+    webhooks = [(source, index) for index in range(20) for source in ("a", "b")]
+    assert await _put_from_thread(queue, *webhooks) == [True] * 40
+    await queue.join()
+    assert queue.qsize() == 0
+    for source in ("a", "b"):
+        assert [data for processed_source, data in processor.processed if processed_source == source] == \
+            list(range(20))
+    await queue.stop()
+
+
+async def test_processing_error():
+    async def process(source, data):
+        if data == 1:
+            raise RuntimeError("error")
+        processed.append(data)
+    processed = []
+    queue = webhook_queue.WebhookQueue(process)
+    queue.start(asyncio.get_event_loop())
+    await _put_from_thread(queue, ("a", 0), ("a", 1), ("a", 2))
+    await queue.join()
+    assert processed == [0, 2]
+    await queue.stop()
+
+
+async def test_reject_overflow_policy():
+    processor = Processor()
+    queue = webhook_queue.WebhookQueue(processor.process, max_size=2,
+                                       overflow_policy=webhook_queue.WebhookQueueOverflowPolicy.REJECT)
+    queue.start(asyncio.get_event_loop())
+    # put from the loop thread: webhooks can't be processed in between
+    assert [queue.put("a", 0), queue.put("b", 1), queue.put("a", 2)] == [True, True, False]
+    assert queue.rejected_count == 1
+    await queue.join()
+    assert processor.processed == [("a", 0), ("b", 1)]
+    await queue.stop()
+
+
+async def test_drop_oldest_overflow_policy():
+    processor = Processor()
+    queue = webhook_queue.WebhookQueue(processor.process, max_size=2,
+                                       overflow_policy=webhook_queue.WebhookQueueOverflowPolicy.DROP_OLDEST)
+    queue.start(asyncio.get_event_loop())
+    assert [queue.put("a", 0), queue.put("b", 1), queue.put("a", 2)] == [True, True, True]
+    assert queue.dropped_count == 1
+    await queue.join()
+    assert sorted(processor.processed) == [("a", 2), ("b", 1)]
+    await queue.stop()
+
+
+async def test_block_overflow_policy():
+    processor = Processor(delay=0.001)
+    queue = webhook_queue.WebhookQueue(processor.process, max_size=2,
+                                       overflow_policy=webhook_queue.WebhookQueueOverflowPolicy.BLOCK)
+    queue.start(asyncio.get_event_loop())
+    webhooks = [("a", index) for index in range(10)]
+    assert await _put_from_thread(queue, *webhooks) == [True] * 10
+    await queue.join()
+    assert processor.processed == webhooks
+    # timeout
+    queue.block_timeout = 0.01
+    queue.loop = None
+    assert queue.put("a", 11) is False
+    await queue.stop()
@@ -32,11 +32,14 @@ import octobot_services.constants as services_constants
 import octobot_services.services as services
 import octobot.constants as constants
 import octobot.community.errors as community_errors
+import tentacles.Services.Services_bases.webhook_service.webhook_queue as webhook_queue
 
 
 class WebHookService(services.AbstractService):
     CONNECTION_TIMEOUT = 8  # can take up to 5s on slow setups
     LOGGERS = ["pyngrok.ngrok", "werkzeug"]
+    CONFIG_WEBHOOK_QUEUE_SIZE = "webhook-queue-size"
+    CONFIG_WEBHOOK_QUEUE_OVERFLOW_POLICY = "webhook-queue-overflow-policy"
 
     def get_fields_description(self):
         if self.use_web_interface_for_webhook:
@@ -78,6 +81,8 @@ class WebHookService(services.AbstractService):
 
         self.service_feed_webhooks = {}
         self.service_feed_auth_callbacks = {}
+        # received webhooks are processed in the bot loop not to block the webhook server
+        self.webhook_queue = webhook_queue.WebhookQueue(self._process_queued_webhook)
 
         self.webhook_app = None
         self.webhook_host = None
@@ -212,11 +217,22 @@ class WebHookService(services.AbstractService):
     def _flask_webhook_call(self, webhook_name):
         if flask.request.method == 'POST':
             data = flask.request.get_data(as_text=True)
-            if self._default_webhook_call(webhook_name, data):
+            if not self.is_valid_webhook_call(webhook_name, data):
+                return 'invalid or missing input parameters', 400
+            if self.webhook_queue.put(webhook_name, data):
                 return '', 200
-            return 'invalid or missing input parameters', 400
+            self.logger.error(f"Webhook queue is full, refused webhook: {data}")
+            return 'too many webhooks to process', 503
         flask.abort(405)
 
+    async def _process_queued_webhook(self, webhook_name: str, data: str):
+        callback = self.service_feed_webhooks[webhook_name]
+        if asyncio.iscoroutinefunction(callback):
+            await callback(data)
+        else:
+            # synchronous callbacks can wait for the bot loop: call them from another thread
+            await asyncio.get_event_loop().run_in_executor(None, callback, data)
+
     def _community_webhook_call_factory(self, service_name: str):
 
         async def _community_webhook_callback(data: dict) -> bool:
@@ -226,12 +242,6 @@ class WebHookService(services.AbstractService):
 
         return _community_webhook_callback
 
-    def _default_webhook_call(self, webhook_name: str, data: str) -> bool:
-        if self.is_valid_webhook_call(webhook_name, data):
-            self.service_feed_webhooks[webhook_name](data)
-            return True
-        return False
-
     async def _async_default_webhook_call(self, webhook_name: str, data: str) -> bool:
         if self.is_valid_webhook_call(webhook_name, data):
             await self.service_feed_webhooks[webhook_name](data)
@@ -367,7 +377,24 @@ class WebHookService(services.AbstractService):
             self.logger.exception(err, True, f"Impossible to start OctoBot cloud based webhook {err}")
             return False
 
+    def _start_webhook_queue(self):
+        webhook_config = self.get_webhook_config()
+        self.webhook_queue.max_size = webhook_config.get(
+            self.CONFIG_WEBHOOK_QUEUE_SIZE, webhook_queue.WebhookQueue.DEFAULT_MAX_SIZE
+        )
+        try:
+            self.webhook_queue.overflow_policy = webhook_queue.WebhookQueueOverflowPolicy(
+                webhook_config.get(
+                    self.CONFIG_WEBHOOK_QUEUE_OVERFLOW_POLICY, webhook_queue.WebhookQueueOverflowPolicy.BLOCK.value
+                )
+            )
+        except ValueError as err:
+            self.logger.error(f"Invalid {self.CONFIG_WEBHOOK_QUEUE_OVERFLOW_POLICY} value: {err}, using "
+                              f"{self.webhook_queue.overflow_policy.value}")
+        self.webhook_queue.start(asyncio.get_event_loop())
+
     async def start_webhooks(self) -> bool:
+        self._start_webhook_queue()
         if self.use_web_interface_for_webhook:
             return await self._register_on_web_interface()
         if self.is_using_cloud_webhooks():
@@ -398,6 +425,7 @@ class WebHookService(services.AbstractService):
         return f"Webhook configured on {webhook_endpoint}", self._is_healthy()
 
     async def stop(self):
+        await self.webhook_queue.stop()
         if not self.use_web_interface_for_webhook and self.connected:
             ngrok.kill()
             if self.webhook_server:
@@ -0,0 +1,140 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import collections
+import enum
+import itertools
+import threading
+
+import octobot_commons.logging as bot_logging
+
+
+class WebhookQueueOverflowPolicy(enum.Enum):
+    # wait for the queue to have space before acknowledging the webhook
+    BLOCK = "block"
+    # refuse the webhook
+    REJECT = "reject"
+    # drop the oldest queued webhook
+    DROP_OLDEST = "drop_oldest"
+
+
+class WebhookQueue:
+    """
+    Bounded queue of received webhooks: webhooks are acknowledged as soon as they are queued from any thread
+    and processed in the bot asyncio loop by process_callback(source, data), in reception order for each source
+    """
+    DEFAULT_MAX_SIZE = 10000
+    DEFAULT_BLOCK_TIMEOUT = 10
+
+    def __init__(self, process_callback, max_size=DEFAULT_MAX_SIZE,
+                 overflow_policy=WebhookQueueOverflowPolicy.BLOCK, block_timeout=DEFAULT_BLOCK_TIMEOUT):
+        self.logger = bot_logging.get_logger(self.__class__.__name__)
+        self.process_callback = process_callback
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.loop = None
+        self.dropped_count = 0
+        self.rejected_count = 0
+        self._size = 0
+        self._condition = threading.Condition()
+        self._counter = itertools.count()
+        # source => deque of (reception index, data)
+        self._queued_by_source = {}
+        # source => consumer task
+        self._consumers = {}
+
+    def start(self, loop):
+        self.loop = loop
+
+    def put(self, source, data) -> bool:
+        """
+        Can be called from any thread
+        :return: True when the webhook is queued
+        """
+        with self._condition:
+            if self.loop is None or not self._reserve_space():
+                self.rejected_count += 1
+                return False
+            try:
+                queued = self._queued_by_source[source]
+            except KeyError:
+                queued = self._queued_by_source[source] = collections.deque()
+            queued.append((next(self._counter), data))
+            self._size += 1
+            if len(queued) == 1:
+                # a consumer might not be running for this source
+                self.loop.call_soon_threadsafe(self._ensure_consumer, source)
+        return True
+
+    def qsize(self) -> int:
+        return self._size
+
+    async def join(self):
+        """
+        Waits for queued webhooks to be processed
+        """
+        while self._size or any(not consumer.done() for consumer in self._consumers.values()):
+            await asyncio.sleep(0.01)
+
+    async def stop(self):
+        for consumer in self._consumers.values():
+            consumer.cancel()
+        self._consumers = {}
+        with self._condition:
+            if self._size:
+                self.logger.warning(f"Stopping with {self._size} unprocessed webhooks")
+            self._queued_by_source = {}
+            self._size = 0
+            self.loop = None
+            self._condition.notify_all()
+
+    def _reserve_space(self) -> bool:
+        if self._size < self.max_size:
+            return True
+        if self.overflow_policy is WebhookQueueOverflowPolicy.BLOCK:
+            return self._condition.wait_for(
+                lambda: self._size < self.max_size or self.loop is None, self.block_timeout
+            ) and self.loop is not None
+        if self.overflow_policy is WebhookQueueOverflowPolicy.DROP_OLDEST:
+            oldest_queue = min(
+                (queued for queued in self._queued_by_source.values() if queued),
+                key=lambda queued: queued[0][0]
+            )
+            _, data = oldest_queue.popleft()
+            self._size -= 1
+            self.dropped_count += 1
+            self.logger.error(f"Webhook queue is full, dropped webhook: {data}")
+            return True
+        return False
+
+    def _ensure_consumer(self, source):
+        if source not in self._consumers or self._consumers[source].done():
+            self._consumers[source] = self.loop.create_task(self._consume(source))
+
+    async def _consume(self, source):
+        while True:
+            with self._condition:
+                queued = self._queued_by_source.get(source)
+                if not queued:
+                    return
+                _, data = queued.popleft()
+                self._size -= 1
+                self._condition.notify()
+            try:
+                await self.process_callback(source, data)
+            except Exception as err:
+                self.logger.exception(err, True, f"Error when processing {source} webhook: {err}")
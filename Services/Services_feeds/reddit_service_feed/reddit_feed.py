@@ -25,6 +25,9 @@ import octobot_services.service_feeds as service_feeds
 import tentacles.Services.Services_bases as Services_bases
 
 
+CONFIG_REDDIT_ENTRIES = "entries"
+
+
 class RedditServiceFeedChannel(services_channel.AbstractServiceFeedChannel):
     pass
 
@@ -34,14 +37,19 @@ class RedditServiceFeed(service_feeds.AbstractServiceFeed):
     REQUIRED_SERVICES = [Services_bases.RedditService]
 
     MAX_CONNECTION_ATTEMPTS = 10
+    MAX_RECONNECT_DELAY = 300
+    MAX_QUEUED_ENTRIES = 1000
+    MAX_DELIVERED_BATCH_SIZE = 100
 
     def __init__(self, config, main_async_loop, bot_id):
         service_feeds.AbstractServiceFeed.__init__(self, config, main_async_loop, bot_id)
         self.subreddits = None
         self.counter = 0
         self.connect_attempts = 0
+        self.reconnect_attempts = 0
         self.credentials_ok = False
         self.listener_task = None
+        self.entries_queue = None
 
     # merge new config into existing config
     def update_feed_config(self, config):
@@ -90,44 +98,93 @@ class RedditServiceFeed(service_feeds.AbstractServiceFeed):
         # new entry => max weight
         return 5
 
+    async def _get_entries_stream(self):
+        subreddit = await self.services[0].get_endpoint().subreddit(self.subreddits)
+        return subreddit.stream.submissions()
+
     async def _start_listener(self):
         # avoid debug log at each asyncprawcore fetch
         logging.getLogger("asyncprawcore").setLevel(logging.WARNING)
-        subreddit = await self.services[0].get_endpoint().subreddit(self.subreddits)
         start_time = time.time()
-        async for entry in subreddit.stream.submissions():
+        async for entry in await self._get_entries_stream():
             self.credentials_ok = True
             self.connect_attempts = 0
+            self.reconnect_attempts = 0
             self.counter += 1
             # check if we are in the 100 history or if it's a new entry (new posts are more valuables)
             # the older the entry is, the les weight it gets
             entry_age_when_feed_started_in_sec = start_time - entry.created_utc
-            entry_weight = self._get_entry_weight(entry_age_when_feed_started_in_sec)
+            # wait for the queue to have space when entries are received faster than they are delivered
+            await self.entries_queue.put((entry, self._get_entry_weight(entry_age_when_feed_started_in_sec)))
+
+    async def _deliver_entries(self):
+        while True:
+            entries = [await self.entries_queue.get()]
+            while len(entries) < self.MAX_DELIVERED_BATCH_SIZE and not self.entries_queue.empty():
+                entries.append(self.entries_queue.get_nowait())
+            try:
+                await self._notify_entries(entries)
+            except Exception as e:
+                self.logger.exception(e, True, f"Error when delivering Reddit entries: '{e}'")
+            finally:
+                for _ in entries:
+                    self.entries_queue.task_done()
+
+    async def _notify_entries(self, entries):
+        entries_by_subreddit = {}
+        for entry, weight in entries:
+            entries_by_subreddit.setdefault(entry.subreddit.display_name.lower(), []).append({
+                services_constants.CONFIG_REDDIT_ENTRY: entry,
+                services_constants.CONFIG_REDDIT_ENTRY_WEIGHT: weight
+            })
+        for subreddit, subreddit_entries in entries_by_subreddit.items():
             await self._async_notify_consumers(
                 {
-                    services_constants.FEED_METADATA: entry.subreddit.display_name.lower(),
-                    services_constants.CONFIG_REDDIT_ENTRY: entry,
-                    services_constants.CONFIG_REDDIT_ENTRY_WEIGHT: entry_weight
+                    services_constants.FEED_METADATA: subreddit,
+                    CONFIG_REDDIT_ENTRIES: subreddit_entries,
                 }
             )
 
+    def _get_reconnect_delay(self):
+        # exponential backoff on consecutive failures
+        return min(
+            self._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC * 2 ** self.reconnect_attempts,
+            self.MAX_RECONNECT_DELAY
+        )
+
+    async def _wait_before_reconnect(self):
+        delay = self._get_reconnect_delay()
+        self.reconnect_attempts += 1
+        await asyncio.sleep(delay)
+
     async def _start_listener_task(self):
+        self.entries_queue = asyncio.Queue(maxsize=self.MAX_QUEUED_ENTRIES)
+        delivery_task = asyncio.create_task(self._deliver_entries())
+        try:
+            listened = await self._listen()
+            # deliver already received entries
+            await self.entries_queue.join()
+            return listened
+        finally:
+            delivery_task.cancel()
+
+    async def _listen(self):
         while not self.should_stop and self.connect_attempts < self.MAX_CONNECTION_ATTEMPTS:
             try:
                 await self._start_listener()
             except asyncprawcore.exceptions.RequestException:
                 # probably a connexion loss, try again
-                time.sleep(self._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC)
+                await self._wait_before_reconnect()
             except asyncprawcore.exceptions.InvalidToken as e:
                 # expired, try again
                 self.logger.exception(e, True, f"Error when receiving Reddit feed: '{e}'")
-                self.logger.info(f"Try to continue after {self._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC} seconds.")
-                time.sleep(self._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC)
+                self.logger.info(f"Try to continue after {self._get_reconnect_delay()} seconds.")
+                await self._wait_before_reconnect()
             except asyncprawcore.exceptions.ServerError as e:
                 # server error, try again
-                self.logger.exception(e, True, "Error when receiving Reddit feed: '{e}'")
-                self.logger.info(f"Try to continue after {self._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC} seconds.")
-                time.sleep(self._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC)
+                self.logger.exception(e, True, f"Error when receiving Reddit feed: '{e}'")
+                self.logger.info(f"Try to continue after {self._get_reconnect_delay()} seconds.")
+                await self._wait_before_reconnect()
             except asyncprawcore.exceptions.OAuthException as e:
                 self.logger.exception(e, True, f"Error when receiving Reddit feed: '{e}' this may mean that reddit "
                                                f"login info in config.json are wrong")
@@ -136,14 +193,14 @@ class RedditServiceFeed(service_feeds.AbstractServiceFeed):
             except asyncprawcore.exceptions.ResponseException as e:
                 message_complement = "this may mean that reddit login info in config.json are invalid." \
                     if not self.credentials_ok else \
-                    f"Try to continue after {self._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC} seconds."
+                    f"Try to continue after {self._get_reconnect_delay()} seconds."
                 self.logger.exception(e, True,
                                       f"Error when receiving Reddit feed: '{e}' this may mean {message_complement}")
                 if not self.credentials_ok:
                     self.connect_attempts += 1
                 else:
                     self.connect_attempts += 0.1
-                time.sleep(self._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC)
+                await self._wait_before_reconnect()
             except Exception as e:
                 self.logger.exception(e, True, f"Error when receiving Reddit feed: '{e}'")
                 self.keep_running = False
@@ -0,0 +1,173 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+import mock
+import pytest
+import pytest_asyncio
+import asyncprawcore.exceptions
+
+import async_channel.channels as channels
+import octobot_services.constants as services_constants
+
+import tentacles.Services.Services_feeds.reddit_service_feed as reddit_service_feed
+import tentacles.Services.Services_feeds.reddit_service_feed.reddit_feed as reddit_feed
+
+
+pytestmark = pytest.mark.asyncio
+
+ENTRIES_COUNT = 500
+ENTRIES_BETWEEN_DISCONNECTIONS = 50
+SUBREDDITS = ["bitcoin", "ethereum"]
+
+
+@pytest_asyncio.fixture
+async def feed():
+    feed = reddit_service_feed.RedditServiceFeed({}, asyncio.get_event_loop(), "bot_id")
+    feed._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC = 0.01
+    feed.MAX_RECONNECT_DELAY = 0.05
+    try:
+        yield feed
+    finally:
+        channels.del_chan(reddit_service_feed.RedditServiceFeed.FEED_CHANNEL.get_name())
+
+
+class FakeEntriesStream:
+    """
+    Streams entries and disconnects every ENTRIES_BETWEEN_DISCONNECTIONS entries, stops the feed when
+    every entry has been streamed
+    """
+    def __init__(self, feed):
+        self.feed = feed
+        self.entries = [
+            mock.Mock(
+                created_utc=time.time(),
+                subreddit=mock.Mock(display_name=SUBREDDITS[index % len(SUBREDDITS)].upper()),
+                id=index
+            )
+            for index in range(ENTRIES_COUNT)
+        ]
+        self.streamed_count = 0
+        self.connections = 0
+
+    async def get_entries_stream(self):
+        self.connections += 1
+        return self._stream()
+
+    async def _stream(self):
+        streamed_in_connection = 0
+        while self.streamed_count < len(self.entries):
+            if streamed_in_connection == ENTRIES_BETWEEN_DISCONNECTIONS:
+                raise asyncprawcore.exceptions.RequestException(ConnectionError("lost"), (), {})
+            # entries are yielded by bursts
+            if self.streamed_count % 10 == 0:
+                await asyncio.sleep(0.001)
+            yield self.entries[self.streamed_count]
+            self.streamed_count += 1
+            streamed_in_connection += 1
+        self.feed.should_stop = True
+
+
+async def _scheduled_ticks(period, stop_event):
+    # max delay between the expected and actual wake up times
+    max_lateness = 0
+    while not stop_event.is_set():
+        expected_wake_up_time = time.perf_counter() + period
+        await asyncio.sleep(period)
+        max_lateness = max(max_lateness, time.perf_counter() - expected_wake_up_time)
+    return max_lateness
+
+
+async def test_listener_reconnects_without_blocking_and_delivers_batches(feed):
+    stream = FakeEntriesStream(feed)
+    notifications = []
+    stop_event = asyncio.Event()
+    ticks_task = asyncio.create_task(_scheduled_ticks(0.005, stop_event))
+    with mock.patch.object(feed, "_get_entries_stream", mock.Mock(side_effect=stream.get_entries_stream)), \
+            mock.patch.object(feed, "_async_notify_consumers",
+                              mock.AsyncMock(side_effect=notifications.append)), \
+            mock.patch.object(asyncio, "sleep", mock.AsyncMock(wraps=asyncio.sleep)) as sleep_mock:
+        assert await feed._start_service_feed() is True
+        await asyncio.wait_for(feed.listener_task, 5)
+        reconnect_delays = [
+            call.args[0]
+            for call in sleep_mock.mock_calls
+            if call.args[0] >= feed._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC
+        ]
+        # let remaining entries be delivered
+        await asyncio.sleep(0.01)
+    stop_event.set()
+    max_lateness = await ticks_task
+
+    # disconnected every ENTRIES_BETWEEN_DISCONNECTIONS entries
+    assert stream.connections == ENTRIES_COUNT // ENTRIES_BETWEEN_DISCONNECTIONS
+    # the stream always received entries before disconnecting: backoff is reset each time
+    assert reconnect_delays == [feed._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC] * (stream.connections - 1)
+    # other coroutines kept running on schedule
+    assert max_lateness < 0.05
+
+    # every entry is delivered, by batches of entries of the same subreddit
+    delivered_ids = []
+    for notification in notifications:
+        entries = notification[reddit_feed.CONFIG_REDDIT_ENTRIES]
+        assert all(
+            entry[services_constants.CONFIG_REDDIT_ENTRY].subreddit.display_name.lower()
+            == notification[services_constants.FEED_METADATA]
+            for entry in entries
+        )
+        assert all(entry[services_constants.CONFIG_REDDIT_ENTRY_WEIGHT] == 4 for entry in entries)
+        delivered_ids.extend(entry[services_constants.CONFIG_REDDIT_ENTRY].id for entry in entries)
+    assert sorted(delivered_ids) == list(range(ENTRIES_COUNT))
+    assert len(notifications) < ENTRIES_COUNT / 2
+    print(f"\n{ENTRIES_COUNT} entries with {stream.connections - 1} disconnections: delivered in "
+          f"{len(notifications)} notifications, max scheduling lateness of other coroutines: "
+          f"{max_lateness * 1000:.1f}ms")
+
+
+async def test_reconnect_delay_exponential_backoff(feed):
+    feed._SLEEPING_TIME_BEFORE_RECONNECT_ATTEMPT_SEC = 10
+    feed.MAX_RECONNECT_DELAY = 300
+
+    async def failing_stream():
+        raise asyncprawcore.exceptions.RequestException(ConnectionError("lost"), (), {})
+
+    delays = []
+
+    async def _wait_before_reconnect():
+        delays.append(feed._get_reconnect_delay())
+        feed.reconnect_attempts += 1
+        if len(delays) == 7:
+            feed.should_stop = True
+
+    with mock.patch.object(feed, "_get_entries_stream", mock.Mock(side_effect=failing_stream)), \
+            mock.patch.object(feed, "_wait_before_reconnect", mock.AsyncMock(side_effect=_wait_before_reconnect)):
+        feed.entries_queue = asyncio.Queue()
+        assert await feed._listen() is False
+    assert delays == [10, 20, 40, 80, 160, 300, 300]
+
+
+async def test_queue_is_bounded(feed):
+    feed.MAX_QUEUED_ENTRIES = 10
+    stream = FakeEntriesStream(feed)
+    with mock.patch.object(feed, "_get_entries_stream", mock.Mock(side_effect=stream.get_entries_stream)), \
+            mock.patch.object(feed, "_deliver_entries", mock.AsyncMock(side_effect=asyncio.Event().wait)):
+        assert await feed._start_service_feed() is True
+        await asyncio.sleep(0.05)
+        # entries are not delivered: the stream is paused until the queue has space
+        assert feed.entries_queue.qsize() == 10
+        assert stream.streamed_count == 10
+        assert not feed.listener_task.done()
+        await feed.stop()
@@ -65,9 +65,9 @@ class TradingViewServiceFeed(service_feeds.AbstractServiceFeed):
     def _register_to_service(self):
         service = self.services[0]
         if not service.is_subscribed(self.webhook_service_name):
-            callback = self.async_webhook_callback if service.is_using_cloud_webhooks() else self.webhook_callback
+            # webhooks are processed from the bot loop
             service.subscribe_feed(
-                self.webhook_service_name, callback, self.ensure_callback_auth
+                self.webhook_service_name, self.async_webhook_callback, self.ensure_callback_auth
             )
 
     def _initialize(self):
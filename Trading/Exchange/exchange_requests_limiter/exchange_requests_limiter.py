@@ -0,0 +1,60 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+import typing
+
+
+class RequestsRateLimiter:
+    """
+    Spaces requests by at least 1 / max_requests_per_second seconds
+    """
+
+    def __init__(self, max_requests_per_second: float):
+        self.max_requests_per_second = max_requests_per_second
+        self._next_allowed_time = 0
+
+    async def wait(self):
+        now = time.monotonic()
+        # reserve the next available time slot before waiting so that concurrent callers get different slots
+        allowed_time = max(now, self._next_allowed_time)
+        self._next_allowed_time = allowed_time + 1 / self.max_requests_per_second
+        if allowed_time > now:
+            await asyncio.sleep(allowed_time - now)
+
+
+def get_max_requests_per_second(exchange_manager) -> typing.Optional[float]:
+    """
+    :return: the number of requests per second allowed by the exchange, None when the exchange has no rate limit
+    """
+    try:
+        # ccxt rateLimit: minimum delay in milliseconds between two requests
+        rate_limit = exchange_manager.exchange.connector.client.rateLimit
+    except AttributeError:
+        # simulated exchange: no rate limit
+        return None
+    if not isinstance(rate_limit, (int, float)) or rate_limit <= 0:
+        return None
+    return 1000 / rate_limit
+
+
+def get_max_concurrent_requests(exchange_manager, max_concurrent_requests: int) -> int:
+    """
+    :return: max_concurrent_requests lowered to 1 second worth of requests on the exchange
+    """
+    if (max_requests_per_second := get_max_requests_per_second(exchange_manager)) is None:
+        return max_concurrent_requests
+    return max(1, min(max_concurrent_requests, int(max_requests_per_second)))
@@ -0,0 +1,58 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+import mock
+import pytest
+
+import tentacles.Trading.Exchange.exchange_requests_limiter as exchange_requests_limiter
+
+MAX_CONCURRENT_REQUESTS = 10
+
+
+@pytest.mark.asyncio
+async def test_requests_rate_limiter():
+    rate_limiter = exchange_requests_limiter.RequestsRateLimiter(50)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(rate_limiter.wait() for _ in range(11)))
+    # 1 request immediately, then 10 requests at 50 per second
+    assert 0.2 * 0.9 <= time.perf_counter() - t0 < 0.4
+
+
+def test_get_max_requests_per_second():
+    exchange_manager = mock.Mock()
+    exchange_manager.exchange.connector.client.rateLimit = 200
+    assert exchange_requests_limiter.get_max_requests_per_second(exchange_manager) == 5
+    exchange_manager.exchange.connector.client.rateLimit = None
+    assert exchange_requests_limiter.get_max_requests_per_second(exchange_manager) is None
+    exchange_manager.exchange.connector.client.rateLimit = 0
+    assert exchange_requests_limiter.get_max_requests_per_second(exchange_manager) is None
+    # simulated exchange
+    assert exchange_requests_limiter.get_max_requests_per_second(mock.Mock(exchange=object())) is None
+
+
+def test_get_max_concurrent_requests():
+    exchange_manager = mock.Mock()
+    exchange_manager.exchange.connector.client.rateLimit = 200
+    assert exchange_requests_limiter.get_max_concurrent_requests(exchange_manager, MAX_CONCURRENT_REQUESTS) == 5
+    exchange_manager.exchange.connector.client.rateLimit = 50
+    assert exchange_requests_limiter.get_max_concurrent_requests(exchange_manager, MAX_CONCURRENT_REQUESTS) \
+        == MAX_CONCURRENT_REQUESTS
+    exchange_manager.exchange.connector.client.rateLimit = 2000
+    assert exchange_requests_limiter.get_max_concurrent_requests(exchange_manager, MAX_CONCURRENT_REQUESTS) == 1
+    exchange_manager.exchange.connector.client.rateLimit = None
+    assert exchange_requests_limiter.get_max_concurrent_requests(exchange_manager, MAX_CONCURRENT_REQUESTS) \
+        == MAX_CONCURRENT_REQUESTS
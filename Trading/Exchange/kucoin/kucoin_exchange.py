@@ -32,8 +32,12 @@ import octobot_trading.enums as trading_enums
 import octobot_trading.errors as trading_errors
 import octobot.community
 
+import tentacles.Trading.Exchange.markets_cache as markets_cache
+
 
 _CACHED_CONFIRMED_FEES_BY_SYMBOL = {}
+_MARKETS_KEY = "markets"
+_CURRENCIES_KEY = "currencies"
 
 
 def _kucoin_retrier(f):
@@ -69,21 +73,87 @@ def _kucoin_retrier(f):
 
 class KucoinConnector(ccxt_connector.CCXTConnector):
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._markets_refresh_task = None
+
     @_kucoin_retrier
     async def _load_markets(self, client, reload: bool):
         # override for retrier
         try:
-            await client.load_markets(reload=reload)
-            # sometimes market fees are missing because they are fetched from all tickers 
-            # and all ticker can miss symbols on kucoin
-            if client.markets:
-                ccxt_client_util.fix_client_missing_markets_fees(client, reload, _CACHED_CONFIRMED_FEES_BY_SYMBOL)
+            if not reload and _load_markets_from_disk_cache(client):
+                # markets are from a previous run: use them right away and refresh them in background
+                self._markets_refresh_task = markets_cache.MarketsCache.instance().refresh_in_background(
+                    _get_disk_cache_exchange_name(client), markets_cache.MARKETS_CONTENT,
+                    lambda: self._fetch_markets(client, True)
+                )
+                return
+            if markets := await self._fetch_markets(client, reload):
+                markets_cache.MarketsCache.instance().set(
+                    _get_disk_cache_exchange_name(client), markets_cache.MARKETS_CONTENT, markets
+                )
         except Exception as err:
             # ensure this is not a proxy error, raise dedicated error if it is
             if proxy_error := ccxt_client_util.get_proxy_error_if_any(self, err):
                 raise ccxt_client_util.get_proxy_error_class(proxy_error)(proxy_error) from err
             raise
 
+    async def _fetch_markets(self, client, reload: bool) -> typing.Optional[dict]:
+        """
+        :return: the fetched markets to store in disk cache, None if they should not be cached
+        """
+        await client.load_markets(reload=reload)
+        # sometimes market fees are missing because they are fetched from all tickers
+        # and all ticker can miss symbols on kucoin
+        if client.markets:
+            cacheable = _is_disk_cacheable(client)
+            if cacheable and not _CACHED_CONFIRMED_FEES_BY_SYMBOL:
+                _CACHED_CONFIRMED_FEES_BY_SYMBOL.update(
+                    markets_cache.MarketsCache.instance().get(
+                        _get_disk_cache_exchange_name(client), markets_cache.CONFIRMED_FEES_CONTENT
+                    ) or {}
+                )
+            ccxt_client_util.fix_client_missing_markets_fees(client, reload, _CACHED_CONFIRMED_FEES_BY_SYMBOL)
+            if cacheable:
+                markets_cache.MarketsCache.instance().set(
+                    _get_disk_cache_exchange_name(client), markets_cache.CONFIRMED_FEES_CONTENT,
+                    dict(_CACHED_CONFIRMED_FEES_BY_SYMBOL)
+                )
+                return {
+                    _MARKETS_KEY: list(client.markets.values()),
+                    _CURRENCIES_KEY: client.currencies,
+                }
+        return None
+
+    async def stop(self):
+        if self._markets_refresh_task is not None and not self._markets_refresh_task.done():
+            self._markets_refresh_task.cancel()
+        self._markets_refresh_task = None
+        await super().stop()
+
+
+def _is_disk_cacheable(client) -> bool:
+    # authenticated markets can be account specific: only share unauthenticated markets between runs
+    return not client.apiKey
+
+
+def _get_disk_cache_exchange_name(client) -> str:
+    return f"{client.id}_sandbox" if client.isSandboxModeEnabled else client.id
+
+
+def _load_markets_from_disk_cache(client) -> bool:
+    if not _is_disk_cacheable(client):
+        return False
+    cache = markets_cache.MarketsCache.instance()
+    exchange_name = _get_disk_cache_exchange_name(client)
+    if (markets := cache.get(exchange_name, markets_cache.MARKETS_CONTENT)) is None:
+        return False
+    client.set_markets(markets[_MARKETS_KEY], markets[_CURRENCIES_KEY])
+    if not _CACHED_CONFIRMED_FEES_BY_SYMBOL:
+        _CACHED_CONFIRMED_FEES_BY_SYMBOL.update(cache.get(exchange_name, markets_cache.CONFIRMED_FEES_CONTENT) or {})
+    return True
+
+
 class Kucoin(exchanges.RestExchange):
     FIX_MARKET_STATUS = True
     REMOVE_MARKET_STATUS_PRICE_LIMITS = True
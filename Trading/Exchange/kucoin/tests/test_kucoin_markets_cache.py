@@ -0,0 +1,148 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import mock
+import pytest
+
+import octobot_trading.exchanges.connectors.ccxt.ccxt_connector as ccxt_connector
+import tentacles.Trading.Exchange.kucoin.kucoin_exchange as kucoin_exchange
+import tentacles.Trading.Exchange.markets_cache as markets_cache
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+MARKETS = [
+    {"symbol": "BTC/USDT", "maker": 0.001, "taker": 0.002},
+    # fees can be missing on kucoin
+    {"symbol": "ETH/USDT", "maker": None, "taker": None},
+]
+CURRENCIES = {"BTC": {"id": "BTC"}, "ETH": {"id": "ETH"}, "USDT": {"id": "USDT"}}
+
+
+class FakeClient:
+    id = "kucoin"
+
+    def __init__(self, api_key=""):
+        self.apiKey = api_key
+        self.isSandboxModeEnabled = False
+        self.markets = None
+        self.currencies = None
+        self.load_markets_calls = 0
+
+    async def load_markets(self, reload=False):
+        self.load_markets_calls += 1
+        await asyncio.sleep(0.01)
+        self.set_markets(MARKETS, CURRENCIES)
+
+    def set_markets(self, markets, currencies=None):
+        self.markets = {market["symbol"]: dict(market) for market in markets}
+        self.currencies = currencies
+
+
+@pytest.fixture
+def connector():
+    with mock.patch.object(ccxt_connector.CCXTConnector, "__init__", mock.Mock(return_value=None)):
+        yield kucoin_exchange.KucoinConnector()
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    kucoin_exchange._CACHED_CONFIRMED_FEES_BY_SYMBOL.clear()
+    yield tmp_path
+    kucoin_exchange._CACHED_CONFIRMED_FEES_BY_SYMBOL.clear()
+
+
+def _restarted_cache(cache_folder):
+    # a new process: empty in-memory markets and confirmed fees
+    kucoin_exchange._CACHED_CONFIRMED_FEES_BY_SYMBOL.clear()
+    cache = markets_cache.MarketsCache(cache_folder=str(cache_folder))
+    return mock.patch.object(markets_cache.MarketsCache, "instance", mock.Mock(return_value=cache)), cache
+
+
+async def test_load_markets_from_disk_cache(connector, disk_cache):
+    instance_patch, cache = _restarted_cache(disk_cache)
+    with instance_patch:
+        client = FakeClient()
+        await connector._load_markets(client, False)
+        assert client.load_markets_calls == 1
+        # missing fees are fixed from similar markets
+        assert client.markets["ETH/USDT"]["maker"] == 0.001
+        assert cache.get("kucoin", markets_cache.MARKETS_CONTENT) is not None
+
+    instance_patch, cache = _restarted_cache(disk_cache)
+    with instance_patch:
+        client = FakeClient()
+        await connector._load_markets(client, False)
+        # markets are from disk cache
+        assert client.load_markets_calls == 0
+        assert client.markets == {
+            "BTC/USDT": MARKETS[0],
+            "ETH/USDT": {"symbol": "ETH/USDT", "maker": 0.001, "taker": 0.002},
+        }
+        assert client.currencies == CURRENCIES
+        assert kucoin_exchange._CACHED_CONFIRMED_FEES_BY_SYMBOL == {"BTC/USDT": [0.001, 0.002]}
+        # and refreshed in background
+        await cache.wait_for_refreshes()
+        assert client.load_markets_calls == 1
+
+        # reload: markets are fetched
+        await connector._load_markets(client, True)
+        assert client.load_markets_calls == 2
+
+
+async def test_load_markets_with_expired_disk_cache(connector, disk_cache):
+    instance_patch, _ = _restarted_cache(disk_cache)
+    with instance_patch:
+        await connector._load_markets(FakeClient(), False)
+    instance_patch, cache = _restarted_cache(disk_cache)
+    cache.ttl = 0
+    with instance_patch:
+        client = FakeClient()
+        await connector._load_markets(client, False)
+        # expired markets: fetched before being used
+        assert client.load_markets_calls == 1
+        assert cache.is_up_to_date("kucoin", markets_cache.MARKETS_CONTENT) is False
+
+
+async def test_authenticated_markets_are_not_cached(connector, disk_cache):
+    instance_patch, cache = _restarted_cache(disk_cache)
+    with instance_patch:
+        await connector._load_markets(FakeClient(), False)
+        client = FakeClient(api_key="key")
+        await connector._load_markets(client, False)
+        assert client.load_markets_calls == 1
+    instance_patch, cache = _restarted_cache(disk_cache)
+    with instance_patch:
+        client = FakeClient(api_key="key")
+        await connector._load_markets(client, False)
+        assert client.load_markets_calls == 1
+        assert cache.get("kucoin", markets_cache.MARKETS_CONTENT) is not None
+
+
+async def test_stop_cancels_markets_refresh(connector, disk_cache):
+    instance_patch, _ = _restarted_cache(disk_cache)
+    with instance_patch:
+        await connector._load_markets(FakeClient(), False)
+    instance_patch, cache = _restarted_cache(disk_cache)
+    with instance_patch, mock.patch.object(ccxt_connector.CCXTConnector, "stop", mock.AsyncMock()) as stop_mock:
+        await connector._load_markets(FakeClient(), False)
+        refresh_task = connector._markets_refresh_task
+        assert not refresh_task.done()
+        await connector.stop()
+        stop_mock.assert_awaited_once()
+        await asyncio.sleep(0)
+        assert refresh_task.cancelled()
+        assert connector._markets_refresh_task is None
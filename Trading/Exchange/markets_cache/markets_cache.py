@@ -0,0 +1,187 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+import typing
+
+import octobot_commons.constants as commons_constants
+import octobot_commons.logging as logging
+import octobot_commons.singleton as singleton
+
+
+# bump when the content of cached files changes to ignore files written by previous versions
+MARKETS_CACHE_VERSION = 1
+# same as ccxt clients in-memory markets cache: 30h and 18min to avoid refreshing at a fix time of the day
+DEFAULT_CACHE_TTL = commons_constants.HOURS_TO_SECONDS * 30 + commons_constants.MINUTE_TO_SECONDS * 18
+DEFAULT_CACHE_FOLDER = os.path.join(commons_constants.USER_FOLDER, commons_constants.CACHE_FOLDER, "markets")
+
+MARKETS_CONTENT = "markets"
+SYMBOLS_CONTENT = "symbols"
+CONFIRMED_FEES_CONTENT = "confirmed_fees"
+
+_VERSION_KEY = "version"
+_TIMESTAMP_KEY = "timestamp"
+_CHECKSUM_KEY = "checksum"
+_DATA_KEY = "data"
+
+
+class MarketsCache(singleton.Singleton):
+    """
+    Process-wide exchange markets cache persisted on disk to avoid fetching markets from every exchange
+    at each start.
+    Each (exchange, content) is stored in its own json file containing the cache version, the update
+    timestamp, the checksum of the data and the data itself. Files from another version or with
+    an invalid checksum are ignored.
+    Expired entries can still be read to be used while they are refreshed in the background.
+    """
+
+    def __init__(self, cache_folder=DEFAULT_CACHE_FOLDER, ttl=DEFAULT_CACHE_TTL, version=MARKETS_CACHE_VERSION):
+        self.cache_folder = cache_folder
+        self.ttl = ttl
+        self.version = version
+        self.logger = logging.get_logger(self.__class__.__name__)
+        # (exchange, content) => (timestamp, data), avoids parsing the same file again
+        self._entries = {}
+        self._refresh_tasks = {}
+
+    def get(self, exchange_name: str, content: str, allow_expired: bool = False) -> typing.Optional[typing.Any]:
+        """
+        :param exchange_name: identifier of the exchange the content is from
+        :param content: identifier of the cached content (ex: MARKETS_CONTENT)
+        :param allow_expired: when True, return the cached content even if it is older than the cache ttl
+        :return: the cached content or None when missing, expired or invalid
+        """
+        entry = self._get_entry(exchange_name, content)
+        if entry is None:
+            return None
+        timestamp, data = entry
+        if not allow_expired and self._is_expired(timestamp):
+            return None
+        return data
+
+    def is_up_to_date(self, exchange_name: str, content: str) -> bool:
+        entry = self._get_entry(exchange_name, content)
+        return entry is not None and not self._is_expired(entry[0])
+
+    def set(self, exchange_name: str, content: str, data: typing.Any):
+        timestamp = time.time()
+        self._entries[(exchange_name, content)] = (timestamp, data)
+        path = self._get_path(exchange_name, content)
+        try:
+            serialized = json.dumps({
+                _VERSION_KEY: self.version,
+                _TIMESTAMP_KEY: timestamp,
+                _CHECKSUM_KEY: _get_checksum(data),
+                _DATA_KEY: data,
+            })
+            os.makedirs(self.cache_folder, exist_ok=True)
+            # write in a temp file first to never leave a partially written cache file
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w") as cache_file:
+                cache_file.write(serialized)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as err:
+            self.logger.warning(f"Impossible to save {exchange_name} {content} cache to {path}: {err}")
+
+    def refresh_in_background(
+        self, exchange_name: str, content: str, fetch: typing.Callable[[], typing.Awaitable[typing.Any]]
+    ) -> asyncio.Task:
+        """
+        Fetch and cache the given content in a background task. Does nothing if this content is already being
+        refreshed.
+        :param fetch: async callable returning the up-to-date content
+        :return: the refresh task
+        """
+        key = (exchange_name, content)
+        if (task := self._refresh_tasks.get(key)) is not None and not task.done():
+            return task
+        task = asyncio.create_task(self._refresh(exchange_name, content, fetch))
+        self._refresh_tasks[key] = task
+        task.add_done_callback(lambda done_task: self._on_refresh_done(key, done_task))
+        return task
+
+    async def wait_for_refreshes(self):
+        if self._refresh_tasks:
+            await asyncio.gather(*self._refresh_tasks.values(), return_exceptions=True)
+
+    def stop(self):
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        self._refresh_tasks.clear()
+
+    def clear(self):
+        self.stop()
+        self._entries.clear()
+        if os.path.isdir(self.cache_folder):
+            for file_name in os.listdir(self.cache_folder):
+                if file_name.endswith(".json"):
+                    os.remove(os.path.join(self.cache_folder, file_name))
+
+    async def _refresh(self, exchange_name: str, content: str, fetch):
+        try:
+            data = await fetch()
+            if data:
+                self.set(exchange_name, content, data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            self.logger.warning(f"Failed to refresh {exchange_name} {content} cache: {err} ({err.__class__.__name__})")
+
+    def _on_refresh_done(self, key, task):
+        if self._refresh_tasks.get(key) is task:
+            self._refresh_tasks.pop(key)
+
+    def _get_entry(self, exchange_name: str, content: str) -> typing.Optional[tuple]:
+        key = (exchange_name, content)
+        try:
+            return self._entries[key]
+        except KeyError:
+            pass
+        if (entry := self._read(exchange_name, content)) is not None:
+            self._entries[key] = entry
+        return entry
+
+    def _read(self, exchange_name: str, content: str) -> typing.Optional[tuple]:
+        path = self._get_path(exchange_name, content)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path) as cache_file:
+                cached = json.load(cache_file)
+            if cached[_VERSION_KEY] != self.version:
+                self.logger.debug(f"Ignored {path} cache from version {cached[_VERSION_KEY]}")
+                return None
+            if cached[_CHECKSUM_KEY] != _get_checksum(cached[_DATA_KEY]):
+                self.logger.warning(f"Ignored {path} cache: invalid checksum")
+                return None
+            return cached[_TIMESTAMP_KEY], cached[_DATA_KEY]
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            self.logger.warning(f"Ignored unreadable {path} cache: {err} ({err.__class__.__name__})")
+            return None
+
+    def _is_expired(self, timestamp: float) -> bool:
+        return time.time() - timestamp > self.ttl
+
+    def _get_path(self, exchange_name: str, content: str) -> str:
+        return os.path.join(self.cache_folder, re.sub(r"[^\w.-]", "_", f"{exchange_name}-{content}") + ".json")
+
+
+def _get_checksum(data) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
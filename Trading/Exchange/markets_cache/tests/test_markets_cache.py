@@ -0,0 +1,131 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import json
+import os
+import time
+import pytest
+
+from tentacles.Trading.Exchange.markets_cache import MarketsCache
+import tentacles.Trading.Exchange.markets_cache as markets_cache
+
+EXCHANGE = "binance"
+SYMBOLS = ["BTC/USDT", "ETH/USDT"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MarketsCache(cache_folder=str(tmp_path), ttl=10)
+
+
+def _file_path(cache, exchange=EXCHANGE, content=markets_cache.SYMBOLS_CONTENT):
+    return os.path.join(cache.cache_folder, f"{exchange}-{content}.json")
+
+
+def test_set_and_get_from_disk(cache):
+    assert cache.get(EXCHANGE, markets_cache.SYMBOLS_CONTENT) is None
+    assert cache.is_up_to_date(EXCHANGE, markets_cache.SYMBOLS_CONTENT) is False
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, SYMBOLS)
+    assert os.path.isfile(_file_path(cache))
+    assert not os.path.isfile(f"{_file_path(cache)}.tmp")
+    # new process: read from disk
+    restarted_cache = MarketsCache(cache_folder=cache.cache_folder, ttl=10)
+    assert restarted_cache.get(EXCHANGE, markets_cache.SYMBOLS_CONTENT) == SYMBOLS
+    assert restarted_cache.is_up_to_date(EXCHANGE, markets_cache.SYMBOLS_CONTENT) is True
+    assert restarted_cache.get(EXCHANGE, markets_cache.MARKETS_CONTENT) is None
+    assert restarted_cache.get("kucoin", markets_cache.SYMBOLS_CONTENT) is None
+
+
+def test_get_expired(cache):
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, SYMBOLS)
+    with open(_file_path(cache)) as cache_file:
+        content = json.load(cache_file)
+    content["timestamp"] = time.time() - 11
+    with open(_file_path(cache), "w") as cache_file:
+        json.dump(content, cache_file)
+    restarted_cache = MarketsCache(cache_folder=cache.cache_folder, ttl=10)
+    assert restarted_cache.get(EXCHANGE, markets_cache.SYMBOLS_CONTENT) is None
+    assert restarted_cache.is_up_to_date(EXCHANGE, markets_cache.SYMBOLS_CONTENT) is False
+    assert restarted_cache.get(EXCHANGE, markets_cache.SYMBOLS_CONTENT, allow_expired=True) == SYMBOLS
+
+
+def test_ignore_other_version(cache):
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, SYMBOLS)
+    assert MarketsCache(cache_folder=cache.cache_folder, version=cache.version + 1).get(
+        EXCHANGE, markets_cache.SYMBOLS_CONTENT, allow_expired=True
+    ) is None
+
+
+def test_ignore_invalid_files(cache):
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, SYMBOLS)
+    with open(_file_path(cache)) as cache_file:
+        content = json.load(cache_file)
+    content["data"].append("XRP/USDT")
+    with open(_file_path(cache), "w") as cache_file:
+        json.dump(content, cache_file)
+    assert MarketsCache(cache_folder=cache.cache_folder).get(
+        EXCHANGE, markets_cache.SYMBOLS_CONTENT, allow_expired=True
+    ) is None
+    with open(_file_path(cache), "w") as cache_file:
+        cache_file.write('{"version": 1, "timestamp"')
+    assert MarketsCache(cache_folder=cache.cache_folder).get(
+        EXCHANGE, markets_cache.SYMBOLS_CONTENT, allow_expired=True
+    ) is None
+
+
+def test_set_not_serializable(cache):
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, SYMBOLS)
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, [object()])
+    # previous file is kept
+    assert MarketsCache(cache_folder=cache.cache_folder).get(EXCHANGE, markets_cache.SYMBOLS_CONTENT) == SYMBOLS
+
+
+def test_clear(cache):
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, SYMBOLS)
+    cache.clear()
+    assert cache.get(EXCHANGE, markets_cache.SYMBOLS_CONTENT, allow_expired=True) is None
+    assert os.listdir(cache.cache_folder) == []
+
+
+@pytest.mark.asyncio
+async def test_refresh_in_background(cache):
+    calls = []
+
+    async def _fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return SYMBOLS
+
+    task = cache.refresh_in_background(EXCHANGE, markets_cache.SYMBOLS_CONTENT, _fetch)
+    # already refreshing
+    assert cache.refresh_in_background(EXCHANGE, markets_cache.SYMBOLS_CONTENT, _fetch) is task
+    assert cache.get(EXCHANGE, markets_cache.SYMBOLS_CONTENT) is None
+    await cache.wait_for_refreshes()
+    assert calls == [1]
+    assert cache.get(EXCHANGE, markets_cache.SYMBOLS_CONTENT) == SYMBOLS
+    assert MarketsCache(cache_folder=cache.cache_folder).get(EXCHANGE, markets_cache.SYMBOLS_CONTENT) == SYMBOLS
+
+
+@pytest.mark.asyncio
+async def test_refresh_in_background_error(cache):
+    cache.set(EXCHANGE, markets_cache.SYMBOLS_CONTENT, SYMBOLS)
+
+    async def _fetch():
+        raise RuntimeError("exchange is down")
+
+    await cache.refresh_in_background(EXCHANGE, markets_cache.SYMBOLS_CONTENT, _fetch)
+    # previous value is kept
+    assert cache.get(EXCHANGE, markets_cache.SYMBOLS_CONTENT) == SYMBOLS
@@ -14,7 +14,9 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import asyncio
+import collections
 import decimal
+import math
 
 import async_channel.constants as channel_constants
 import async_channel.channels as channel_instances
@@ -273,18 +275,83 @@ class ArbitrageModeConsumer(trading_modes.AbstractTradingModeConsumer):
                                                                            + self.STOP_LOSS_DELTA_FROM_OWN_PRICE))
 
 
+class MarkPrices(collections.UserDict):
+    """
+    Exchange name => mark price mapping keeping track of the sum of its prices as float
+    to get their average in O(1) on each price update.
+    """
+    # updates between two exact sum computations: prevents float errors accumulation
+    SUM_REFRESH_INTERVAL = 10000
+
+    def __init__(self, *args, **kwargs):
+        self._float_prices = {}
+        self._float_sum = 0.0
+        self._updates_count = 0
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, exchange, mark_price):
+        float_mark_price = float(mark_price)
+        self._float_sum += float_mark_price - self._float_prices.get(exchange, 0.0)
+        self._float_prices[exchange] = float_mark_price
+        self.data[exchange] = mark_price
+        self._updates_count += 1
+        if self._updates_count >= self.SUM_REFRESH_INTERVAL:
+            self._refresh_float_sum()
+
+    def __delitem__(self, exchange):
+        del self.data[exchange]
+        self._float_prices.pop(exchange)
+        self._refresh_float_sum()
+
+    def get_float_average(self) -> float:
+        return self._float_sum / len(self.data)
+
+    def get_decimal_average(self) -> decimal.Decimal:
+        return decimal.Decimal(str(data_util.mean([decimal.Decimal(str(price)) for price in self.data.values()])))
+
+    def _refresh_float_sum(self):
+        self._float_sum = math.fsum(self._float_prices.values())
+        self._updates_count = 0
+
+
 class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
+    # relative tolerance of the float based arbitrage opportunity pre-check, opportunities are then confirmed
+    # using decimal prices
+    FLOAT_OPPORTUNITY_CHECK_TOLERANCE = 1e-9
 
     def __init__(self, channel, config, trading_mode, exchange_manager):
         super().__init__(channel, config, trading_mode, exchange_manager)
-        self.own_exchange_mark_price: decimal.Decimal = None
-        self.other_exchanges_mark_prices = {}
+        self._own_exchange_mark_price = None
+        self._own_exchange_float_mark_price: float = None
+        self._own_exchange_decimal_mark_price: decimal.Decimal = None
+        self._other_exchanges_mark_prices = MarkPrices()
         self.state = trading_enums.EvaluatorStates.NEUTRAL
         self.final_eval = ""
         self.quote, self.base = symbol_util.parse_symbol(self.trading_mode.symbol).base_and_quote()
         self.lock = asyncio.Lock()
         self.enable_shorts = self.enable_longs = True
 
+    @property
+    def own_exchange_mark_price(self) -> decimal.Decimal:
+        if self._own_exchange_decimal_mark_price is None and self._own_exchange_mark_price is not None:
+            # only convert to decimal when required
+            self._own_exchange_decimal_mark_price = decimal.Decimal(str(self._own_exchange_mark_price))
+        return self._own_exchange_decimal_mark_price
+
+    @own_exchange_mark_price.setter
+    def own_exchange_mark_price(self, mark_price):
+        self._own_exchange_mark_price = mark_price
+        self._own_exchange_float_mark_price = None if mark_price is None else float(mark_price)
+        self._own_exchange_decimal_mark_price = None
+
+    @property
+    def other_exchanges_mark_prices(self) -> MarkPrices:
+        return self._other_exchanges_mark_prices
+
+    @other_exchanges_mark_prices.setter
+    def other_exchanges_mark_prices(self, mark_prices: dict):
+        self._other_exchanges_mark_prices = MarkPrices(mark_prices)
+
     def on_reload_config(self):
         """
         Called at constructor and after the associated trading mode's reload_config.
@@ -373,7 +440,7 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
         :param mark_price: updated mark price
         :return: None
         """
-        self.own_exchange_mark_price = decimal.Decimal(str(mark_price))
+        self.own_exchange_mark_price = mark_price
         try:
             if self.other_exchanges_mark_prices:
                 await self._analyse_arbitrage_opportunities()
@@ -392,17 +459,19 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
         :param mark_price: updated mark price
         :return: None
         """
-        self.other_exchanges_mark_prices[exchange] = decimal.Decimal(str(mark_price))
+        self.other_exchanges_mark_prices[exchange] = mark_price
         try:
-            if self.own_exchange_mark_price is not None:
+            if self._own_exchange_mark_price is not None:
                 await self._analyse_arbitrage_opportunities()
         except Exception as e:
             self.logger.exception(e, True, f"Error when handling mark_price_callback for {self.exchange_name}: {e}")
 
     async def _analyse_arbitrage_opportunities(self):
+        if not self._is_potential_arbitrage_opportunity():
+            # most price updates are not arbitrage opportunities: skip decimal computations
+            return
         async with self.trading_mode_trigger():
-            other_exchanges_average_price = \
-                decimal.Decimal(str(data_util.mean(self.other_exchanges_mark_prices.values())))
+            other_exchanges_average_price = self.other_exchanges_mark_prices.get_decimal_average()
             state = None
             if other_exchanges_average_price > self.own_exchange_mark_price * self.sup_triggering_price_delta_ratio:
                 # min long = high price > own_price / (1 - 2fees)
@@ -418,6 +487,17 @@ class ArbitrageModeProducer(trading_modes.AbstractTradingModeProducer):
                     # 2. handle new opportunities
                     await self._trigger_arbitrage_opportunity(other_exchanges_average_price, state)
 
+    def _is_potential_arbitrage_opportunity(self) -> bool:
+        other_exchanges_average_price = self.other_exchanges_mark_prices.get_float_average()
+        own_exchange_price = self._own_exchange_float_mark_price
+        return (
+            other_exchanges_average_price > own_exchange_price * float(self.sup_triggering_price_delta_ratio)
+            * (1 - self.FLOAT_OPPORTUNITY_CHECK_TOLERANCE)
+        ) or (
+            other_exchanges_average_price < own_exchange_price * float(self.inf_triggering_price_delta_ratio)
+            * (1 + self.FLOAT_OPPORTUNITY_CHECK_TOLERANCE)
+        )
+
     def _is_traded_state(self, state):
         if state is None:
             return False
@@ -20,6 +20,7 @@ import decimal
 import octobot_commons.pretty_printer as pretty_printer
 import octobot_trading.enums as trading_enums
 import tentacles.Trading.Mode.arbitrage_trading_mode.arbitrage_container as arbitrage_container_import
+import tentacles.Trading.Mode.arbitrage_trading_mode.arbitrage_trading as arbitrage_trading
 import tentacles.Trading.Mode.arbitrage_trading_mode.tests as arbitrage_trading_mode_tests
 import octobot_tentacles_manager.api as tentacles_manager_api
 
@@ -87,6 +88,36 @@ async def test_mark_price_callback():
             kraken_order_mock.assert_called_once()
 
 
+async def test_mark_prices():
+    mark_prices = arbitrage_trading.MarkPrices({"kraken": decimal.Decimal(10)})
+    assert mark_prices.get_float_average() == 10
+    mark_prices["bitfinex"] = 20.5
+    assert mark_prices.get_float_average() == 15.25
+    assert mark_prices.get_decimal_average() == decimal.Decimal("15.25")
+    mark_prices["kraken"] = 30
+    assert mark_prices.get_float_average() == 25.25
+    del mark_prices["bitfinex"]
+    assert mark_prices.get_float_average() == 30
+    assert mark_prices == {"kraken": 30}
+    for i in range(arbitrage_trading.MarkPrices.SUM_REFRESH_INTERVAL + 1):
+        mark_prices["kraken"] = 0.1 * i
+    assert mark_prices.get_float_average() == pytest.approx(0.1 * arbitrage_trading.MarkPrices.SUM_REFRESH_INTERVAL)
+
+
+async def test_analyse_arbitrage_opportunities_float_pre_check():
+    async with arbitrage_trading_mode_tests.exchange("binance") as exchange_tuple:
+        binance_producer, _, _ = exchange_tuple
+
+        with mock.patch.object(binance_producer, "trading_mode_trigger", mock.Mock()) as trading_mode_trigger_mock:
+            binance_producer.own_exchange_mark_price = 100
+            binance_producer.other_exchanges_mark_prices = {"kraken": 101, "bitfinex": 100.5}
+            # not an opportunity: decimal prices are not used
+            await binance_producer._analyse_arbitrage_opportunities()
+            trading_mode_trigger_mock.assert_not_called()
+            assert binance_producer._own_exchange_decimal_mark_price is None
+            assert binance_producer.own_exchange_mark_price == decimal.Decimal(100)
+
+
 async def test_order_filled_callback():
     async with arbitrage_trading_mode_tests.exchange("binance") as exchange_tuple:
         binance_producer, binance_consumer, _ = exchange_tuple
@@ -0,0 +1,110 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import decimal
+import os
+import time
+import mock
+import numpy as np
+import pytest
+
+import octobot_commons.data_util as data_util
+import octobot_trading.enums as trading_enums
+import tentacles.Trading.Mode.arbitrage_trading_mode.tests as arbitrage_trading_mode_tests
+
+# All test coroutines will be treated as marked.
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it"),
+]
+
+TICKS_COUNT = 1000000
+OTHER_EXCHANGES = [f"exchange_{i}" for i in range(9)]
+# one in OPPORTUNITY_INTERVAL ticks is an opportunity on the own exchange
+OPPORTUNITY_INTERVAL = 50000
+
+
+def _get_ticks():
+    random = np.random.default_rng(42)
+    exchanges = [None] + OTHER_EXCHANGES  # None is the own exchange
+    exchange_indexes = random.integers(0, len(exchanges), TICKS_COUNT)
+    prices = 10000 + np.cumsum(random.normal(0, 1, TICKS_COUNT)) + random.normal(0, 5, TICKS_COUNT)
+    # price spikes on the own exchange
+    spikes = np.arange(OPPORTUNITY_INTERVAL, TICKS_COUNT, OPPORTUNITY_INTERVAL)
+    exchange_indexes[spikes] = 0
+    prices[spikes] *= np.where(np.arange(len(spikes)) % 2, 1.05, 0.95)
+    return [(exchanges[index], price) for index, price in zip(exchange_indexes.tolist(), prices.tolist())]
+
+
+async def _legacy_replay(producer, ticks):
+    # previous implementation: decimal prices and average computed on each tick
+    own_exchange_mark_price = None
+    other_exchanges_mark_prices = {}
+
+    async def _analyse_arbitrage_opportunities():
+        async with producer.trading_mode_trigger():
+            other_exchanges_average_price = \
+                decimal.Decimal(str(data_util.mean(other_exchanges_mark_prices.values())))
+            state = None
+            if other_exchanges_average_price > own_exchange_mark_price * producer.sup_triggering_price_delta_ratio:
+                state = trading_enums.EvaluatorStates.LONG
+            elif other_exchanges_average_price < own_exchange_mark_price * producer.inf_triggering_price_delta_ratio:
+                state = trading_enums.EvaluatorStates.SHORT
+            if producer._is_traded_state(state):
+                async with producer.lock:
+                    await producer._ensure_no_expired_opportunities(other_exchanges_average_price, state)
+                    await producer._trigger_arbitrage_opportunity(other_exchanges_average_price, state)
+
+    for exchange, mark_price in ticks:
+        if exchange is None:
+            own_exchange_mark_price = decimal.Decimal(str(mark_price))
+            if other_exchanges_mark_prices:
+                await _analyse_arbitrage_opportunities()
+        else:
+            other_exchanges_mark_prices[exchange] = decimal.Decimal(str(mark_price))
+            if own_exchange_mark_price is not None:
+                await _analyse_arbitrage_opportunities()
+
+
+async def _replay(producer, ticks):
+    for exchange, mark_price in ticks:
+        if exchange is None:
+            await producer._own_exchange_mark_price_callback("", "", "", "", mark_price)
+        else:
+            await producer._mark_price_callback(exchange, "", "", "", mark_price)
+
+
+async def _timed_replay(replay, producer, ticks):
+    with mock.patch.object(producer, "_ensure_no_expired_opportunities", new=mock.AsyncMock()), \
+            mock.patch.object(producer, "_trigger_arbitrage_opportunity", new=mock.AsyncMock()) as trigger_mock:
+        t0 = time.perf_counter()
+        await replay(producer, ticks)
+        duration = time.perf_counter() - t0
+        return duration, trigger_mock.mock_calls
+
+
+async def test_mark_price_ticks_benchmark():
+    ticks = _get_ticks()
+    async with arbitrage_trading_mode_tests.exchange("binance") as exchange_tuple:
+        producer, _, _ = exchange_tuple
+        legacy_duration, legacy_triggers = await _timed_replay(_legacy_replay, producer, ticks)
+        duration, triggers = await _timed_replay(_replay, producer, ticks)
+    print(f"\n{TICKS_COUNT} mark price ticks across {len(OTHER_EXCHANGES) + 1} exchanges: "
+          f"previous implementation: {TICKS_COUNT / legacy_duration:.0f} ticks/s, "
+          f"running average: {TICKS_COUNT / duration:.0f} ticks/s (x{legacy_duration / duration:.1f})")
+    # same opportunities are identified
+    assert triggers
+    assert triggers == legacy_triggers
+    assert duration < legacy_duration
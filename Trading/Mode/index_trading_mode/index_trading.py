@@ -31,6 +31,7 @@ import octobot_trading.util as trading_util
 import octobot_trading.personal_data as trading_personal_data
 import octobot_trading.signals as signals
 
+import tentacles.Trading.Exchange.exchange_requests_limiter as exchange_requests_limiter
 import tentacles.Trading.Mode.index_trading_mode.index_distribution as index_distribution
 
 
@@ -66,9 +67,26 @@ DEFAULT_QUOTE_ASSET_REBALANCE_TRIGGER_MIN_RATIO = 0.1  # 10%
 DEFAULT_REBALANCE_TRIGGER_MIN_RATIO = 0.05  # 5%
 
 
+class _FundsReservation:
+    """
+    Reference market funds available before creating concurrent buy orders: each order reserves its cost
+    before being created for concurrent orders not to use the same funds
+    """
+    def __init__(self, available):
+        self.available = available
+        self.reserved = trading_constants.ZERO
+
+    def get_unreserved(self):
+        return max(self.available - self.reserved, trading_constants.ZERO)
+
+    def reserve(self, amount):
+        self.reserved += amount
+
+
 class IndexTradingModeConsumer(trading_modes.AbstractTradingModeConsumer):
     FILL_ORDER_TIMEOUT = 60
     SIMPLE_ADD_MIN_TOLERANCE_RATIO = decimal.Decimal("0.8")  # 20% tolerance
+    MAX_CONCURRENT_REQUESTS = 10    # max concurrent price fetching and buy orders creation requests
 
     def __init__(self, trading_mode):
         super().__init__(trading_mode)
@@ -243,7 +261,6 @@ class IndexTradingModeConsumer(trading_modes.AbstractTradingModeConsumer):
     async def _split_reference_market_into_indexed_coins(
         self, details: dict, is_simple_buy_without_selling: bool, dependencies: typing.Optional[commons_signals.SignalDependencies]
     ):
-        orders = []
         ref_market = self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market
         if details[RebalanceDetails.SWAP.value] or is_simple_buy_without_selling:
             # has to infer total reference market holdings
@@ -262,25 +279,94 @@ class IndexTradingModeConsumer(trading_modes.AbstractTradingModeConsumer):
             coins_to_buy = self.trading_mode.indexed_coins
         self.logger.info(f"Splitting {reference_market_to_split} {ref_market} to buy {coins_to_buy}")
         amount_by_symbol = await self._get_symbols_and_amounts(coins_to_buy, reference_market_to_split)
-        for symbol, ideal_amount in amount_by_symbol.items():
-            orders.extend(await self._buy_coin(symbol, ideal_amount, dependencies))
+        orders = await self._buy_coins(amount_by_symbol, dependencies)
         if not orders:
             raise trading_errors.MissingMinimalExchangeTradeVolume()
         return orders
 
+    async def _buy_coins(
+        self, amount_by_symbol: dict, dependencies: typing.Optional[commons_signals.SignalDependencies]
+    ) -> list:
+        orders = []
+        symbols = list(amount_by_symbol)
+        # buy orders are independent: create them concurrently except for the last one which is created
+        # afterward as it can be adapted to the funds left by others
+        concurrent_symbols = symbols[:-1]
+        funds_reservation = None
+        if len(concurrent_symbols) > 1:
+            # concurrent orders can't see each other's locked funds
+            funds_reservation = _FundsReservation(
+                self.exchange_manager.exchange_personal_data.portfolio_manager.portfolio.get_currency_portfolio(
+                    self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market
+                ).available
+            )
+        results = await self._gather_with_concurrency_limit([
+            self._buy_coin(symbol, amount_by_symbol[symbol], dependencies, funds_reservation=funds_reservation)
+            for symbol in concurrent_symbols
+        ])
+        results += await self._gather_with_concurrency_limit([
+            self._buy_coin(symbol, amount_by_symbol[symbol], dependencies)
+            for symbol in symbols[-1:]
+        ])
+        errors = []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                # don't prevent other coins from being bought
+                self.logger.exception(
+                    result, True, f"Error when buying {symbol}: {result} ({result.__class__.__name__})"
+                )
+                errors.append(result)
+            else:
+                orders.extend(result)
+        if errors and not orders:
+            raise errors[0]
+        return orders
+
+    async def _gather_with_concurrency_limit(self, coroutines: list) -> list:
+        """
+        :return: the result or raised exception of each coroutine, in the coroutines order
+        """
+        semaphore = asyncio.Semaphore(self._get_max_concurrent_requests())
+
+        async def _limited(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        return await asyncio.gather(*(_limited(coroutine) for coroutine in coroutines), return_exceptions=True)
+
+    def _get_max_concurrent_requests(self) -> int:
+        return exchange_requests_limiter.get_max_concurrent_requests(
+            self.exchange_manager, self.MAX_CONCURRENT_REQUESTS
+        )
+
     async def _get_symbols_and_amounts(self, coins_to_buy, reference_market_to_split):
         amount_by_symbol = {}
-        for coin in coins_to_buy:
-            if coin == self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market:
-                # nothing to do for reference market, keep as is
-                continue
-            symbol = symbol_util.merge_currencies(
-                coin,
-                self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market
-            )
-            price = await trading_personal_data.get_up_to_date_price(
+        reference_market = self.exchange_manager.exchange_personal_data.portfolio_manager.reference_market
+        symbol_by_coin = {
+            coin: symbol_util.merge_currencies(coin, reference_market)
+            for coin in coins_to_buy
+            # nothing to do for reference market, keep as is
+            if coin != reference_market
+        }
+        prices = await self._gather_with_concurrency_limit([
+            trading_personal_data.get_up_to_date_price(
                 self.exchange_manager, symbol, timeout=trading_constants.ORDER_DATA_FETCHING_TIMEOUT
             )
+            for symbol in symbol_by_coin.values()
+        ])
+        price_errors = []
+        for (coin, symbol), price in zip(symbol_by_coin.items(), prices):
+            if isinstance(price, asyncio.CancelledError):
+                raise price
+            if isinstance(price, BaseException):
+                # don't prevent other coins from being bought
+                self.logger.exception(
+                    price, True, f"Error when fetching {symbol} price: {price} ({price.__class__.__name__})"
+                )
+                price_errors.append(price)
+                continue
             symbol_market = self.exchange_manager.exchange.get_market_status(symbol, with_fixer=False)
             ratio = self.trading_mode.get_target_ratio(coin)
             if ratio == trading_constants.ZERO:
@@ -311,13 +397,21 @@ class IndexTradingModeConsumer(trading_modes.AbstractTradingModeConsumer):
                     f"{symbol_market[trading_enums.ExchangeConstantsMarketStatusColumns.LIMITS.value]}."
                 )
             amount_by_symbol[symbol] = ideal_amount
+        if price_errors and not amount_by_symbol:
+            raise price_errors[0]
         return amount_by_symbol
 
-    async def _buy_coin(self, symbol, ideal_amount, dependencies: typing.Optional[commons_signals.SignalDependencies]) -> list:
+    async def _buy_coin(
+        self, symbol, ideal_amount, dependencies: typing.Optional[commons_signals.SignalDependencies],
+        funds_reservation: typing.Optional["_FundsReservation"] = None
+    ) -> list:
         current_symbol_holding, current_market_holding, market_quantity, price, symbol_market = \
             await trading_personal_data.get_pre_order_data(
                 self.exchange_manager, symbol=symbol, timeout=trading_constants.ORDER_DATA_FETCHING_TIMEOUT
             )
+        if funds_reservation is not None:
+            # concurrent buy orders: don't use funds reserved by other orders
+            current_market_holding = min(current_market_holding, funds_reservation.get_unreserved())
         order_target_price = price
         # ideally use the expected reference_market_available_holdings ratio, fallback to available
         # holdings if necessary
@@ -329,6 +423,8 @@ class IndexTradingModeConsumer(trading_modes.AbstractTradingModeConsumer):
             self.exchange_manager, symbol, trading_enums.TraderOrderType.BUY_MARKET, ideal_quantity,
             order_target_price, trading_enums.TradeOrderSide.BUY
         )
+        if funds_reservation is not None:
+            funds_reservation.reserve(quantity * order_target_price)
         created_orders = []
         orders_should_have_been_created = False
         ideal_order_type = trading_enums.TraderOrderType.BUY_MARKET
@@ -13,6 +13,7 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
 import time
 import pytest
 import pytest_asyncio
@@ -1890,7 +1891,31 @@ async def test_get_symbols_and_amounts(tools):
     ) as get_up_to_date_price_mock:
         with pytest.raises(trading_errors.MissingMinimalExchangeTradeVolume):
             await consumer._get_symbols_and_amounts(["BTC", "ETH"], decimal.Decimal(0.01))
-        assert get_up_to_date_price_mock.call_count == 1
+        # prices are fetched concurrently
+        assert get_up_to_date_price_mock.call_count == 2
+
+    # price fetching errors
+    async def _get_up_to_date_price(_, symbol, **__):
+        if symbol == "ETH/USDT":
+            raise trading_errors.FailedRequest("ETH price")
+        return decimal.Decimal(1000)
+
+    with mock.patch.object(
+            trading_personal_data, "get_up_to_date_price", mock.AsyncMock(side_effect=_get_up_to_date_price)
+    ), mock.patch.object(consumer.logger, "exception", mock.Mock()) as exception_mock:
+        # ETH error does not prevent BTC from being bought
+        assert await consumer._get_symbols_and_amounts(["BTC", "ETH"], decimal.Decimal(3000)) == {
+            "BTC/USDT": decimal.Decimal("1.5")
+        }
+        exception_mock.assert_called_once()
+        # only errors: raise
+        with pytest.raises(trading_errors.FailedRequest):
+            await consumer._get_symbols_and_amounts(["ETH"], decimal.Decimal(3000))
+    with mock.patch.object(
+            trading_personal_data, "get_up_to_date_price", mock.AsyncMock(side_effect=asyncio.CancelledError)
+    ):
+        with pytest.raises(asyncio.CancelledError):
+            await consumer._get_symbols_and_amounts(["BTC", "ETH"], decimal.Decimal(3000))
 
     # with ref market in coins config
     mode.trading_config = {
@@ -1919,6 +1944,175 @@ async def test_get_symbols_and_amounts(tools):
         assert get_up_to_date_price_mock.call_count == 1
 
 
+async def test_buy_coins(tools):
+    update = {}
+    mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
+    dependencies = trading_signals.get_orders_dependencies([mock.Mock(order_id="123")])
+    amount_by_symbol = {
+        "BTC/USDT": decimal.Decimal(1),
+        "ETH/USDT": decimal.Decimal(2),
+        "SOL/USDT": decimal.Decimal(3),
+    }
+
+    async def _buy_coin(symbol, ideal_amount, _, **__):
+        if symbol == "ETH/USDT":
+            raise trading_errors.MissingMinimalExchangeTradeVolume()
+        return [f"{symbol} order"]
+
+    with mock.patch.object(consumer, "_buy_coin", mock.AsyncMock(side_effect=_buy_coin)) as _buy_coin_mock:
+        # ETH error does not prevent other coins from being bought
+        assert await consumer._buy_coins(amount_by_symbol, dependencies) == ["BTC/USDT order", "SOL/USDT order"]
+        assert _buy_coin_mock.call_count == 3
+        # last coin is bought after others
+        assert _buy_coin_mock.mock_calls[-1].args == ("SOL/USDT", decimal.Decimal(3), dependencies)
+        _buy_coin_mock.reset_mock()
+
+        # only errors: raise
+        with pytest.raises(trading_errors.MissingMinimalExchangeTradeVolume):
+            await consumer._buy_coins({"ETH/USDT": decimal.Decimal(2)}, dependencies)
+        _buy_coin_mock.assert_called_once_with("ETH/USDT", decimal.Decimal(2), dependencies)
+
+    async def _cancelled_buy_coin(symbol, ideal_amount, _, **__):
+        if symbol == "ETH/USDT":
+            raise asyncio.CancelledError()
+        return [f"{symbol} order"]
+
+    with mock.patch.object(consumer, "_buy_coin", mock.AsyncMock(side_effect=_cancelled_buy_coin)):
+        # cancellation is not handled as a buy error
+        with pytest.raises(asyncio.CancelledError):
+            await consumer._buy_coins(amount_by_symbol, dependencies)
+
+
+async def test_buy_coins_does_not_over_commit_funds(tools):
+    update = {}
+    mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
+    dependencies = trading_signals.get_orders_dependencies([mock.Mock(order_id="123")])
+    price = decimal.Decimal(100)
+    symbol_market = trader.exchange_manager.exchange.get_market_status("BTC/USDT", with_fixer=False)
+    amount_by_symbol = {
+        "BTC/USDT": decimal.Decimal(7),
+        "ETH/USDT": decimal.Decimal(7),
+        "SOL/USDT": decimal.Decimal(7),
+        "ADA/USDT": decimal.Decimal(7),
+    }
+
+    async def _get_pre_order_data(*_, **__):
+        # available funds are not updated until orders are created
+        await asyncio.sleep(0.01)
+        return trading_constants.ZERO, decimal.Decimal(2000), decimal.Decimal(20), price, symbol_market
+
+    async def _create_order(order, **_):
+        await asyncio.sleep(0.01)
+        return order
+
+    with mock.patch.object(
+        trading_personal_data, "get_pre_order_data", mock.AsyncMock(side_effect=_get_pre_order_data)
+    ), mock.patch.object(
+        trading_personal_data, "decimal_adapt_order_quantity_because_fees",
+        mock.Mock(side_effect=lambda _, __, ___, quantity, *____: quantity)
+    ), mock.patch.object(
+        trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio,
+        "get_currency_portfolio", mock.Mock(return_value=mock.Mock(available=decimal.Decimal(2000)))
+    ), mock.patch.object(mode, "create_order", mock.AsyncMock(side_effect=_create_order)):
+        orders = await consumer._buy_coins(amount_by_symbol, dependencies)
+    # concurrent orders share the 2000 USDT
+    assert [(order.symbol, order.origin_quantity) for order in orders[:3]] == [
+        ("BTC/USDT", decimal.Decimal(7)),
+        ("ETH/USDT", decimal.Decimal(7)),
+        ("SOL/USDT", decimal.Decimal(6)),
+    ]
+    # last order is created afterward from the actual available funds
+    assert orders[3].symbol == "ADA/USDT"
+
+
+async def test_get_max_concurrent_requests(tools):
+    update = {}
+    mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
+    # simulated exchange
+    assert consumer._get_max_concurrent_requests() == consumer.MAX_CONCURRENT_REQUESTS
+    with mock.patch.object(consumer, "exchange_manager", mock.Mock()) as exchange_manager_mock:
+        exchange_manager_mock.exchange.connector.client.rateLimit = 200
+        assert consumer._get_max_concurrent_requests() == 5
+        exchange_manager_mock.exchange.connector.client.rateLimit = 50
+        assert consumer._get_max_concurrent_requests() == consumer.MAX_CONCURRENT_REQUESTS
+        exchange_manager_mock.exchange.connector.client.rateLimit = 2000
+        assert consumer._get_max_concurrent_requests() == 1
+        exchange_manager_mock.exchange.connector.client.rateLimit = None
+        assert consumer._get_max_concurrent_requests() == consumer.MAX_CONCURRENT_REQUESTS
+
+
+async def test_split_reference_market_into_indexed_coins_with_exchange_latency(tools):
+    update = {}
+    mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
+    coins = ["BTC", "ETH", "ADA", "SOL", "XRP", "DOT", "LTC", "BNB"]
+    trader.exchange_manager.exchange_config.traded_symbols = [
+        commons_symbols.parse_symbol(f"{coin}/USDT")
+        for coin in coins
+    ]
+    mode.ensure_updated_coins_distribution()
+    assert sorted(mode.indexed_coins) == sorted(coins)
+    details = {index_trading.RebalanceDetails.SWAP.value: {}}
+    dependencies = trading_signals.get_orders_dependencies([mock.Mock(order_id="123")])
+    price = decimal.Decimal(100)
+    symbol_market = trader.exchange_manager.exchange.get_market_status("BTC/USDT", with_fixer=False)
+    running_requests_by_type = {}
+    max_running_requests_by_type = {}
+
+    async def _exchange_request(request_type, result):
+        running_requests_by_type[request_type] = running_requests_by_type.get(request_type, 0) + 1
+        max_running_requests_by_type[request_type] = max(
+            max_running_requests_by_type.get(request_type, 0), running_requests_by_type[request_type]
+        )
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            running_requests_by_type[request_type] -= 1
+        return result
+
+    async def _get_up_to_date_price(*_, **__):
+        return await _exchange_request("price", price)
+
+    async def _get_pre_order_data(*_, **__):
+        return await _exchange_request(
+            "pre_order_data",
+            (trading_constants.ZERO, decimal.Decimal(2000), decimal.Decimal(20), price, symbol_market)
+        )
+
+    async def _create_order(order, **_):
+        return await _exchange_request("create_order", order)
+
+    async def _split(max_concurrent_requests):
+        max_running_requests_by_type.clear()
+        with mock.patch.object(
+            consumer, "_get_max_concurrent_requests", mock.Mock(return_value=max_concurrent_requests)
+        ), mock.patch.object(mode, "create_order", mock.AsyncMock(side_effect=_create_order)):
+            orders = await consumer._split_reference_market_into_indexed_coins(details, False, dependencies)
+            return dict(max_running_requests_by_type), [(order.symbol, order.origin_quantity) for order in orders]
+
+    with mock.patch.object(
+        trading_personal_data, "get_up_to_date_price", mock.AsyncMock(side_effect=_get_up_to_date_price)
+    ), mock.patch.object(
+        trading_personal_data, "get_pre_order_data", mock.AsyncMock(side_effect=_get_pre_order_data)
+    ), mock.patch.object(
+        trader.exchange_manager.exchange, "get_market_status", mock.Mock(return_value=symbol_market)
+    ), mock.patch.object(
+        trading_personal_data, "decimal_adapt_order_quantity_because_fees",
+        mock.Mock(side_effect=lambda _, __, ___, quantity, *____: quantity)
+    ), mock.patch.object(
+        trader.exchange_manager.exchange_personal_data.portfolio_manager.portfolio,
+        "get_currency_portfolio", mock.Mock(return_value=mock.Mock(available=decimal.Decimal(2000)))
+    ):
+        sequential_max_running_requests, sequential_allocation = await _split(1)
+        concurrent_max_running_requests, concurrent_allocation = await _split(3)
+    # same orders
+    assert len(sequential_allocation) == len(coins)
+    assert concurrent_allocation == sequential_allocation
+    # one request at a time
+    assert sequential_max_running_requests == {"price": 1, "pre_order_data": 1, "create_order": 1}
+    # prices are fetched and orders created concurrently, within the concurrency limit
+    assert concurrent_max_running_requests == {"price": 3, "pre_order_data": 3, "create_order": 3}
+
+
 async def test_buy_coin(tools):
     update = {}
     mode, producer, consumer, trader = await _init_mode(tools, _get_config(tools, update))
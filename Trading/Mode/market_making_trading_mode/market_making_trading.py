@@ -34,6 +34,7 @@ import octobot_trading.personal_data as trading_personal_data
 import octobot_trading.exchanges as trading_exchanges
 import tentacles.Trading.Mode.market_making_trading_mode.order_book_distribution as order_book_distribution
 import tentacles.Trading.Mode.market_making_trading_mode.reference_price as reference_price_import
+import tentacles.Trading.Mode.market_making_trading_mode.open_orders_view as open_orders_view
 
 
 @dataclasses.dataclass
@@ -231,6 +232,9 @@ class MarketMakingTradingMode(trading_modes.AbstractTradingMode):
     async def _order_notification_callback(
         self, exchange, exchange_id, cryptocurrency, symbol, order, update_type, is_from_bot
     ):
+        if not self.producers:
+            return
+        self.producers[0].on_order_update(order)
         if (
             order[trading_enums.ExchangeConstantsOrderColumns.STATUS.value] == trading_enums.OrderStatus.FILLED.value
             and order[trading_enums.ExchangeConstantsOrderColumns.TYPE.value] in (
@@ -476,6 +480,8 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
         self._started_at = 0
         self._last_error_at = 0
         self.latest_actions_plan: OrdersUpdatePlan = None
+        self._open_orders_view: open_orders_view.OpenOrdersView = open_orders_view.OpenOrdersView()
+        self._reference_price_exchange_manager = None
 
         try:
             self._load_symbol_trading_config()
@@ -581,6 +587,8 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
         #   - on initialization
         #   - when price moves beyond spread
         #   - when orders are filled
+        # synchronize open orders view on next reference price update to make sure it remains accurate
+        self._open_orders_view.invalidate()
         _, _, _, current_price, symbol_market = await trading_personal_data.get_pre_order_data(
             self.exchange_manager,
             symbol=self.symbol,
@@ -1190,32 +1198,37 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
     async def _on_reference_price_update(self):
         trigger = False
         if reference_price := await self._get_reference_price():
-            open_orders = self.get_market_making_orders()
-            buy_orders = [
-                order
-                for order in open_orders
-                if order.side == trading_enums.TradeOrderSide.BUY
-            ]
-            if not buy_orders:
+            if not self._open_orders_view.is_synchronized:
+                self._open_orders_view.synchronize(self.get_market_making_orders())
+            max_buy_price = self._open_orders_view.get_highest_buy_price()
+            if max_buy_price is None or max_buy_price > reference_price:
                 trigger = True
-            else:
-                max_buy_price = max(order.origin_price for order in buy_orders)
-                if max_buy_price > reference_price:
-                    trigger = True
-            sell_orders = [
-                order
-                for order in open_orders
-                if order.side == trading_enums.TradeOrderSide.SELL
-            ]
-            if not sell_orders:
+            min_sell_price = self._open_orders_view.get_lowest_sell_price()
+            if min_sell_price is None or min_sell_price < reference_price:
                 trigger = True
-            else:
-                min_sell_price = min(order.origin_price for order in sell_orders)
-                if min_sell_price < reference_price:
-                    trigger = True
         if trigger:
             await self._ensure_market_making_orders(f"reference price update: {float(reference_price)}")
 
+    def on_order_update(self, order: dict):
+        """
+        Called on each update of this symbol's orders: keeps open orders view up-to-date
+        :param order: the updated order dict
+        :return: None
+        """
+        order_id = order[trading_enums.ExchangeConstantsOrderColumns.ID.value]
+        try:
+            updated_order = self.exchange_manager.exchange_personal_data.orders_manager.get_order(order_id)
+        except KeyError:
+            # order is not open anymore
+            self._open_orders_view.remove(order_id)
+            return
+        if updated_order.is_open() and isinstance(
+            updated_order, (trading_personal_data.BuyLimitOrder, trading_personal_data.SellLimitOrder)
+        ):
+            self._open_orders_view.upsert(order_id, updated_order.side, updated_order.origin_price)
+        else:
+            self._open_orders_view.remove(order_id)
+
     async def order_filled_callback(self, order: dict):
         self.logger.info(
             f"Triggering {self.symbol} [{self.exchange_manager.exchange_name}] order update an order got filled: "
@@ -1251,6 +1264,8 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
         )
 
     async def _get_reference_price(self) -> decimal.Decimal:
+        if self._reference_price_exchange_manager is not None:
+            return self._read_reference_price(self._reference_price_exchange_manager)
         local_exchange_name = self.exchange_manager.exchange_name
         price = trading_constants.ZERO
         for exchange_id in trading_api.get_all_exchange_ids_with_same_matrix_id(
@@ -1270,25 +1285,31 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
                 continue
             if exchange_id not in self.subscribed_exchange_ids:
                 await self._subscribe_to_exchange_mark_price(exchange_id, exchange_manager)
-            try:
-                price, updated = trading_personal_data.get_potentially_outdated_price(
-                    exchange_manager, self.reference_price.pair
-                )
-                if not updated:
-                    self.logger.warning(
-                        f"{exchange_manager.exchange_name} mark price: {price} is outdated for {self.symbol}. "
-                        f"Using it anyway"
-                    )
-            except KeyError:
-                method = self.logger.info if self.is_first_execution else (
-                    self.logger.error if (
-                        self.exchange_manager.exchange.get_exchange_current_time() - self._started_at
-                        > self.REFERENCE_PRICE_INIT_DELAY
-                    )
-                    else self.logger.warning()
+            self._reference_price_exchange_manager = exchange_manager
+            price = self._read_reference_price(exchange_manager)
+        return price
+
+    def _read_reference_price(self, exchange_manager) -> decimal.Decimal:
+        try:
+            price, updated = trading_personal_data.get_potentially_outdated_price(
+                exchange_manager, self.reference_price.pair
+            )
+            if not updated:
+                self.logger.warning(
+                    f"{exchange_manager.exchange_name} mark price: {price} is outdated for {self.symbol}. "
+                    f"Using it anyway"
                 )
-                method(
-                    f"No {exchange_manager.exchange_name} exchange symbol data for {self.symbol}, "
-                    f"it's probably initializing"
+            return price
+        except KeyError:
+            method = self.logger.info if self.is_first_execution else (
+                self.logger.error if (
+                    self.exchange_manager.exchange.get_exchange_current_time() - self._started_at
+                    > self.REFERENCE_PRICE_INIT_DELAY
                 )
-        return price
+                else self.logger.warning()
+            )
+            method(
+                f"No {exchange_manager.exchange_name} exchange symbol data for {self.symbol}, "
+                f"it's probably initializing"
+            )
+        return trading_constants.ZERO
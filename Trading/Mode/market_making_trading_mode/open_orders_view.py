@@ -0,0 +1,72 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import decimal
+import typing
+
+import sortedcontainers
+
+import octobot_trading.enums as trading_enums
+
+
+class OpenOrdersView:
+    """
+    Side sorted prices of the open market making orders, updated from orders notifications
+    to avoid going through every open order on each reference price update.
+    """
+
+    def __init__(self):
+        self.is_synchronized: bool = False
+        self._side_and_price_by_order_id: dict = {}
+        self._prices_by_side: dict = {
+            trading_enums.TradeOrderSide.BUY: sortedcontainers.SortedList(),
+            trading_enums.TradeOrderSide.SELL: sortedcontainers.SortedList(),
+        }
+
+    def synchronize(self, open_orders: list):
+        self.clear()
+        for order in open_orders:
+            self.upsert(order.order_id, order.side, order.origin_price)
+        self.is_synchronized = True
+
+    def invalidate(self):
+        # will be synchronized from open orders on next use
+        self.is_synchronized = False
+
+    def upsert(self, order_id: str, side: trading_enums.TradeOrderSide, price: decimal.Decimal):
+        self.remove(order_id)
+        self._side_and_price_by_order_id[order_id] = (side, price)
+        self._prices_by_side[side].add(price)
+
+    def remove(self, order_id: str):
+        if (side_and_price := self._side_and_price_by_order_id.pop(order_id, None)) is not None:
+            side, price = side_and_price
+            self._prices_by_side[side].remove(price)
+
+    def clear(self):
+        self._side_and_price_by_order_id.clear()
+        for prices in self._prices_by_side.values():
+            prices.clear()
+
+    def get_highest_buy_price(self) -> typing.Optional[decimal.Decimal]:
+        buy_prices = self._prices_by_side[trading_enums.TradeOrderSide.BUY]
+        return buy_prices[-1] if buy_prices else None
+
+    def get_lowest_sell_price(self) -> typing.Optional[decimal.Decimal]:
+        sell_prices = self._prices_by_side[trading_enums.TradeOrderSide.SELL]
+        return sell_prices[0] if sell_prices else None
+
+    def __len__(self):
+        return len(self._side_and_price_by_order_id)
@@ -336,3 +336,96 @@ async def test_handle_market_making_orders_missing_funds_for_buy_orders():
             ])
             _get_reference_price_mock.reset_mock()
             submit_trading_evaluation_mock.reset_mock()
+
+
+async def test_on_reference_price_update():
+    symbol = "BTC/USDT"
+    async with _get_tools(symbol) as (producer, consumer, exchange_manager):
+        price = decimal.Decimal(1000)
+        with mock.patch.object(
+            producer, "_get_reference_price", mock.AsyncMock(return_value=price)
+        ), mock.patch.object(
+            producer, "_get_daily_volume", mock.Mock(return_value=(decimal.Decimal(1), decimal.Decimal(1000)))
+        ):
+            # create orders
+            assert await producer._handle_market_making_orders(price, SYMBOL_MARKET, "ref_price", False) is True
+            for _ in range(10):
+                await asyncio_tools.wait_asyncio_next_cycle()
+        open_orders = exchange_manager.exchange_personal_data.orders_manager.get_open_orders(symbol)
+        assert len(open_orders) == 10
+        with mock.patch.object(
+            producer, "_get_reference_price", mock.AsyncMock(return_value=price)
+        ) as _get_reference_price_mock, mock.patch.object(
+            producer, "_ensure_market_making_orders", mock.AsyncMock()
+        ) as _ensure_market_making_orders_mock:
+            # 1. orders are around reference price: nothing to do
+            assert producer._open_orders_view.is_synchronized is False
+            await producer._on_reference_price_update()
+            assert producer._open_orders_view.is_synchronized is True
+            assert len(producer._open_orders_view) == 10
+            _ensure_market_making_orders_mock.assert_not_awaited()
+
+            # 2. price moved beyond sell orders
+            _get_reference_price_mock.return_value = max(o.origin_price for o in open_orders) + 1
+            await producer._on_reference_price_update()
+            _ensure_market_making_orders_mock.assert_awaited_once()
+            _ensure_market_making_orders_mock.reset_mock()
+
+            # 3. buy orders are cancelled: view is updated from orders notifications
+            _get_reference_price_mock.return_value = price
+            for order in open_orders:
+                if order.side is trading_enums.TradeOrderSide.BUY:
+                    await exchange_manager.trader.cancel_order(order)
+                    producer.on_order_update({trading_enums.ExchangeConstantsOrderColumns.ID.value: order.order_id})
+            assert producer._open_orders_view.is_synchronized is True
+            assert len(producer._open_orders_view) == 5
+            assert producer._open_orders_view.get_highest_buy_price() is None
+            await producer._on_reference_price_update()
+            _ensure_market_making_orders_mock.assert_awaited_once()
+
+
+async def test_get_reference_price_from_reference_exchange_manager():
+    symbol = "BTC/USDT"
+    async with _get_tools(symbol) as (producer, consumer, exchange_manager):
+        producer._reference_price_exchange_manager = exchange_manager
+        with mock.patch.object(
+            market_making_trading.trading_personal_data, "get_potentially_outdated_price",
+            mock.Mock(return_value=(decimal.Decimal(1000), True))
+        ) as get_potentially_outdated_price_mock, mock.patch.object(
+            producer.logger, "warning", mock.Mock()
+        ) as warning_mock, mock.patch.object(
+            market_making_trading.trading_api, "get_all_exchange_ids_with_same_matrix_id", mock.Mock()
+        ) as get_all_exchange_ids_with_same_matrix_id_mock:
+            assert await producer._get_reference_price() == decimal.Decimal(1000)
+            get_potentially_outdated_price_mock.assert_called_once_with(exchange_manager, symbol)
+            # exchanges are not looked up again
+            get_all_exchange_ids_with_same_matrix_id_mock.assert_not_called()
+            warning_mock.assert_not_called()
+            get_potentially_outdated_price_mock.reset_mock()
+
+            # outdated price
+            get_potentially_outdated_price_mock.return_value = (decimal.Decimal(1001), False)
+            assert await producer._get_reference_price() == decimal.Decimal(1001)
+            get_potentially_outdated_price_mock.assert_called_once_with(exchange_manager, symbol)
+            warning_mock.assert_called_once()
+
+
+async def test_order_notification_callback_without_producer():
+    symbol = "BTC/USDT"
+    async with _get_tools(symbol) as (producer, consumer, exchange_manager):
+        mode = producer.trading_mode
+        producers = mode.producers
+        mode.producers = []
+        try:
+            # does not raise
+            await mode._order_notification_callback(
+                "binance", exchange_manager.id, "BTC", symbol,
+                {
+                    trading_enums.ExchangeConstantsOrderColumns.ID.value: "1",
+                    trading_enums.ExchangeConstantsOrderColumns.STATUS.value: trading_enums.OrderStatus.FILLED.value,
+                    trading_enums.ExchangeConstantsOrderColumns.TYPE.value: trading_enums.TradeOrderType.LIMIT.value,
+                },
+                trading_enums.OrderUpdateType.STATE_CHANGE.value, True
+            )
+        finally:
+            mode.producers = producers
@@ -0,0 +1,135 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import decimal
+import os
+import time
+import mock
+import numpy as np
+import pytest
+
+import octobot_trading.enums as trading_enums
+import octobot_trading.personal_data as trading_personal_data
+import tentacles.Trading.Mode.market_making_trading_mode.market_making_trading as market_making_trading
+import tentacles.Trading.Mode.market_making_trading_mode.tests.test_market_making_trading as test_market_making_trading
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+TICKS_PER_SECOND = 1000
+TICKS_COUNT = 1000
+ORDERS_COUNT = 200
+# one order is edited every ORDER_UPDATE_INTERVAL ticks
+ORDER_UPDATE_INTERVAL = 20
+# a reference price update should be handled before the next one
+MAX_P99_LATENCY = 1 / TICKS_PER_SECOND
+
+
+async def _create_orders(exchange_manager, symbol):
+    orders = []
+    for i in range(ORDERS_COUNT // 2):
+        for order_class, order_type, price in (
+            (trading_personal_data.BuyLimitOrder, trading_enums.TraderOrderType.BUY_LIMIT, 990 - i),
+            (trading_personal_data.SellLimitOrder, trading_enums.TraderOrderType.SELL_LIMIT, 1010 + i),
+        ):
+            order = order_class(exchange_manager.trader)
+            order.update(order_type=order_type,
+                         symbol=symbol,
+                         current_price=decimal.Decimal(1000),
+                         quantity=decimal.Decimal("0.001"),
+                         price=decimal.Decimal(price))
+            await exchange_manager.exchange_personal_data.orders_manager.upsert_order_instance(order)
+            orders.append(order)
+    return orders
+
+
+def _get_ticks():
+    random = np.random.default_rng(42)
+    # mostly within open orders spread, sometimes beyond it
+    prices = 1000 + np.cumsum(random.normal(0, 1, TICKS_COUNT))
+    return [decimal.Decimal(str(round(price, 2))) for price in prices.tolist()]
+
+
+async def _legacy_on_reference_price_update(producer):
+    # previous implementation: open orders are filtered and sorted on each reference price update
+    trigger = False
+    if reference_price := producer._read_reference_price(producer._reference_price_exchange_manager):
+        open_orders = producer.get_market_making_orders()
+        buy_orders = [order for order in open_orders if order.side == trading_enums.TradeOrderSide.BUY]
+        if not buy_orders or max(order.origin_price for order in buy_orders) > reference_price:
+            trigger = True
+        sell_orders = [order for order in open_orders if order.side == trading_enums.TradeOrderSide.SELL]
+        if not sell_orders or min(order.origin_price for order in sell_orders) < reference_price:
+            trigger = True
+    if trigger:
+        await producer._ensure_market_making_orders(f"reference price update: {float(reference_price)}")
+
+
+async def _on_reference_price_update(producer):
+    await producer._mark_price_callback("binance", "", "BTC", producer.symbol, None)
+
+
+async def _paced_replay(on_reference_price_update, producer, orders, ticks):
+    current_price = [None]
+    latencies = []
+    producer._open_orders_view.invalidate()
+    with mock.patch.object(
+        market_making_trading.trading_personal_data, "get_potentially_outdated_price",
+        mock.Mock(side_effect=lambda *_: (current_price[0], True))
+    ), mock.patch.object(producer, "_ensure_market_making_orders", mock.AsyncMock()) as ensure_mock:
+        start = time.perf_counter()
+        for index, price in enumerate(ticks):
+            if (delay := start + index / TICKS_PER_SECOND - time.perf_counter()) > 0:
+                await asyncio.sleep(delay)
+            if index % ORDER_UPDATE_INTERVAL == 0:
+                # order edit notification
+                edited_order = orders[index % len(orders)]
+                edited_order.origin_price += decimal.Decimal("0.01") \
+                    if edited_order.side is trading_enums.TradeOrderSide.SELL else decimal.Decimal("-0.01")
+                producer.on_order_update({trading_enums.ExchangeConstantsOrderColumns.ID.value: edited_order.order_id})
+            current_price[0] = price
+            t0 = time.perf_counter()
+            await on_reference_price_update(producer)
+            latencies.append(time.perf_counter() - t0)
+        return np.percentile(latencies, [50, 95, 99]), ensure_mock.mock_calls
+
+
+async def test_reference_price_updates_latency_benchmark():
+    symbol = "BTC/USDT"
+    async with test_market_making_trading._get_tools(symbol) as (producer, _, exchange_manager):
+        orders = await _create_orders(exchange_manager, symbol)
+        assert len(producer.get_market_making_orders()) == ORDERS_COUNT
+        producer._reference_price_exchange_manager = exchange_manager
+        ticks = _get_ticks()
+        legacy_latencies, legacy_triggers = await _paced_replay(
+            _legacy_on_reference_price_update, producer, orders, ticks
+        )
+        # revert order edits
+        for index in range(0, TICKS_COUNT, ORDER_UPDATE_INTERVAL):
+            edited_order = orders[index % len(orders)]
+            edited_order.origin_price -= decimal.Decimal("0.01") \
+                if edited_order.side is trading_enums.TradeOrderSide.SELL else decimal.Decimal("-0.01")
+        latencies, triggers = await _paced_replay(_on_reference_price_update, producer, orders, ticks)
+    print(f"\n{TICKS_PER_SECOND} reference price updates/s with {ORDERS_COUNT} open orders: "
+          f"previous implementation p50/p95/p99: {' / '.join(f'{l * 1e6:.0f}µs' for l in legacy_latencies)}, "
+          f"open orders view p50/p95/p99: {' / '.join(f'{l * 1e6:.0f}µs' for l in latencies)}")
+    # same orders updates are triggered
+    assert triggers
+    assert triggers == legacy_triggers
+    if os.getenv("RUN_BENCHMARKS"):
+        # timings are only reliable on an idle machine
+        assert latencies[0] < legacy_latencies[0]
+        assert latencies[2] < MAX_P99_LATENCY
@@ -0,0 +1,74 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import decimal
+import mock
+
+import octobot_trading.enums as trading_enums
+import tentacles.Trading.Mode.market_making_trading_mode.open_orders_view as open_orders_view
+
+
+def _order(order_id, side, price):
+    return mock.Mock(order_id=order_id, side=side, origin_price=decimal.Decimal(str(price)))
+
+
+def test_synchronize():
+    view = open_orders_view.OpenOrdersView()
+    assert view.is_synchronized is False
+    assert view.get_highest_buy_price() is None
+    assert view.get_lowest_sell_price() is None
+    view.synchronize([
+        _order("1", trading_enums.TradeOrderSide.BUY, 90),
+        _order("2", trading_enums.TradeOrderSide.BUY, 95),
+        _order("3", trading_enums.TradeOrderSide.SELL, 110),
+        _order("4", trading_enums.TradeOrderSide.SELL, 105),
+    ])
+    assert view.is_synchronized is True
+    assert len(view) == 4
+    assert view.get_highest_buy_price() == decimal.Decimal(95)
+    assert view.get_lowest_sell_price() == decimal.Decimal(105)
+
+    view.invalidate()
+    assert view.is_synchronized is False
+    # synchronizing again replaces previous orders
+    view.synchronize([_order("5", trading_enums.TradeOrderSide.BUY, 80)])
+    assert len(view) == 1
+    assert view.get_highest_buy_price() == decimal.Decimal(80)
+    assert view.get_lowest_sell_price() is None
+
+
+def test_upsert_and_remove():
+    view = open_orders_view.OpenOrdersView()
+    view.upsert("1", trading_enums.TradeOrderSide.BUY, decimal.Decimal(90))
+    view.upsert("2", trading_enums.TradeOrderSide.BUY, decimal.Decimal(90))
+    view.upsert("3", trading_enums.TradeOrderSide.SELL, decimal.Decimal(110))
+    assert len(view) == 3
+    assert view.get_highest_buy_price() == decimal.Decimal(90)
+    # edited order
+    view.upsert("1", trading_enums.TradeOrderSide.BUY, decimal.Decimal(99))
+    assert len(view) == 3
+    assert view.get_highest_buy_price() == decimal.Decimal(99)
+    view.remove("1")
+    # same price order is still open
+    assert view.get_highest_buy_price() == decimal.Decimal(90)
+    view.remove("2")
+    assert view.get_highest_buy_price() is None
+    # unknown order
+    view.remove("2")
+    assert len(view) == 1
+    assert view.get_lowest_sell_price() == decimal.Decimal(110)
+    view.clear()
+    assert len(view) == 0
+    assert view.get_lowest_sell_price() is None
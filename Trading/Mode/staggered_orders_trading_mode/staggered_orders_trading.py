@@ -21,6 +21,7 @@ import math
 import asyncio
 import decimal
 import typing
+import sortedcontainers
 
 import async_channel.constants as channel_constants
 import octobot_commons.constants as commons_constants
@@ -116,6 +117,74 @@ class OrderData:
     associated_entry_id: str = None
 
 
+class PriceLevels:
+    """
+    Price sorted index of orders or trades replacing linear scans by O(log(n)) price lookups.
+    Elements sharing the same price keep their original list order.
+    """
+    def __init__(self, elements, price_key):
+        self.elements = elements
+        self.size = len(elements)
+        self._levels = sortedcontainers.SortedDict()
+        self._levels_by_side = {
+            trading_enums.TradeOrderSide.BUY: sortedcontainers.SortedDict(),
+            trading_enums.TradeOrderSide.SELL: sortedcontainers.SortedDict(),
+        }
+        for index, element in enumerate(elements):
+            price = price_key(element)
+            self._levels.setdefault(price, []).append((index, element))
+            if (side_levels := self._levels_by_side.get(element.side)) is not None:
+                side_levels.setdefault(price, []).append((index, element))
+
+    def is_indexing(self, elements) -> bool:
+        return self.elements is elements and self.size == len(elements)
+
+    def get_surrounding_elements(self, price) -> tuple:
+        """
+        :return: the last element priced at or below price (or the first element when every element is priced
+        above it) and the first element following it priced above price, as if iterating over price sorted elements
+        """
+        if not self._levels:
+            return None, None
+        position = self._levels.bisect_right(price)
+        if position == 0:
+            first_level = self._levels.peekitem(0)[1]
+            if len(first_level) > 1:
+                return first_level[0][1], first_level[1][1]
+            return first_level[0][1], self._get_first_element_of_level(1)
+        return self._levels.peekitem(position - 1)[1][-1][1], self._get_first_element_of_level(position)
+
+    def get_first_in_range(self, lower_bound, higher_bound, side):
+        """
+        :return: the lowest priced element of the given side within [lower_bound, higher_bound]
+        """
+        levels = self._levels_by_side[side]
+        for price in levels.irange(lower_bound, higher_bound):
+            return levels[price][0][1]
+        return None
+
+    def get_first_indexed_in_range(self, lower_bound, higher_bound, side) -> tuple:
+        """
+        :return: the (index, element) of the given side within [lower_bound, higher_bound] that is the first one
+        in the indexed elements list
+        """
+        levels = self._levels_by_side[side]
+        return min(
+            (
+                indexed_element
+                for price in levels.irange(lower_bound, higher_bound)
+                for indexed_element in levels[price]
+            ),
+            key=lambda indexed_element: indexed_element[0],
+            default=(None, None)
+        )
+
+    def _get_first_element_of_level(self, position):
+        if position < len(self._levels):
+            return self._levels.peekitem(position)[1][0][1]
+        return None
+
+
 class StaggeredOrdersTradingMode(trading_modes.AbstractTradingMode):
     CONFIG_PAIR_SETTINGS = "pair_settings"
     CONFIG_PAIR = "pair"
@@ -591,6 +660,8 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         self.use_order_by_order_trailing = True # enabled by default
         self.funds_redispatch_interval = 24
         self._expect_missing_orders = False
+        # price indexes of the orders and trades of the missing orders fill in progress, if any
+        self._price_levels_by_elements_id = None
         self._skip_order_restore_on_recently_closed_orders = True
         self._use_recent_trades_for_order_restore = False
         self._already_created_init_orders = False
@@ -1943,23 +2014,29 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
     def _fill_missing_orders(
         self, lower_bound, upper_bound, side, sorted_orders, current_price, missing_orders, selling,
         order_limiting_currency, order_limiting_currency_amount, currency, recent_trades
+    ):
+        # orders and trades are indexed once for this fill: price lookups don't scan every element
+        self._price_levels_by_elements_id = {}
+        try:
+            return self._fill_indexed_missing_orders(
+                lower_bound, upper_bound, side, sorted_orders, current_price, missing_orders, selling,
+                order_limiting_currency, order_limiting_currency_amount, currency, recent_trades
+            )
+        finally:
+            self._price_levels_by_elements_id = None
+
+    def _fill_indexed_missing_orders(
+        self, lower_bound, upper_bound, side, sorted_orders, current_price, missing_orders, selling,
+        order_limiting_currency, order_limiting_currency_amount, currency, recent_trades
     ):
         orders = []
         if missing_orders and [o for o in missing_orders if o[1] is side]:
             max_quant_per_order = order_limiting_currency_amount / len([o for o in missing_orders if o[1] is side])
             missing_orders_around_spread = []
+            orders_price_levels = self._get_orders_price_levels(sorted_orders)
             for missing_order_price, missing_order_side in missing_orders:
                 if missing_order_side == side:
-                    previous_o = None
-                    following_o = None
-                    for o in sorted_orders:
-                        if previous_o is None:
-                            previous_o = o
-                        elif o.origin_price > missing_order_price:
-                            following_o = o
-                            break
-                        else:
-                            previous_o = o
+                    previous_o, following_o = orders_price_levels.get_surrounding_elements(missing_order_price)
                     if following_o is None or previous_o.side == following_o.side:
                         decimal_missing_order_price = decimal.Decimal(str(missing_order_price))
                         # missing order between similar orders
@@ -2119,14 +2196,12 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
 
     def _get_quantity_from_existing_orders(self, price, sorted_orders, selling):
         increment_window = self.flat_increment / 4
-        price_window_lower_bound = price - increment_window
-        price_window_higher_bound = price + increment_window
-        for order in sorted_orders:
-            if price_window_lower_bound <= order.origin_price <= price_window_higher_bound and (
-                order.side is (trading_enums.TradeOrderSide.SELL if selling else trading_enums.TradeOrderSide.BUY)
-            ):
-                return order.origin_quantity
-        return None
+        order = self._get_orders_price_levels(sorted_orders).get_first_in_range(
+            price - increment_window,
+            price + increment_window,
+            trading_enums.TradeOrderSide.SELL if selling else trading_enums.TradeOrderSide.BUY
+        )
+        return None if order is None else order.origin_quantity
 
     def _get_quantity_from_existing_boundary_orders(self, price, sorted_orders, selling):
         # Should be the last attempt: compute price from existing orders using cost
@@ -2158,23 +2233,42 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         increment_window = self.flat_increment / 4
         price_window_lower_bound = price - increment_window
         price_window_higher_bound = price + increment_window
-        for trade in trades:
-            is_sell_trade = trade.side == trading_enums.TradeOrderSide.SELL
-            trade_price = trade.origin_price or trade.executed_price
-            if is_sell_trade == selling:
-                # same side
-                if price_window_lower_bound <= trade_price <= price_window_higher_bound:
-                    # found the exact same trade
-                    return trade
-            else:
-                # different side: use spread to compute mirror order price
-                price_increment = self.flat_spread - self.flat_increment
-                mirror_order_price = (trade_price - price_increment) \
-                    if is_sell_trade else (trade_price + price_increment)
-                if price_window_lower_bound <= mirror_order_price <= price_window_higher_bound:
-                    # found mirror trade
-                    return trade
-        return None
+        trades_price_levels = self._get_trades_price_levels(trades)
+        same_side, other_side = (trading_enums.TradeOrderSide.SELL, trading_enums.TradeOrderSide.BUY) \
+            if selling else (trading_enums.TradeOrderSide.BUY, trading_enums.TradeOrderSide.SELL)
+        # same side: found the exact same trade
+        same_side_index, same_side_trade = trades_price_levels.get_first_indexed_in_range(
+            price_window_lower_bound, price_window_higher_bound, same_side
+        )
+        # different side: use spread to compute mirror order price (sell trade price - spread
+        # or buy trade price + spread) and look for trades which mirror order price is within the window
+        price_increment = self.flat_spread - self.flat_increment
+        if other_side is trading_enums.TradeOrderSide.BUY:
+            price_increment = -price_increment
+        mirror_index, mirror_trade = trades_price_levels.get_first_indexed_in_range(
+            price_window_lower_bound + price_increment, price_window_higher_bound + price_increment, other_side
+        )
+        if mirror_index is None or (same_side_index is not None and same_side_index < mirror_index):
+            return same_side_trade
+        # found mirror trade first
+        return mirror_trade
+
+    def _get_orders_price_levels(self, sorted_orders) -> PriceLevels:
+        return self._get_price_levels(sorted_orders, lambda order: order.origin_price)
+
+    def _get_trades_price_levels(self, trades) -> PriceLevels:
+        return self._get_price_levels(trades, lambda trade: trade.origin_price or trade.executed_price)
+
+    def _get_price_levels(self, elements, price_key) -> PriceLevels:
+        if self._price_levels_by_elements_id is None:
+            # not filling missing orders: elements might change before the next call
+            return PriceLevels(elements, price_key)
+        # reuse index as long as elements are the same during this fill
+        price_levels = self._price_levels_by_elements_id.get(id(elements))
+        if price_levels is None or not price_levels.is_indexing(elements):
+            price_levels = PriceLevels(elements, price_key)
+            self._price_levels_by_elements_id[id(elements)] = price_levels
+        return price_levels
 
     def _get_maximum_traded_funds(self, allowed_funds, total_available_funds, currency, selling, ignore_available_funds):
         to_trade_funds = total_available_funds
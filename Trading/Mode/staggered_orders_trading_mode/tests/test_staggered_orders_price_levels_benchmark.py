@@ -0,0 +1,112 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import decimal
+import os
+import time
+import mock
+import pytest
+
+import octobot_trading.api as trading_api
+
+import tentacles.Trading.Mode.staggered_orders_trading_mode.staggered_orders_trading as staggered_orders_trading
+import tentacles.Trading.Mode.staggered_orders_trading_mode.tests.test_staggered_orders_trading_mode as \
+    staggered_orders_tests
+
+# All test coroutines will be treated as marked.
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="slow benchmark, set RUN_BENCHMARKS to run it"),
+]
+
+GRID_LEVELS = 2000
+# cancel one order every MISSING_ORDER_STEP orders
+MISSING_ORDER_STEP = 10
+
+
+class _LinearPriceLevels:
+    """
+    Previous implementation: scan every element for each lookup
+    """
+    def __init__(self, elements, price_key):
+        self.elements = elements
+        self.price_key = price_key
+
+    def is_indexing(self, elements) -> bool:
+        return self.elements is elements
+
+    def get_surrounding_elements(self, price) -> tuple:
+        previous_element = following_element = None
+        for element in self.elements:
+            if previous_element is None:
+                previous_element = element
+            elif self.price_key(element) > price:
+                following_element = element
+                break
+            else:
+                previous_element = element
+        return previous_element, following_element
+
+    def get_first_in_range(self, lower_bound, higher_bound, side):
+        for element in self.elements:
+            if lower_bound <= self.price_key(element) <= higher_bound and element.side is side:
+                return element
+        return None
+
+    def get_first_indexed_in_range(self, lower_bound, higher_bound, side) -> tuple:
+        for index, element in enumerate(self.elements):
+            if lower_bound <= self.price_key(element) <= higher_bound and element.side is side:
+                return index, element
+        return None, None
+
+
+async def _timed_orders_restore(producer, exchange_manager):
+    open_orders = trading_api.get_open_orders(exchange_manager)
+    to_cancel = open_orders[1:-1:MISSING_ORDER_STEP]
+    for order in to_cancel:
+        await exchange_manager.trader.cancel_order(order)
+    assert len(trading_api.get_open_orders(exchange_manager)) == len(open_orders) - len(to_cancel)
+    t0 = time.perf_counter()
+    await producer._ensure_staggered_orders()
+    duration = time.perf_counter() - t0
+    await asyncio.create_task(staggered_orders_tests._wait_for_orders_creation(len(to_cancel)))
+    # restored orders
+    assert len(trading_api.get_open_orders(exchange_manager)) == len(open_orders)
+    return duration, len(to_cancel)
+
+
+async def test_restore_missing_orders_benchmark():
+    async with staggered_orders_tests._get_tools(
+        "BTC/USD", btc_holdings=100000, additional_portfolio={"USD": 100000000}
+    ) as tools:
+        producer, _, exchange_manager = tools
+        producer.operational_depth = GRID_LEVELS
+        producer.spread = decimal.Decimal("0.001")
+        producer.increment = decimal.Decimal("0.0005")
+        producer.mode = staggered_orders_trading.StrategyModes.FLAT
+        producer.RECENT_TRADES_ALLOWED_TIME = -1
+        trading_api.force_set_mark_price(exchange_manager, producer.symbol, 5000)
+        await producer._ensure_staggered_orders()
+        await asyncio.create_task(staggered_orders_tests._wait_for_orders_creation(GRID_LEVELS))
+        assert len(trading_api.get_open_orders(exchange_manager)) == GRID_LEVELS
+
+        with mock.patch.object(staggered_orders_trading, "PriceLevels", _LinearPriceLevels):
+            linear_duration, restored_orders = await _timed_orders_restore(producer, exchange_manager)
+        indexed_duration, _ = await _timed_orders_restore(producer, exchange_manager)
+        print(f"\n{GRID_LEVELS} levels grid _ensure_staggered_orders pass restoring {restored_orders} orders: "
+              f"linear scans: {linear_duration:.4f}s, price levels: {indexed_duration:.4f}s "
+              f"(x{linear_duration / indexed_duration:.1f})")
+        assert indexed_duration < linear_duration
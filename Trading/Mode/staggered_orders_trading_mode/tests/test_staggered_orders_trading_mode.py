@@ -2875,6 +2875,83 @@ async def test_ensure_full_funds_usage():
             producer._ensure_full_funds_usage([buy_order, buy_order_2, buy_order_3, sell_order], 3, 1)
 
 
+async def test_price_levels():
+    buy_1 = mock.Mock(origin_price=decimal.Decimal(90), side=trading_enums.TradeOrderSide.BUY)
+    buy_2 = mock.Mock(origin_price=decimal.Decimal(95), side=trading_enums.TradeOrderSide.BUY)
+    buy_3 = mock.Mock(origin_price=decimal.Decimal(95), side=trading_enums.TradeOrderSide.BUY)
+    sell_1 = mock.Mock(origin_price=decimal.Decimal(105), side=trading_enums.TradeOrderSide.SELL)
+    sorted_orders = [buy_1, buy_2, buy_3, sell_1]
+    price_levels = staggered_orders_trading.PriceLevels(sorted_orders, lambda order: order.origin_price)
+    assert price_levels.is_indexing(sorted_orders)
+    assert not price_levels.is_indexing(list(sorted_orders))
+
+    assert price_levels.get_surrounding_elements(80) == (buy_1, buy_2)
+    assert price_levels.get_surrounding_elements(90) == (buy_1, buy_2)
+    assert price_levels.get_surrounding_elements(decimal.Decimal(92)) == (buy_1, buy_2)
+    assert price_levels.get_surrounding_elements(100) == (buy_3, sell_1)
+    assert price_levels.get_surrounding_elements(110) == (sell_1, None)
+    assert staggered_orders_trading.PriceLevels([], lambda order: order.origin_price).get_surrounding_elements(1) \
+           == (None, None)
+
+    assert price_levels.get_first_in_range(94, 110, trading_enums.TradeOrderSide.BUY) is buy_2
+    assert price_levels.get_first_in_range(94, 110, trading_enums.TradeOrderSide.SELL) is sell_1
+    assert price_levels.get_first_in_range(96, 104, trading_enums.TradeOrderSide.BUY) is None
+
+    # lowest index first, whatever the price
+    trades = [sell_1, buy_3, buy_1, buy_2]
+    price_levels = staggered_orders_trading.PriceLevels(trades, lambda order: order.origin_price)
+    assert price_levels.get_first_indexed_in_range(80, 100, trading_enums.TradeOrderSide.BUY) == (1, buy_3)
+    assert price_levels.get_first_indexed_in_range(80, 100, trading_enums.TradeOrderSide.SELL) == (None, None)
+
+
+async def test_get_associated_trade():
+    symbol = "BTC/USD"
+    async with _get_tools(symbol) as tools:
+        producer, _, exchange_manager = tools
+        producer.flat_increment = decimal.Decimal(4)
+        producer.flat_spread = decimal.Decimal(10)
+        sell_trade = mock.Mock(
+            origin_price=decimal.Decimal(106), executed_price=None, side=trading_enums.TradeOrderSide.SELL
+        )
+        buy_trade = mock.Mock(
+            origin_price=None, executed_price=decimal.Decimal(100), side=trading_enums.TradeOrderSide.BUY
+        )
+        trades = [sell_trade, buy_trade]
+        # same side
+        assert producer._get_associated_trade(decimal.Decimal(100), [buy_trade, sell_trade], False) is buy_trade
+        assert producer._get_associated_trade(decimal.Decimal(106), trades, True) is sell_trade
+        # mirror price: 106 - (10 - 4) = 100, first trade is returned
+        assert producer._get_associated_trade(decimal.Decimal(100), trades, False) is sell_trade
+        assert producer._get_associated_trade(decimal.Decimal(101), trades, False) is sell_trade
+        # mirror price: 100 + (10 - 4) = 106
+        assert producer._get_associated_trade(decimal.Decimal(107), [buy_trade], True) is buy_trade
+        assert producer._get_associated_trade(decimal.Decimal(103), trades, True) is None
+
+
+async def test_price_levels_are_not_kept_between_calls():
+    symbol = "BTC/USD"
+    async with _get_tools(symbol) as tools:
+        producer, _, exchange_manager = tools
+        producer.flat_increment = decimal.Decimal(4)
+        sell_order = mock.Mock(
+            origin_price=decimal.Decimal(100), origin_quantity=decimal.Decimal(1), side=trading_enums.TradeOrderSide.SELL
+        )
+        sorted_orders = [sell_order]
+        assert producer._get_quantity_from_existing_orders(decimal.Decimal(100), sorted_orders, True) == 1
+        # order replaced in the same orders list
+        sorted_orders[0] = mock.Mock(
+            origin_price=decimal.Decimal(200), origin_quantity=decimal.Decimal(2), side=trading_enums.TradeOrderSide.SELL
+        )
+        assert producer._get_quantity_from_existing_orders(decimal.Decimal(100), sorted_orders, True) is None
+        assert producer._get_quantity_from_existing_orders(decimal.Decimal(200), sorted_orders, True) == 2
+        # orders and trades are only indexed during missing orders fills
+        assert producer._fill_missing_orders(
+            decimal.Decimal(50), decimal.Decimal(300), trading_enums.TradeOrderSide.SELL, sorted_orders,
+            decimal.Decimal(150), [], True, "BTC", decimal.Decimal(1), "BTC", []
+        ) == []
+        assert producer._price_levels_by_elements_id is None
+
+
 async def _wait_for_orders_creation(orders_count=1):
     for _ in range(orders_count):
         await asyncio_tools.wait_asyncio_next_cycle()
@@ -0,0 +1,156 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import decimal
+import time
+import mock
+import pytest
+
+import octobot_trading.api as trading_api
+import octobot_trading.enums as trading_enums
+import octobot_trading.personal_data as trading_personal_data
+import tentacles.Trading.Mode.volume_booster_trading_mode.volume_booster_trading as volume_booster_trading
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+SYMBOLS = [f"COIN{i}/USDT" for i in range(20)]
+PRICE_FETCH_LATENCY = 0.05
+# sleep after each order creation in _execute_volume_boost_trade
+ORDER_PROCESSING_TIME = 0.5
+
+
+class SimulatedExchange:
+    """
+    Simulated exchange answering price requests with latency and recording created orders
+    """
+
+    def __init__(self):
+        self.created_orders_by_symbol = {symbol: [] for symbol in SYMBOLS}
+        self.trade_start_times = []
+
+    async def get_pre_order_data(self, exchange_manager, symbol, timeout=None):
+        self.trade_start_times.append(time.perf_counter())
+        await asyncio.sleep(PRICE_FETCH_LATENCY)
+        return None, None, None, decimal.Decimal(100), {}
+
+    async def create_order(self, order):
+        self.created_orders_by_symbol[order.symbol].append(order)
+        return mock.Mock(status=trading_enums.OrderStatus.OPEN)
+
+
+def _create_consumer():
+    trading_mode = mock.Mock(
+        trading_config={
+            volume_booster_trading.VOLUME_TARGET_KEY: 10000000.0,
+            volume_booster_trading.TRADE_FREQUENCY_MIN_KEY: 0.1,
+            volume_booster_trading.TRADE_FREQUENCY_MAX_KEY: 0.2,
+            volume_booster_trading.ENABLE_VOLUME_BOOSTER_KEY: True,
+        },
+        exchange_manager=mock.Mock(
+            exchange_config=mock.Mock(traded_symbol_pairs=SYMBOLS),
+            # simulated exchange: no ccxt rate limit
+            exchange=mock.Mock(connector=None),
+            trader=mock.Mock(is_enabled=True),
+        ),
+    )
+    return volume_booster_trading.VolumeBoosterTradingModeConsumer(trading_mode)
+
+
+async def test_symbols_are_traded_concurrently():
+    exchange = SimulatedExchange()
+    consumer = _create_consumer()
+    consumer.trading_mode.create_order = exchange.create_order
+    consumer.MAX_CONCURRENT_REQUESTS = 10
+    running_trades = max_running_trades = 0
+    origin_execute_volume_boost_trade = consumer._execute_volume_boost_trade
+
+    async def _execute_volume_boost_trade(symbol):
+        nonlocal running_trades, max_running_trades
+        running_trades += 1
+        max_running_trades = max(max_running_trades, running_trades)
+        try:
+            await origin_execute_volume_boost_trade(symbol)
+        finally:
+            running_trades -= 1
+
+    with mock.patch.object(consumer, "_execute_volume_boost_trade",
+                           mock.AsyncMock(side_effect=_execute_volume_boost_trade)), \
+            mock.patch.object(trading_personal_data, "get_pre_order_data",
+                           mock.AsyncMock(side_effect=exchange.get_pre_order_data)), \
+            mock.patch.object(trading_personal_data, "create_order_instance",
+                              mock.Mock(side_effect=lambda **kwargs: mock.Mock(symbol=kwargs["symbol"]))), \
+            mock.patch.object(trading_api, "get_portfolio_currency",
+                              mock.Mock(return_value=mock.Mock(available=decimal.Decimal(1000000)))), \
+            mock.patch.object(consumer._trades_rate_limiter, "max_requests_per_second", 100):
+        t0 = time.perf_counter()
+        assert await consumer.inner_start() is True
+        first_cycle_time = None
+        while min(len(orders) for orders in exchange.created_orders_by_symbol.values()) < 2:
+            if first_cycle_time is None and all(exchange.created_orders_by_symbol.values()):
+                first_cycle_time = time.perf_counter() - t0
+            await asyncio.sleep(0.01)
+        two_cycles_time = time.perf_counter() - t0
+        await consumer.stop()
+
+    orders_count = sum(len(orders) for orders in exchange.created_orders_by_symbol.values())
+    # symbols handled one after another: at least price fetching and order processing time for each symbol
+    sequential_cycle_time = len(SYMBOLS) * (PRICE_FETCH_LATENCY + ORDER_PROCESSING_TIME)
+    print(
+        f"\n{len(SYMBOLS)} symbols: first cycle in {first_cycle_time:.2f}s, 2 cycles in {two_cycles_time:.2f}s "
+        f"(sequential minimum: {sequential_cycle_time:.2f}s per cycle), {orders_count} orders, "
+        f"max concurrent trades: {max_running_trades}"
+    )
+    assert first_cycle_time < sequential_cycle_time / 4
+    assert two_cycles_time < sequential_cycle_time / 2
+    assert consumer.orders_placed == orders_count >= 2 * len(SYMBOLS)
+    # orders being processed when stopping are not counted as successful
+    assert orders_count - consumer.MAX_CONCURRENT_REQUESTS <= consumer.successful_orders <= orders_count
+    assert consumer.failed_orders == 0
+    # per exchange concurrency cap
+    assert max_running_trades == consumer.MAX_CONCURRENT_REQUESTS
+    # global rate limit: at most 100 trades per second (10 trades in at least 0.1 second, with timers tolerance)
+    start_times = sorted(exchange.trade_start_times)
+    assert min(b - a for a, b in zip(start_times, start_times[10:])) >= 0.1 * 0.8
+    # tasks are stopped
+    assert consumer.symbol_tasks == {}
+    assert consumer.is_running is False
+
+
+async def test_symbols_tasks_follow_traded_symbols():
+    consumer = _create_consumer()
+    consumer.is_running = True
+    with mock.patch.object(consumer, "_symbol_volume_booster_loop",
+                           mock.Mock(side_effect=lambda symbol: asyncio.sleep(10))):
+        consumer._update_symbol_tasks(SYMBOLS[:3])
+        tasks = dict(consumer.symbol_tasks)
+        assert list(tasks) == SYMBOLS[:3]
+        consumer._update_symbol_tasks(SYMBOLS[1:4])
+        await asyncio.sleep(0)
+        assert list(consumer.symbol_tasks) == SYMBOLS[1:4]
+        assert tasks[SYMBOLS[0]].cancelled()
+        # running tasks are kept
+        assert consumer.symbol_tasks[SYMBOLS[1]] is tasks[SYMBOLS[1]]
+        await consumer._cancel_symbol_tasks()
+    assert consumer.symbol_tasks == {}
+
+
+
+async def test_trades_rate_limiter_is_per_exchange():
+    consumer_1 = _create_consumer()
+    consumer_2 = _create_consumer()
+    assert consumer_1._trades_rate_limiter is not consumer_2._trades_rate_limiter
+    assert consumer_1._trades_rate_limiter.max_requests_per_second == volume_booster_trading.MAX_TRADES_PER_SECOND
@@ -38,6 +38,8 @@ try:
 except ImportError as e:
     raise ImportError(f"Required OctoBot modules not found: {e}")
 
+import tentacles.Trading.Exchange.exchange_requests_limiter as exchange_requests_limiter
+
 # Configuration constants
 VOLUME_TARGET_KEY = "volume_target"
 ORDER_TYPE_KEY = "order_type"
@@ -74,6 +76,9 @@ ENABLE_VOLUME_BOOSTER_DESC = "Start/Stop the volume boosting activity"
 # Trading mode metadata
 VOLUME_BOOSTER_MODE_NAME = "VolumeBoosterTradingMode"
 
+# Maximum trades per second, shared by every symbol of the volume booster of an exchange
+MAX_TRADES_PER_SECOND = 10
+
 
 class VolumeBoosterTradingMode(trading_modes.AbstractTradingMode):
     """
@@ -309,6 +314,8 @@ class VolumeBoosterTradingModeConsumer(trading_modes.AbstractTradingModeConsumer
     """
     Consumer for Volume Booster Trading Mode
     """
+    MAX_CONCURRENT_REQUESTS = 5    # max concurrent price fetching and orders creation requests on the exchange
+    SYMBOLS_SUPERVISION_INTERVAL = 1
 
     def __init__(self, trading_mode):
         super().__init__(trading_mode)
@@ -325,6 +332,9 @@ class VolumeBoosterTradingModeConsumer(trading_modes.AbstractTradingModeConsumer
         # Task management
         self.volume_task = None
         self.symbol_tasks = {}
+        self._exchange_requests_semaphore = None
+        # consumers are bound to a single exchange manager: trades are rate limited per exchange
+        self._trades_rate_limiter = exchange_requests_limiter.RequestsRateLimiter(MAX_TRADES_PER_SECOND)
         
         # Configuration cache
         self._config_cache = {}
@@ -490,12 +500,13 @@ class VolumeBoosterTradingModeConsumer(trading_modes.AbstractTradingModeConsumer
 
     async def _volume_booster_loop(self):
         """
-        Enhanced main loop for volume boosting with better management
+        Enhanced main loop for volume boosting: each symbol is traded by its own task
         """
         try:
             self.logger.info("Volume Booster main loop started")
-            
-            while self.is_running and not self.should_stop and self.current_volume < self.target_volume:
+            self._exchange_requests_semaphore = asyncio.Semaphore(self._get_max_concurrent_requests())
+
+            while self._should_keep_boosting():
                 # Refresh configuration periodically (every 60 seconds)
                 if time.time() - self._last_config_update > 60:
                     self._update_config_cache()
@@ -510,46 +521,10 @@ class VolumeBoosterTradingModeConsumer(trading_modes.AbstractTradingModeConsumer
                     self.logger.warning("No symbols configured for trading")
                     await asyncio.sleep(5)
                     continue
-                
-                # Process each symbol
-                for symbol in symbols:
-                    if (not self.is_running or self.should_stop or 
-                        (self.current_volume is not None and self.target_volume is not None and 
-                         self.current_volume >= self.target_volume)):
-                        break
-                        
-                    try:
-                        # Check if we should slow down due to consecutive failures
-                        if self.consecutive_failures >= 3:
-                            backoff_time = min(30, self.consecutive_failures * 2)
-                            self.logger.warning(f"Too many consecutive failures ({self.consecutive_failures}), backing off for {backoff_time}s")
-                            await asyncio.sleep(backoff_time)
-                            
-                        await self._execute_volume_boost_trade(symbol)
-                        
-                        # Dynamic wait time based on configuration and recent failures
-                        min_freq = self._get_config(TRADE_FREQUENCY_MIN_KEY, DEFAULT_TRADE_FREQUENCY_MIN)
-                        max_freq = self._get_config(TRADE_FREQUENCY_MAX_KEY, DEFAULT_TRADE_FREQUENCY_MAX)
-                        
-                        # Ensure min_freq <= max_freq
-                        if min_freq > max_freq:
-                            min_freq, max_freq = max_freq, min_freq
-                        
-                        # Increase wait time if we've had recent failures
-                        failure_multiplier = 1.0
-                        if self.consecutive_failures > 0:
-                            failure_multiplier = 1 + (self.consecutive_failures * 0.5)
-                            
-                        wait_time = random.uniform(min_freq, max_freq) * failure_multiplier
-                        await asyncio.sleep(wait_time)
-                        
-                    except asyncio.CancelledError:
-                        self.logger.info(f"Volume boost task for {symbol} cancelled")
-                        break
-                    except Exception as e:
-                        self.failed_orders += 1
-                        self.logger.warning(f"Error in volume boost trade for {symbol}: {e}")
-                        await asyncio.sleep(2)  # Brief pause on error
+
+                self._update_symbol_tasks(symbols)
+                # wake up regularly to refresh configuration and symbols
+                await asyncio.wait(self.symbol_tasks.values(), timeout=self.SYMBOLS_SUPERVISION_INTERVAL)
             
             # Check completion status
             if (self.current_volume is not None and self.target_volume is not None and 
@@ -566,6 +541,79 @@ class VolumeBoosterTradingModeConsumer(trading_modes.AbstractTradingModeConsumer
             self.logger.error(f"Critical error in volume booster loop: {e}")
         finally:
             self.is_running = False
+            await self._cancel_symbol_tasks()
+
+    def _should_keep_boosting(self) -> bool:
+        return self.is_running and not self.should_stop and not (
+            self.current_volume is not None and self.target_volume is not None and
+            self.current_volume >= self.target_volume
+        )
+
+    def _update_symbol_tasks(self, symbols: list):
+        for symbol in list(self.symbol_tasks):
+            if symbol not in symbols:
+                self.logger.info(f"{symbol} is not traded anymore, stopping its volume boost")
+                self.symbol_tasks.pop(symbol).cancel()
+        for symbol in symbols:
+            task = self.symbol_tasks.get(symbol)
+            if task is None or task.done():
+                self.symbol_tasks[symbol] = asyncio.create_task(self._symbol_volume_booster_loop(symbol))
+
+    async def _cancel_symbol_tasks(self):
+        tasks = [task for task in self.symbol_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.symbol_tasks.clear()
+
+    async def _symbol_volume_booster_loop(self, symbol: str):
+        """
+        Trade symbol with randomized pacing until the volume target is reached or the booster stops
+        """
+        while self._should_keep_boosting():
+            try:
+                # Check if we should slow down due to consecutive failures
+                if self.consecutive_failures >= 3:
+                    backoff_time = min(30, self.consecutive_failures * 2)
+                    self.logger.warning(f"Too many consecutive failures ({self.consecutive_failures}), backing off for {backoff_time}s")
+                    await asyncio.sleep(backoff_time)
+
+                # per exchange concurrency limit, then per exchange trades rate limit
+                async with self._exchange_requests_semaphore:
+                    await self._trades_rate_limiter.wait()
+                    if not self._should_keep_boosting():
+                        break
+                    await self._execute_volume_boost_trade(symbol)
+
+                # Dynamic wait time based on configuration and recent failures
+                min_freq = self._get_config(TRADE_FREQUENCY_MIN_KEY, DEFAULT_TRADE_FREQUENCY_MIN)
+                max_freq = self._get_config(TRADE_FREQUENCY_MAX_KEY, DEFAULT_TRADE_FREQUENCY_MAX)
+
+                # Ensure min_freq <= max_freq
+                if min_freq > max_freq:
+                    min_freq, max_freq = max_freq, min_freq
+
+                # Increase wait time if we've had recent failures
+                failure_multiplier = 1.0
+                if self.consecutive_failures > 0:
+                    failure_multiplier = 1 + (self.consecutive_failures * 0.5)
+
+                wait_time = random.uniform(min_freq, max_freq) * failure_multiplier
+                await asyncio.sleep(wait_time)
+
+            except asyncio.CancelledError:
+                self.logger.info(f"Volume boost task for {symbol} cancelled")
+                break
+            except Exception as e:
+                self.failed_orders += 1
+                self.logger.warning(f"Error in volume boost trade for {symbol}: {e}")
+                await asyncio.sleep(2)  # Brief pause on error
+
+    def _get_max_concurrent_requests(self) -> int:
+        return exchange_requests_limiter.get_max_concurrent_requests(
+            self.exchange_manager, self.MAX_CONCURRENT_REQUESTS
+        )
 
     async def _execute_volume_boost_trade(self, symbol: str):
         """
@@ -779,6 +827,9 @@ class VolumeBoosterTradingModeConsumer(trading_modes.AbstractTradingModeConsumer
                 self.last_failure_time = time.time()
                 self.logger.warning(f"❌ Order creation returned None for {symbol} {action}")
             
+        except asyncio.CancelledError:
+            # symbol task cancelled: not a failed order
+            raise
         except trading_errors.MissingMinimalExchangeTradeVolume as e:
             self.failed_orders += 1
             self.consecutive_failures += 1
@@ -789,7 +840,7 @@ class VolumeBoosterTradingModeConsumer(trading_modes.AbstractTradingModeConsumer
             self.consecutive_failures += 1
             self.last_failure_time = time.time()
             self.logger.warning(f"Order type not supported for {symbol}: {e}")
-        except trading_errors.InsufficientFunds as e:
+        except trading_errors.MissingFunds as e:
             self.failed_orders += 1
             self.consecutive_failures += 1
             self.last_failure_time = time.time()